@@ -11,7 +11,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from app.models.base import Base
 from app.models.user import User       # noqa: F401 — register model
-from app.models.inventory import InventoryItem  # noqa: F401 — register model
+from app.models.inventory import InventoryItem, SEARCH_OBJECT_NAMES  # noqa: F401 — register model
 from app.models.transaction import Transaction  # noqa: F401 — register model
 from app.models.invoice import Invoice, InvoiceItem  # noqa: F401 — register model
 from app.models.subscription import Subscription, WebhookEvent  # noqa: F401 — register model
@@ -21,6 +21,9 @@ from app.models.clover import CloverCredential  # noqa: F401 — register model
 from app.models.provider import ProviderSyncRun, ReconciliationIssue, ProviderWebhookEvent  # noqa: F401
 from app.models.auth_session import AuthSession  # noqa: F401
 from app.models.support import SupportRequest  # noqa: F401
+from app.models.photo import PhotoRendition  # noqa: F401
+from app.models.export import ExportJob  # noqa: F401
+from app.models.change_version import ChangeVersion  # noqa: F401
 from app.config import settings
 
 config = context.config
@@ -34,9 +37,16 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """Skip the search column and indexes that exist only as raw DDL (models/inventory.py)."""
+    return not (reflected and compare_to is None and (type_, name) in SEARCH_OBJECT_NAMES)
+
+
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
-    context.configure(url=url, target_metadata=target_metadata, literal_binds=True)
+    context.configure(
+        url=url, target_metadata=target_metadata, include_object=include_object, literal_binds=True,
+    )
     with context.begin_transaction():
         context.run_migrations()
 
@@ -48,7 +58,7 @@ def run_migrations_online() -> None:
         poolclass=pool.NullPool,
     )
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
         with context.begin_transaction():
             context.run_migrations()
 
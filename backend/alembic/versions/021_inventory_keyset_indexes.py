@@ -0,0 +1,50 @@
+"""Add keyset pagination indexes for inventory list sorts.
+
+Revision ID: 021
+Revises: 020
+
+Changes:
+  - DROP INDEX ix_inventory_user_created (user_id, created_at DESC)
+  - CREATE INDEX ix_inventory_user_created_id (user_id, created_at, id)
+  - CREATE INDEX ix_inventory_user_updated_id (user_id, updated_at, id)
+  - CREATE INDEX ix_inventory_user_price_id   (user_id, expected_sell_price, id)
+  - CREATE INDEX ix_inventory_user_name_id    (user_id, name, id)
+
+All four are partial on deleted_at IS NULL. A backward scan serves the DESC
+variant of each sort, so one index per key covers both directions.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "021"
+down_revision = "020"
+branch_labels = None
+depends_on = None
+
+_KEYSET_INDEXES = {
+    "ix_inventory_user_created_id": ["user_id", "created_at", "id"],
+    "ix_inventory_user_updated_id": ["user_id", "updated_at", "id"],
+    "ix_inventory_user_price_id": ["user_id", "expected_sell_price", "id"],
+    "ix_inventory_user_name_id": ["user_id", "name", "id"],
+}
+
+
+def upgrade() -> None:
+    for name, columns in _KEYSET_INDEXES.items():
+        op.create_index(
+            name,
+            "inventory_items",
+            columns,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        )
+    op.execute("DROP INDEX IF EXISTS ix_inventory_user_created")
+
+
+def downgrade() -> None:
+    op.execute("""
+        CREATE INDEX ix_inventory_user_created
+            ON inventory_items (user_id, created_at DESC)
+            WHERE deleted_at IS NULL
+    """)
+    for name in reversed(list(_KEYSET_INDEXES)):
+        op.drop_index(name, table_name="inventory_items")
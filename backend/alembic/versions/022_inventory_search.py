@@ -0,0 +1,57 @@
+"""Add trigram / full-text search structures for inventory search.
+
+Revision ID: 022
+Revises: 021
+
+Changes:
+  - CREATE EXTENSION pg_trgm
+  - ADD COLUMN inventory_items.search_vector tsvector GENERATED ALWAYS AS
+      to_tsvector('simple', name || sku || upc) STORED
+  - CREATE INDEX ix_inventory_search_vector (GIN on search_vector)
+  - CREATE INDEX ix_inventory_{name,sku,upc}_trgm (GIN gin_trgm_ops)
+  - CREATE INDEX ix_inventory_user_upc / ix_inventory_user_sku
+      (user_id, upc|sku) btree, partial — exact-match fast path
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "022"
+down_revision = "021"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("""
+        ALTER TABLE inventory_items ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(sku, '') || ' ' || coalesce(upc, ''))
+            ) STORED
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_inventory_search_vector ON inventory_items USING gin (search_vector)")
+    for column in ("name", "sku", "upc"):
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_inventory_{column}_trgm "
+            f"ON inventory_items USING gin ({column} gin_trgm_ops)"
+        )
+    op.create_index(
+        "ix_inventory_user_upc",
+        "inventory_items",
+        ["user_id", "upc"],
+        postgresql_where=sa.text("deleted_at IS NULL AND upc IS NOT NULL"),
+    )
+    op.create_index(
+        "ix_inventory_user_sku",
+        "inventory_items",
+        ["user_id", "sku"],
+        postgresql_where=sa.text("deleted_at IS NULL AND sku IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_inventory_user_sku", table_name="inventory_items")
+    op.drop_index("ix_inventory_user_upc", table_name="inventory_items")
+    for index in ("ix_inventory_upc_trgm", "ix_inventory_sku_trgm", "ix_inventory_name_trgm", "ix_inventory_search_vector"):
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+    op.execute("ALTER TABLE inventory_items DROP COLUMN IF EXISTS search_vector")
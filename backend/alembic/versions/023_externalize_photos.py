@@ -0,0 +1,146 @@
+"""Move inline base64 photos into the content-addressed photo store.
+
+Revision ID: 023
+Revises: 022
+
+Changes:
+  - inventory_items.photo_front_url / photo_back_url: data URLs → photo URLs
+  - users.profile_picture: data URL → photo URL
+
+Rows are rewritten in id-ordered batches so the migration never holds more
+than BATCH_SIZE decoded photos in memory. Photo bytes go to whatever backend
+PHOTO_STORAGE_BACKEND selects, so configure storage before upgrading.
+
+The store layout (ab/cd/<sha256> on disk, <prefix>/<sha256> in S3) and the
+URL shape are written out here rather than imported from the app, so later
+changes to app.services.photo_store cannot change what this revision does.
+Settings are read from the environment (or .env) with the app's defaults
+of the time.
+
+Downgrade is a no-op: photo URLs keep resolving through GET /photos/{hash},
+and the store is append-only.
+"""
+import base64
+import binascii
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from alembic import op
+import sqlalchemy as sa
+from dotenv import dotenv_values
+
+revision = "023"
+down_revision = "022"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 200
+
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+def _setting(name: str, default: str) -> str:
+    # Same sources as the app's settings: the environment, then .env.
+    return os.environ.get(name) or dotenv_values(".env").get(name) or default
+
+
+def _decode_data_url(value: str):
+    header, sep, encoded = value.partition(",")
+    if not sep or ";base64" not in header:
+        return None
+    try:
+        data = base64.b64decode(encoded, validate=False)
+    except (binascii.Error, ValueError):
+        return None
+    mime = header[len("data:"):].split(";", 1)[0]
+    if not mime:
+        mime = next((m for sig, m in _SIGNATURES if data.startswith(sig)), "application/octet-stream")
+    return data, mime
+
+
+class _LocalWriter:
+    def __init__(self):
+        self.root = Path(_setting("PHOTO_STORAGE_DIR", "storage/photos"))
+
+    def put(self, digest: str, data: bytes, content_type: str) -> None:
+        path = self.root / digest[:2] / digest[2:4] / digest
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+
+class _S3Writer:
+    def __init__(self):
+        import boto3
+
+        self.bucket = _setting("PHOTO_S3_BUCKET", "")
+        self.prefix = _setting("PHOTO_S3_PREFIX", "photos").strip("/")
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=_setting("PHOTO_S3_ENDPOINT_URL", "") or None,
+            region_name=_setting("PHOTO_S3_REGION", "") or None,
+        )
+
+    def put(self, digest: str, data: bytes, content_type: str) -> None:
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=f"{self.prefix}/{digest}" if self.prefix else digest,
+            Body=data,
+            ContentType=content_type,
+            CacheControl="public, max-age=31536000, immutable",
+        )
+
+
+def _externalize_column(conn, writer, base_url: str, table: str, column: str) -> None:
+    select_batch = sa.text(
+        f"SELECT id, {column} FROM {table} "
+        f"WHERE {column} LIKE 'data:%' AND id > CAST(:after AS UUID) "
+        f"ORDER BY id LIMIT :limit"
+    )
+    update_row = sa.text(f"UPDATE {table} SET {column} = :value WHERE id = :id")
+
+    after = "00000000-0000-0000-0000-000000000000"
+    while True:
+        rows = conn.execute(select_batch, {"after": after, "limit": BATCH_SIZE}).fetchall()
+        if not rows:
+            return
+        for row_id, value in rows:
+            decoded = _decode_data_url(value)
+            if decoded is not None:
+                data, mime = decoded
+                digest = hashlib.sha256(data).hexdigest()
+                writer.put(digest, data, mime)
+                conn.execute(update_row, {"value": f"{base_url}/photos/{digest}", "id": row_id})
+        after = str(rows[-1][0])
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    writer = _S3Writer() if _setting("PHOTO_STORAGE_BACKEND", "local") == "s3" else _LocalWriter()
+    base_url = _setting("PUBLIC_API_BASE_URL", "http://localhost:8000/api/v1").rstrip("/")
+    for table, column in (
+        ("inventory_items", "photo_front_url"),
+        ("inventory_items", "photo_back_url"),
+        ("users", "profile_picture"),
+    ):
+        _externalize_column(conn, writer, base_url, table, column)
+
+
+def downgrade() -> None:
+    pass
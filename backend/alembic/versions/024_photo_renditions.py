@@ -0,0 +1,34 @@
+"""Add photo_renditions index for resized photo variants.
+
+Revision ID: 024
+Revises: 023
+
+Changes:
+  - CREATE TABLE photo_renditions (source_hash, rendition, format) → rendition_hash
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "024"
+down_revision = "023"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "photo_renditions",
+        sa.Column("source_hash", sa.String(length=64), nullable=False),
+        sa.Column("rendition", sa.String(length=16), nullable=False),
+        sa.Column("format", sa.String(length=8), nullable=False),
+        sa.Column("rendition_hash", sa.String(length=64), nullable=False),
+        sa.Column("width", sa.Integer(), nullable=False),
+        sa.Column("height", sa.Integer(), nullable=False),
+        sa.Column("byte_size", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("source_hash", "rendition", "format"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("photo_renditions")
@@ -0,0 +1,39 @@
+"""Cover soft-deleted rows in the (user_id, updated_at, id) index.
+
+Revision ID: 025
+Revises: 024
+
+Changes:
+  - ix_inventory_user_updated_id: partial (deleted_at IS NULL) → full index
+
+GET /inventory/changes pages through every item of a user in
+(updated_at, id) order, tombstones included, so the partial index from
+migration 021 can no longer serve it. The full index still serves the
+sort=updated_at list keyset; rebuilding it in place avoids keeping two
+near-identical indexes on the write path.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "025"
+down_revision = "024"
+branch_labels = None
+depends_on = None
+
+_INDEX = "ix_inventory_user_updated_id"
+_COLUMNS = ["user_id", "updated_at", "id"]
+
+
+def upgrade() -> None:
+    op.drop_index(_INDEX, table_name="inventory_items")
+    op.create_index(_INDEX, "inventory_items", _COLUMNS)
+
+
+def downgrade() -> None:
+    op.drop_index(_INDEX, table_name="inventory_items")
+    op.create_index(
+        _INDEX,
+        "inventory_items",
+        _COLUMNS,
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
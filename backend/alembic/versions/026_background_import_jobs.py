@@ -0,0 +1,56 @@
+"""Run spreadsheet imports as background jobs.
+
+Revision ID: 026
+Revises: 025
+
+Changes:
+  - inventory_import_jobs: + source_url, content_type, upload_content,
+    dry_run, rows_processed, attempts, started_at, finished_at,
+    error_message, result
+  - ck_import_job_status → ck_import_jobs_status, adding the background
+    job states queued / running / completed
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "026"
+down_revision = "025"
+branch_labels = None
+depends_on = None
+
+_TABLE = "inventory_import_jobs"
+
+
+def upgrade() -> None:
+    op.add_column(_TABLE, sa.Column("source_url", sa.String(2048), nullable=True))
+    op.add_column(_TABLE, sa.Column("content_type", sa.String(255), nullable=True))
+    op.add_column(_TABLE, sa.Column("upload_content", sa.LargeBinary(), nullable=True))
+    op.add_column(_TABLE, sa.Column("dry_run", sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.add_column(_TABLE, sa.Column("rows_processed", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column(_TABLE, sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column(_TABLE, sa.Column("started_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column(_TABLE, sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column(_TABLE, sa.Column("error_message", sa.Text(), nullable=True))
+    op.add_column(_TABLE, sa.Column("result", sa.JSON(), nullable=True))
+
+    op.drop_constraint("ck_import_job_status", _TABLE, type_="check")
+    op.create_check_constraint(
+        "ck_import_jobs_status",
+        _TABLE,
+        "status IN ('pending','previewed','committed','queued','running','completed','failed')",
+    )
+
+
+def downgrade() -> None:
+    op.execute(f"DELETE FROM {_TABLE} WHERE status IN ('queued','running','completed')")
+    op.drop_constraint("ck_import_jobs_status", _TABLE, type_="check")
+    op.create_check_constraint(
+        "ck_import_job_status",
+        _TABLE,
+        "status IN ('pending','previewed','committed','failed')",
+    )
+    for column in (
+        "result", "error_message", "finished_at", "started_at", "attempts",
+        "rows_processed", "dry_run", "upload_content", "content_type", "source_url",
+    ):
+        op.drop_column(_TABLE, column)
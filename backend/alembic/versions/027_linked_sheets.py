@@ -0,0 +1,52 @@
+"""Add inventory_linked_sheets for scheduled spreadsheet link sync.
+
+Revision ID: 027
+Revises: 026
+
+Changes:
+  - CREATE TABLE inventory_linked_sheets (url, schedule, HTTP validators,
+    content hash and per-row fingerprints of the last applied sync)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "027"
+down_revision = "026"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "inventory_linked_sheets",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("url", sa.String(length=2048), nullable=False),
+        sa.Column("sync_interval_minutes", sa.Integer(), server_default="60", nullable=False),
+        sa.Column("next_sync_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("export_url", sa.String(length=2048), nullable=True),
+        sa.Column("etag", sa.String(length=255), nullable=True),
+        sa.Column("last_modified", sa.String(length=64), nullable=True),
+        sa.Column("content_hash", sa.String(length=64), nullable=True),
+        sa.Column("row_fingerprints", sa.JSON(), nullable=True),
+        sa.Column("last_status", sa.String(length=20), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("last_checked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_synced_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_result", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.CheckConstraint(
+            "last_status IS NULL OR last_status IN ('synced','not_modified','unchanged','failed')",
+            name="ck_linked_sheets_last_status",
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "url", name="uq_linked_sheets_user_url"),
+    )
+    op.create_index("ix_linked_sheets_next_sync_at", "inventory_linked_sheets", ["next_sync_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_linked_sheets_next_sync_at", table_name="inventory_linked_sheets")
+    op.drop_table("inventory_linked_sheets")
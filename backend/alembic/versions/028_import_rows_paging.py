@@ -0,0 +1,28 @@
+"""Index preview import rows by (job_id, row_number).
+
+Revision ID: 028
+Revises: 027
+
+Changes:
+  - ix_import_rows_job_id (job_id) → ix_import_rows_job_row (job_id, row_number)
+
+GET /inventory/imports/{job_id}/rows pages a job's rows in row_number
+order, which the composite index serves without sorting the whole job;
+it also serves every job_id lookup the old index did.
+"""
+from alembic import op
+
+revision = "028"
+down_revision = "027"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_import_rows_job_id", table_name="inventory_import_rows")
+    op.create_index("ix_import_rows_job_row", "inventory_import_rows", ["job_id", "row_number"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_import_rows_job_row", table_name="inventory_import_rows")
+    op.create_index("ix_import_rows_job_id", "inventory_import_rows", ["job_id"])
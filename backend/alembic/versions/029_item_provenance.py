@@ -0,0 +1,80 @@
+"""Move import provenance out of custom_attributes into inventory_item_provenance.
+
+Revision ID: 029
+Revises: 028
+
+Changes:
+  - CREATE TABLE inventory_item_provenance (item, import job, row number,
+    source cells, review flags), append-only
+  - existing custom_attributes.import_raw / import_review → one provenance
+    row per item, and both keys removed from custom_attributes
+
+Imports used to copy the whole source row into every item's
+custom_attributes, which was then loaded and serialized with the item on
+every read and merged again on every re-import.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "029"
+down_revision = "028"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "inventory_item_provenance",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("inventory_item_id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("import_job_id", sa.Uuid(), nullable=True),
+        sa.Column("source", sa.String(length=50), server_default="spreadsheet", nullable=False),
+        sa.Column("row_number", sa.Integer(), nullable=True),
+        sa.Column("source_cells", sa.JSON(), nullable=False),
+        sa.Column("review", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["inventory_item_id"], ["inventory_items.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["import_job_id"], ["inventory_import_jobs.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_item_provenance_item_created", "inventory_item_provenance", ["inventory_item_id", "created_at"],
+    )
+    op.execute("""
+        INSERT INTO inventory_item_provenance
+            (id, inventory_item_id, user_id, source, source_cells, review, created_at, updated_at)
+        SELECT gen_random_uuid(), id, user_id, 'spreadsheet',
+               (custom_attributes -> 'import_raw')::json,
+               (custom_attributes -> 'import_review')::json,
+               updated_at, updated_at
+        FROM inventory_items
+        WHERE custom_attributes ? 'import_raw'
+    """)
+    op.execute("""
+        UPDATE inventory_items
+        SET custom_attributes = custom_attributes - 'import_raw' - 'import_review'
+        WHERE custom_attributes ?| array['import_raw', 'import_review']
+    """)
+
+
+def downgrade() -> None:
+    # Put the most recent provenance of each item back into custom_attributes.
+    op.execute("""
+        UPDATE inventory_items AS items
+        SET custom_attributes = COALESCE(items.custom_attributes, '{}'::jsonb)
+            || jsonb_strip_nulls(jsonb_build_object(
+                'import_raw', latest.source_cells::jsonb,
+                'import_review', latest.review::jsonb
+            ))
+        FROM (
+            SELECT DISTINCT ON (inventory_item_id) inventory_item_id, source_cells, review
+            FROM inventory_item_provenance
+            ORDER BY inventory_item_id, created_at DESC
+        ) AS latest
+        WHERE latest.inventory_item_id = items.id
+    """)
+    op.drop_index("ix_item_provenance_item_created", table_name="inventory_item_provenance")
+    op.drop_table("inventory_item_provenance")
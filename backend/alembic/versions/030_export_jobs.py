@@ -0,0 +1,54 @@
+"""Add export_jobs for asynchronous exports with expiring artifacts.
+
+Revision ID: 030
+Revises: 029
+
+Changes:
+  - CREATE TABLE export_jobs (dataset/template/format, run state and
+    progress, the artifact file and its expiry, and the source version an
+    identical request is matched on)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "030"
+down_revision = "029"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "export_jobs",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("dataset", sa.String(length=20), nullable=False),
+        sa.Column("template", sa.String(length=20), server_default="canonical", nullable=False),
+        sa.Column("format", sa.String(length=10), server_default="csv", nullable=False),
+        sa.Column("status", sa.String(length=20), server_default="queued", nullable=False),
+        sa.Column("source_version", sa.String(length=64), nullable=False),
+        sa.Column("total_rows", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("rows_processed", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("filename", sa.String(length=255), nullable=False),
+        sa.Column("artifact_path", sa.String(length=1024), nullable=True),
+        sa.Column("artifact_size", sa.BigInteger(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.CheckConstraint(
+            "status IN ('queued','running','completed','failed','expired')",
+            name="ck_export_jobs_status",
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_export_jobs_user_version", "export_jobs", ["user_id", "source_version"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_export_jobs_user_version", table_name="export_jobs")
+    op.drop_table("export_jobs")
@@ -0,0 +1,34 @@
+"""Add change_versions, the per-user write counters behind collection ETags.
+
+Revision ID: 031
+Revises: 030
+
+Changes:
+  - CREATE TABLE change_versions (user_id, scope) → version
+
+No backfill: a missing row reads as version 0, and the first write after
+the upgrade creates it. Clients holding ETags from the old
+(max(updated_at), count) validators simply get one full response.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "031"
+down_revision = "030"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "change_versions",
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("scope", sa.String(length=20), nullable=False),
+        sa.Column("version", sa.BigInteger(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "scope"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("change_versions")
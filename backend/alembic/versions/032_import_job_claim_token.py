@@ -0,0 +1,24 @@
+"""Add a claim token to inventory_import_jobs.
+
+Revision ID: 032
+Revises: 031
+
+Changes:
+  - ADD COLUMN inventory_import_jobs.claim_token (set on every claim; a
+    background run only writes to the job while it still holds it)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "032"
+down_revision = "031"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("inventory_import_jobs", sa.Column("claim_token", sa.Uuid(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("inventory_import_jobs", "claim_token")
@@ -0,0 +1,25 @@
+"""Add a claim token to export_jobs.
+
+Revision ID: 033
+Revises: 032
+
+Changes:
+  - ADD COLUMN export_jobs.claim_token (set on every claim, as for
+    background imports; a run only writes to the job while it still
+    holds it)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "033"
+down_revision = "032"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("export_jobs", sa.Column("claim_token", sa.Uuid(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("export_jobs", "claim_token")
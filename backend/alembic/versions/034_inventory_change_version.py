@@ -0,0 +1,39 @@
+"""Stamp inventory items with the change version of their last write.
+
+Revision ID: 034
+Revises: 033
+
+Changes:
+  - ADD COLUMN inventory_items.change_version bigint NOT NULL DEFAULT 0
+  - CREATE INDEX ix_inventory_user_change_version_id (user_id, change_version, id)
+
+GET /inventory/changes pages by (change_version, id) instead of
+(updated_at, id): updated_at is the start time of the writing transaction,
+so a long import committed rows behind tokens already handed out. Existing
+rows read as version 0 and come back once to clients resyncing from scratch;
+tokens from the updated_at feed are rejected (400, resync without `since`).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "034"
+down_revision = "033"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "inventory_items",
+        sa.Column("change_version", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    op.create_index(
+        "ix_inventory_user_change_version_id",
+        "inventory_items",
+        ["user_id", "change_version", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_inventory_user_change_version_id", table_name="inventory_items")
+    op.drop_column("inventory_items", "change_version")
@@ -0,0 +1,42 @@
+"""Keep background import uploads on disk instead of in the job row.
+
+Revision ID: 035
+Revises: 034
+
+Changes:
+  - ADD COLUMN inventory_import_jobs.upload_path (the uploaded file under
+    IMPORT_UPLOAD_DIR, deleted when the job finishes)
+  - DROP COLUMN inventory_import_jobs.upload_content
+
+Unfinished upload jobs lose their input with the column, so they are
+failed with a message asking for a new upload.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "035"
+down_revision = "034"
+branch_labels = None
+depends_on = None
+
+_TABLE = "inventory_import_jobs"
+
+
+def upgrade() -> None:
+    op.add_column(_TABLE, sa.Column("upload_path", sa.String(1024), nullable=True))
+    op.execute(
+        f"UPDATE {_TABLE} SET status = 'failed', finished_at = now(), "
+        "error_message = 'The import was interrupted by an upgrade. Upload the file again.' "
+        "WHERE status IN ('queued', 'running') AND upload_content IS NOT NULL"
+    )
+    op.drop_column(_TABLE, "upload_content")
+
+
+def downgrade() -> None:
+    op.add_column(_TABLE, sa.Column("upload_content", sa.LargeBinary(), nullable=True))
+    op.execute(
+        f"UPDATE {_TABLE} SET status = 'failed', finished_at = now(), "
+        "error_message = 'The import was interrupted by a downgrade. Upload the file again.' "
+        "WHERE status IN ('queued', 'running') AND upload_path IS NOT NULL"
+    )
+    op.drop_column(_TABLE, "upload_path")
@@ -57,5 +57,36 @@ class Settings(BaseSettings):
     # Set to the Signature Key shown in the Square Developer Console for your webhook endpoint.
     SQUARE_WEBHOOK_SIGNATURE_KEY: str = ""
     SQUARE_WEBHOOK_URL: str = ""
+    # Content-addressed photo storage (services/photo_store.py).
+    # "local" writes under PHOTO_STORAGE_DIR; "s3" uses any S3-compatible bucket
+    # (needs boto3; credentials come from the standard AWS_* environment).
+    PHOTO_STORAGE_BACKEND: str = "local"
+    PHOTO_STORAGE_DIR: str = "storage/photos"
+    PHOTO_S3_BUCKET: str = ""
+    PHOTO_S3_PREFIX: str = "photos"
+    PHOTO_S3_ENDPOINT_URL: str = ""
+    PHOTO_S3_REGION: str = ""
+    # Embedded-photo thumbnails of the XLSX export, keyed by photo hash
+    # (services/xlsx_export.py); content-addressed, so entries never go stale.
+    EXPORT_THUMBNAIL_CACHE_DIR: str = "storage/export-thumbnails"
+    # Files built by export jobs (services/export_jobs.py) and how long they
+    # stay downloadable.
+    EXPORT_ARTIFACT_DIR: str = "storage/exports"
+    EXPORT_ARTIFACT_TTL_SECONDS: int = 86400
+    # Uploaded sheets waiting for their background import (services/import_jobs.py);
+    # each is deleted when its job finishes.
+    IMPORT_UPLOAD_DIR: str = "storage/imports"
+    # Threads for CPU-heavy request work (image resizing); 0 = min(4, CPU count).
+    WORKER_POOL_SIZE: int = 0
+    # Processes for GIL-bound work (spreadsheet parsing, sheet image thumbnails);
+    # 0 = min(4, CPU count), -1 = run inline. Each process gets an address-space
+    # cap and each call a CPU-time budget (services/worker_pool.py).
+    PROCESS_POOL_SIZE: int = 0
+    PROCESS_WORKER_MEMORY_MB: int = 1024
+    PROCESS_TASK_CPU_SECONDS: int = 60
+    # Parsed-sheet cache for repeat imports of the same file (services/parse_cache.py);
+    # 0 MB turns it off.
+    IMPORT_CACHE_MAX_MB: int = 256
+    IMPORT_CACHE_TTL_SECONDS: int = 900
 
 settings = Settings()
@@ -5,10 +5,15 @@ from typing import Generator
 from app.config import settings
 
 connect_args = {}
+engine_options = {}
 if settings.DATABASE_URL.startswith("sqlite"):
     connect_args = {"check_same_thread": False}
+elif settings.DATABASE_URL.startswith("postgresql"):
+    # Batch executemany UPDATE/DELETE (e.g. import flushes) into pages of
+    # statements instead of one round trip per row.
+    engine_options = {"executemany_mode": "values_plus_batch"}
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True, connect_args=connect_args)
+engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True, connect_args=connect_args, **engine_options)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -19,3 +24,7 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+# Registers the flush hook that counts writes for collection ETags.
+import app.services.change_versions  # noqa: E402,F401
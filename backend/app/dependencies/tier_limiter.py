@@ -19,6 +19,36 @@ TIER_LIMITS: dict[str, int | None] = {
 }
 
 
+def check_item_limit(current_user: User, db: Session, adding: int = 1) -> None:
+    """Raise 403 if creating *adding* more items would exceed the user's tier.
+
+    One COUNT per call, so batch creates check the whole batch at once.
+    """
+    limit = TIER_LIMITS.get(current_user.subscription_tier)
+    if limit is None:
+        return
+    count = (
+        db.query(InventoryItem)
+        .filter(
+            InventoryItem.user_id == current_user.id,
+            InventoryItem.deleted_at.is_(None),
+        )
+        .count()
+    )
+    if count + adding > limit:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "error": "tier_limit_reached",
+                "message": f"Free tier is limited to {limit} items. Upgrade to Pro ($20/mo) for unlimited inventory.",
+                "current_count": count,
+                "requested": adding,
+                "tier": current_user.subscription_tier,
+                "limit": limit,
+            },
+        )
+
+
 def enforce_item_limit(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -28,25 +58,5 @@ def enforce_item_limit(
     Applied as a dependency on POST /inventory only.
     Returns the current_user if within limits.
     """
-    limit = TIER_LIMITS.get(current_user.subscription_tier)
-    if limit is not None:
-        count = (
-            db.query(InventoryItem)
-            .filter(
-                InventoryItem.user_id == current_user.id,
-                InventoryItem.deleted_at.is_(None),
-            )
-            .count()
-        )
-        if count >= limit:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail={
-                    "error": "tier_limit_reached",
-                    "message": f"Free tier is limited to {limit} items. Upgrade to Pro ($20/mo) for unlimited inventory.",
-                    "current_count": count,
-                    "tier": current_user.subscription_tier,
-                    "limit": limit,
-                },
-            )
+    check_item_limit(current_user, db)
     return current_user
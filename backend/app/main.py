@@ -1,4 +1,5 @@
 """Vendora API — FastAPI application entrypoint."""
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -15,9 +16,13 @@ from slowapi.errors import RateLimitExceeded
 
 from app.routers import auth, inventory, transactions, dashboard, invoices, webhooks
 from app.routers import export, features, sellers, integrations
-from app.routers import subscriptions, support
+from app.routers import subscriptions, support, photos
 from app.config import settings
 from app.rate_limit import limiter
+from app.services.export_jobs import sweep_export_jobs
+from app.services.import_jobs import sweep_import_jobs
+from app.services.linked_sheets import sweep_linked_sheets
+from app.services.worker_pool import shutdown_worker_pool
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +40,19 @@ async def lifespan(app: FastAPI):
         alembic_cfg = Config(str(alembic_path))
         alembic_command.upgrade(alembic_cfg, "head")
         logger.info("Alembic migrations applied.")
+    # Resume background imports and exports interrupted by a restart, expire old
+    # export files and run due linked-sheet syncs (tests run these directly).
+    sweepers = []
+    if settings.ENVIRONMENT != "testing":
+        sweepers = [
+            asyncio.create_task(sweep_import_jobs(inventory.run_background_import)),
+            asyncio.create_task(sweep_linked_sheets(inventory.sync_linked_sheet)),
+            asyncio.create_task(sweep_export_jobs()),
+        ]
     yield
+    for sweeper in sweepers:
+        sweeper.cancel()
+    shutdown_worker_pool()
 
 app = FastAPI(
     title="Vendora API",
@@ -84,6 +101,7 @@ app.include_router(sellers.router, prefix="/api/v1")
 app.include_router(integrations.router, prefix="/api/v1")
 app.include_router(subscriptions.router, prefix="/api/v1")
 app.include_router(support.router, prefix="/api/v1")
+app.include_router(photos.router, prefix="/api/v1")
 
 
 @app.get("/api/v1/health", tags=["health"])
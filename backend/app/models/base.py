@@ -1,6 +1,7 @@
 """Base model with soft-delete mixin and declarative base."""
 import uuid
 from datetime import datetime, timezone
+from typing import Optional
 
 from sqlalchemy import Column, DateTime
 from sqlalchemy.orm import DeclarativeBase, declared_attr
@@ -10,6 +11,18 @@ class Base(DeclarativeBase):
     pass
 
 
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """*value* as an aware UTC datetime.
+
+    Stored timestamps are always UTC, but SQLite hands them back naive.
+    """
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
 class TimestampMixin:
     """Adds created_at and updated_at columns.
     updated_at is auto-set by PostgreSQL trigger (update_updated_at_column).
@@ -0,0 +1,19 @@
+"""Change version model — per-user write counters behind collection ETags."""
+import sqlalchemy as sa
+from sqlalchemy import Column, ForeignKey, String, Uuid
+
+from app.models.base import Base
+
+
+class ChangeVersion(Base):
+    """How many write transactions have touched one of a user's collections.
+
+    One row per (user, scope), scope being inventory / transactions /
+    invoices. services/change_versions.py bumps it in the transaction of
+    every write; a missing row reads as version 0.
+    """
+    __tablename__ = "change_versions"
+
+    user_id = Column(Uuid, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    scope = Column(String(20), primary_key=True)
+    version = Column(sa.BigInteger, nullable=False, server_default="0")
@@ -0,0 +1,49 @@
+"""Export job model — asynchronous /export downloads (services/export_jobs.py)."""
+import uuid
+
+import sqlalchemy as sa
+from sqlalchemy import CheckConstraint, Column, ForeignKey, Index, String, Uuid
+
+from app.models.base import Base, TimestampMixin
+
+
+class ExportJob(Base, TimestampMixin):
+    """One export file built off the request path.
+
+    Jobs go queued → running → completed (or failed). A completed job's file
+    lives under EXPORT_ARTIFACT_DIR until expires_at, when the sweeper
+    deletes it and marks the job expired. source_version identifies the data
+    the file is built from: an identical request made before that data
+    changes gets the same job back instead of a new build.
+    """
+    __tablename__ = "export_jobs"
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('queued','running','completed','failed','expired')",
+            name="ck_export_jobs_status",
+        ),
+        Index("ix_export_jobs_user_version", "user_id", "source_version"),
+    )
+
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    user_id = Column(
+        Uuid, ForeignKey("users.id", ondelete="CASCADE"), nullable=False,
+    )
+    dataset = Column(String(20), nullable=False)                                  # inventory | transactions
+    template = Column(String(20), nullable=False, server_default="canonical")     # canonical | warehouse
+    format = Column(String(10), nullable=False, server_default="csv")             # csv | xlsx
+    status = Column(String(20), nullable=False, server_default="queued")
+    # Digest of the request and the exported table's change version at queue time
+    source_version = Column(String(64), nullable=False)
+    total_rows = Column(sa.Integer, nullable=False, server_default="0", default=0)
+    rows_processed = Column(sa.Integer, nullable=False, server_default="0", default=0)
+    attempts = Column(sa.Integer, nullable=False, server_default="0", default=0)
+    # New on every claim; a run only writes to the job while it still holds its token.
+    claim_token = Column(Uuid, nullable=True)
+    started_at = Column(sa.DateTime(timezone=True), nullable=True)
+    finished_at = Column(sa.DateTime(timezone=True), nullable=True)
+    error_message = Column(sa.Text, nullable=True)
+    filename = Column(String(255), nullable=False)
+    artifact_path = Column(String(1024), nullable=True)
+    artifact_size = Column(sa.BigInteger, nullable=True)
+    expires_at = Column(sa.DateTime(timezone=True), nullable=True)
@@ -6,13 +6,15 @@ Models:
   InventoryExternalLink   — maps a Vendora item to a record in an external system
   InventoryImportJob      — tracks a spreadsheet import preview → commit lifecycle
   InventoryImportRow      — one CSV row with per-row validation and action results
+  InventoryItemProvenance — append-only source cells of every import that wrote an item
+  InventoryLinkedSheet    — a spreadsheet link re-imported on a schedule
 """
 import uuid
 
 import sqlalchemy as sa
 from sqlalchemy import (
     Column, String, Numeric, ForeignKey, CheckConstraint,
-    Index, Uuid, JSON, text, UniqueConstraint,
+    DDL, Index, Uuid, JSON, event, text, UniqueConstraint,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB  # kept for generic compat
 
@@ -30,12 +32,46 @@ class InventoryItem(Base, TimestampMixin, SoftDeleteMixin):
         Index("ix_inventory_items_status", "status"),
         Index("ix_inventory_items_category", "category"),
         Index("ix_inventory_items_created_at", "created_at"),
-        # Composite partial index for stable per-user pagination + tier count
+        # Composite partial indexes backing keyset pagination on each list sort
+        # key (id is the tie-breaker); the created_at one also serves tier counts.
         Index(
-            "ix_inventory_user_created",
+            "ix_inventory_user_created_id",
             "user_id",
-            sa.desc("created_at"),
-            postgresql_where="deleted_at IS NULL",
+            "created_at",
+            "id",
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        ),
+        # Serves sort=updated_at (full rather than partial since migration 025).
+        Index("ix_inventory_user_updated_id", "user_id", "updated_at", "id"),
+        # Not partial: the changes feed (services/inventory_changes.py) also
+        # returns soft-deleted rows as tombstones.
+        Index("ix_inventory_user_change_version_id", "user_id", "change_version", "id"),
+        Index(
+            "ix_inventory_user_price_id",
+            "user_id",
+            "expected_sell_price",
+            "id",
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_inventory_user_name_id",
+            "user_id",
+            "name",
+            "id",
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        ),
+        # Exact UPC/SKU lookups (search fast path, import matching)
+        Index(
+            "ix_inventory_user_upc",
+            "user_id",
+            "upc",
+            postgresql_where=sa.text("deleted_at IS NULL AND upc IS NOT NULL"),
+        ),
+        Index(
+            "ix_inventory_user_sku",
+            "user_id",
+            "sku",
+            postgresql_where=sa.text("deleted_at IS NULL AND sku IS NOT NULL"),
         ),
         Index(
             "uq_inventory_user_source_external",
@@ -67,7 +103,8 @@ class InventoryItem(Base, TimestampMixin, SoftDeleteMixin):
     actual_sell_price = Column(Numeric(10, 2), nullable=True)
     platform = Column(String(100), nullable=True)
     status = Column(String(20), nullable=False, server_default="in_stock")
-    # Photos — stored as base64 data URLs (consistent with profile_picture approach)
+    # Photos — photo store URLs (services/photo_store.py) or remote URLs; legacy
+    # rows may still hold base64 data URLs until migration 023 runs
     photo_front_url = Column(sa.Text, nullable=True)
     photo_back_url = Column(sa.Text, nullable=True)
 
@@ -84,6 +121,47 @@ class InventoryItem(Base, TimestampMixin, SoftDeleteMixin):
     source = Column(String(50), nullable=True, index=True)       # e.g. "lightspeed", "manual"
     external_id = Column(String(255), nullable=True, index=True) # e.g. Lightspeed itemID
 
+    # The seller's inventory change version (services/change_versions.py) as of
+    # the last write to this row — the changes feed's cursor
+    change_version = Column(sa.BigInteger, nullable=False, server_default="0")
+
+
+# PostgreSQL-only search structures (services/inventory_search.py). The
+# generated tsvector is deliberately not a mapped column: ORM reads never pay
+# for it, and SQLite dev/test engines can still create_all the table.
+SEARCH_VECTOR_EXPRESSION = (
+    "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(sku, '') || ' ' || coalesce(upc, ''))"
+)
+SEARCH_DDL = [
+    "ALTER TABLE inventory_items ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    f"GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_inventory_search_vector ON inventory_items USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_inventory_name_trgm ON inventory_items USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_inventory_sku_trgm ON inventory_items USING gin (sku gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_inventory_upc_trgm ON inventory_items USING gin (upc gin_trgm_ops)",
+]
+# What SEARCH_DDL (and migration 022) creates outside Base.metadata; alembic/env.py
+# keeps autogenerate from proposing to drop them.
+SEARCH_OBJECT_NAMES = {
+    ("column", "search_vector"),
+    ("index", "ix_inventory_search_vector"),
+    ("index", "ix_inventory_name_trgm"),
+    ("index", "ix_inventory_sku_trgm"),
+    ("index", "ix_inventory_upc_trgm"),
+}
+
+event.listen(
+    InventoryItem.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+for _statement in SEARCH_DDL:
+    event.listen(
+        InventoryItem.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
+
 
 # ─── Stock ledger ────────────────────────────────────────────────────────────
 
@@ -164,11 +242,16 @@ class InventoryExternalLink(Base, TimestampMixin):
 # ─── Spreadsheet import ───────────────────────────────────────────────────────
 
 class InventoryImportJob(Base, TimestampMixin):
-    """Tracks a spreadsheet import through preview → commit lifecycle."""
+    """Tracks a spreadsheet import.
+
+    Preview imports go pending → previewed → committed; background imports
+    (services/import_jobs.py) go queued → running → completed. Either can
+    end in failed.
+    """
     __tablename__ = "inventory_import_jobs"
     __table_args__ = (
         CheckConstraint(
-            "status IN ('pending','previewed','committed','failed')",
+            "status IN ('pending','previewed','committed','queued','running','completed','failed')",
             name="ck_import_jobs_status",
         ),
         Index("ix_import_jobs_user_id", "user_id"),
@@ -188,13 +271,28 @@ class InventoryImportJob(Base, TimestampMixin):
     rows_updated = Column(sa.Integer, nullable=False, server_default="0")
     rows_skipped = Column(sa.Integer, nullable=False, server_default="0")
     rows_errored = Column(sa.Integer, nullable=False, server_default="0")
+    # Background imports: the input (a link, or the uploaded file under
+    # IMPORT_UPLOAD_DIR until the job finishes) and run state for progress
+    # polling and resume.
+    source_url = Column(String(2048), nullable=True)
+    content_type = Column(String(255), nullable=True)
+    upload_path = Column(String(1024), nullable=True)
+    dry_run = Column(sa.Boolean, nullable=False, server_default=sa.false(), default=False)
+    rows_processed = Column(sa.Integer, nullable=False, server_default="0", default=0)
+    attempts = Column(sa.Integer, nullable=False, server_default="0", default=0)
+    # New on every claim; a run only writes to the job while it still holds its token.
+    claim_token = Column(Uuid, nullable=True)
+    started_at = Column(sa.DateTime(timezone=True), nullable=True)
+    finished_at = Column(sa.DateTime(timezone=True), nullable=True)
+    error_message = Column(sa.Text, nullable=True)
+    result = Column(JSON, nullable=True)  # InventoryImportResult of a completed job
 
 
 class InventoryImportRow(Base, TimestampMixin):
     """One CSV row within an import job with per-row validation and action result."""
     __tablename__ = "inventory_import_rows"
     __table_args__ = (
-        Index("ix_import_rows_job_id", "job_id"),
+        Index("ix_import_rows_job_row", "job_id", "row_number"),
     )
 
     id = Column(Uuid, primary_key=True, default=uuid.uuid4)
@@ -207,9 +305,81 @@ class InventoryImportRow(Base, TimestampMixin):
     inventory_item_id = Column(
         Uuid, ForeignKey("inventory_items.id", ondelete="SET NULL"), nullable=True,
     )
-    raw_data = Column(JSON, nullable=False)   # original CSV row as dict
+    # Original CSV row as dict; emptied ({}) once the job is committed.
+    raw_data = Column(JSON, nullable=False)
     mapped_data = Column(JSON, nullable=True)  # normalized/mapped fields
     error_message = Column(sa.Text, nullable=True)
     # sku | external_id — key used to deduplicate against existing items
     match_key = Column(String(100), nullable=True)
     match_value = Column(String(255), nullable=True)
+
+
+class InventoryItemProvenance(Base, TimestampMixin):
+    """The spreadsheet cells an import wrote an item from.
+
+    One row per import that created or updated the item. Never updated —
+    only inserted. Kept out of custom_attributes so item rows and list
+    payloads stay small; read by GET /inventory/{id}/provenance.
+    """
+    __tablename__ = "inventory_item_provenance"
+    __table_args__ = (
+        Index("ix_item_provenance_item_created", "inventory_item_id", "created_at"),
+    )
+
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    inventory_item_id = Column(
+        Uuid, ForeignKey("inventory_items.id", ondelete="CASCADE"), nullable=False,
+    )
+    user_id = Column(
+        Uuid, ForeignKey("users.id", ondelete="CASCADE"), nullable=False,
+    )
+    # The preview or background job that ran the import (NULL for direct imports)
+    import_job_id = Column(
+        Uuid, ForeignKey("inventory_import_jobs.id", ondelete="SET NULL"), nullable=True,
+    )
+    source = Column(String(50), nullable=False, server_default="spreadsheet")
+    row_number = Column(sa.Integer, nullable=True)
+    # Non-empty cells of the source row, keyed by column header
+    source_cells = Column(JSON, nullable=False)
+    # Fields the seller should review, e.g. {"missing_price": true}
+    review = Column(JSON, nullable=True)
+
+
+class InventoryLinkedSheet(Base, TimestampMixin):
+    """A seller's spreadsheet link, re-fetched and re-applied on a schedule.
+
+    services/linked_sheets.py keeps the HTTP validators and content hash of
+    the last download, and a fingerprint per sheet row, so a sync only
+    applies rows that changed since the last one.
+    """
+    __tablename__ = "inventory_linked_sheets"
+    __table_args__ = (
+        UniqueConstraint("user_id", "url", name="uq_linked_sheets_user_url"),
+        CheckConstraint(
+            "last_status IS NULL OR last_status IN ('synced','not_modified','unchanged','failed')",
+            name="ck_linked_sheets_last_status",
+        ),
+        Index("ix_linked_sheets_next_sync_at", "next_sync_at"),
+    )
+
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    user_id = Column(
+        Uuid, ForeignKey("users.id", ondelete="CASCADE"), nullable=False,
+    )
+    url = Column(String(2048), nullable=False)
+    sync_interval_minutes = Column(sa.Integer, nullable=False, server_default="60", default=60)
+    next_sync_at = Column(sa.DateTime(timezone=True), nullable=False)
+    # The export URL that last returned the sheet, and its HTTP validators
+    # for conditional re-fetches (If-None-Match / If-Modified-Since).
+    export_url = Column(String(2048), nullable=True)
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(64), nullable=True)
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of the last applied download
+    # {row key: payload fingerprint} of the last applied version of the sheet
+    row_fingerprints = Column(JSON, nullable=True)
+    # synced | not_modified | unchanged | failed
+    last_status = Column(String(20), nullable=True)
+    last_error = Column(sa.Text, nullable=True)
+    last_checked_at = Column(sa.DateTime(timezone=True), nullable=True)
+    last_synced_at = Column(sa.DateTime(timezone=True), nullable=True)
+    last_result = Column(JSON, nullable=True)  # InventoryImportResult of the last applied sync
@@ -0,0 +1,28 @@
+"""Photo rendition index for the content-addressed photo store."""
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.models.base import Base
+
+
+class PhotoRendition(Base):
+    """Maps a stored photo to one resized rendition of it.
+
+    Both sides are SHA-256 digests in the photo store, so a rendition never
+    changes once written; rows are insert-only.
+    """
+    __tablename__ = "photo_renditions"
+
+    source_hash = Column(String(64), primary_key=True)
+    rendition = Column(String(16), primary_key=True)   # thumb | list | detail
+    format = Column(String(8), primary_key=True)       # webp | jpeg
+    rendition_hash = Column(String(64), nullable=False)
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+    byte_size = Column(Integer, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
@@ -21,7 +21,7 @@ class User(Base, TimestampMixin, SoftDeleteMixin):
     subscription_tier = Column(String(20), nullable=False, server_default="free")
     is_partner = Column(Boolean, nullable=False, server_default="false")
     stripe_account_id = Column(String(255), nullable=True)
-    profile_picture = Column(Text, nullable=True)  # base64 data URL of profile image / business icon
+    profile_picture = Column(Text, nullable=True)  # photo store URL of profile image / business icon
     # Invoice branding (shown on the generated PDF)
     business_address = Column(Text, nullable=True)
     business_phone = Column(String(40), nullable=True)
@@ -33,6 +33,7 @@ from app.services.auth import (
     verify_password,
 )
 from app.services.email import EmailDeliveryError, send_password_reset_email
+from app.services.photo_store import externalize_photo
 from app.rate_limit import limiter
 from app.services.tester_access import apply_tester_entitlements, persist_tester_entitlements
 from app.dependencies.auth import get_current_user
@@ -202,11 +203,11 @@ def update_profile(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Update business name, profile picture (base64 data URL), and invoice branding."""
+    """Update business name, profile picture (base64 data URL, stored as a photo URL), and invoice branding."""
     if payload.business_name is not None:
         current_user.business_name = payload.business_name
     if payload.profile_picture is not None:
-        current_user.profile_picture = payload.profile_picture
+        current_user.profile_picture = externalize_photo(payload.profile_picture)
     if payload.business_address is not None:
         current_user.business_address = payload.business_address
     if payload.business_phone is not None:
@@ -6,7 +6,7 @@ Provides aggregated business metrics per ROADMAP Sprint 2:
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -15,6 +15,8 @@ from app.models.user import User
 from app.schemas.dashboard import DashboardResponse, AdvancedAnalyticsResponse
 from app.models.inventory import InventoryItem
 from app.models.transaction import Transaction
+from app.services import change_versions
+from app.services.conditional import conditional_response, make_validator
 from app.services.profit import (
     get_revenue,
     get_refund_total,
@@ -29,10 +31,15 @@ router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 @router.get("", response_model=DashboardResponse)
 def get_dashboard(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Return all dashboard metrics for the current user."""
+    """Return all dashboard metrics for the current user.
+
+    Answers 304 while items, transactions and the UTC day are unchanged.
+    """
     now = datetime.now(timezone.utc)
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     week_start = today_start - timedelta(days=today_start.weekday())
@@ -40,6 +47,16 @@ def get_dashboard(
 
     uid = current_user.id
 
+    # Metrics are windowed by day/week/month, so the day is part of the tag.
+    validator = make_validator(
+        uid,
+        today_start.date(),
+        *change_versions.current(db, uid, change_versions.INVENTORY, change_versions.TRANSACTIONS),
+    )
+    not_modified = conditional_response(request, response, validator)
+    if not_modified:
+        return not_modified
+
     # Revenue (gross sales - refunds)
     rev_today = get_revenue(db, uid, since=today_start) - get_refund_total(db, uid, since=today_start)
     rev_week = get_revenue(db, uid, since=week_start) - get_refund_total(db, uid, since=week_start)
@@ -99,8 +116,11 @@ def get_advanced_analytics(
     sale_net = Decimal("0")
     sale_count = 0
     item_ids = {txn.item_id for txn in transactions if txn.item_id}
-    items = db.query(InventoryItem).filter(InventoryItem.id.in_(item_ids)).all() if item_ids else []
-    item_categories = {item.id: item.category or "Uncategorized" for item in items}
+    items = (
+        db.query(InventoryItem.id, InventoryItem.category).filter(InventoryItem.id.in_(item_ids)).all()
+        if item_ids else []
+    )
+    item_categories = {item_id: category or "Uncategorized" for item_id, category in items}
 
     for transaction in transactions:
         date_key = transaction.created_at.date().isoformat()
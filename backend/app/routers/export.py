@@ -1,26 +1,55 @@
 """Export router — CSV export endpoints (Pro only).
 
 Endpoints:
-    GET /api/v1/export/inventory  — Download inventory CSV
-    GET /api/v1/export/transactions — Download transactions CSV
+    GET  /api/v1/export/inventory  — Download inventory CSV
+    GET  /api/v1/export/transactions — Download transactions CSV
+    GET  /api/v1/export/inventory.parquet — Download inventory as Parquet
+    GET  /api/v1/export/ledger.parquet — Download the stock ledger as Parquet
+    GET  /api/v1/export/transactions.parquet — Download transactions as Parquet
+    POST /api/v1/export/jobs — Queue an export job (or reuse one for unchanged data)
+    GET  /api/v1/export/jobs/{job_id} — Poll an export job
+    GET  /api/v1/export/jobs/{job_id}/download — Download a finished export (Range supported)
 """
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import StreamingResponse
+from typing import IO, Iterator
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-import io
 
 from app.database import get_db
 from app.dependencies.auth import get_current_user
+from app.models.export import ExportJob
 from app.models.user import User
+from app.schemas.export import ExportJobCreate, ExportJobResponse
 from app.services.feature_flags import is_feature_enabled
 from app.services.csv_export import (
     export_inventory_csv,
     export_inventory_warehouse_csv,
     export_transactions_csv,
 )
+from app.services.export_jobs import (
+    COMPLETED,
+    EXPIRED,
+    FAILED,
+    MEDIA_TYPES,
+    QUEUED,
+    artifact_available,
+    describe_job,
+    export_filename,
+    find_reusable_job,
+    run_export_job,
+    source_version,
+)
+from app.services.parquet_export import (
+    PARQUET_MEDIA_TYPE,
+    export_inventory_parquet,
+    export_ledger_parquet,
+    export_transactions_parquet,
+)
 from app.services.xlsx_export import export_inventory_xlsx
 
 _XLSX_MEDIA = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+_FILE_CHUNK_BYTES = 64 * 1024
 
 router = APIRouter(prefix="/export", tags=["export"])
 
@@ -38,6 +67,13 @@ def _require_pro(user: User):
         )
 
 
+def _file_chunks(file: IO[bytes]) -> Iterator[bytes]:
+    """Read *file* out in chunks, closing it (and so deleting a temp file) at the end."""
+    with file:
+        while chunk := file.read(_FILE_CHUNK_BYTES):
+            yield chunk
+
+
 @router.get("/inventory")
 def export_inventory(
     template: str = Query("canonical", pattern="^(canonical|warehouse)$"),
@@ -49,27 +85,27 @@ def export_inventory(
 
     format=xlsx → a styled .xlsx with item photos **embedded as real images**
     (base64 data URLs can't render via =IMAGE, so CSV showed them as text).
-    format=csv  → the round-trip-friendly CSV template.
+    format=csv  → the round-trip-friendly CSV template, streamed as it is
+    read from the database.
     """
     _require_pro(current_user)
 
     if format == "xlsx":
-        xlsx_bytes = export_inventory_xlsx(db, current_user.id)
         return StreamingResponse(
-            io.BytesIO(xlsx_bytes),
+            _file_chunks(export_inventory_xlsx(db, current_user.id)),
             media_type=_XLSX_MEDIA,
             headers={"Content-Disposition": "attachment; filename=vendora_inventory.xlsx"},
         )
 
     if template == "warehouse":
-        csv_content = export_inventory_warehouse_csv(db, current_user.id)
+        csv_chunks = export_inventory_warehouse_csv(db, current_user.id)
         filename = "vendora_inventory_warehouse.csv"
     else:
-        csv_content = export_inventory_csv(db, current_user.id)
+        csv_chunks = export_inventory_csv(db, current_user.id)
         filename = "vendora_inventory.csv"
 
     return StreamingResponse(
-        io.BytesIO(csv_content.encode("utf-8")),
+        csv_chunks,
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
@@ -83,10 +119,139 @@ def export_transactions(
     """Download transactions as CSV file (Pro only)."""
     _require_pro(current_user)
 
-    csv_content = export_transactions_csv(db, current_user.id)
-
     return StreamingResponse(
-        io.BytesIO(csv_content.encode("utf-8")),
+        export_transactions_csv(db, current_user.id),
         media_type="text/csv",
         headers={"Content-Disposition": "attachment; filename=vendora_transactions.csv"},
     )
+
+
+def _parquet_response(chunks: Iterator[bytes], filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type=PARQUET_MEDIA_TYPE,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+@router.get("/inventory.parquet")
+def export_inventory_as_parquet(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Download active inventory as Parquet (Pro only).
+
+    Typed columns (decimal prices, UTC timestamps, categorical text) for
+    pandas / Arrow; the CSV export stays the one to edit and re-import.
+    """
+    _require_pro(current_user)
+    return _parquet_response(export_inventory_parquet(db, current_user.id), "vendora_inventory.parquet")
+
+
+@router.get("/ledger.parquet")
+def export_ledger_as_parquet(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Download the stock ledger as Parquet (Pro only)."""
+    _require_pro(current_user)
+    return _parquet_response(export_ledger_parquet(db, current_user.id), "vendora_stock_ledger.parquet")
+
+
+@router.get("/transactions.parquet")
+def export_transactions_as_parquet(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Download transactions as Parquet (Pro only)."""
+    _require_pro(current_user)
+    return _parquet_response(export_transactions_parquet(db, current_user.id), "vendora_transactions.parquet")
+
+
+@router.post(
+    "/jobs",
+    response_model=ExportJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={200: {"model": ExportJobResponse, "description": "An existing job for unchanged data."}},
+)
+def create_export_job(
+    payload: ExportJobCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Queue an export to build in the background (Pro only).
+
+    202 returns the new job to poll. If the same export was already asked
+    for and the data has not changed since, 200 returns that job instead —
+    still running, or finished with its file ready to download.
+    """
+    _require_pro(current_user)
+
+    version = source_version(db, current_user.id, payload)
+    existing = find_reusable_job(db, current_user.id, version)
+    if existing is not None:
+        return JSONResponse(
+            status_code=status.HTTP_200_OK,
+            content=describe_job(existing).model_dump(mode="json"),
+        )
+
+    job = ExportJob(
+        user_id=current_user.id,
+        status=QUEUED,
+        source_version=version,
+        filename=export_filename(payload),
+        **payload.model_dump(),
+    )
+    db.add(job)
+    db.commit()
+    background_tasks.add_task(run_export_job, job.id)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=describe_job(job).model_dump(mode="json"),
+        headers={"Location": f"/api/v1/export/jobs/{job.id}"},
+    )
+
+
+def _get_export_job(job_id: str, user_id, db: Session) -> ExportJob:
+    job = db.query(ExportJob).filter(
+        ExportJob.id == job_id,
+        ExportJob.user_id == user_id,
+    ).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found.")
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=ExportJobResponse)
+def get_export_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Poll an export job: status, progress and, once finished, the download URL."""
+    _require_pro(current_user)
+    return describe_job(_get_export_job(job_id, current_user.id, db))
+
+
+@router.get("/jobs/{job_id}/download")
+def download_export_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Download a finished export.
+
+    Served as a file, so Range requests get 206 partial content and an
+    interrupted download can resume. 409 while the job is still queued or
+    running, 410 once its file has expired or if the job failed.
+    """
+    _require_pro(current_user)
+    job = _get_export_job(job_id, current_user.id, db)
+    if job.status == FAILED:
+        raise HTTPException(status_code=410, detail=f"This export failed: {job.error_message} Start a new one.")
+    if job.status not in (COMPLETED, EXPIRED):
+        raise HTTPException(status_code=409, detail="This export is not ready yet.")
+    if not artifact_available(job):
+        raise HTTPException(status_code=410, detail="This export has expired. Start a new one.")
+    return FileResponse(job.artifact_path, media_type=MEDIA_TYPES[job.format], filename=job.filename)
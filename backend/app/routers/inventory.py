@@ -9,16 +9,21 @@ import io
 import ipaddress
 import math
 import socket
+import tempfile
 from contextlib import asynccontextmanager
+from dataclasses import asdict
 from datetime import datetime, timezone
 from typing import Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 from urllib.parse import urljoin, urlparse
 
 import httpx
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi import (
+    APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, Request, Response, UploadFile, status,
+)
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse
 from pydantic import BaseModel as _PydBase
-from sqlalchemy import func, or_
+from sqlalchemy import func, insert
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -27,9 +32,13 @@ from app.models.inventory import (
     InventoryItem,
     InventoryImportJob,
     InventoryImportRow,
+    InventoryItemProvenance,
+    InventoryLinkedSheet,
     InventoryStockLedger,
 )
 from app.schemas.inventory import (
+    BulkCreateRequest,
+    BulkCreateResponse,
     ItemCreate,
     ItemUpdate,
     ItemResponse,
@@ -38,28 +47,79 @@ from app.schemas.inventory import (
     PhotoUpdate,
     ImportJobResponse,
     ImportPreviewResponse,
+    ImportRowPage,
     ImportRowResult,
     ImportCommitResponse,
     InventoryActivityEntry,
+    InventoryChanges,
+    InventoryFacets,
     InventoryImportRequest,
     InventoryImportResult,
+    ItemProvenanceEntry,
+    LinkedSheetCreate,
+    LinkedSheetResponse,
 )
 from app.dependencies.auth import get_current_user
-from app.dependencies.tier_limiter import TIER_LIMITS, enforce_item_limit
+from app.dependencies.tier_limiter import check_item_limit, enforce_item_limit
+from app.services import change_versions
+from app.services.conditional import conditional_response, make_validator
+from app.services.import_commit import commit_preview_job
+from app.services.import_jobs import QUEUED, describe_job, job_event_stream, run_import_job, store_upload
 from app.services.inventory import transition_item, get_available_quantity
+from app.services.inventory_bulk import (
+    bulk_create,
+    bulk_soft_delete,
+    bulk_transition,
+    check_batch_size,
+    new_item_values,
+)
+from app.services.inventory_changes import DEFAULT_CHANGES_LIMIT, MAX_CHANGES_LIMIT, list_changes
+from app.services.inventory_facets import facet_counts
+from app.services.inventory_import import import_inventory_content
+from app.services.linked_sheets import NOT_MODIFIED, apply_sheet_content, conditional_headers, mark_checked, run_sheet_sync
+from app.services.inventory_listing import (
+    SORT_PATTERN,
+    apply_cursor,
+    apply_item_filters,
+    apply_projection,
+    apply_sort,
+    count_items,
+    RELEVANCE_SORT,
+    decode_cursor,
+    decode_offset_cursor,
+    encode_cursor,
+    encode_offset_cursor,
+    project_row,
+    resolve_fields,
+    resolve_order,
+    resolve_sort,
+)
+from app.services.inventory_search import name_matches, relevance_order
+from app.services.photo_renditions import (
+    MAX_PHOTO_UPLOAD_BYTES,
+    RENDITION_PATTERN,
+    PhotoDecodeError,
+    build_and_store_renditions,
+    canonical_digest,
+    index_renditions,
+    rendition_url,
+)
+from app.services.photo_store import decode_data_url, externalize_photo, photo_url
+from app.services.worker_pool import run_in_worker
 from app.services.spreadsheet_import import (
-    detect_format,
     google_sheet_candidate_csv_urls,
     google_sheet_export_urls,
     google_sheet_csv_url,
-    parse_inventory_rows,
-    rows_from_bytes,
+    has_inventory_layout,
     MAX_CSV_IMPORT_BYTES,
     MAX_XLSX_IMPORT_BYTES,
 )
 
 router = APIRouter(prefix="/inventory", tags=["inventory"])
 
+# Discovered sheet tabs downloaded at once when a link's export has no header.
+CANDIDATE_FETCH_CONCURRENCY = 8
+
 # ---------------------------------------------------------------------------
 # Canonical CSV header → InventoryItem field mapping (case-insensitive)
 # ---------------------------------------------------------------------------
@@ -176,6 +236,28 @@ async def _assert_public_dns(url: str) -> None:
         raise HTTPException(status_code=400, detail="Import link must resolve only to public addresses.")
 
 
+class _PublicHostChecks:
+    """_assert_public_dns results for one import, by host and port.
+
+    A sheet's export candidates and their redirects live on a handful of
+    hosts, so each is resolved once per import rather than once per request;
+    concurrent requests to one host share the lookup, and a failed check
+    fails every later request to that host.
+    """
+
+    def __init__(self) -> None:
+        self._checks: dict[tuple[str, int], asyncio.Future] = {}
+
+    async def check(self, url: str) -> None:
+        parsed = _public_url_parts(url)
+        key = (parsed.hostname.lower().rstrip("."), parsed.port or (443 if parsed.scheme == "https" else 80))
+        check = self._checks.get(key)
+        if check is None:
+            check = self._checks[key] = asyncio.ensure_future(_assert_public_dns(url))
+        # Shielded: a cancelled request must not cancel a lookup others wait on.
+        await asyncio.shield(check)
+
+
 def _assert_public_peer(response: httpx.Response) -> None:
     stream = getattr(response, "extensions", {}).get("network_stream")
     if stream is None:
@@ -185,25 +267,31 @@ def _assert_public_peer(response: httpx.Response) -> None:
         raise HTTPException(status_code=400, detail="Import link connected to a non-public address.")
 
 
-async def _download_public_content(
+async def _fetch_public_content(
     client: httpx.AsyncClient,
     url: str,
     *,
     max_bytes: int = MAX_XLSX_IMPORT_BYTES,
-) -> tuple[bytes, str | None, str]:
+    headers: dict[str, str] | None = None,
+    hosts: _PublicHostChecks | None = None,
+) -> tuple[bytes | None, httpx.Headers, str]:
+    """(content, response headers, final URL); content is None on a 304 reply
+    to conditional *headers*. *hosts* caches the DNS checks across requests."""
+    request_kwargs = {"headers": headers} if headers else {}
+
     @asynccontextmanager
     async def response_context(request_url: str):
         # The compatibility branch keeps lightweight test doubles useful; the
         # production httpx client always takes the streaming branch.
         if hasattr(client, "stream"):
-            async with client.stream("GET", request_url) as streamed_response:
+            async with client.stream("GET", request_url, **request_kwargs) as streamed_response:
                 yield streamed_response
         else:
-            yield await client.get(request_url)
+            yield await client.get(request_url, **request_kwargs)
 
     current_url = url
     for _ in range(6):
-        await _assert_public_dns(current_url)
+        await (hosts.check(current_url) if hosts else _assert_public_dns(current_url))
         async with response_context(current_url) as response:
             _assert_public_peer(response)
             if getattr(response, "is_redirect", False):
@@ -212,6 +300,8 @@ async def _download_public_content(
                     raise HTTPException(status_code=400, detail="Spreadsheet link returned an invalid redirect.")
                 current_url = urljoin(current_url, location)
                 continue
+            if headers and response.status_code == status.HTTP_304_NOT_MODIFIED:
+                return None, response.headers, current_url
             response.raise_for_status()
             content_length = response.headers.get("content-length")
             if content_length and int(content_length) > max_bytes:
@@ -226,130 +316,54 @@ async def _download_public_content(
                 content.extend(response.content)
                 if len(content) > max_bytes:
                     raise HTTPException(status_code=413, detail="Spreadsheet download is too large.")
-            return bytes(content), response.headers.get("content-type"), current_url
+            return bytes(content), response.headers, current_url
     raise HTTPException(status_code=400, detail="Spreadsheet link redirected too many times.")
 
 
-async def _read_upload_limited(file: UploadFile, max_bytes: int) -> bytes:
+async def _download_public_content(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    max_bytes: int = MAX_XLSX_IMPORT_BYTES,
+    hosts: _PublicHostChecks | None = None,
+) -> tuple[bytes, str | None, str]:
+    content, headers, final_url = await _fetch_public_content(client, url, max_bytes=max_bytes, hosts=hosts)
+    return content, headers.get("content-type"), final_url
+
+
+async def _read_upload_limited(
+    file: UploadFile,
+    max_bytes: int,
+    too_large_detail: str = "Spreadsheet upload is too large.",
+) -> bytes:
     content = bytearray()
     while chunk := await file.read(1024 * 1024):
         content.extend(chunk)
         if len(content) > max_bytes:
-            raise HTTPException(status_code=413, detail="Spreadsheet upload is too large.")
+            raise HTTPException(status_code=413, detail=too_large_detail)
     return bytes(content)
 
 
-def _find_import_match(
-    db: Session,
-    user_id,
-    payload: dict,
-    external_id: str,
-) -> InventoryItem | None:
-    if payload.get("upc"):
-        match = db.query(InventoryItem).filter(
-            InventoryItem.user_id == user_id,
-            InventoryItem.deleted_at.is_(None),
-            InventoryItem.upc == payload["upc"],
-        ).first()
-        if match:
-            return match
-    if payload.get("sku"):
-        match = db.query(InventoryItem).filter(
-            InventoryItem.user_id == user_id,
-            InventoryItem.deleted_at.is_(None),
-            InventoryItem.sku == payload["sku"],
-        ).first()
-        if match:
-            return match
-    return db.query(InventoryItem).filter(
-        InventoryItem.user_id == user_id,
-        InventoryItem.deleted_at.is_(None),
-        InventoryItem.source == "spreadsheet",
-        InventoryItem.external_id == external_id,
-    ).first()
-
-
-def _import_inventory_content(
-    *,
-    filename: str,
-    content_type: str | None,
-    content: bytes,
-    dry_run: bool,
-    source_name: str | None,
-    db: Session,
-    current_user: User,
-) -> InventoryImportResult:
-    rows = rows_from_bytes(content, detect_format(filename, content_type, content), content_type)
-    parsed_rows = parse_inventory_rows(rows)
-
-    result = {
-        "dry_run": dry_run,
-        "rows_seen": len(rows),
-        "rows_importable": 0,
-        "created": 0,
-        "updated": 0,
-        "skipped": 0,
-        "errors": [],
-        "warnings": [],
-        "sample_items": [],
-    }
-
-    existing_count = db.query(InventoryItem).filter(
-        InventoryItem.user_id == current_user.id,
-        InventoryItem.deleted_at.is_(None),
-    ).count()
-    tier_limit = TIER_LIMITS.get(current_user.subscription_tier)
-
-    for parsed_row in parsed_rows:
-        for warning in parsed_row.warnings:
-            result["warnings"].append({"row": parsed_row.row_number, "message": warning})
-
-        if not parsed_row.payload:
-            result["skipped"] += 1
-            continue
-
-        result["rows_importable"] += 1
-        match = _find_import_match(db, current_user.id, parsed_row.payload, parsed_row.external_id)
-        if match:
-            result["updated"] += 1
-        else:
-            if tier_limit is not None and existing_count + result["created"] >= tier_limit:
-                result["skipped"] += 1
-                result["errors"].append({
-                    "row": parsed_row.row_number,
-                    "message": f"Tier limit reached at {tier_limit} inventory items.",
-                })
-                continue
-            result["created"] += 1
-
-        if len(result["sample_items"]) < 5:
-            result["sample_items"].append(parsed_row.payload)
-
-        if dry_run:
-            continue
-
-        payload = dict(parsed_row.payload)
-        raw_attrs = payload.pop("custom_attributes", {}) or {}
-        if match:
-            existing_attrs = match.custom_attributes or {}
-            payload["custom_attributes"] = {**existing_attrs, **raw_attrs}
-            for field, value in payload.items():
-                setattr(match, field, value)
-            db.add(match)
-        else:
-            item = InventoryItem(
-                user_id=current_user.id,
-                source="spreadsheet",
-                external_id=parsed_row.external_id,
-                custom_attributes=raw_attrs,
-                **payload,
-            )
-            db.add(item)
+async def _spool_upload_limited(file: UploadFile, max_bytes: int):
+    """Copy an upload to a named temp file (the caller closes it), enforcing max_bytes."""
+    spool = tempfile.NamedTemporaryFile(prefix="vendora-upload-")
+    size = 0
+    try:
+        while chunk := await file.read(1024 * 1024):
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(status_code=413, detail="Spreadsheet upload is too large.")
+            spool.write(chunk)
+        spool.flush()
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
 
-    if not dry_run:
-        db.commit()
 
-    return InventoryImportResult(**result)
+# Kept as a module attribute: the link/file endpoints resolve it at call time.
+_import_inventory_content = import_inventory_content
 
 
 @router.post("", response_model=ItemResponse, status_code=status.HTTP_201_CREATED)
@@ -359,113 +373,258 @@ def create_item(
     current_user: User = Depends(enforce_item_limit),
 ):
     """Create a new inventory item. Tier limit enforced (Free: 25 max)."""
-    item = InventoryItem(
-        user_id=current_user.id,
-        name=payload.name,
-        category=payload.category,
-        sku=payload.sku,
-        upc=payload.upc,
-        size=payload.size,
-        color=payload.color,
-        condition=payload.condition,
-        serial_number=payload.serial_number,
-        custom_attributes=payload.custom_attributes or {},
-        buy_price=payload.buy_price,
-        expected_sell_price=payload.expected_sell_price,
-        actual_sell_price=payload.actual_sell_price,
-        platform=payload.platform,
-        photo_front_url=payload.photo_front_url,
-        photo_back_url=payload.photo_back_url,
-        quantity=payload.quantity,
-        vendor_name=payload.vendor_name,
-        notes=payload.notes,
-    )
+    item = InventoryItem(**new_item_values(current_user.id, payload))
     db.add(item)
     db.commit()
     db.refresh(item)
     return item
 
 
+@router.post("/bulk", response_model=BulkCreateResponse, status_code=status.HTTP_201_CREATED)
+def bulk_create_items(
+    payload: BulkCreateRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Create up to 1000 items in one request (e.g. onboarding a haul).
+
+    The tier limit is checked once for the whole batch — all or nothing —
+    and rows go in as a single multi-row INSERT.
+    """
+    check_batch_size(len(payload.items), "items")
+    check_item_limit(current_user, db, adding=len(payload.items))
+    ids = bulk_create(db, current_user.id, payload.items)
+    return BulkCreateResponse(created=len(ids), ids=ids)
+
+
 @router.get("", response_model=PaginatedItems)
 def list_items(
-    page: int = Query(1, ge=1, description="Page number"),
+    request: Request,
+    response: Response,
+    page: int = Query(1, ge=1, description="Page number (ignored when cursor is set)"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, max_length=512, description="Opaque next_cursor from a previous page"),
+    sort: Optional[str] = Query(
+        None,
+        pattern=SORT_PATTERN,
+        description="created_at | updated_at | price | name | relevance (default relevance when q is set, else created_at)",
+    ),
+    order: Optional[str] = Query(None, pattern="^(asc|desc)$", description="Defaults to asc for name, desc otherwise"),
+    count: str = Query("exact", pattern="^(exact|estimate|none)$", description="How to compute total"),
     q: Optional[str] = Query(None, description="Search by name, SKU, or UPC"),
     status_filter: Optional[str] = Query(None, alias="status", description="Filter by status"),
     source_filter: Optional[str] = Query(None, alias="source", description="Filter by source (e.g. lightspeed)"),
     available_only: bool = Query(False, description="Only items with quantity > 0 and status in (in_stock, listed)"),
+    view: str = Query("full", pattern="^(full|summary)$", description="summary returns slim rows without photo blobs"),
+    fields: Optional[str] = Query(None, max_length=500, description="Comma-separated item fields to return (overrides view)"),
+    include_facets: bool = Query(False, description="Attach filter-chip facet counts to the first page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """List inventory items with pagination and optional search/filters."""
-    base_query = db.query(InventoryItem).filter(
-        InventoryItem.user_id == current_user.id,
-        InventoryItem.deleted_at.is_(None),
+    """List inventory items with pagination and optional search/filters.
+
+    Pass the returned next_cursor back as `cursor` for keyset paging; the
+    page/per_page contract stays available for older app builds.
+    view=summary / fields= load only the requested columns and return photo
+    URLs (GET /inventory/{id}/photos/{side}) instead of base64 blobs.
+    include_facets=true adds GET /inventory/facets counts to the first page.
+    Answers 304 while the caller's items are unchanged (If-None-Match).
+    """
+    projection = resolve_fields(view, fields)
+    validator = make_validator(
+        current_user.id,
+        request.url,
+        *change_versions.current(db, current_user.id, change_versions.INVENTORY),
     )
+    not_modified = conditional_response(request, response, validator)
+    if not_modified:
+        return not_modified
+    base_query = apply_item_filters(
+        db.query(InventoryItem).filter(
+            InventoryItem.user_id == current_user.id,
+            InventoryItem.deleted_at.is_(None),
+        ),
+        q=q,
+        status_filter=status_filter,
+        source_filter=source_filter,
+        available_only=available_only,
+    )
+    sort = resolve_sort(sort, q)
+    order = resolve_order(sort, order)
+
+    total, total_is_estimate = count_items(db, base_query, count)
+    offset = (page - 1) * per_page
+    if sort == RELEVANCE_SORT:
+        # Rank is computed per query, so relevance pages by offset inside the cursor.
+        page_query = relevance_order(base_query, q)
+        if cursor:
+            offset = decode_offset_cursor(cursor, order)
+        page_query = page_query.offset(offset)
+    else:
+        page_query = apply_sort(base_query, sort, order)
+        if cursor:
+            cursor_key, cursor_id = decode_cursor(cursor, sort, order)
+            page_query = apply_cursor(page_query, sort, order, cursor_key, cursor_id)
+        else:
+            page_query = page_query.offset(offset)
+
+    if projection:
+        page_query = apply_projection(page_query, projection, sort)
+
+    # Fetch one extra row to learn whether another page exists without a COUNT.
+    rows = page_query.limit(per_page + 1).all()
+    if projection:
+        projected = [
+            project_row(row, projection, lambda item, side, size: _photo_url(request, item.id, side, size))
+            for row in rows[:per_page]
+        ]
+        items = [item for item, _ in projected]
+        payload = [data for _, data in projected]
+    else:
+        items = payload = rows[:per_page]
+    next_cursor = None
+    if len(rows) > per_page:
+        if sort == RELEVANCE_SORT:
+            next_cursor = encode_offset_cursor(offset + per_page, order)
+        else:
+            next_cursor = encode_cursor(items[-1], sort, order)
 
-    if q:
-        term = f"%{q[:50]}%"  # cap at 50 chars for safety
-        base_query = base_query.filter(
-            or_(
-                InventoryItem.name.ilike(term),
-                InventoryItem.sku.ilike(term),
-                InventoryItem.upc.ilike(term),
-            )
-        )
-
-    if status_filter:
-        base_query = base_query.filter(InventoryItem.status == status_filter)
-
-    if source_filter:
-        base_query = base_query.filter(InventoryItem.source == source_filter)
-
-    if available_only:
-        base_query = base_query.filter(
-            InventoryItem.status.in_(["in_stock", "listed"]),
-            InventoryItem.quantity > 0,
-        )
+    facets = None
+    if include_facets and not cursor and page == 1:
+        facets, _ = facet_counts(base_query)
 
-    total = base_query.count()
-    items = (
-        base_query
-        .order_by(InventoryItem.created_at.desc())
-        .offset((page - 1) * per_page)
-        .limit(per_page)
-        .all()
-    )
     return PaginatedItems(
-        items=items,
+        items=payload,
         total=total,
-        page=page,
+        page=None if cursor else page,
         per_page=per_page,
-        pages=math.ceil(total / per_page) if total > 0 else 0,
+        pages=None if total is None else math.ceil(total / per_page),
+        next_cursor=next_cursor,
+        total_is_estimate=total_is_estimate,
+        facets=facets,
     )
 
 
-@router.post("/import", response_model=InventoryImportResult)
-async def import_inventory_from_link(
-    payload: InventoryImportRequest,
+@router.get("/facets", response_model=InventoryFacets)
+def get_item_facets(
+    q: Optional[str] = Query(None, description="Search by name, SKU, or UPC"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by status"),
+    source_filter: Optional[str] = Query(None, alias="source", description="Filter by source (e.g. lightspeed)"),
+    available_only: bool = Query(False, description="Only items with quantity > 0 and status in (in_stock, listed)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Import inventory from a public/read-only spreadsheet link.
+    """Counts per status, category, source, platform and condition.
 
-    Supports Google Sheets read-only URLs by converting them to XLSX/CSV export URLs.
+    Takes the same filters as GET /inventory and computes every facet in one
+    grouped query (services/inventory_facets.py).
+    """
+    base_query = apply_item_filters(
+        db.query(InventoryItem).filter(
+            InventoryItem.user_id == current_user.id,
+            InventoryItem.deleted_at.is_(None),
+        ),
+        q=q,
+        status_filter=status_filter,
+        source_filter=source_filter,
+        available_only=available_only,
+    )
+    facets, total = facet_counts(base_query)
+    return InventoryFacets(facets=facets, total=total)
+
+
+@router.get("/changes", response_model=InventoryChanges)
+def list_item_changes(
+    since: Optional[str] = Query(None, max_length=256, description="next_token from the previous call; omit for a full sync"),
+    limit: int = Query(DEFAULT_CHANGES_LIMIT, ge=1, le=MAX_CHANGES_LIMIT),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Delta feed for app sync: items created, updated or deleted after `since`.
+
+    Deleted items come back as tombstones (id + deleted_at only). Keep
+    calling with next_token while has_more is true; store the final token
+    and resume from it next session.
+    """
+    page = list_changes(db, current_user.id, since, limit)
+    return InventoryChanges(
+        items=page.items,
+        deleted=page.deleted,
+        next_token=page.next_token,
+        has_more=page.has_more,
+    )
+
+
+def _import_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(120.0, connect=20.0),
+        follow_redirects=False,
+        headers={
+            "Accept": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet,text/csv,*/*",
+            "User-Agent": "VendoraSpreadsheetImport/1.0",
+        },
+    )
+
+
+async def _first_readable_candidate(
+    client: httpx.AsyncClient,
+    urls: list[str],
+    hosts: _PublicHostChecks,
+) -> tuple[bytes, str | None, str] | None:
+    """Download *urls* concurrently; the first, in order, with an inventory layout wins.
+
+    At most CANDIDATE_FETCH_CONCURRENCY downloads run at once on the shared
+    client. A candidate whose first rows hold a header is accepted once
+    every candidate before it has finished without one (failed to download
+    or held no header), so the same sheet always picks the same tab; the
+    rest are then cancelled.
     """
-    import_urls = _validate_import_host(payload.url)
-    if payload.dry_run:
+    semaphore = asyncio.Semaphore(CANDIDATE_FETCH_CONCURRENCY)
+
+    async def fetch(candidate_url: str):
+        async with semaphore:
+            try:
+                content, content_type, final_url = await _download_public_content(
+                    client, candidate_url, max_bytes=MAX_CSV_IMPORT_BYTES, hosts=hosts,
+                )
+            except (httpx.HTTPError, HTTPException):
+                return None
+        if not has_inventory_layout(urlparse(final_url).path, content_type, content):
+            return None
+        return content, content_type, final_url
+
+    tasks = [asyncio.ensure_future(fetch(candidate_url)) for candidate_url in urls]
+    try:
+        for task in tasks:
+            download = await task
+            if download is not None:
+                return download
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _import_from_link(url: str, dry_run: bool, run_import) -> InventoryImportResult:
+    """Download *url* (trying each export candidate) and hand it to run_import.
+
+    run_import(filename, content_type, content) is awaited for each export
+    candidate in turn until one parses as an inventory sheet. When a
+    Google Sheet's export has no header row, the sheet's other tabs are
+    discovered from its page and raced (_first_readable_candidate); only
+    the winner is imported.
+    """
+    import_urls = _validate_import_host(url)
+    if dry_run:
         import_urls = sorted(import_urls, key=lambda candidate: 0 if "format=csv" in candidate else 1)
     last_error: HTTPException | None = None
-    timeout = httpx.Timeout(120.0, connect=20.0)
-    headers = {
-        "Accept": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet,text/csv,*/*",
-        "User-Agent": "VendoraSpreadsheetImport/1.0",
-    }
+    hosts = _PublicHostChecks()
 
-    async with httpx.AsyncClient(timeout=timeout, follow_redirects=False, headers=headers) as client:
+    async with _import_client() as client:
         for import_url in import_urls:
             try:
-                content, content_type, final_url = await _download_public_content(client, import_url)
+                content, content_type, final_url = await _download_public_content(client, import_url, hosts=hosts)
             except httpx.HTTPStatusError as exc:
                 last_error = HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -480,15 +639,7 @@ async def import_inventory_from_link(
                 continue
 
             try:
-                return _import_inventory_content(
-                    filename=urlparse(final_url).path,
-                    content_type=content_type,
-                    content=content,
-                    dry_run=payload.dry_run,
-                    source_name=payload.source_name,
-                    db=db,
-                    current_user=current_user,
-                )
+                return await run_import(urlparse(final_url).path, content_type, content)
             except HTTPException as exc:
                 last_error = exc
                 if "web page instead of spreadsheet data" in str(exc.detail):
@@ -497,17 +648,20 @@ async def import_inventory_from_link(
                     discovery_text = content.decode("utf-8", errors="replace")
                     try:
                         discovery_content, _, _ = await _download_public_content(
-                            client, payload.url, max_bytes=MAX_CSV_IMPORT_BYTES
+                            client, url, max_bytes=MAX_CSV_IMPORT_BYTES, hosts=hosts,
                         )
                         discovery_text = discovery_content.decode("utf-8", errors="replace")
                     except (httpx.HTTPError, HTTPException):
                         pass
-                    extra_urls = google_sheet_candidate_csv_urls(payload.url, discovery_text)
-                    for extra_url in extra_urls:
-                        if extra_url not in import_urls:
-                            import_urls.append(extra_url)
-                    if extra_urls:
-                        continue
+                    extra_urls = [
+                        extra_url
+                        for extra_url in google_sheet_candidate_csv_urls(url, discovery_text)
+                        if extra_url not in import_urls
+                    ]
+                    winner = await _first_readable_candidate(client, extra_urls, hosts) if extra_urls else None
+                    if winner is not None:
+                        winner_content, winner_type, winner_url = winner
+                        return await run_import(urlparse(winner_url).path, winner_type, winner_content)
                 raise
 
     if last_error:
@@ -518,28 +672,283 @@ async def import_inventory_from_link(
     )
 
 
-@router.post("/import/file", response_model=InventoryImportResult)
+async def run_background_import(job: InventoryImportJob, db: Session, progress) -> InventoryImportResult:
+    """Importer for services.import_jobs: parse/match/write on the worker pool."""
+    current_user = db.get(User, job.user_id)
+
+    async def run_import(filename, content_type, content):
+        return await run_in_worker(
+            _import_inventory_content,
+            filename=filename,
+            content_type=content_type,
+            content=content,
+            dry_run=job.dry_run,
+            source_name=None,
+            db=db,
+            current_user=current_user,
+            progress=progress,
+            import_job_id=job.id,
+        )
+
+    if job.source_url:
+        return await _import_from_link(job.source_url, job.dry_run, run_import)
+    try:
+        upload = open(job.upload_path, "rb")
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="The uploaded file is no longer available. Upload it again.",
+        )
+    with upload:
+        return await run_import(job.filename, job.content_type, upload)
+
+
+async def sync_linked_sheet(sheet: InventoryLinkedSheet, db: Session) -> None:
+    """Syncer for services.linked_sheets: conditional fetch, then apply changed rows.
+
+    The export URL that worked last time is tried first (with the stored
+    validators), then the other export candidates, CSV first.
+    """
+    current_user = db.get(User, sheet.user_id)
+    candidates = sorted(_validate_import_host(sheet.url), key=lambda candidate: 0 if "format=csv" in candidate else 1)
+    if sheet.export_url in candidates:
+        candidates.remove(sheet.export_url)
+        candidates.insert(0, sheet.export_url)
+    last_error: HTTPException | None = None
+    hosts = _PublicHostChecks()
+
+    async with _import_client() as client:
+        for export_url in candidates:
+            validators = conditional_headers(sheet) if export_url == sheet.export_url else None
+            try:
+                content, headers, final_url = await _fetch_public_content(
+                    client, export_url, headers=validators, hosts=hosts,
+                )
+            except httpx.HTTPStatusError as exc:
+                last_error = HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Spreadsheet link returned HTTP {exc.response.status_code}.",
+                )
+                continue
+            except httpx.HTTPError:
+                last_error = HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Could not download the spreadsheet link.",
+                )
+                continue
+            if content is None:
+                mark_checked(db, sheet, NOT_MODIFIED)
+                return
+
+            try:
+                await run_in_worker(
+                    apply_sheet_content,
+                    sheet=sheet,
+                    export_url=export_url,
+                    filename=urlparse(final_url).path,
+                    content_type=headers.get("content-type"),
+                    content=content,
+                    etag=headers.get("etag"),
+                    last_modified=headers.get("last-modified"),
+                    db=db,
+                    current_user=current_user,
+                )
+            except HTTPException as exc:
+                detail = str(exc.detail)
+                if "web page instead of spreadsheet data" in detail or "Could not find an inventory header row" in detail:
+                    last_error = exc
+                    continue
+                raise
+            return
+
+    raise last_error or HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Could not download the spreadsheet link.",
+    )
+
+
+def _queue_import_job(background_tasks: BackgroundTasks, db: Session, current_user: User, **fields) -> JSONResponse:
+    job = InventoryImportJob(user_id=current_user.id, status=QUEUED, source="spreadsheet", **fields)
+    db.add(job)
+    db.commit()
+    background_tasks.add_task(run_import_job, job.id, run_background_import)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=describe_job(job).model_dump(mode="json"),
+        headers={"Location": f"/api/v1/inventory/imports/{job.id}"},
+    )
+
+
+@router.post(
+    "/import",
+    response_model=InventoryImportResult,
+    responses={202: {"model": ImportJobResponse, "description": "Queued as a background import job."}},
+)
+async def import_inventory_from_link(
+    payload: InventoryImportRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Import inventory from a public/read-only spreadsheet link.
+
+    Supports Google Sheets read-only URLs by converting them to XLSX/CSV export URLs.
+    With background=true the import is queued and 202 returns the job to poll.
+    """
+    if payload.background:
+        _validate_import_host(payload.url)
+        return _queue_import_job(
+            background_tasks, db, current_user,
+            source_url=payload.url,
+            filename=urlparse(payload.url).path[:500] or None,
+            dry_run=payload.dry_run,
+        )
+
+    async def run_import(filename, content_type, content):
+        return await run_in_worker(
+            _import_inventory_content,
+            filename=filename,
+            content_type=content_type,
+            content=content,
+            dry_run=payload.dry_run,
+            source_name=payload.source_name,
+            db=db,
+            current_user=current_user,
+        )
+
+    return await _import_from_link(payload.url, payload.dry_run, run_import)
+
+
+@router.post(
+    "/import/file",
+    response_model=InventoryImportResult,
+    responses={202: {"model": ImportJobResponse, "description": "Queued as a background import job."}},
+)
 async def import_inventory_file(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     dry_run: bool = Query(False),
+    background: bool = Query(False, description="Queue as a background job and return 202"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Import inventory from an uploaded CSV or XLSX spreadsheet."""
     filename = file.filename or "inventory.csv"
     max_bytes = MAX_XLSX_IMPORT_BYTES if filename.lower().endswith(".xlsx") else MAX_CSV_IMPORT_BYTES
-    content = await _read_upload_limited(file, max_bytes)
-    return _import_inventory_content(
-        filename=filename,
-        content_type=file.content_type,
-        content=content,
-        dry_run=dry_run,
-        source_name="file-upload",
-        db=db,
-        current_user=current_user,
+    with await _spool_upload_limited(file, max_bytes) as upload:
+        if background:
+            return _queue_import_job(
+                background_tasks, db, current_user,
+                filename=filename[:500],
+                content_type=file.content_type,
+                upload_path=await run_in_worker(store_upload, upload),
+                dry_run=dry_run,
+            )
+        return await run_in_worker(
+            _import_inventory_content,
+            filename=filename,
+            content_type=file.content_type,
+            content=upload,
+            dry_run=dry_run,
+            source_name="file-upload",
+            db=db,
+            current_user=current_user,
+        )
+
+
+@router.post("/linked-sheets", response_model=LinkedSheetResponse, status_code=status.HTTP_201_CREATED)
+def create_linked_sheet(
+    payload: LinkedSheetCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Link a public/read-only spreadsheet for scheduled sync.
+
+    The first sync starts right away; later ones run every
+    sync_interval_minutes and apply only rows that changed.
+    """
+    _validate_import_host(payload.url)
+    existing = db.query(InventoryLinkedSheet).filter(
+        InventoryLinkedSheet.user_id == current_user.id,
+        InventoryLinkedSheet.url == payload.url,
+    ).first()
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This spreadsheet is already linked.",
+        )
+    sheet = InventoryLinkedSheet(
+        user_id=current_user.id,
+        url=payload.url,
+        sync_interval_minutes=payload.sync_interval_minutes,
+        next_sync_at=datetime.now(timezone.utc),
+    )
+    db.add(sheet)
+    db.commit()
+    background_tasks.add_task(run_sheet_sync, sheet.id, sync_linked_sheet)
+    return sheet
+
+
+@router.get("/linked-sheets", response_model=list[LinkedSheetResponse])
+def list_linked_sheets(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """List the seller's linked spreadsheets with their last sync outcome."""
+    return (
+        db.query(InventoryLinkedSheet)
+        .filter(InventoryLinkedSheet.user_id == current_user.id)
+        .order_by(InventoryLinkedSheet.created_at)
+        .all()
     )
 
 
+def _get_linked_sheet(sheet_id: UUID, user_id, db: Session) -> InventoryLinkedSheet:
+    sheet = db.query(InventoryLinkedSheet).filter(
+        InventoryLinkedSheet.id == sheet_id,
+        InventoryLinkedSheet.user_id == user_id,
+    ).first()
+    if not sheet:
+        raise HTTPException(status_code=404, detail="Linked sheet not found.")
+    return sheet
+
+
+@router.get("/linked-sheets/{sheet_id}", response_model=LinkedSheetResponse)
+def get_linked_sheet(
+    sheet_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get a linked spreadsheet and the outcome of its last sync."""
+    return _get_linked_sheet(sheet_id, current_user.id, db)
+
+
+@router.post("/linked-sheets/{sheet_id}/sync", response_model=LinkedSheetResponse)
+async def sync_linked_sheet_now(
+    sheet_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Sync a linked spreadsheet now instead of waiting for its schedule."""
+    sheet = _get_linked_sheet(sheet_id, current_user.id, db)
+    await run_sheet_sync(sheet.id, sync_linked_sheet, force=True)
+    db.refresh(sheet)
+    return sheet
+
+
+@router.delete("/linked-sheets/{sheet_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_linked_sheet(
+    sheet_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Unlink a spreadsheet. Items it imported stay in inventory."""
+    db.delete(_get_linked_sheet(sheet_id, current_user.id, db))
+    db.commit()
+    return None
+
+
 @router.get("/market-price")
 async def get_market_price(
     query: str = Query(..., description="Item name to look up"),
@@ -601,26 +1010,16 @@ async def get_market_price(
             pass  # graceful degradation
 
     # 2. Internal history — avg sell price for similar-named items in user's account
-    name_avg = (
-        db.query(func.avg(InventoryItem.actual_sell_price))
+    name_avg, sample_count = (
+        db.query(func.avg(InventoryItem.actual_sell_price), func.count(InventoryItem.id))
         .filter(
             InventoryItem.user_id == current_user.id,
             InventoryItem.actual_sell_price.isnot(None),
-            InventoryItem.name.ilike(f"%{query[:20]}%"),
+            name_matches(query[:20]),
         )
-        .scalar()
+        .one()
     )
     if name_avg:
-        sample_count = (
-            db.query(func.count(InventoryItem.id))
-            .filter(
-                InventoryItem.user_id == current_user.id,
-                InventoryItem.actual_sell_price.isnot(None),
-                InventoryItem.name.ilike(f"%{query[:20]}%"),
-            )
-            .scalar()
-            or 0
-        )
         result["internal_history"] = {
             "avg_sold_price": round(float(name_avg), 2),
             "sample_count": sample_count,
@@ -660,7 +1059,7 @@ def get_pricing_suggestion(
         .filter(
             InventoryItem.user_id == current_user.id,
             InventoryItem.actual_sell_price.isnot(None),
-            InventoryItem.name.ilike(f"%{item.name[:15]}%"),
+            name_matches(item.name[:15]),
             InventoryItem.id != item.id,
         )
         .scalar()
@@ -705,11 +1104,18 @@ def get_pricing_suggestion(
 @router.get("/{item_id}", response_model=ItemResponse)
 def get_item(
     item_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get a single inventory item. Returns 404 if deleted or not owned."""
-    return _get_active_item(item_id, current_user.id, db)
+    """Get a single inventory item. Returns 404 if deleted or not owned.
+
+    Sends ETag/Last-Modified from updated_at and answers 304 when unchanged.
+    """
+    item = _get_active_item(item_id, current_user.id, db)
+    validator = make_validator(item.id, item.updated_at, last_modified=item.updated_at)
+    return conditional_response(request, response, validator) or item
 
 
 @router.get("/{item_id}/activity", response_model=list[InventoryActivityEntry])
@@ -730,6 +1136,24 @@ def get_item_activity(
     )
 
 
+@router.get("/{item_id}/provenance", response_model=list[ItemProvenanceEntry])
+def get_item_provenance(
+    item_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Return the source cells of each import that wrote this item, newest first."""
+    item = _get_active_item(item_id, current_user.id, db)
+    return (
+        db.query(InventoryItemProvenance)
+        .filter(InventoryItemProvenance.inventory_item_id == item.id)
+        .order_by(InventoryItemProvenance.created_at.desc())
+        .limit(limit)
+        .all()
+    )
+
+
 @router.put("/{item_id}", response_model=ItemResponse)
 def update_item(
     item_id: str,
@@ -741,6 +1165,9 @@ def update_item(
     item = _get_active_item(item_id, current_user.id, db)
 
     update_data = payload.model_dump(exclude_unset=True)
+    for field in ("photo_front_url", "photo_back_url"):
+        if field in update_data:
+            update_data[field] = externalize_photo(update_data[field])
     for field, value in update_data.items():
         setattr(item, field, value)
 
@@ -773,11 +1200,30 @@ class BulkDeleteRequest(_PydBase):
     delete_from_source: bool = False
 
 
+class BulkItemResult(_PydBase):
+    id: str
+    outcome: str  # updated | deleted | invalid_transition | not_found
+    status: Optional[str] = None
+    allowed_transitions: list[str] = []
+
+
 class BulkDeleteResponse(_PydBase):
     deleted: int
     source_removed: int = 0
     source_unsupported: int = 0
     source_note: str = ""
+    results: list[BulkItemResult] = []
+
+
+class BulkStatusRequest(_PydBase):
+    item_ids: list[str]
+    status: str
+
+
+class BulkStatusResponse(_PydBase):
+    updated: int
+    failed: int
+    results: list[BulkItemResult]
 
 
 @router.post("/bulk-delete", response_model=BulkDeleteResponse)
@@ -788,47 +1234,130 @@ def bulk_delete_items(
 ):
     """Soft-delete many inventory items at once (owned + active only).
 
+    One UPDATE ... RETURNING for the whole batch (services/inventory_bulk.py);
+    `results` carries a per-id outcome.
+
     `delete_from_source` note: spreadsheet imports are read-only (a public
     Sheets URL or an uploaded file), so items sourced from a spreadsheet cannot
     be removed at the source from here — those are counted in `source_unsupported`.
     """
-    if not payload.item_ids:
-        raise HTTPException(status_code=400, detail="item_ids is required")
-
-    deleted = 0
-    source_unsupported = 0
-    now = datetime.now(timezone.utc)
-    for item_id in payload.item_ids[:500]:
-        item = (
-            db.query(InventoryItem)
-            .filter(
-                InventoryItem.id == item_id,
-                InventoryItem.user_id == current_user.id,
-                InventoryItem.deleted_at.is_(None),
-            )
-            .first()
-        )
-        if not item:
-            continue
-        if payload.delete_from_source and item.source == "spreadsheet":
-            source_unsupported += 1
-        item.deleted_at = now
-        db.add(item)
-        deleted += 1
-    db.commit()
+    results, sources = bulk_soft_delete(db, current_user.id, payload.item_ids)
+    source_unsupported = sum(1 for source in sources if source == "spreadsheet") if payload.delete_from_source else 0
 
     note = ""
-    if payload.delete_from_source and source_unsupported:
+    if source_unsupported:
         note = (
             f"{source_unsupported} item(s) came from a read-only spreadsheet import, "
             "so they were removed from Vendora but can't be edited in your original sheet."
         )
     return BulkDeleteResponse(
-        deleted=deleted,
+        deleted=len(sources),
         source_removed=0,
         source_unsupported=source_unsupported,
         source_note=note,
+        results=[BulkItemResult(**asdict(result)) for result in results],
+    )
+
+
+@router.post("/bulk-status", response_model=BulkStatusResponse)
+def bulk_update_status(
+    payload: BulkStatusRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Transition many items to one status in a single statement.
+
+    Enforces the same STATE_MACHINES.md rules as PATCH /{item_id}/status;
+    items that may not move are left untouched and reported per id.
+    """
+    results = bulk_transition(db, current_user.id, payload.item_ids, payload.status)
+    updated = sum(1 for result in results if result.outcome == "updated")
+    return BulkStatusResponse(
+        updated=updated,
+        failed=len(results) - updated,
+        results=[BulkItemResult(**asdict(result)) for result in results],
+    )
+
+
+def _photo_url(request: Request, item_id, side: str, size: Optional[str] = None) -> str:
+    url = request.url_for("get_item_photo", item_id=str(item_id), side=side)
+    return str(url.include_query_params(size=size) if size else url)
+
+
+@router.get("/{item_id}/photos/{side}", name="get_item_photo")
+def get_item_photo(
+    item_id: str,
+    side: str,
+    size: Optional[str] = Query(None, pattern=RENDITION_PATTERN, description="thumb | list | detail"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Serve one item photo: legacy inline blobs as binary, URLs (including
+    photo-store URLs) by redirect.
+
+    This is the URL list views hand out in place of the base64 blob.
+    """
+    if side not in ("front", "back"):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found.")
+    column = getattr(InventoryItem, f"photo_{side}_url")
+    value = (
+        db.query(column)
+        .filter(
+            InventoryItem.id == item_id,
+            InventoryItem.user_id == current_user.id,
+            InventoryItem.deleted_at.is_(None),
+        )
+        .scalar()
+    )
+    if not value:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found.")
+    if value.startswith(("http://", "https://")):
+        target = rendition_url(value, size) if size else value
+        return RedirectResponse(target, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+    decoded = decode_data_url(value)
+    if decoded is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found.")
+    content, mime = decoded
+    return Response(content=content, media_type=mime, headers={"Cache-Control": "private, max-age=300"})
+
+
+@router.post("/{item_id}/photos/{side}", response_model=ItemResponse)
+async def upload_item_photo(
+    item_id: str,
+    side: str,
+    file: UploadFile = File(..., description="JPEG, PNG or WebP image"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Upload one item photo as multipart binary (no base64 inflation).
+
+    The image is re-encoded off the event loop into the thumb/list/detail
+    ladder (WebP + progressive JPEG); the item keeps the detail JPEG URL and
+    GET /photos/{hash}?size= serves the smaller rungs.
+    """
+    if side not in ("front", "back"):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo side must be front or back.")
+    item = _get_active_item(item_id, current_user.id, db)
+    content = await _read_upload_limited(
+        file,
+        MAX_PHOTO_UPLOAD_BYTES,
+        too_large_detail=f"Photo upload is too large. Photos must be {MAX_PHOTO_UPLOAD_BYTES // (1024 * 1024)} MB or less.",
     )
+    try:
+        stored = await run_in_worker(build_and_store_renditions, content)
+    except PhotoDecodeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "invalid_image", "message": str(exc)},
+        ) from exc
+
+    digest = canonical_digest(stored)
+    index_renditions(db, digest, stored)
+    setattr(item, f"photo_{side}_url", photo_url(digest))
+    db.add(item)
+    db.commit()
+    db.refresh(item)
+    return item
 
 
 @router.patch("/{item_id}/photos", response_model=ItemResponse)
@@ -838,12 +1367,16 @@ def update_item_photos(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Update front/back photo (base64 data URL). Called after createItem succeeds."""
+    """Update front/back photo from JSON (legacy; prefer POST /{item_id}/photos/{side}).
+
+    Base64 data URLs are moved into the photo store and the item keeps the
+    returned /photos/{hash} URL; remote URLs are saved as-is.
+    """
     item = _get_active_item(item_id, current_user.id, db)
     if payload.photo_front is not None:
-        item.photo_front_url = payload.photo_front
+        item.photo_front_url = externalize_photo(payload.photo_front)
     if payload.photo_back is not None:
-        item.photo_back_url = payload.photo_back
+        item.photo_back_url = externalize_photo(payload.photo_back)
     db.add(item)
     db.commit()
     db.refresh(item)
@@ -889,6 +1422,8 @@ def _detect_mapping(headers: list[str]) -> dict[str, str]:
 
 DECIMAL_FIELDS = {"buy_price", "expected_sell_price", "actual_sell_price"}
 INT_FIELDS = {"quantity"}
+PREVIEW_ROWS_PER_PAGE = 50
+PREVIEW_INSERT_BATCH_SIZE = 1000
 
 
 def _coerce_row(raw: dict, mapping: dict[str, str]) -> tuple[dict, Optional[str]]:
@@ -925,6 +1460,9 @@ async def preview_import(
     """Upload a CSV, parse it, detect column mapping, and return a preview.
 
     No inventory changes are made.  Call POST /imports/{job_id}/commit to apply.
+    Every row is stored (multi-row INSERTs of PREVIEW_INSERT_BATCH_SIZE rows);
+    the response carries the counts and the first PREVIEW_ROWS_PER_PAGE rows,
+    and GET /imports/{job_id}/rows pages through the rest.
     """
     if not file.filename or not file.filename.lower().endswith(".csv"):
         raise HTTPException(status_code=400, detail="Only .csv files are accepted.")
@@ -951,6 +1489,7 @@ async def preview_import(
     db.flush()  # get job.id
 
     preview_rows: list[ImportRowResult] = []
+    stored_rows: list[dict] = []
     counts = {"create": 0, "update": 0, "skip": 0, "error": 0}
 
     # Build lookups of existing items by SKU and by id for the current user.
@@ -1001,19 +1540,26 @@ async def preview_import(
                     row_number=row_num, action=action, mapped_data=mapped,
                 )
 
-        preview_rows.append(row_result)
-
-        db.add(InventoryImportRow(
-            job_id=job.id,
-            row_number=row_num,
-            action=action,
-            inventory_item_id=row_result.inventory_item_id,
-            raw_data=dict(raw),
-            mapped_data=mapped or None,
-            error_message=error,
-            match_key=row_result.match_key,
-            match_value=row_result.match_value,
-        ))
+        if len(preview_rows) < PREVIEW_ROWS_PER_PAGE:
+            preview_rows.append(row_result)
+
+        stored_rows.append({
+            "id": uuid4(),
+            "job_id": job.id,
+            "row_number": row_num,
+            "action": action,
+            "inventory_item_id": row_result.inventory_item_id,
+            "raw_data": dict(raw),
+            "mapped_data": mapped or None,
+            "error_message": error,
+            "match_key": row_result.match_key,
+            "match_value": row_result.match_value,
+        })
+        if len(stored_rows) >= PREVIEW_INSERT_BATCH_SIZE:
+            db.execute(insert(InventoryImportRow), stored_rows)
+            stored_rows.clear()
+    if stored_rows:
+        db.execute(insert(InventoryImportRow), stored_rows)
 
     job.status = "previewed"
     job.rows_created = counts["create"]
@@ -1029,6 +1575,7 @@ async def preview_import(
         filename=job.filename,
         detected_mapping=detected_mapping,
         rows=preview_rows,
+        has_more_rows=job.total_rows > len(preview_rows),
         total_rows=job.total_rows,
         rows_to_create=counts["create"],
         rows_to_update=counts["update"],
@@ -1045,10 +1592,10 @@ def commit_import(
 ):
     """Apply a previewed import job.  Only callable once per job.
 
-    Creates or updates InventoryItem records based on the previewed rows.
+    Creates or updates InventoryItem records based on the previewed rows, in
+    checkpointed chunks (services/import_commit.py); calling it again after
+    an interrupted commit resumes where it stopped.
     """
-    from app.services.inventory import restore_stock  # local import to avoid circular
-
     job = db.query(InventoryImportJob).filter(
         InventoryImportJob.id == job_id,
         InventoryImportJob.user_id == current_user.id,
@@ -1061,86 +1608,7 @@ def commit_import(
             detail=f"Job status is '{job.status}'. Only 'previewed' jobs can be committed.",
         )
 
-    import_rows = db.query(InventoryImportRow).filter(
-        InventoryImportRow.job_id == job.id,
-    ).order_by(InventoryImportRow.row_number).all()
-
-    counts = {"create": 0, "update": 0, "skip": 0, "error": 0}
-
-    for row in import_rows:
-        if row.action == "error" or not row.mapped_data:
-            counts["skip"] += 1
-            continue
-
-        mapped = row.mapped_data
-
-        if row.action == "create":
-            item = InventoryItem(
-                user_id=current_user.id,
-                name=mapped.get("name", ""),
-                category=mapped.get("category"),
-                sku=mapped.get("sku"),
-                upc=mapped.get("upc"),
-                size=mapped.get("size"),
-                color=mapped.get("color"),
-                condition=mapped.get("condition"),
-                buy_price=mapped.get("buy_price"),
-                expected_sell_price=mapped.get("expected_sell_price"),
-                actual_sell_price=mapped.get("actual_sell_price"),
-                quantity=int(mapped.get("quantity") or 1),
-                vendor_name=mapped.get("vendor_name"),
-                notes=mapped.get("notes"),
-                platform=mapped.get("platform"),
-                photo_front_url=mapped.get("photo_front_url"),
-                photo_back_url=mapped.get("photo_back_url"),
-                source="spreadsheet",
-                status="in_stock",
-            )
-            db.add(item)
-            counts["create"] += 1
-
-        elif row.action == "update" and row.inventory_item_id:
-            item = db.query(InventoryItem).filter(
-                InventoryItem.id == row.inventory_item_id,
-                InventoryItem.user_id == current_user.id,
-                InventoryItem.deleted_at.is_(None),
-            ).first()
-            if not item:
-                counts["skip"] += 1
-                continue
-
-            # Write a ledger entry for quantity changes
-            new_qty = int(mapped.get("quantity") or item.quantity)
-            delta = new_qty - item.quantity
-            if delta != 0:
-                ledger = InventoryStockLedger(
-                    inventory_item_id=item.id,
-                    user_id=current_user.id,
-                    delta_quantity=delta,
-                    quantity_after=new_qty,
-                    event_type="import_adjust",
-                    source_type="import_job",
-                    source_id=str(job.id),
-                    idempotency_key=f"import:{job.id}:row:{row.row_number}:qty",
-                )
-                db.add(ledger)
-
-            # Apply all mapped fields (skip internal import-only keys)
-            _SKIP_ON_UPDATE = {"_import_id"}
-            for field, value in mapped.items():
-                if field not in _SKIP_ON_UPDATE and hasattr(item, field):
-                    setattr(item, field, value)
-            db.add(item)
-            counts["update"] += 1
-        else:
-            counts["skip"] += 1
-
-    job.status = "committed"
-    job.rows_created = counts["create"]
-    job.rows_updated = counts["update"]
-    job.rows_skipped = counts["skip"]
-    db.add(job)
-    db.commit()
+    counts = commit_preview_job(db, job, current_user.id)
 
     return ImportCommitResponse(
         job_id=job.id,
@@ -1148,21 +1616,74 @@ def commit_import(
         rows_created=counts["create"],
         rows_updated=counts["update"],
         rows_skipped=counts["skip"],
-        rows_errored=counts["error"],
+        rows_errored=0,
     )
 
 
-@router.get("/imports/{job_id}", response_model=ImportJobResponse)
-def get_import_job(
-    job_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    """Get the status and summary of an import job."""
+def _get_import_job(job_id: str, user_id, db: Session) -> InventoryImportJob:
     job = db.query(InventoryImportJob).filter(
         InventoryImportJob.id == job_id,
-        InventoryImportJob.user_id == current_user.id,
+        InventoryImportJob.user_id == user_id,
     ).first()
     if not job:
         raise HTTPException(status_code=404, detail="Import job not found.")
     return job
+
+
+@router.get("/imports/{job_id}", response_model=ImportJobResponse)
+def get_import_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get the status, progress and summary of an import job."""
+    return describe_job(_get_import_job(job_id, current_user.id, db))
+
+
+@router.get("/imports/{job_id}/rows", response_model=ImportRowPage)
+def list_import_rows(
+    job_id: str,
+    page: int = Query(1, ge=1),
+    per_page: int = Query(PREVIEW_ROWS_PER_PAGE, ge=1, le=500),
+    action: Optional[str] = Query(None, pattern="^(create|update|skip|error)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Page through a previewed import's rows in sheet order (optionally one action)."""
+    job = _get_import_job(job_id, current_user.id, db)
+    query = db.query(
+        InventoryImportRow.row_number,
+        InventoryImportRow.action,
+        InventoryImportRow.inventory_item_id,
+        InventoryImportRow.mapped_data,
+        InventoryImportRow.match_key,
+        InventoryImportRow.match_value,
+        InventoryImportRow.error_message,
+    ).filter(InventoryImportRow.job_id == job.id)
+    if action:
+        query = query.filter(InventoryImportRow.action == action)
+    total = query.count()
+    rows = query.order_by(InventoryImportRow.row_number).offset((page - 1) * per_page).limit(per_page).all()
+    return ImportRowPage(
+        items=[ImportRowResult(**row._mapping) for row in rows],
+        total=total,
+        page=page,
+        per_page=per_page,
+        pages=math.ceil(total / per_page) if total else 0,
+    )
+
+
+@router.get("/imports/{job_id}/events")
+def stream_import_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Server-sent events: a `progress` event (the job, as GET /imports/{job_id})
+    whenever it changes, until the job finishes."""
+    job = _get_import_job(job_id, current_user.id, db)
+    return StreamingResponse(
+        job_event_stream(job.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
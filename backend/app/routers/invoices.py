@@ -8,10 +8,11 @@ Endpoints:
     POST   /api/v1/invoices/{id}/pay   — Create Stripe PaymentIntent (Pro only)
 """
 import base64
+from datetime import datetime, timezone
 from decimal import Decimal
 from math import ceil
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
@@ -28,6 +29,8 @@ from app.schemas.invoice import (
     InvoiceItemResponse,
     InvoiceStatusUpdate,
 )
+from app.services import change_versions
+from app.services.conditional import conditional_response, make_validator
 from app.services.invoice import (
     calculate_invoice_totals,
     check_invoice_item_availability,
@@ -131,6 +134,8 @@ def create_invoice(
 
 @router.get("", response_model=InvoiceListResponse)
 def list_invoices(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
     status_filter: str = Query(None, alias="status"),
@@ -138,7 +143,21 @@ def list_invoices(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """List user's invoices with optional status filter."""
+    """List user's invoices with optional status filter.
+
+    Answers 304 while the user's invoices are unchanged (If-None-Match).
+    Line items are only edited through update_invoice, which also writes
+    the invoice, so the invoices change version covers them.
+    """
+    validator = make_validator(
+        current_user.id,
+        request.url,
+        *change_versions.current(db, current_user.id, change_versions.INVOICES),
+    )
+    not_modified = conditional_response(request, response, validator)
+    if not_modified:
+        return not_modified
+
     query = db.query(Invoice).filter(Invoice.user_id == current_user.id)
     if status_filter:
         query = query.filter(Invoice.status == status_filter)
@@ -228,6 +247,10 @@ def update_invoice(
     invoice.discount = payload.discount
     invoice.total = totals["total"]
     invoice.notes = payload.notes
+    # Line items are replaced with a bulk Query.delete() the flush hook cannot
+    # see; touching updated_at marks the invoice dirty, so the write still
+    # bumps the invoices change version even when the totals do not change.
+    invoice.updated_at = datetime.now(timezone.utc)
 
     db.query(InvoiceItem).filter(InvoiceItem.invoice_id == invoice.id).delete()
 
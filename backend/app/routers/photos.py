@@ -0,0 +1,115 @@
+"""Photo router — serves content-addressed photo bytes.
+
+Endpoints:
+    GET /api/v1/photos/{hash}             — photo bytes by SHA-256 (no auth required)
+    GET /api/v1/photos/{hash}?size=list   — thumb | list | detail rendition
+
+The 256-bit content hash is the capability: URLs are only handed out on
+items and profiles the caller can already see. Content never changes for a
+hash, so responses carry a strong ETag and are cacheable forever. Sized
+requests serve WebP to clients that accept it and progressive JPEG to the
+rest (Vary: Accept); the ETag is always the digest of the bytes served.
+"""
+import re
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.services.conditional import etag_matches
+from app.services.photo_renditions import RENDITION_PATTERN, resolve_rendition
+from app.services.photo_store import get_photo_store, is_photo_digest, sniff_content_type
+
+router = APIRouter(prefix="/photos", tags=["photos"])
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """Return an inclusive (start, end) for a single `bytes=` range.
+
+    None means "serve the whole photo" (unsupported multi-range); an
+    unsatisfiable range raises 416.
+    """
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the final N bytes.
+        length = int(last)
+        if length == 0:
+            raise _unsatisfiable(size)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise _unsatisfiable(size)
+    return start, end
+
+
+def _unsatisfiable(size: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+        detail="Requested range not satisfiable.",
+        headers={"Content-Range": f"bytes */{size}"},
+    )
+
+
+@router.get("/{digest}", name="get_photo")
+def get_photo(
+    digest: str,
+    request: Request,
+    size: Optional[str] = Query(None, pattern=RENDITION_PATTERN, description="thumb | list | detail"),
+    db: Session = Depends(get_db),
+):
+    """Serve a stored photo with ETag/304 and single-range (206) support."""
+    store = get_photo_store()
+    if not is_photo_digest(digest) or store.size(digest) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found.")
+
+    headers = {
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+    if size:
+        accept_webp = "image/webp" in request.headers.get("accept", "")
+        digest = resolve_rendition(db, digest, size, accept_webp)
+        headers["Vary"] = "Accept"
+    byte_size = store.size(digest)
+    if byte_size is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found.")
+
+    etag = f'"{digest}"'
+    headers["ETag"] = etag
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    byte_range = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        byte_range = _parse_range(range_header, byte_size)
+
+    if byte_range is None:
+        content = store.read(digest)
+        if content is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found.")
+        return Response(content=content, media_type=sniff_content_type(content[:16]), headers=headers)
+
+    start, end = byte_range
+    content = store.read(digest, start, end)
+    head = store.read(digest, 0, 15) if start else content
+    if content is None or head is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found.")
+    headers["Content-Range"] = f"bytes {start}-{end}/{byte_size}"
+    return Response(
+        content=content,
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=sniff_content_type(head[:16]),
+        headers=headers,
+    )
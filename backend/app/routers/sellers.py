@@ -5,14 +5,16 @@ Endpoints:
 """
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session, load_only
 from sqlalchemy import func
 
 from app.database import get_db
 from app.models.user import User
 from app.models.inventory import InventoryItem
 from app.models.transaction import Transaction
+from app.services import change_versions
+from app.services.conditional import PUBLIC_REVALIDATE, conditional_response, make_validator
 
 router = APIRouter(prefix="/sellers", tags=["sellers"])
 
@@ -20,12 +22,15 @@ router = APIRouter(prefix="/sellers", tags=["sellers"])
 @router.get("/{user_id}")
 def get_public_seller_profile(
     user_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
 ):
     """Get public seller profile. Only available for Partner users.
 
     No auth required — this is a public-facing page.
     Per RISK_REGISTER.md: Never imply financial guarantees.
+    Answers 304 while the profile, items and transactions are unchanged.
     """
     user = db.query(User).filter(
         User.id == user_id,
@@ -41,6 +46,15 @@ def get_public_seller_profile(
             detail="This seller does not have a public profile.",
         )
 
+    validator = make_validator(
+        user.id,
+        user.updated_at,
+        *change_versions.current(db, user.id, change_versions.INVENTORY, change_versions.TRANSACTIONS),
+    )
+    not_modified = conditional_response(request, response, validator, cache_control=PUBLIC_REVALIDATE)
+    if not_modified:
+        return not_modified
+
     # Gather public stats
     total_items = db.query(func.count(InventoryItem.id)).filter(
         InventoryItem.user_id == user.id,
@@ -59,8 +73,17 @@ def get_public_seller_profile(
         Transaction.is_refund == False,
     ).scalar() or 0
 
-    # Active listings for public display
-    active_items = db.query(InventoryItem).filter(
+    # Active listings for public display — only the columns rendered below,
+    # so photo blobs and custom attributes are never loaded.
+    active_items = db.query(InventoryItem).options(load_only(
+        InventoryItem.name,
+        InventoryItem.category,
+        InventoryItem.size,
+        InventoryItem.color,
+        InventoryItem.condition,
+        InventoryItem.expected_sell_price,
+        InventoryItem.status,
+    )).filter(
         InventoryItem.user_id == user.id,
         InventoryItem.status.in_(["in_stock", "listed"]),
         InventoryItem.deleted_at.is_(None),
@@ -0,0 +1,44 @@
+"""Export job schemas — POST /export/jobs and GET /export/jobs/{job_id}."""
+from datetime import datetime
+from typing import Literal, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, model_validator
+
+
+class ExportJobCreate(BaseModel):
+    """Queue an export; the same options as GET /export/inventory and /export/transactions."""
+    dataset: Literal["inventory", "transactions"] = "inventory"
+    template: Literal["canonical", "warehouse"] = "canonical"
+    format: Literal["csv", "xlsx"] = "csv"
+
+    @model_validator(mode="after")
+    def check_combination(self):
+        if self.dataset == "transactions" and (self.template, self.format) != ("canonical", "csv"):
+            raise ValueError("Transactions export only as a canonical CSV")
+        if self.format == "xlsx" and self.template != "canonical":
+            raise ValueError("The warehouse template is CSV only")
+        return self
+
+
+class ExportJobResponse(BaseModel):
+    """Status of an export job; download_url is set once the file is ready."""
+    id: UUID
+    dataset: str
+    template: str
+    format: str
+    status: str                     # queued | running | completed | failed | expired
+    filename: str
+    total_rows: int
+    rows_processed: int = 0
+    progress: float = 0.0           # 0–1
+    artifact_size: Optional[int] = None
+    download_url: Optional[str] = None
+    expires_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error_message: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
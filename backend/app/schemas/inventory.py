@@ -24,6 +24,8 @@ class InventoryImportRequest(BaseModel):
     url: str = Field(..., max_length=2048)
     dry_run: bool = False
     source_name: str | None = Field(None, max_length=100)
+    # Queue the import as a job and answer 202 instead of importing inline.
+    background: bool = False
 
 
 class InventoryImportIssue(BaseModel):
@@ -41,6 +43,8 @@ class InventoryImportResult(BaseModel):
     errors: list[InventoryImportIssue]
     warnings: list[InventoryImportIssue]
     sample_items: list[dict[str, Any]]
+    # Linked-sheet syncs: rows identical to the last applied version, not re-applied.
+    unchanged: int = 0
 
 
 VALID_STATUSES = ["in_stock", "listed", "sold", "shipped", "paid", "archived"]
@@ -67,6 +71,16 @@ class ItemCreate(BaseModel):
     notes: str | None = None
 
 
+class BulkCreateRequest(BaseModel):
+    # Matches inventory_bulk.BULK_MAX_ITEMS; rejects an oversized body before validating every item.
+    items: list[ItemCreate] = Field(max_length=1000)
+
+
+class BulkCreateResponse(BaseModel):
+    created: int
+    ids: list[UUID]  # same order as the request items
+
+
 class ItemUpdate(BaseModel):
     name: str | None = Field(None, max_length=255)
     category: str | None = Field(None, max_length=100)
@@ -122,12 +136,70 @@ class ItemResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
-class PaginatedItems(BaseModel):
-    items: list[ItemResponse]
+class ItemSummary(BaseModel):
+    """Slim list row for GET /inventory?view=summary.
+
+    Photo fields carry a URL, never an inline base64 blob: remote URLs pass
+    through and stored photos point at GET /inventory/{id}/photos/{side}.
+    """
+    id: UUID
+    name: str
+    category: str | None = None
+    sku: str | None = None
+    upc: str | None = None
+    size: str | None = None
+    color: str | None = None
+    condition: str | None = None
+    status: str
+    quantity: int = 1
+    buy_price: Decimal | None = None
+    expected_sell_price: Decimal | None = None
+    actual_sell_price: Decimal | None = None
+    platform: str | None = None
+    source: str | None = None
+    photo_front_url: str | None = None
+    photo_back_url: str | None = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class FacetBucket(BaseModel):
+    value: str | None   # None = items with no value for this facet
+    count: int
+
+
+class InventoryFacets(BaseModel):
+    """GET /inventory/facets — filter-chip counts over the filtered items."""
+    facets: dict[str, list[FacetBucket]]  # status, category, source, platform, condition
     total: int
-    page: int
+
+
+class PaginatedItems(BaseModel):
+    # Full rows by default; view=summary / fields= return projected dicts.
+    items: list[ItemResponse] | list[dict[str, Any]]
+    total: int | None          # None when count=none
+    page: int | None           # None in cursor mode
     per_page: int
-    pages: int
+    pages: int | None
+    next_cursor: str | None = None  # pass back as ?cursor= for the next page
+    total_is_estimate: bool = False
+    facets: dict[str, list[FacetBucket]] | None = None  # first page with include_facets=true
+
+
+class ItemTombstone(BaseModel):
+    """A soft-deleted item in the changes feed — drop it from the local copy."""
+    id: UUID
+    deleted_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class InventoryChanges(BaseModel):
+    """GET /inventory/changes — items changed after the `since` token."""
+    items: list[ItemResponse]        # created or updated, oldest change first
+    deleted: list[ItemTombstone]
+    next_token: str                  # pass back as ?since= next time
+    has_more: bool                   # call again right away when true
 
 
 class InventoryActivityEntry(BaseModel):
@@ -145,6 +217,21 @@ class InventoryActivityEntry(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ItemProvenanceEntry(BaseModel):
+    """Source cells of one import that wrote an inventory item."""
+
+    id: UUID
+    inventory_item_id: UUID
+    import_job_id: UUID | None = None
+    source: str
+    row_number: int | None = None
+    source_cells: dict[str, Any]
+    review: dict[str, bool] | None = None
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
 # ─── Import schemas ────────────────────────────────────────────────────
 
 class ImportRowResult(BaseModel):
@@ -161,7 +248,9 @@ class ImportRowResult(BaseModel):
 class ImportJobResponse(BaseModel):
     """Status and summary for a spreadsheet import job."""
     id: UUID
-    status: str                     # pending | previewed | committed | failed
+    # pending | previewed | committed (preview flow); queued | running | completed
+    # (background imports); failed
+    status: str
     filename: Optional[str] = None
     field_mapping: Optional[dict[str, Any]] = None
     total_rows: int
@@ -169,19 +258,52 @@ class ImportJobResponse(BaseModel):
     rows_updated: int
     rows_skipped: int
     rows_errored: int
+    dry_run: bool = False
+    rows_processed: int = 0
+    progress: float = 0.0           # 0–1
+    eta_seconds: Optional[int] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error_message: Optional[str] = None
+    result: Optional[InventoryImportResult] = None
     created_at: datetime
     updated_at: datetime
 
     model_config = {"from_attributes": True}
 
 
+class LinkedSheetCreate(BaseModel):
+    """Link a spreadsheet for scheduled sync (POST /inventory/linked-sheets)."""
+    url: str = Field(..., max_length=2048)
+    sync_interval_minutes: int = Field(60, ge=15, le=1440)
+
+
+class LinkedSheetResponse(BaseModel):
+    """A linked spreadsheet and the outcome of its last sync."""
+    id: UUID
+    url: str
+    sync_interval_minutes: int
+    next_sync_at: datetime
+    # synced | not_modified | unchanged | failed; None until the first sync
+    last_status: Optional[str] = None
+    last_error: Optional[str] = None
+    last_checked_at: Optional[datetime] = None
+    last_synced_at: Optional[datetime] = None
+    last_result: Optional[InventoryImportResult] = None
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
 class ImportPreviewResponse(BaseModel):
     """Response for POST /inventory/imports/preview."""
     job_id: UUID
     status: str
     filename: Optional[str] = None
     detected_mapping: dict[str, str]  # csv_col → canonical_field
+    # First page of rows; GET /inventory/imports/{job_id}/rows pages through all of them.
     rows: list[ImportRowResult]
+    has_more_rows: bool = False
     total_rows: int
     rows_to_create: int
     rows_to_update: int
@@ -189,6 +311,15 @@ class ImportPreviewResponse(BaseModel):
     rows_errored: int
 
 
+class ImportRowPage(BaseModel):
+    """Response for GET /inventory/imports/{job_id}/rows."""
+    items: list[ImportRowResult]
+    total: int
+    page: int
+    per_page: int
+    pages: int
+
+
 class ImportCommitResponse(BaseModel):
     """Response for POST /inventory/imports/{job_id}/commit."""
     job_id: UUID
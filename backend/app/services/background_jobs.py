@@ -0,0 +1,189 @@
+"""Claiming, heartbeats and resumption for background jobs stored as rows.
+
+Background imports (services/import_jobs.py) and export jobs
+(services/export_jobs.py) share this plumbing; the functions take the job
+model, which needs status, attempts, claim_token, started_at, finished_at
+and updated_at columns. Linked sheet syncs (services/linked_sheets.py),
+claimed by their schedule instead, use the sessions, scheduling and
+sweeper from here too.
+
+  - claim_job moves a queued job to running with a conditional UPDATE, so
+    two workers never run the same job, and stores a fresh claim_token.
+  - A running job's updated_at is its heartbeat: heartbeat() refreshes it
+    every HEARTBEAT_SECONDS while the run is alive, and touch_job with
+    every progress report. A running job whose heartbeat is older than
+    STALE_AFTER_SECONDS belonged to a worker that died, and is claimable
+    again (up to MAX_ATTEMPTS runs; the job modules enforce the limit).
+  - A run only writes to its job while the claim_token is still its own:
+    touch_job raises ClaimLost, and finish_job does nothing, once another
+    run has claimed the job.
+  - sweep_forever runs a module's sweep every SWEEP_INTERVAL_SECONDS (the
+    sweepers are started from the app lifespan).
+"""
+import asyncio
+import logging
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Coroutine, Iterator
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, update
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.services.worker_pool import run_in_worker
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+
+STALE_AFTER_SECONDS = 300
+HEARTBEAT_SECONDS = 60
+SWEEP_INTERVAL_SECONDS = 60
+MAX_ATTEMPTS = 3
+
+# Strong references to scheduled runs; asyncio only keeps weak ones.
+_tasks: set[asyncio.Task] = set()
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """A session of its own: jobs outlive the request that queued them."""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def failure_message(exc: Exception, unexpected: str) -> str:
+    """What to record for a run that raised *exc*: an HTTP error's detail, else *unexpected*."""
+    if isinstance(exc, HTTPException):
+        detail = exc.detail
+        if isinstance(detail, dict):
+            return str(detail.get("message") or detail.get("error") or detail)
+        return str(detail)
+    return unexpected
+
+
+class ClaimLost(Exception):
+    """The job was claimed again (this run looked dead); the run must stop."""
+
+
+def claimable(model, at: datetime):
+    """Jobs of *model* a worker may claim at *at*: queued, or running with a stale heartbeat."""
+    return or_(
+        model.status == QUEUED,
+        and_(model.status == RUNNING, model.updated_at < at - timedelta(seconds=STALE_AFTER_SECONDS)),
+    )
+
+
+def claim_job(db: Session, model, job_id, **values):
+    """Atomically move a queued (or abandoned) job to running; None if taken.
+
+    *values* are further columns to reset for the new run.
+    """
+    at = now()
+    claimed = db.execute(
+        update(model)
+        .where(model.id == job_id, claimable(model, at))
+        .values(
+            status=RUNNING,
+            claim_token=uuid.uuid4(),
+            started_at=at,
+            attempts=model.attempts + 1,
+            updated_at=at,
+            **values,
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    if not claimed:
+        return None
+    job = db.get(model, job_id)
+    db.refresh(job)
+    return job
+
+
+def _owned(model, job_id, claim_token):
+    return and_(model.id == job_id, model.claim_token == claim_token)
+
+
+def touch_job(model, job_id, claim_token, **values) -> None:
+    """Write *values* and a fresh heartbeat through a session of its own.
+
+    Raises ClaimLost when another run has claimed the job since.
+    """
+    with session_scope() as db:
+        owned = db.execute(
+            update(model)
+            .where(_owned(model, job_id, claim_token))
+            .values(updated_at=now(), **values)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+    if not owned:
+        raise ClaimLost(job_id)
+
+
+def finish_job(db: Session, model, job_id, claim_token, **values) -> bool:
+    """Record the end of a run, unless another run has claimed the job since."""
+    at = now()
+    finished = db.execute(
+        update(model)
+        .where(_owned(model, job_id, claim_token))
+        .values(finished_at=at, updated_at=at, **values)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return bool(finished)
+
+
+async def heartbeat(model, job_id, claim_token) -> None:
+    """Keep a run's job fresh while it runs, including stretches without progress reports.
+
+    Run it as a task next to the run and cancel it when the run ends; it
+    returns by itself once the claim is lost.
+    """
+    while True:
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        try:
+            await run_in_worker(touch_job, model, job_id, claim_token)
+        except ClaimLost:
+            return
+        except Exception:
+            logger.exception("Heartbeat of %s %s failed", model.__tablename__, job_id)
+
+
+def schedule(run: Coroutine) -> None:
+    """Run *run* on the current event loop without awaiting it."""
+    task = asyncio.create_task(run)
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+def resumable_job_ids(db: Session, model) -> list:
+    """Ids of claimable jobs of *model*, oldest first."""
+    return [
+        job_id
+        for (job_id,) in db.query(model.id)
+        .filter(claimable(model, now()))
+        .order_by(model.created_at)
+        .all()
+    ]
+
+
+async def sweep_forever(sweep: Callable[[], None], description: str) -> None:
+    """Call *sweep* every SWEEP_INTERVAL_SECONDS, forever, logging its failures."""
+    while True:
+        try:
+            sweep()
+        except Exception:
+            logger.exception("%s sweep failed", description)
+        await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
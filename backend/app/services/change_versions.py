@@ -0,0 +1,98 @@
+"""Per-user change versions — the validators behind collection ETags.
+
+Each of a user's collections (inventory, transactions, invoices) has a
+counter in change_versions that goes up by one in the transaction of every
+write to it. Collection endpoints fold the counter into their ETag, which
+costs one primary-key read instead of a scan of the user's rows.
+
+The counter is incremented with an upsert, which takes the row lock until
+the writing transaction ends, so concurrent writers commit strictly
+increasing versions and a response can never be tagged with a version
+that a later-committing write does not move past. Read the version
+*before* the data: a response may then be newer than its tag (the client
+just re-fetches once more), never older.
+
+Inventory rows also carry the version of their last write
+(inventory_items.change_version), the cursor of the changes feed
+(services/inventory_changes.py). Because the counter's row lock is held
+until commit, a transaction that sees version N committed also sees every
+row stamped with a lower version, however long those writes ran.
+
+ORM writes are counted — and inventory rows stamped — automatically by a
+before_flush hook, registered on import (app/database.py imports this
+module). Bulk statements — db.execute(insert(...) / update(...)) — bypass
+the unit of work, so their callers call bump() themselves, before the
+statement, and write the returned version into change_version.
+"""
+from typing import Iterable
+
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.change_version import ChangeVersion
+from app.models.inventory import InventoryItem
+from app.models.invoice import Invoice
+from app.models.transaction import Transaction
+from app.models.user import User
+
+INVENTORY = "inventory"
+TRANSACTIONS = "transactions"
+INVOICES = "invoices"
+
+_SCOPES = {InventoryItem: INVENTORY, Transaction: TRANSACTIONS, Invoice: INVOICES}
+
+_table = ChangeVersion.__table__
+
+
+def _upsert(connection, keys: Iterable[tuple]) -> dict[tuple, int]:
+    """Bump the (user_id, scope) counters in *keys*; returns their new versions by key."""
+    # Sorted, so two transactions bumping the same rows lock them in the same order.
+    rows = [{"user_id": user_id, "scope": scope, "version": 1} for user_id, scope in sorted(set(keys), key=str)]
+    if not rows:
+        return {}
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(_table).values(rows)
+    result = connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=[_table.c.user_id, _table.c.scope],
+            set_={"version": _table.c.version + 1},
+        ).returning(_table.c.user_id, _table.c.scope, _table.c.version)
+    )
+    return {(str(user_id), scope): version for user_id, scope, version in result}
+
+
+def bump(db: Session, user_id, *scopes: str) -> tuple[int, ...]:
+    """Count a write to *scopes* of *user_id* in the current transaction; returns the new versions in order."""
+    versions = _upsert(db.connection(), ((user_id, scope) for scope in scopes))
+    return tuple(versions[(str(user_id), scope)] for scope in scopes)
+
+
+def current(db: Session, user_id, *scopes: str) -> tuple[int, ...]:
+    """The versions of *scopes* for *user_id*, in order (0 before any write)."""
+    versions = dict(
+        db.query(ChangeVersion.scope, ChangeVersion.version)
+        .filter(ChangeVersion.user_id == user_id, ChangeVersion.scope.in_(scopes))
+        .all()
+    )
+    return tuple(versions.get(scope, 0) for scope in scopes)
+
+
+@event.listens_for(Session, "before_flush")
+def _count_flushed_writes(session: Session, flush_context, instances) -> None:
+    deleted_users = {obj.id for obj in session.deleted if isinstance(obj, User)}
+    keys = set()
+    stamped = []
+    for objects, check, stamp in ((session.new, False, True), (session.dirty, True, True), (session.deleted, False, False)):
+        for obj in objects:
+            scope = _SCOPES.get(type(obj))
+            if scope is None or obj.user_id in deleted_users:
+                continue
+            if check and not session.is_modified(obj, include_collections=False):
+                continue
+            keys.add((obj.user_id, scope))
+            if stamp and scope == INVENTORY:
+                stamped.append(obj)
+    versions = _upsert(session.connection(), keys)
+    for item in stamped:
+        item.change_version = versions[(str(item.user_id), INVENTORY)]
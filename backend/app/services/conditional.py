@@ -0,0 +1,91 @@
+"""Conditional GET — ETag / If-None-Match / Last-Modified for read endpoints.
+
+Clients re-fetch the same screens constantly, so read endpoints derive a
+cheap validator *before* doing the expensive work and answer 304 Not
+Modified when the client already holds the current representation:
+
+  single rows  — the row's updated_at (also sent as Last-Modified)
+  collections  — the caller's change version for the collection
+                 (services/change_versions.py), a counter bumped in the
+                 transaction of every write to it
+
+Validators are weak ETags: they identify the data behind a response, not
+its exact bytes. Every part that shapes the body (user, request URL, the
+current UTC day for date-windowed metrics) is folded into the tag.
+"""
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+from app.models.base import as_utc
+
+# Authenticated responses: browsers/apps may keep them, but must revalidate.
+PRIVATE_REVALIDATE = "private, no-cache"
+PUBLIC_REVALIDATE = "public, no-cache"
+
+
+@dataclass(frozen=True)
+class Validator:
+    etag: str
+    last_modified: Optional[datetime] = None
+
+
+def make_validator(*parts: Any, last_modified: Optional[datetime] = None) -> Validator:
+    """Fold *parts* into a weak ETag."""
+    digest = hashlib.sha256("|".join(map(str, parts)).encode()).hexdigest()[:32]
+    return Validator(etag=f'W/"{digest}"', last_modified=last_modified)
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Weak comparison of *etag* against an If-None-Match header."""
+    if not header:
+        return False
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def _not_modified_since(header: Optional[str], last_modified: Optional[datetime]) -> bool:
+    if not header or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have one-second resolution.
+    return as_utc(last_modified).replace(microsecond=0) <= as_utc(since)
+
+
+def is_not_modified(request: Request, validator: Validator) -> bool:
+    """RFC 9110 §13.2.2: If-None-Match wins; If-Modified-Since only without it."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, validator.etag)
+    return _not_modified_since(request.headers.get("if-modified-since"), validator.last_modified)
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    validator: Validator,
+    cache_control: str = PRIVATE_REVALIDATE,
+) -> Optional[Response]:
+    """Return a 304 when the client's copy is current, else stamp *response*.
+
+    Callers return the 304 as-is and otherwise go on to build the body;
+    the validator headers are already set on the injected *response*.
+    """
+    headers = {"ETag": validator.etag, "Cache-Control": cache_control}
+    if validator.last_modified is not None:
+        headers["Last-Modified"] = format_datetime(as_utc(validator.last_modified), usegmt=True)
+    if is_not_modified(request, validator):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
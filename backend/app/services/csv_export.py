@@ -2,11 +2,20 @@
 
 Export columns match the spreadsheet import template so merchants can
 round-trip: export → edit → re-import without column remapping.
+
+Exports are generators of CSV text chunks for StreamingResponse. Rows are
+read as plain column tuples through a server-side cursor (yield_per,
+EXPORT_FETCH_ROWS at a time) and written into a small buffer that is handed
+out every EXPORT_CHUNK_BYTES, so the first bytes go out straight away and
+memory stays flat however large the export is. *progress*, when given, is
+called with the number of records written so far each time a chunk is
+handed out (export jobs report it).
 """
 import csv
 import io
+from typing import Callable, Iterable, Iterator, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session
 
 from app.models.inventory import InventoryItem
 from app.models.transaction import Transaction
@@ -28,8 +37,72 @@ INVENTORY_EXPORT_COLUMNS = [
 WAREHOUSE_PRODUCTS_PER_ROW = 2
 WAREHOUSE_PRODUCT_WIDTH = 4
 
+EXPORT_FETCH_ROWS = 1000
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+Progress = Optional[Callable[[int], None]]
+
+# Item columns the exports read (no ORM objects are built).
+_INVENTORY_COLUMNS = (
+    InventoryItem.id, InventoryItem.name, InventoryItem.category, InventoryItem.sku,
+    InventoryItem.upc, InventoryItem.size, InventoryItem.color, InventoryItem.condition,
+    InventoryItem.quantity, InventoryItem.buy_price, InventoryItem.expected_sell_price,
+    InventoryItem.actual_sell_price, InventoryItem.status, InventoryItem.platform,
+    InventoryItem.vendor_name, InventoryItem.notes, InventoryItem.photo_front_url,
+    InventoryItem.photo_back_url, InventoryItem.custom_attributes, InventoryItem.source,
+    InventoryItem.external_id, InventoryItem.created_at, InventoryItem.updated_at,
+)
+_WAREHOUSE_COLUMNS = (
+    InventoryItem.name, InventoryItem.size, InventoryItem.quantity,
+    InventoryItem.photo_front_url, InventoryItem.custom_attributes,
+)
+_TRANSACTION_COLUMNS = (
+    Transaction.created_at, Transaction.method, Transaction.status, Transaction.gross_amount,
+    Transaction.fee_amount, Transaction.net_amount, Transaction.quantity, Transaction.is_refund,
+    Transaction.invoice_id, Transaction.item_id, Transaction.notes,
+)
+
+
+class _ChunkedCSV:
+    """csv.writer over a buffer that is handed out and emptied chunk by chunk."""
+
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def writerow(self, row: Iterable) -> None:
+        self._writer.writerow(row)
+
+    @property
+    def full(self) -> bool:
+        return self._buffer.tell() >= EXPORT_CHUNK_BYTES
+
+    def drain(self, progress: Progress = None, written: int = 0) -> str:
+        if progress:
+            progress(written)
+        chunk = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return chunk
+
+
+def _streamed(query: Query) -> Query:
+    """Iterate *query* through a server-side cursor, EXPORT_FETCH_ROWS at a time."""
+    return query.yield_per(EXPORT_FETCH_ROWS)
+
+
+def _active_items(db: Session, user_id, columns) -> Query:
+    return _streamed(
+        db.query(*columns)
+        .filter(
+            InventoryItem.user_id == user_id,
+            InventoryItem.deleted_at.is_(None),
+        )
+        .order_by(InventoryItem.created_at.desc())
+    )
 
-def _resolved_photo(item: InventoryItem, key: str) -> str:
+
+def _resolved_photo(item, key: str) -> str:
     """Prefer dedicated photo columns, fallback to legacy custom_attributes storage."""
     direct_value = getattr(item, f"{key}_url", None)
     if direct_value:
@@ -47,7 +120,7 @@ def _image_formula(url: str) -> str:
     return f'=IMAGE("{escaped}")'
 
 
-def _size_breakdown(item: InventoryItem) -> str:
+def _size_breakdown(item) -> str:
     attrs = item.custom_attributes or {}
     variants = attrs.get("variants")
     if isinstance(variants, list) and variants:
@@ -72,7 +145,7 @@ def _size_breakdown(item: InventoryItem) -> str:
     return ""
 
 
-def _variant_rows(item: InventoryItem) -> list[tuple[str, int]]:
+def _variant_rows(item) -> list[tuple[str, int]]:
     attrs = item.custom_attributes or {}
     variants = attrs.get("variants")
     rows: list[tuple[str, int]] = []
@@ -93,31 +166,19 @@ def _variant_rows(item: InventoryItem) -> list[tuple[str, int]]:
     return [(item.size or "OS", max(0, int(item.quantity or 0)))]
 
 
-def export_inventory_csv(db: Session, user_id) -> str:
+def export_inventory_csv(db: Session, user_id, progress: Progress = None) -> Iterator[str]:
     """Export all active inventory items as a canonical worksheet CSV.
 
     The header row matches the import template so the file can be
     edited and re-imported without remapping columns.
     """
-    items = (
-        db.query(InventoryItem)
-        .filter(
-            InventoryItem.user_id == user_id,
-            InventoryItem.deleted_at.is_(None),
-        )
-        .order_by(InventoryItem.created_at.desc())
-        .all()
-    )
+    output = _ChunkedCSV()
+    output.writerow(INVENTORY_EXPORT_COLUMNS)
 
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    writer.writerow(INVENTORY_EXPORT_COLUMNS)
-
-    for item in items:
+    for written, item in enumerate(_active_items(db, user_id, _INVENTORY_COLUMNS), start=1):
         photo_front_url = _resolved_photo(item, "photo_front")
         photo_back_url = _resolved_photo(item, "photo_back")
-        writer.writerow([
+        output.writerow([
             str(item.id),
             item.name,
             item.category or "",
@@ -144,98 +205,98 @@ def export_inventory_csv(db: Session, user_id) -> str:
             item.created_at.isoformat() if item.created_at else "",
             item.updated_at.isoformat() if item.updated_at else "",
         ])
+        if output.full:
+            yield output.drain(progress, written)
 
-    return output.getvalue()
-
-
-def export_inventory_warehouse_csv(db: Session, user_id) -> str:
-    """Export inventory in the warehouse Size/QTY matrix layout.
+    yield output.drain()
 
-    This mirrors the reseller worksheet shape the importer understands: product
-    name above a compact Size/QTY grid, with products arranged side-by-side.
-    """
-    items = (
-        db.query(InventoryItem)
-        .filter(
-            InventoryItem.user_id == user_id,
-            InventoryItem.deleted_at.is_(None),
-        )
-        .order_by(InventoryItem.created_at.desc())
-        .all()
-    )
 
-    output = io.StringIO()
-    writer = csv.writer(output)
+def _write_warehouse_group(output: _ChunkedCSV, group: list) -> None:
+    variant_cache = [_variant_rows(item) for item in group]
+    max_variants = max(len(variants) for variants in variant_cache)
+    row_width = WAREHOUSE_PRODUCTS_PER_ROW * WAREHOUSE_PRODUCT_WIDTH - 1
 
-    if not items:
-        writer.writerow(["Product Name", "", "", "", "Product Name", "", ""])
-        writer.writerow(["Size", "QTY", "", "", "Size", "QTY", ""])
-        return output.getvalue()
+    title_row = [""] * row_width
+    header_row = [""] * row_width
 
-    for group_start in range(0, len(items), WAREHOUSE_PRODUCTS_PER_ROW):
-        group = items[group_start:group_start + WAREHOUSE_PRODUCTS_PER_ROW]
-        max_variants = max(len(_variant_rows(item)) for item in group)
-        row_width = WAREHOUSE_PRODUCTS_PER_ROW * WAREHOUSE_PRODUCT_WIDTH - 1
+    for idx, item in enumerate(group):
+        col = idx * WAREHOUSE_PRODUCT_WIDTH
+        title_row[col] = item.name
+        header_row[col] = "Size"
+        header_row[col + 1] = "QTY"
 
-        title_row = [""] * row_width
-        header_row = [""] * row_width
+    output.writerow(title_row)
+    output.writerow(header_row)
 
-        for idx, item in enumerate(group):
-            col = idx * WAREHOUSE_PRODUCT_WIDTH
-            title_row[col] = item.name
-            header_row[col] = "Size"
-            header_row[col + 1] = "QTY"
-
-        writer.writerow(title_row)
-        writer.writerow(header_row)
-
-        variant_cache = [_variant_rows(item) for item in group]
-        for row_idx in range(max_variants):
-            row = [""] * row_width
-            for idx, variants in enumerate(variant_cache):
-                if row_idx >= len(variants):
-                    continue
-                col = idx * WAREHOUSE_PRODUCT_WIDTH
-                size, quantity = variants[row_idx]
-                row[col] = size
-                row[col + 1] = quantity
-            writer.writerow(row)
-
-        image_row = [""] * row_width
-        for idx, item in enumerate(group):
-            photo_front_url = _resolved_photo(item, "photo_front")
-            if not photo_front_url:
+    for row_idx in range(max_variants):
+        row = [""] * row_width
+        for idx, variants in enumerate(variant_cache):
+            if row_idx >= len(variants):
                 continue
             col = idx * WAREHOUSE_PRODUCT_WIDTH
-            image_row[col] = "Image URL"
-            image_row[col + 1] = photo_front_url
-        if any(image_row):
-            writer.writerow(image_row)
+            size, quantity = variants[row_idx]
+            row[col] = size
+            row[col + 1] = quantity
+        output.writerow(row)
 
-        writer.writerow([])
+    image_row = [""] * row_width
+    for idx, item in enumerate(group):
+        photo_front_url = _resolved_photo(item, "photo_front")
+        if not photo_front_url:
+            continue
+        col = idx * WAREHOUSE_PRODUCT_WIDTH
+        image_row[col] = "Image URL"
+        image_row[col + 1] = photo_front_url
+    if any(image_row):
+        output.writerow(image_row)
 
-    return output.getvalue()
+    output.writerow([])
 
 
-def export_transactions_csv(db: Session, user_id) -> str:
-    """Export all transactions as CSV string."""
-    txns = (
-        db.query(Transaction)
+def export_inventory_warehouse_csv(db: Session, user_id, progress: Progress = None) -> Iterator[str]:
+    """Export inventory in the warehouse Size/QTY matrix layout.
+
+    This mirrors the reseller worksheet shape the importer understands: product
+    name above a compact Size/QTY grid, with products arranged side-by-side.
+    """
+    output = _ChunkedCSV()
+    group: list = []
+    exported = False
+
+    for written, item in enumerate(_active_items(db, user_id, _WAREHOUSE_COLUMNS), start=1):
+        group.append(item)
+        if len(group) < WAREHOUSE_PRODUCTS_PER_ROW:
+            continue
+        _write_warehouse_group(output, group)
+        group = []
+        exported = True
+        if output.full:
+            yield output.drain(progress, written)
+
+    if group:
+        _write_warehouse_group(output, group)
+    elif not exported:
+        output.writerow(["Product Name", "", "", "", "Product Name", "", ""])
+        output.writerow(["Size", "QTY", "", "", "Size", "QTY", ""])
+    yield output.drain()
+
+
+def export_transactions_csv(db: Session, user_id, progress: Progress = None) -> Iterator[str]:
+    """Export all transactions as CSV."""
+    txns = _streamed(
+        db.query(*_TRANSACTION_COLUMNS)
         .filter(Transaction.user_id == user_id)
         .order_by(Transaction.created_at.desc())
-        .all()
     )
 
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    writer.writerow([
+    output = _ChunkedCSV()
+    output.writerow([
         "Date", "Method", "Status", "Gross Amount", "Fee",
         "Net Amount", "Quantity", "Is Refund", "Invoice ID", "Item ID", "Notes",
     ])
 
-    for txn in txns:
-        writer.writerow([
+    for written, txn in enumerate(txns, start=1):
+        output.writerow([
             txn.created_at.isoformat() if txn.created_at else "",
             txn.method,
             txn.status,
@@ -248,5 +309,7 @@ def export_transactions_csv(db: Session, user_id) -> str:
             str(txn.item_id) if txn.item_id else "",
             txn.notes or "",
         ])
+        if output.full:
+            yield output.drain(progress, written)
 
-    return output.getvalue()
+    yield output.drain()
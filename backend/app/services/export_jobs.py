@@ -0,0 +1,253 @@
+"""Export jobs — POST /export/jobs and the artifact download.
+
+An XLSX export with thousands of photos can take minutes, too long for one
+request. An export job builds the file off the request path instead:
+
+  queued ─▶ running ─▶ completed ─▶ expired
+                    └▶ failed
+
+The request only records the job and answers 202; run_export_job writes the
+file (the same CSV / XLSX exporters as GET /export/*) under
+EXPORT_ARTIFACT_DIR and reports rows_processed as it goes. The finished
+file stays downloadable, with Range support, for
+EXPORT_ARTIFACT_TTL_SECONDS; the sweeper (started from the app lifespan)
+then deletes it and marks the job expired.
+
+Each job carries a source_version: a digest of the request and the
+seller's change version of the exported collection
+(services/change_versions.py). Asking for the same export again while that
+version is unchanged returns the queued, running or completed job instead
+of building the file again.
+
+Claiming, heartbeats and resuming the jobs of a dead worker are shared
+with background imports (services/background_jobs.py); a run that was
+taken for dead and claimed again gets ClaimLost at its next progress
+report and leaves the job alone.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.base import as_utc
+from app.models.export import ExportJob
+from app.models.inventory import InventoryItem
+from app.models.transaction import Transaction
+from app.schemas.export import ExportJobCreate, ExportJobResponse
+from app.services import background_jobs, change_versions
+from app.services.background_jobs import MAX_ATTEMPTS, QUEUED, RUNNING, ClaimLost
+from app.services.csv_export import export_inventory_csv, export_inventory_warehouse_csv, export_transactions_csv
+from app.services.worker_pool import run_in_worker
+from app.services.xlsx_export import export_inventory_xlsx
+
+logger = logging.getLogger(__name__)
+
+COMPLETED = "completed"
+FAILED = "failed"
+EXPIRED = "expired"
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def export_filename(request: ExportJobCreate) -> str:
+    """The download name GET /export/* uses for the same export."""
+    if request.dataset == "transactions":
+        return "vendora_transactions.csv"
+    if request.template == "warehouse":
+        return "vendora_inventory_warehouse.csv"
+    return f"vendora_inventory.{request.format}"
+
+
+def _source_model(dataset: str):
+    return Transaction if dataset == "transactions" else InventoryItem
+
+
+def source_version(db: Session, user_id, request: ExportJobCreate) -> str:
+    """Digest of *request* and the current change version of its collection."""
+    scope = change_versions.TRANSACTIONS if request.dataset == "transactions" else change_versions.INVENTORY
+    (version,) = change_versions.current(db, user_id, scope)
+    parts = (user_id, request.dataset, request.template, request.format, version)
+    return hashlib.sha256("|".join(map(str, parts)).encode()).hexdigest()
+
+
+def find_reusable_job(db: Session, user_id, version: str) -> Optional[ExportJob]:
+    """A live job for the same export of unchanged data, if there is one."""
+    jobs = (
+        db.query(ExportJob)
+        .filter(
+            ExportJob.user_id == user_id,
+            ExportJob.source_version == version,
+            ExportJob.status.in_((QUEUED, RUNNING, COMPLETED)),
+        )
+        .order_by(ExportJob.created_at.desc())
+        .all()
+    )
+    for job in jobs:
+        if job.status != COMPLETED or artifact_available(job):
+            return job
+    return None
+
+
+def artifact_available(job: ExportJob, now: Optional[datetime] = None) -> bool:
+    return (
+        job.status == COMPLETED
+        and job.artifact_path is not None
+        and as_utc(job.expires_at) > (now or background_jobs.now())
+        and os.path.exists(job.artifact_path)
+    )
+
+
+def describe_job(job: ExportJob) -> ExportJobResponse:
+    """API view of a job, with progress (0–1) and the download URL once ready."""
+    response = ExportJobResponse.model_validate(job)
+    if job.status == COMPLETED:
+        response.progress = 1.0
+        response.download_url = f"/api/v1/export/jobs/{job.id}/download"
+    elif job.total_rows:
+        response.progress = min(job.rows_processed / job.total_rows, 1.0)
+    return response
+
+
+class ExportProgress:
+    """Progress callback handed to the exporter; writes through a session of its own.
+
+    Raises ClaimLost once another run has claimed the job.
+    """
+
+    def __init__(self, job_id, claim_token):
+        self.job_id = job_id
+        self.claim_token = claim_token
+
+    def __call__(self, rows_processed: int) -> None:
+        background_jobs.touch_job(ExportJob, self.job_id, self.claim_token, rows_processed=rows_processed)
+
+
+def _row_count(db: Session, job: ExportJob) -> int:
+    model = _source_model(job.dataset)
+    query = db.query(func.count()).select_from(model).filter(model.user_id == job.user_id)
+    if model is InventoryItem:
+        query = query.filter(InventoryItem.deleted_at.is_(None))
+    return query.scalar()
+
+
+def build_artifact(db: Session, job: ExportJob, progress: ExportProgress) -> tuple[str, int]:
+    """Write the job's file under EXPORT_ARTIFACT_DIR; returns (path, size).
+
+    Each attempt writes a file of its own, so a run that was taken for dead
+    never writes over (or deletes) the file of the run that replaced it. A
+    build that fails removes its file.
+    """
+    os.makedirs(settings.EXPORT_ARTIFACT_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=settings.EXPORT_ARTIFACT_DIR, prefix=f"{job.id}-", suffix=f".{job.format}")
+    built = False
+    try:
+        if job.format == "xlsx":
+            with os.fdopen(fd, "wb") as output:
+                export_inventory_xlsx(db, job.user_id, output=output, progress=progress)
+        else:
+            if job.dataset == "transactions":
+                chunks = export_transactions_csv(db, job.user_id, progress)
+            elif job.template == "warehouse":
+                chunks = export_inventory_warehouse_csv(db, job.user_id, progress)
+            else:
+                chunks = export_inventory_csv(db, job.user_id, progress)
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as output:
+                output.writelines(chunks)
+        built = True
+    finally:
+        if not built:
+            os.unlink(path)
+    return path, os.path.getsize(path)
+
+
+def claim_job(db: Session, job_id) -> Optional[ExportJob]:
+    """Atomically move a queued (or abandoned) job to running; None if taken."""
+    return background_jobs.claim_job(db, ExportJob, job_id, rows_processed=0)
+
+
+async def run_export_job(job_id) -> None:
+    """Claim *job_id* and build its file, recording completion or failure."""
+    with background_jobs.session_scope() as db:
+        job = claim_job(db, job_id)
+        if job is None:
+            return
+        claim_token = job.claim_token
+        if job.attempts > MAX_ATTEMPTS:
+            background_jobs.finish_job(
+                db, ExportJob, job_id, claim_token,
+                status=FAILED, error_message="Export stopped after repeated interruptions.",
+            )
+            return
+        heartbeat = asyncio.create_task(background_jobs.heartbeat(ExportJob, job_id, claim_token))
+        try:
+            total_rows = _row_count(db, job)
+            background_jobs.touch_job(ExportJob, job_id, claim_token, total_rows=total_rows)
+            path, size = await run_in_worker(build_artifact, db, job, ExportProgress(job_id, claim_token))
+        except ClaimLost:
+            logger.warning("Export job %s was claimed by another run; stopping", job_id)
+            db.rollback()
+            return
+        except Exception:
+            logger.exception("Export job %s failed", job_id)
+            db.rollback()
+            background_jobs.finish_job(
+                db, ExportJob, job_id, claim_token, status=FAILED, error_message="Export failed unexpectedly.",
+            )
+            return
+        finally:
+            heartbeat.cancel()
+        finished = background_jobs.finish_job(
+            db, ExportJob, job_id, claim_token,
+            status=COMPLETED,
+            rows_processed=total_rows,
+            artifact_path=path,
+            artifact_size=size,
+            expires_at=background_jobs.now() + timedelta(seconds=settings.EXPORT_ARTIFACT_TTL_SECONDS),
+        )
+        if not finished:
+            os.unlink(path)  # the job belongs to another run now, and so does its file
+
+
+def schedule_export_job(job_id) -> None:
+    """Run a job on the current event loop without awaiting it."""
+    background_jobs.schedule(run_export_job(job_id))
+
+
+def resumable_job_ids(db: Session) -> list:
+    return background_jobs.resumable_job_ids(db, ExportJob)
+
+
+def expire_artifacts(db: Session) -> int:
+    """Delete the files of completed jobs past expires_at; returns how many jobs expired."""
+    jobs = db.query(ExportJob).filter(ExportJob.status == COMPLETED, ExportJob.expires_at <= background_jobs.now()).all()
+    for job in jobs:
+        try:
+            os.unlink(job.artifact_path)
+        except FileNotFoundError:
+            pass
+        job.status = EXPIRED
+        job.artifact_path = None
+    db.commit()
+    return len(jobs)
+
+
+async def sweep_export_jobs() -> None:
+    """Resume abandoned export jobs and delete expired artifacts, forever."""
+    def sweep() -> None:
+        with background_jobs.session_scope() as db:
+            expire_artifacts(db)
+            job_ids = resumable_job_ids(db)
+        for job_id in job_ids:
+            schedule_export_job(job_id)
+
+    await background_jobs.sweep_forever(sweep, "Export job")
@@ -0,0 +1,211 @@
+"""Preview import commit — POST /inventory/imports/{job_id}/commit.
+
+A previewed job's rows are applied in row_number order, COMMIT_CHUNK_ROWS
+rows per transaction:
+
+1. The chunk's rows are read, and the items they update are loaded with one
+   SELECT (id and quantity only).
+2. New items go out as one executemany INSERT (multi-row INSERT ... VALUES)
+   and updates as one executemany UPDATE by primary key, which the psycopg2
+   executemany mode (app/database.py) sends in pages rather than a round
+   trip per row. Quantity changes become InventoryStockLedger rows and each
+   applied row's CSV cells an InventoryItemProvenance row, each kind
+   inserted in one statement.
+3. The job's checkpoint moves forward in the same transaction: rows_processed
+   holds the row_number of the last applied row, next to the running counts.
+
+A commit that dies between chunks leaves the job 'previewed' with its
+checkpoint, and committing it again resumes after the last applied chunk.
+The checkpoint is advanced with a conditional UPDATE, so a second commit of
+the same job running at the same time stops with a 409 instead of applying
+rows twice.
+"""
+from typing import Any
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from app.models.inventory import (
+    InventoryImportJob,
+    InventoryImportRow,
+    InventoryItem,
+    InventoryItemProvenance,
+    InventoryStockLedger,
+)
+from app.services import change_versions
+
+COMMIT_CHUNK_ROWS = 1000
+
+# Mapped fields copied onto new items, besides name and quantity.
+_CREATE_FIELDS = (
+    "category", "sku", "upc", "size", "color", "condition",
+    "buy_price", "expected_sell_price", "actual_sell_price",
+    "vendor_name", "notes", "platform", "photo_front_url", "photo_back_url",
+)
+_ITEM_COLUMNS = frozenset(InventoryItem.__table__.columns.keys()) - {"id"}
+
+
+def _new_item(user_id, mapped: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": uuid4(),
+        "user_id": user_id,
+        "name": mapped.get("name", ""),
+        "quantity": int(mapped.get("quantity") or 1),
+        **{field: mapped.get(field) for field in _CREATE_FIELDS},
+        "source": "spreadsheet",
+        "status": "in_stock",
+    }
+
+
+def _provenance(origin: dict[str, Any], item_id: UUID, row) -> dict[str, Any]:
+    return {
+        "id": uuid4(),
+        "inventory_item_id": item_id,
+        **origin,
+        "row_number": row.row_number,
+        "source_cells": {key: value for key, value in (row.raw_data or {}).items() if value not in (None, "")},
+    }
+
+
+def _chunk_rows(db: Session, job_id, after_row: int) -> list:
+    return (
+        db.query(
+            InventoryImportRow.row_number,
+            InventoryImportRow.action,
+            InventoryImportRow.inventory_item_id,
+            InventoryImportRow.mapped_data,
+            InventoryImportRow.raw_data,
+        )
+        .filter(InventoryImportRow.job_id == job_id, InventoryImportRow.row_number > after_row)
+        .order_by(InventoryImportRow.row_number)
+        .limit(COMMIT_CHUNK_ROWS)
+        .all()
+    )
+
+
+def _active_quantities(db: Session, user_id, item_ids: list[UUID]) -> dict[UUID, int]:
+    if not item_ids:
+        return {}
+    return dict(
+        db.query(InventoryItem.id, InventoryItem.quantity)
+        .filter(
+            InventoryItem.id.in_(item_ids),
+            InventoryItem.user_id == user_id,
+            InventoryItem.deleted_at.is_(None),
+        )
+        .all()
+    )
+
+
+def _advance_checkpoint(db: Session, job_id, after_row: int, **values) -> None:
+    """Move the job's checkpoint from *after_row*; 409 if another commit moved it."""
+    advanced = db.execute(
+        update(InventoryImportJob)
+        .where(
+            InventoryImportJob.id == job_id,
+            InventoryImportJob.status == "previewed",
+            InventoryImportJob.rows_processed == after_row,
+        )
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not advanced:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This import is already being committed.",
+        )
+
+
+def commit_preview_job(db: Session, job: InventoryImportJob, user_id) -> dict[str, int]:
+    """Apply a previewed job's rows (resuming after its checkpoint); returns the counts."""
+    job_id = job.id
+    origin = {"user_id": user_id, "import_job_id": job_id, "source": job.source}
+    after_row = job.rows_processed or 0
+    if after_row:
+        counts = {"create": job.rows_created, "update": job.rows_updated, "skip": job.rows_skipped}
+    else:  # the job still holds the preview's counts
+        counts = {"create": 0, "update": 0, "skip": 0}
+
+    while rows := _chunk_rows(db, job_id, after_row):
+        quantities = _active_quantities(
+            db, user_id,
+            list({row.inventory_item_id for row in rows if row.action == "update" and row.inventory_item_id}),
+        )
+        creates: list[dict[str, Any]] = []
+        updates: dict[UUID, dict[str, Any]] = {}
+        ledger: list[dict[str, Any]] = []
+        provenance: list[dict[str, Any]] = []
+        for row in rows:
+            mapped = row.mapped_data
+            if row.action == "error" or not mapped:
+                counts["skip"] += 1
+            elif row.action == "create":
+                creates.append(_new_item(user_id, mapped))
+                provenance.append(_provenance(origin, creates[-1]["id"], row))
+                counts["create"] += 1
+            elif row.action == "update" and row.inventory_item_id in quantities:
+                item_id = row.inventory_item_id
+                new_qty = int(mapped.get("quantity") or quantities[item_id])
+                delta = new_qty - quantities[item_id]
+                if delta != 0:
+                    ledger.append({
+                        "id": uuid4(),
+                        "inventory_item_id": item_id,
+                        "user_id": user_id,
+                        "delta_quantity": delta,
+                        "quantity_after": new_qty,
+                        "event_type": "import_adjust",
+                        "source_type": "import_job",
+                        "source_id": str(job_id),
+                        "idempotency_key": f"import:{job_id}:row:{row.row_number}:qty",
+                    })
+                quantities[item_id] = new_qty
+                # Later rows for the same item win, as if applied one by one.
+                updates.setdefault(item_id, {}).update(
+                    (field, value) for field, value in mapped.items() if field in _ITEM_COLUMNS
+                )
+                provenance.append(_provenance(origin, item_id, row))
+                counts["update"] += 1
+            else:  # skip rows, and updates of items deleted since the preview
+                counts["skip"] += 1
+
+        last_row = rows[-1].row_number
+        _advance_checkpoint(
+            db, job_id, after_row,
+            rows_processed=last_row,
+            rows_created=counts["create"],
+            rows_updated=counts["update"],
+            rows_skipped=counts["skip"],
+        )
+        if creates or updates:
+            (version,) = change_versions.bump(db, user_id, change_versions.INVENTORY)
+        if creates:
+            db.execute(insert(InventoryItem), [{**values, "change_version": version} for values in creates])
+        if updates:
+            db.execute(
+                update(InventoryItem),
+                [{"id": item_id, **values, "change_version": version} for item_id, values in updates.items()],
+            )
+        if ledger:
+            db.execute(insert(InventoryStockLedger), ledger)
+        if provenance:
+            db.execute(insert(InventoryItemProvenance), provenance)
+        db.commit()
+        after_row = last_row
+
+    # The raw CSV cells live on as item provenance; drop the preview's copy.
+    db.query(InventoryImportRow).filter(InventoryImportRow.job_id == job_id).update(
+        {InventoryImportRow.raw_data: {}}, synchronize_session=False,
+    )
+    _advance_checkpoint(
+        db, job_id, after_row,
+        status="committed",
+        rows_created=counts["create"],
+        rows_updated=counts["update"],
+        rows_skipped=counts["skip"],
+    )
+    db.commit()
+    return counts
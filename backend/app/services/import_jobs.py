@@ -0,0 +1,206 @@
+"""Background spreadsheet imports — POST /inventory/import{,/file} with background=true.
+
+A background import is an InventoryImportJob row, so it survives restarts:
+
+  queued ─▶ running ─▶ completed
+                    └▶ failed
+
+The request that creates the job only validates the input, stores it (the
+link URL, or the uploaded file under IMPORT_UPLOAD_DIR via store_upload)
+and answers 202 with the job id; downloading, parsing, matching and
+writing happen in run_import_job, off the request path, which deletes the
+uploaded file once the job finishes. Clients poll GET /inventory/imports/{job_id} or follow
+GET /inventory/imports/{job_id}/events (server-sent events) for status,
+rows_processed, progress and an ETA.
+
+Claiming, heartbeats and resuming the jobs of a dead worker are shared
+with export jobs (services/background_jobs.py): the sweeper (started from
+the app lifespan) picks up jobs whose heartbeat went stale, up to
+MAX_ATTEMPTS runs, and a run that was taken for dead and claimed again
+gets ClaimLost at its next progress report — the importer reports once
+more just before it commits, so such a run writes nothing. Re-running is
+safe: rows match existing items by UPC / SKU / spreadsheet row id, so a
+repeat import updates instead of duplicating.
+"""
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from typing import IO, AsyncIterator, Awaitable, Callable, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.base import as_utc
+from app.models.inventory import InventoryImportJob
+from app.schemas.inventory import ImportJobResponse, InventoryImportResult
+from app.services import background_jobs
+from app.services.background_jobs import MAX_ATTEMPTS, QUEUED, RUNNING, ClaimLost
+from app.services.worker_pool import run_in_worker
+
+logger = logging.getLogger(__name__)
+
+COMPLETED = "completed"
+FAILED = "failed"
+ACTIVE_STATUSES = {QUEUED, RUNNING}
+
+EVENTS_POLL_SECONDS = 1.0
+EVENTS_MAX_SECONDS = 300  # clients reconnect for longer imports
+
+ImportRunner = Callable[[InventoryImportJob, Session, "JobProgress"], Awaitable[InventoryImportResult]]
+
+
+class JobProgress:
+    """Progress callback handed to the importer.
+
+    Writes the job row through a session of its own, so reporting progress
+    never commits the import's half-written batches. Raises ClaimLost once
+    another run has claimed the job.
+    """
+
+    def __init__(self, job_id, claim_token):
+        self.job_id = job_id
+        self.claim_token = claim_token
+
+    def __call__(self, rows_processed: int, total_rows: int) -> None:
+        background_jobs.touch_job(
+            InventoryImportJob, self.job_id, self.claim_token, rows_processed=rows_processed, total_rows=total_rows,
+        )
+
+
+def describe_job(job: InventoryImportJob, now: Optional[datetime] = None) -> ImportJobResponse:
+    """API view of a job, with progress (0–1) and a linear ETA while running."""
+    response = ImportJobResponse.model_validate(job)
+    if job.status in (COMPLETED, "committed"):
+        response.progress = 1.0
+    elif job.total_rows:
+        response.progress = min(job.rows_processed / job.total_rows, 1.0)
+    started_at = as_utc(job.started_at)
+    if job.status == RUNNING and started_at and job.rows_processed and job.total_rows:
+        elapsed = ((now or background_jobs.now()) - started_at).total_seconds()
+        remaining = max(job.total_rows - job.rows_processed, 0)
+        response.eta_seconds = round(elapsed / job.rows_processed * remaining)
+    return response
+
+
+def claim_job(db: Session, job_id) -> Optional[InventoryImportJob]:
+    """Atomically move a queued (or abandoned) job to running; None if taken."""
+    return background_jobs.claim_job(db, InventoryImportJob, job_id, rows_processed=0)
+
+
+def store_upload(upload: IO[bytes]) -> str:
+    """Copy an uploaded sheet under IMPORT_UPLOAD_DIR, chunk by chunk; returns its path."""
+    os.makedirs(settings.IMPORT_UPLOAD_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=settings.IMPORT_UPLOAD_DIR, prefix="upload-")
+    try:
+        with os.fdopen(fd, "wb") as stored:
+            shutil.copyfileobj(upload, stored)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+def _finish(db: Session, job_id, claim_token, upload_path: Optional[str], **values) -> bool:
+    """Record the end of a run and delete its upload, unless another run has claimed the job since."""
+    finished = background_jobs.finish_job(db, InventoryImportJob, job_id, claim_token, upload_path=None, **values)
+    if finished and upload_path:
+        try:
+            os.unlink(upload_path)
+        except FileNotFoundError:
+            pass
+    return finished
+
+
+async def run_import_job(job_id, importer: ImportRunner) -> None:
+    """Claim *job_id* and run it to completion or failure."""
+    with background_jobs.session_scope() as db:
+        job = claim_job(db, job_id)
+        if job is None:
+            return
+        claim_token, upload_path = job.claim_token, job.upload_path
+        if job.attempts > MAX_ATTEMPTS:
+            _finish(
+                db, job_id, claim_token, upload_path,
+                status=FAILED, error_message="Import stopped after repeated interruptions.",
+            )
+            return
+        heartbeat = asyncio.create_task(background_jobs.heartbeat(InventoryImportJob, job_id, claim_token))
+        try:
+            result = await importer(job, db, JobProgress(job_id, claim_token))
+        except ClaimLost:
+            logger.warning("Background import %s was claimed by another run; stopping", job_id)
+            db.rollback()
+            return
+        except Exception as exc:
+            if not isinstance(exc, HTTPException):
+                logger.exception("Background import %s failed", job_id)
+            db.rollback()
+            _finish(
+                db, job_id, claim_token, upload_path,
+                status=FAILED, error_message=background_jobs.failure_message(exc, "Import failed unexpectedly."),
+            )
+            return
+        finally:
+            heartbeat.cancel()
+        _finish(
+            db,
+            job_id,
+            claim_token,
+            upload_path,
+            status=COMPLETED,
+            total_rows=result.rows_seen,
+            rows_processed=result.rows_seen,
+            rows_created=result.created,
+            rows_updated=result.updated,
+            rows_skipped=result.skipped,
+            rows_errored=len(result.errors),
+            result=result.model_dump(mode="json"),
+        )
+
+
+def schedule_import_job(job_id, importer: ImportRunner) -> None:
+    """Run a job on the current event loop without awaiting it."""
+    background_jobs.schedule(run_import_job(job_id, importer))
+
+
+def resumable_job_ids(db: Session) -> list:
+    return background_jobs.resumable_job_ids(db, InventoryImportJob)
+
+
+async def sweep_import_jobs(importer: ImportRunner) -> None:
+    """Re-queue jobs left behind by a restart or a dead worker, forever."""
+    def sweep() -> None:
+        with background_jobs.session_scope() as db:
+            job_ids = resumable_job_ids(db)
+        for job_id in job_ids:
+            schedule_import_job(job_id, importer)
+
+    await background_jobs.sweep_forever(sweep, "Import job")
+
+
+def _job_snapshot(job_id) -> Optional[ImportJobResponse]:
+    with background_jobs.session_scope() as db:
+        job = db.get(InventoryImportJob, job_id)
+        return describe_job(job) if job else None
+
+
+async def job_event_stream(job_id) -> AsyncIterator[str]:
+    """Server-sent `progress` events for a job until it leaves ACTIVE_STATUSES."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + EVENTS_MAX_SECONDS
+    last = None
+    while True:
+        snapshot = await run_in_worker(_job_snapshot, job_id)
+        if snapshot is None:
+            return
+        data = snapshot.model_dump_json()
+        if data != last:
+            yield f"event: progress\ndata: {data}\n\n"
+            last = data
+        if snapshot.status not in ACTIVE_STATUSES or loop.time() >= deadline:
+            return
+        await asyncio.sleep(EVENTS_POLL_SECONDS)
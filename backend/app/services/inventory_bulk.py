@@ -0,0 +1,200 @@
+"""Set-based bulk mutations — POST /inventory/bulk, /bulk-status and /bulk-delete.
+
+Each mutation is a single UPDATE ... WHERE id = ANY(:ids) ... RETURNING id
+over the caller's active items, however many ids are sent (up to
+BULK_MAX_ITEMS). The state machine is enforced in the WHERE clause: a
+status change only matches rows whose current status may transition to the
+target per VALID_TRANSITIONS, so rows that may not move are never written
+(and their updated_at / ETag / changes-feed position stays put).
+
+Ids the UPDATE did not return are explained afterwards with one SELECT, so
+every requested id gets an outcome:
+
+  updated / deleted   — the row was changed
+  invalid_transition  — the item exists but its status cannot move to the target
+  not_found           — not an id of an active item owned by the caller
+
+Bulk create builds every row up front (ids are generated client-side) and
+sends them as one executemany INSERT, which SQLAlchemy's insertmanyvalues
+turns into multi-row INSERT ... VALUES statements of up to 1000 rows.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException, status
+from sqlalchemy import ColumnElement, any_, bindparam, insert, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+from app.models.inventory import InventoryItem
+from app.schemas.inventory import ItemCreate
+from app.services import change_versions
+from app.services.inventory import ALL_STATUSES, VALID_TRANSITIONS
+from app.services.photo_store import externalize_photo
+
+BULK_MAX_ITEMS = 1000
+
+
+@dataclass
+class BulkResult:
+    id: str
+    outcome: str
+    status: Optional[str] = None
+    allowed_transitions: list[str] = field(default_factory=list)
+
+
+def source_statuses(target_status: str) -> list[str]:
+    """Statuses that VALID_TRANSITIONS allows to move to *target_status*."""
+    return [current for current, targets in VALID_TRANSITIONS.items() if target_status in targets]
+
+
+def _normalize(raw) -> str:
+    text = str(raw).strip()
+    try:
+        return str(UUID(text))
+    except ValueError:
+        return text
+
+
+def check_batch_size(size: int, field_name: str) -> None:
+    if not size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{field_name} is required")
+    if size > BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "too_many_items",
+                "message": f"Send at most {BULK_MAX_ITEMS} items per request.",
+                "max_items": BULK_MAX_ITEMS,
+            },
+        )
+
+
+def parse_item_ids(raw_ids: Iterable[str]) -> tuple[list[str], list[UUID]]:
+    """Return (requested ids in order, deduplicated; the ones that are UUIDs)."""
+    requested = list(dict.fromkeys(_normalize(raw) for raw in raw_ids))
+    check_batch_size(len(requested), "item_ids")
+    ids = []
+    for item_id in requested:
+        try:
+            ids.append(UUID(item_id))
+        except ValueError:
+            continue
+    return requested, ids
+
+
+def _id_in(db: Session, ids: list[UUID]) -> ColumnElement:
+    # One array parameter on PostgreSQL keeps the statement text (and its
+    # cached plan) identical for any batch size.
+    if db.get_bind().dialect.name == "postgresql":
+        return InventoryItem.id == any_(bindparam("bulk_ids", ids, type_=ARRAY(InventoryItem.id.type)))
+    return InventoryItem.id.in_(ids)
+
+
+def _active_owned(db: Session, user_id, ids: list[UUID]) -> list[ColumnElement]:
+    return [
+        _id_in(db, ids),
+        InventoryItem.user_id == user_id,
+        InventoryItem.deleted_at.is_(None),
+    ]
+
+
+def _outcomes(requested: list[str], changed: dict[str, BulkResult], missed: dict[str, BulkResult]) -> list[BulkResult]:
+    return [changed.get(raw) or missed.get(raw) or BulkResult(id=raw, outcome="not_found") for raw in requested]
+
+
+def bulk_transition(db: Session, user_id, raw_ids: Iterable[str], target_status: str) -> list[BulkResult]:
+    """Move every eligible item to *target_status* in one statement."""
+    if target_status not in ALL_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "invalid_status",
+                "message": f"'{target_status}' is not a valid status.",
+                "valid_statuses": ALL_STATUSES,
+            },
+        )
+    requested, ids = parse_item_ids(raw_ids)
+    if not ids:
+        return _outcomes(requested, {}, {})
+
+    (version,) = change_versions.bump(db, user_id, change_versions.INVENTORY)
+    updated_ids = db.execute(
+        update(InventoryItem)
+        .where(*_active_owned(db, user_id, ids), InventoryItem.status.in_(source_statuses(target_status)))
+        .values(status=target_status, change_version=version)
+        .returning(InventoryItem.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    changed = {
+        str(item_id): BulkResult(id=str(item_id), outcome="updated", status=target_status)
+        for item_id in updated_ids
+    }
+
+    missed = {}
+    leftover = [item_id for item_id in ids if str(item_id) not in changed]
+    if leftover:
+        rows = (
+            db.query(InventoryItem.id, InventoryItem.status)
+            .filter(*_active_owned(db, user_id, leftover))
+            .all()
+        )
+        missed = {
+            str(item_id): BulkResult(
+                id=str(item_id),
+                outcome="invalid_transition",
+                status=current,
+                allowed_transitions=VALID_TRANSITIONS.get(current, []),
+            )
+            for item_id, current in rows
+        }
+    db.commit()
+    return _outcomes(requested, changed, missed)
+
+
+def bulk_soft_delete(db: Session, user_id, raw_ids: Iterable[str]) -> tuple[list[BulkResult], list[Optional[str]]]:
+    """Soft-delete every active owned item in one statement.
+
+    Returns (per-id outcomes, source of each deleted item).
+    """
+    requested, ids = parse_item_ids(raw_ids)
+    if not ids:
+        return _outcomes(requested, {}, {}), []
+
+    (version,) = change_versions.bump(db, user_id, change_versions.INVENTORY)
+    rows = db.execute(
+        update(InventoryItem)
+        .where(*_active_owned(db, user_id, ids))
+        .values(deleted_at=datetime.now(timezone.utc), change_version=version)
+        .returning(InventoryItem.id, InventoryItem.source)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    changed = {str(item_id): BulkResult(id=str(item_id), outcome="deleted") for item_id, _ in rows}
+    return _outcomes(requested, changed, {}), [source for _, source in rows]
+
+
+def new_item_values(user_id, payload: ItemCreate) -> dict:
+    """Column values for a new item from a create payload."""
+    values = payload.model_dump()
+    values.update(
+        user_id=user_id,
+        custom_attributes=payload.custom_attributes or {},
+        photo_front_url=externalize_photo(payload.photo_front_url),
+        photo_back_url=externalize_photo(payload.photo_back_url),
+    )
+    return values
+
+
+def bulk_create(db: Session, user_id, payloads: list[ItemCreate]) -> list[UUID]:
+    """Insert every payload in one executemany round trip; returns the new ids in order.
+
+    Callers check the batch size and tier limit first.
+    """
+    (version,) = change_versions.bump(db, user_id, change_versions.INVENTORY)
+    rows = [{"id": uuid4(), **new_item_values(user_id, payload), "change_version": version} for payload in payloads]
+    db.execute(insert(InventoryItem), rows)
+    db.commit()
+    return [row["id"] for row in rows]
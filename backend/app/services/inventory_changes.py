@@ -0,0 +1,101 @@
+"""Delta feed for mobile inventory sync — GET /inventory/changes.
+
+The app keeps a local copy of the seller's items and refreshes it with
+`?since=<token>`: every item created, updated or soft-deleted after the
+token comes back in (change_version, id) order, and the response carries
+the token to resume from. Soft-deleted rows are returned as tombstones (id +
+deleted_at) so the app can drop them locally.
+
+Ledger-driven quantity changes (sales, refunds, provider syncs, imports)
+always rewrite inventory_items.quantity in the same transaction as their
+InventoryStockLedger row, so they surface here without a separate ledger
+scan.
+
+The cursor is the seller's inventory change version
+(services/change_versions.py) that every write stamps on the rows it
+touches, not updated_at: updated_at is when the writing transaction
+started, so an import that ran for minutes would commit rows behind tokens
+handed out meanwhile. Change versions follow commit order — once a version
+is visible, so is every row stamped with a lower one — so a token never
+skips a row, however long the transaction that wrote it.
+
+Backed by the (user_id, change_version, id) index on inventory_items,
+which includes soft-deleted rows (migration 034).
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import literal, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.inventory import InventoryItem
+
+DEFAULT_CHANGES_LIMIT = 200
+MAX_CHANGES_LIMIT = 500
+
+_NIL_ID = UUID(int=0)
+
+
+@dataclass
+class ChangePage:
+    items: list[InventoryItem]
+    deleted: list[InventoryItem]
+    next_token: str
+    has_more: bool
+
+
+def _invalid_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail={"error": "invalid_change_token", "message": "Change token is invalid. Resync without `since`."},
+    )
+
+
+def encode_change_token(change_version: int, item_id: UUID) -> str:
+    raw = json.dumps({"v": change_version, "id": str(item_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_change_token(token: str) -> tuple[int, UUID]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        change_version = payload["v"]
+        if type(change_version) is not int:
+            raise TypeError(change_version)
+        return change_version, UUID(payload["id"])
+    except (KeyError, TypeError, ValueError, binascii.Error, UnicodeError) as exc:
+        raise _invalid_token() from exc
+
+
+def list_changes(db: Session, user_id, since: Optional[str], limit: int) -> ChangePage:
+    """Items of *user_id* changed after *since*, oldest change first."""
+    position = decode_change_token(since) if since else (0, _NIL_ID)
+    rows = (
+        db.query(InventoryItem)
+        .filter(
+            InventoryItem.user_id == user_id,
+            tuple_(InventoryItem.change_version, InventoryItem.id)
+            > tuple_(literal(position[0], InventoryItem.change_version.type), literal(position[1], InventoryItem.id.type)),
+        )
+        .order_by(InventoryItem.change_version, InventoryItem.id)
+        .limit(limit + 1)
+        .all()
+    )
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if rows:
+        position = (rows[-1].change_version, rows[-1].id)
+
+    return ChangePage(
+        items=[row for row in rows if row.deleted_at is None],
+        deleted=[row for row in rows if row.deleted_at is not None],
+        next_token=encode_change_token(*position),
+        has_more=has_more,
+    )
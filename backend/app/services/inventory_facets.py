@@ -0,0 +1,79 @@
+"""Facet counts for the inventory filter chips — GET /inventory/facets.
+
+Counts per value of status, category, source, platform and condition over
+the same filtered set GET /inventory would list (q / status / source /
+available_only all apply), computed in one statement:
+
+  PostgreSQL — GROUP BY GROUPING SETS ((status), (category), ..., ()), a
+               single scan; GROUPING() tells which set a row belongs to,
+               so a NULL category is still its own bucket. The empty set
+               yields the overall total.
+  elsewhere  — the equivalent UNION ALL of one GROUP BY per facet.
+"""
+from typing import Optional
+
+from sqlalchemy import func, literal, null, select, tuple_, union_all
+from sqlalchemy.orm import Query
+
+from app.models.inventory import InventoryItem
+
+FACET_COLUMNS = {
+    "status": InventoryItem.status,
+    "category": InventoryItem.category,
+    "source": InventoryItem.source,
+    "platform": InventoryItem.platform,
+    "condition": InventoryItem.condition,
+}
+_TOTAL = "_total"
+
+
+def _grouping_sets_rows(query: Query) -> list[tuple[str, Optional[str], int]]:
+    columns = list(FACET_COLUMNS.values())
+    rows = (
+        query.order_by(None)
+        .with_entities(*columns, *(func.grouping(column) for column in columns), func.count())
+        .group_by(func.grouping_sets(*(tuple_(column) for column in columns), tuple_()))
+        .all()
+    )
+    names = list(FACET_COLUMNS)
+    out = []
+    for row in rows:
+        values, grouped, count = row[: len(names)], row[len(names): 2 * len(names)], row[-1]
+        # GROUPING(col) = 0 only for the column this row was grouped by.
+        facet = next((name for name, flag in zip(names, grouped) if flag == 0), _TOTAL)
+        value = values[names.index(facet)] if facet != _TOTAL else None
+        out.append((facet, value, count))
+    return out
+
+
+def _union_rows(query: Query) -> list[tuple[str, Optional[str], int]]:
+    filtered = query.order_by(None).with_entities(*FACET_COLUMNS.values()).subquery()
+    parts = [
+        select(literal(name).label("facet"), filtered.c[column.key].label("value"), func.count().label("n"))
+        .group_by(filtered.c[column.key])
+        for name, column in FACET_COLUMNS.items()
+    ]
+    parts.append(select(literal(_TOTAL), null(), func.count()).select_from(filtered))
+    return [tuple(row) for row in query.session.execute(union_all(*parts)).all()]
+
+
+def facet_counts(query: Query) -> tuple[dict[str, list[dict]], int]:
+    """Return ({facet: [{value, count}, ...]}, total) for a filtered item query.
+
+    Values are ordered by count (highest first), then value.
+    """
+    if query.session.get_bind().dialect.name == "postgresql":
+        rows = _grouping_sets_rows(query)
+    else:
+        rows = _union_rows(query)
+
+    facets: dict[str, list[dict]] = {name: [] for name in FACET_COLUMNS}
+    total = 0
+    for facet, value, count in rows:
+        if facet == _TOTAL:
+            total = count
+        else:
+            facets[facet].append({"value": value, "count": count})
+    for buckets in facets.values():
+        buckets.sort(key=lambda bucket: (-bucket["count"], bucket["value"] is None, bucket["value"] or ""))
+    return facets, total
@@ -0,0 +1,262 @@
+"""Spreadsheet link/file import — POST /inventory/import and /inventory/import/file.
+
+Parsed rows are matched against the seller's existing items by UPC, then
+SKU, then the spreadsheet external_id (in that order of preference). The
+match keys of every active item are read once into an ImportMatchIndex
+before the row loop, so matching costs one query per import instead of up
+to three per row.
+
+Rows stream through the import: the sheet is parsed into a spool file on
+the process pool (spreadsheet_import.parsed_spreadsheet) and read back one
+row at a time, and writes go out every WRITE_BATCH_SIZE rows — new items as
+one multi-row INSERT, matched items loaded by id, updated in memory and
+flushed. Memory stays flat for large sheets and import time follows the
+row count, not the number of round trips to the database. The whole import
+is still one transaction: batches are flushed, and committed together at
+the end.
+
+Each written row also gets an InventoryItemProvenance row (the sheet cells
+and review flags), inserted with its batch, instead of riding along in the
+item's custom_attributes.
+"""
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Callable, Iterable, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.dependencies.tier_limiter import TIER_LIMITS
+from app.models.inventory import InventoryItem, InventoryItemProvenance
+from app.models.user import User
+from app.schemas.inventory import InventoryImportResult
+from app.services import change_versions
+from app.services.spreadsheet_import import ParsedImportRow, detect_format, parsed_spreadsheet
+
+SPREADSHEET_SOURCE = "spreadsheet"
+LOAD_CHUNK_SIZE = 1000
+WRITE_BATCH_SIZE = 1000
+PROGRESS_EVERY_ROWS = 500
+# Server defaults of NOT NULL columns a sheet row may leave out.
+_CREATE_DEFAULTS = {"status": "in_stock", "quantity": 1}
+
+
+@dataclass
+class ImportMatchIndex:
+    """Existing item ids keyed by each import match key (first item wins)."""
+    by_upc: dict[str, UUID] = field(default_factory=dict)
+    by_sku: dict[str, UUID] = field(default_factory=dict)
+    by_external_id: dict[str, UUID] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, db: Session, user_id) -> "ImportMatchIndex":
+        index = cls()
+        rows = (
+            db.query(
+                InventoryItem.id,
+                InventoryItem.upc,
+                InventoryItem.sku,
+                InventoryItem.source,
+                InventoryItem.external_id,
+            )
+            .filter(InventoryItem.user_id == user_id, InventoryItem.deleted_at.is_(None))
+            .order_by(InventoryItem.created_at, InventoryItem.id)
+            .all()
+        )
+        for item_id, upc, sku, source, external_id in rows:
+            if upc:
+                index.by_upc.setdefault(upc, item_id)
+            if sku:
+                index.by_sku.setdefault(sku, item_id)
+            if source == SPREADSHEET_SOURCE and external_id:
+                index.by_external_id.setdefault(external_id, item_id)
+        return index
+
+    def match(self, payload: dict[str, Any], external_id: str) -> Optional[UUID]:
+        if payload.get("upc") and payload["upc"] in self.by_upc:
+            return self.by_upc[payload["upc"]]
+        if payload.get("sku") and payload["sku"] in self.by_sku:
+            return self.by_sku[payload["sku"]]
+        return self.by_external_id.get(external_id)
+
+
+def _load_items(db: Session, item_ids: list[UUID]) -> dict[UUID, InventoryItem]:
+    items: dict[UUID, InventoryItem] = {}
+    for start in range(0, len(item_ids), LOAD_CHUNK_SIZE):
+        chunk = item_ids[start:start + LOAD_CHUNK_SIZE]
+        for item in db.query(InventoryItem).filter(InventoryItem.id.in_(chunk)).all():
+            items[item.id] = item
+    return items
+
+
+def _uniform_rows(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Give every row the same keys so the batch is one multi-row INSERT.
+
+    Rows only carry the columns their sheet cells filled; missing ones get
+    the column default (NULL unless listed in _CREATE_DEFAULTS).
+    """
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    return [{key: row.get(key, _CREATE_DEFAULTS.get(key)) for key in columns} for row in rows]
+
+
+def _write_batch(
+    db: Session,
+    creates: list[dict[str, Any]],
+    updates: list[tuple[UUID, dict[str, Any]]],
+    provenance: list[dict[str, Any]],
+) -> None:
+    """Flush one batch of imported rows (not committed) and empty the lists."""
+    # Rows are applied in sheet order, so a later row wins when several
+    # rows match the same item (custom attributes accumulate).
+    matched = _load_items(db, list(dict.fromkeys(item_id for item_id, _ in updates)))
+    missing: set[UUID] = set()
+    for item_id, payload in updates:
+        item = matched.get(item_id)
+        if item is None:  # deleted since the index was built
+            missing.add(item_id)
+            continue
+        raw_attrs = payload.pop("custom_attributes", {}) or {}
+        payload["custom_attributes"] = {**(item.custom_attributes or {}), **raw_attrs}
+        for field_name, value in payload.items():
+            setattr(item, field_name, value)
+    if creates:
+        (version,) = change_versions.bump(db, creates[0]["user_id"], change_versions.INVENTORY)
+        db.execute(insert(InventoryItem), [{**row, "change_version": version} for row in _uniform_rows(creates)])
+    written = [row for row in provenance if row["inventory_item_id"] not in missing]
+    if written:
+        db.execute(insert(InventoryItemProvenance), written)
+    db.flush()
+    creates.clear()
+    updates.clear()
+    provenance.clear()
+
+
+def import_inventory_content(
+    *,
+    filename: str,
+    content_type: str | None,
+    content: bytes | BinaryIO,
+    dry_run: bool,
+    source_name: str | None,
+    db: Session,
+    current_user: User,
+    progress: Optional[Callable[[int, int], None]] = None,
+    import_job_id: Optional[UUID] = None,
+) -> InventoryImportResult:
+    """Parse, match and (unless dry_run) write one spreadsheet.
+
+    *content* is the file's bytes or a seekable file holding them (spooled
+    uploads). Blocks on the process pool while the sheet is parsed, so async
+    callers run it via worker_pool.run_in_worker. *progress*, when given, is
+    called as progress(rows_processed, total_rows) every PROGRESS_EVERY_ROWS
+    rows and once more before the import commits — background jobs use it
+    to report status, and raise from it to stop a run that no longer owns
+    its job. *import_job_id* is recorded on the items' provenance.
+    """
+    with parsed_spreadsheet(content, detect_format(filename, content_type, content), content_type) as parsed_rows:
+        return import_parsed_rows(
+            parsed_rows, len(parsed_rows), dry_run=dry_run, db=db, current_user=current_user, progress=progress,
+            import_job_id=import_job_id,
+        )
+
+
+def import_parsed_rows(
+    parsed_rows: Iterable[ParsedImportRow],
+    total_rows: int,
+    *,
+    dry_run: bool,
+    db: Session,
+    current_user: User,
+    progress: Optional[Callable[[int, int], None]] = None,
+    import_job_id: Optional[UUID] = None,
+) -> InventoryImportResult:
+    """Match and (unless dry_run) write already-parsed rows; *total_rows* is the sheet's row count."""
+    if progress:
+        progress(0, total_rows)
+
+    result = {
+        "dry_run": dry_run,
+        "rows_seen": total_rows,
+        "rows_importable": 0,
+        "created": 0,
+        "updated": 0,
+        "skipped": 0,
+        "errors": [],
+        "warnings": [],
+        "sample_items": [],
+    }
+
+    existing_count = db.query(InventoryItem).filter(
+        InventoryItem.user_id == current_user.id,
+        InventoryItem.deleted_at.is_(None),
+    ).count()
+    tier_limit = TIER_LIMITS.get(current_user.subscription_tier)
+    index = ImportMatchIndex.build(db, current_user.id)
+
+    creates: list[dict[str, Any]] = []
+    updates: list[tuple[UUID, dict[str, Any]]] = []
+    provenance: list[dict[str, Any]] = []
+    for position, parsed_row in enumerate(parsed_rows, start=1):
+        if progress and position % PROGRESS_EVERY_ROWS == 0:
+            progress(position, total_rows)
+        for warning in parsed_row.warnings:
+            result["warnings"].append({"row": parsed_row.row_number, "message": warning})
+
+        if not parsed_row.payload:
+            result["skipped"] += 1
+            continue
+
+        result["rows_importable"] += 1
+        match_id = index.match(parsed_row.payload, parsed_row.external_id)
+        if match_id:
+            result["updated"] += 1
+        else:
+            if tier_limit is not None and existing_count + result["created"] >= tier_limit:
+                result["skipped"] += 1
+                result["errors"].append({
+                    "row": parsed_row.row_number,
+                    "message": f"Tier limit reached at {tier_limit} inventory items.",
+                })
+                continue
+            result["created"] += 1
+
+        if len(result["sample_items"]) < 5:
+            result["sample_items"].append(parsed_row.payload)
+
+        if dry_run:
+            continue
+
+        payload = dict(parsed_row.payload)
+        item_id = match_id or uuid4()
+        if match_id:
+            updates.append((match_id, payload))
+        else:
+            raw_attrs = payload.pop("custom_attributes", {}) or {}
+            creates.append({
+                "id": item_id,
+                "user_id": current_user.id,
+                "source": SPREADSHEET_SOURCE,
+                "external_id": parsed_row.external_id,
+                "custom_attributes": raw_attrs,
+                **payload,
+            })
+        provenance.append({
+            "id": uuid4(),
+            "inventory_item_id": item_id,
+            "user_id": current_user.id,
+            "import_job_id": import_job_id,
+            "source": SPREADSHEET_SOURCE,
+            "row_number": parsed_row.row_number,
+            "source_cells": parsed_row.source_cells(),
+            "review": parsed_row.review or None,
+        })
+        if len(creates) + len(updates) >= WRITE_BATCH_SIZE:
+            _write_batch(db, creates, updates, provenance)
+
+    if not dry_run:
+        _write_batch(db, creates, updates, provenance)
+        if progress:
+            progress(total_rows, total_rows)
+        db.commit()
+
+    return InventoryImportResult(**result)
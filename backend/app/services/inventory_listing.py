@@ -0,0 +1,302 @@
+"""Inventory list query helpers — filters, sort keys, and keyset cursors.
+
+GET /inventory supports two pagination contracts:
+  page/per_page — legacy OFFSET paging kept for older app builds
+  cursor        — opaque keyset cursor over (sort key, id); every page is an
+                  index range scan no matter how deep the seller scrolls
+
+List rows come in three shapes: full ItemResponse rows (default),
+view=summary (ItemSummary columns), or an explicit fields= subset. The slim
+shapes load only the requested columns, and photo columns are reduced in
+SQL to a URL or an inline-blob marker, so base64 photos never leave the
+database on a list request. Photo-store URLs point at the "list" rendition.
+
+Each sortable key has a matching (user_id, key, id) index on
+inventory_items (see migration 021; the updated_at one also covers deleted
+rows since 025, for the changes feed). Search results (`q`) default to
+relevance order, which pages by an offset carried inside the same opaque
+cursor — search result sets are small, and rank is not a stable keyset.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, case, literal, or_, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Query, Session, load_only
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.models.inventory import InventoryItem
+from app.schemas.inventory import ItemResponse, ItemSummary
+from app.services.inventory_search import search_filter
+from app.services.photo_renditions import rendition_url
+
+
+SORT_COLUMNS = {
+    "created_at": InventoryItem.created_at,
+    "updated_at": InventoryItem.updated_at,
+    "price": InventoryItem.expected_sell_price,
+    "name": InventoryItem.name,
+}
+RELEVANCE_SORT = "relevance"
+SORT_PATTERN = f"^({'|'.join([*SORT_COLUMNS, RELEVANCE_SORT])})$"
+# Alphabetical lists read A→Z; everything else defaults to newest/highest first.
+DEFAULT_SORT_ORDER = {"name": "asc"}
+COUNT_MODES = ("exact", "estimate", "none")
+
+PHOTO_FIELDS = {"photo_front_url": "front", "photo_back_url": "back"}
+PROJECTABLE_FIELDS = tuple(ItemResponse.model_fields)
+SUMMARY_FIELDS = tuple(ItemSummary.model_fields)
+_INLINE_PHOTO = "data:"
+LIST_RENDITION = "list"
+
+
+def apply_item_filters(
+    query: Query,
+    *,
+    q: Optional[str] = None,
+    status_filter: Optional[str] = None,
+    source_filter: Optional[str] = None,
+    available_only: bool = False,
+) -> Query:
+    """Apply the shared GET /inventory search and filter parameters."""
+    if status_filter:
+        query = query.filter(InventoryItem.status == status_filter)
+
+    if source_filter:
+        query = query.filter(InventoryItem.source == source_filter)
+
+    if available_only:
+        query = query.filter(
+            InventoryItem.status.in_(["in_stock", "listed"]),
+            InventoryItem.quantity > 0,
+        )
+
+    # Search last so the exact UPC/SKU probe sees the other filters too.
+    return search_filter(query, q)
+
+
+def resolve_sort(sort: Optional[str], q: Optional[str]) -> str:
+    """Search defaults to relevance; relevance without a search term is newest-first."""
+    if sort == RELEVANCE_SORT or sort is None:
+        return RELEVANCE_SORT if (q or "").strip() else "created_at"
+    return sort
+
+
+def resolve_order(sort: str, order: Optional[str]) -> str:
+    return order or DEFAULT_SORT_ORDER.get(sort, "desc")
+
+
+def apply_sort(query: Query, sort: str, order: str) -> Query:
+    """Order by (sort key, id). NULL prices sort as the highest value on every
+    dialect, which matches PostgreSQL's native btree ordering for the index."""
+    column = SORT_COLUMNS[sort]
+    if order == "asc":
+        return query.order_by(column.asc().nulls_last(), InventoryItem.id.asc())
+    return query.order_by(column.desc().nulls_first(), InventoryItem.id.desc())
+
+
+def resolve_fields(view: str, fields: Optional[str]) -> Optional[tuple[str, ...]]:
+    """Return the projected field names, or None for full ItemResponse rows."""
+    if fields:
+        requested = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = sorted(set(requested) - set(PROJECTABLE_FIELDS))
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "error": "invalid_fields",
+                    "message": f"Unknown fields: {', '.join(unknown)}",
+                    "allowed": list(PROJECTABLE_FIELDS),
+                },
+            )
+        # id is always returned so rows stay addressable.
+        return tuple(dict.fromkeys(["id", *requested]))
+    if view == "summary":
+        return SUMMARY_FIELDS
+    return None
+
+
+def _photo_reference(column):
+    """Remote URLs pass through; inline data URLs collapse to a short marker."""
+    return case((column.startswith(_INLINE_PHOTO), literal(_INLINE_PHOTO)), else_=column)
+
+
+def apply_projection(query: Query, fields: tuple[str, ...], sort: str) -> Query:
+    """Load only *fields* (plus the sort key the cursor needs) for each row.
+
+    Photo fields are added as extra result columns, so rows come back as
+    (item, <photo reference>...) tuples — see project_row.
+    """
+    loaded = [name for name in fields if name not in PHOTO_FIELDS]
+    if sort in SORT_COLUMNS:
+        loaded.append(SORT_COLUMNS[sort].key)
+    query = query.options(load_only(*(getattr(InventoryItem, name) for name in dict.fromkeys(loaded))))
+    photos = [name for name in fields if name in PHOTO_FIELDS]
+    if photos:
+        query = query.add_columns(
+            *(_photo_reference(getattr(InventoryItem, name)).label(name) for name in photos)
+        )
+    return query
+
+
+def project_row(row, fields: tuple[str, ...], photo_url) -> tuple[InventoryItem, dict]:
+    """Split a projected result row into (item, response dict).
+
+    *photo_url(item, side, size)* builds the URL served for an inline photo.
+    """
+    photos = [name for name in fields if name in PHOTO_FIELDS]
+    if photos:
+        item, refs = row[0], dict(zip(photos, row[1:]))
+    else:
+        item, refs = row, {}
+
+    data = {}
+    for name in fields:
+        if name in refs:
+            ref = refs[name]
+            if ref == _INLINE_PHOTO:
+                data[name] = photo_url(item, PHOTO_FIELDS[name], LIST_RENDITION)
+            else:
+                data[name] = rendition_url(ref, LIST_RENDITION)
+        else:
+            data[name] = getattr(item, name)
+    return item, data
+
+
+def _invalid_cursor(message: str = "Cursor is invalid or expired.") -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail={"error": "invalid_cursor", "message": message},
+    )
+
+
+def _serialize_key(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _parse_key(sort: str, raw: Optional[str]) -> Any:
+    if raw is None:
+        return None
+    if sort in ("created_at", "updated_at"):
+        return datetime.fromisoformat(raw)
+    if sort == "price":
+        return Decimal(raw)
+    return raw
+
+
+def _encode(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode(token: str, sort: str, order: str) -> dict:
+    padded = token + "=" * (-len(token) % 4)
+    payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    if payload["s"] != sort or payload["o"] != order:
+        raise _invalid_cursor("Cursor was issued for a different sort order.")
+    return payload
+
+
+def encode_cursor(item: InventoryItem, sort: str, order: str) -> str:
+    """Return an opaque token pointing just past *item* in the given ordering."""
+    return _encode({
+        "s": sort,
+        "o": order,
+        "k": _serialize_key(getattr(item, SORT_COLUMNS[sort].key)),
+        "id": str(item.id),
+    })
+
+
+def decode_cursor(token: str, sort: str, order: str) -> tuple[Any, UUID]:
+    """Decode a cursor produced by encode_cursor for the same sort/order."""
+    try:
+        payload = _decode(token, sort, order)
+        return _parse_key(sort, payload["k"]), UUID(payload["id"])
+    except HTTPException:
+        raise
+    except (KeyError, TypeError, ValueError, InvalidOperation, binascii.Error, UnicodeError) as exc:
+        raise _invalid_cursor() from exc
+
+
+def encode_offset_cursor(offset: int, order: str) -> str:
+    return _encode({"s": RELEVANCE_SORT, "o": order, "off": offset})
+
+
+def decode_offset_cursor(token: str, order: str) -> int:
+    try:
+        offset = int(_decode(token, RELEVANCE_SORT, order)["off"])
+    except HTTPException:
+        raise
+    except (KeyError, TypeError, ValueError, binascii.Error, UnicodeError) as exc:
+        raise _invalid_cursor() from exc
+    if offset < 0:
+        raise _invalid_cursor()
+    return offset
+
+
+def apply_cursor(query: Query, sort: str, order: str, key: Any, item_id: UUID) -> Query:
+    """Keep only rows strictly after (key, item_id) in apply_sort's ordering.
+
+    Non-NULL keys are compared as a row value, (key, id) > (:key, :id), which
+    PostgreSQL turns into the start of an index range scan. Row comparisons
+    are never true for NULL keys, so the NULL-price segment (last in asc,
+    first in desc) gets a branch of its own.
+    """
+    column = SORT_COLUMNS[sort]
+    id_col = InventoryItem.id
+    position = tuple_(column, id_col)
+    if order == "asc":
+        if key is None:
+            return query.filter(and_(column.is_(None), id_col > item_id))
+        return query.filter(or_(position > _row_value(column, key, item_id), column.is_(None)))
+    if key is None:
+        return query.filter(or_(
+            and_(column.is_(None), id_col < item_id),
+            column.isnot(None),
+        ))
+    return query.filter(position < _row_value(column, key, item_id))
+
+
+def _row_value(column, key: Any, item_id: UUID):
+    return tuple_(literal(key, column.type), literal(item_id, InventoryItem.id.type))
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN wrapper so the planner estimate reuses SQLAlchemy's bind handling."""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def count_items(db: Session, query: Query, mode: str) -> tuple[Optional[int], bool]:
+    """Return (total, is_estimate) for a filtered item query.
+
+    exact    — COUNT(*) over the filtered rows
+    estimate — PostgreSQL planner row estimate (no scan); exact elsewhere
+    none     — skip counting entirely
+    """
+    if mode == "none":
+        return None, False
+    query = query.order_by(None)
+    if mode == "estimate" and db.get_bind().dialect.name == "postgresql":
+        plan = db.execute(_Explain(query.statement)).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"]), True
+    return query.count(), False
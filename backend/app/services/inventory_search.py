@@ -0,0 +1,107 @@
+"""Inventory search engine — backs the `q` box and name-based price lookups.
+
+PostgreSQL:
+  - inventory_items.search_vector is a generated tsvector over name/sku/upc
+    (GIN-indexed) used for prefix word matching and ts_rank relevance
+  - pg_trgm GIN indexes on name/sku/upc let substring ILIKE use an index
+    instead of a sequential scan
+Other engines (SQLite dev/test) fall back to plain ILIKE with a CASE rank.
+
+Exact UPC/SKU hits (a scanned barcode, a pasted style code) take a fast path
+through the (user_id, upc) / (user_id, sku) btree indexes and suppress fuzzy
+matches entirely.
+"""
+import re
+from typing import Optional
+
+from sqlalchemy import case, func, literal_column, or_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.inventory import InventoryItem
+
+MAX_SEARCH_TERM_LENGTH = 50
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Mirrors the generated column declared in models/inventory.py.
+SEARCH_VECTOR = literal_column("inventory_items.search_vector", type_=TSVECTOR)
+
+
+def normalize_term(q: Optional[str], max_length: int = MAX_SEARCH_TERM_LENGTH) -> str:
+    return (q or "").strip()[:max_length]
+
+
+def _is_postgres(query: Query) -> bool:
+    return query.session.get_bind().dialect.name == "postgresql"
+
+
+def name_matches(term: str) -> ColumnElement:
+    """Substring match on InventoryItem.name (trigram-indexed on PostgreSQL).
+
+    The user's own % and _ are escaped so they match literally.
+    """
+    return InventoryItem.name.icontains(term, autoescape=True)
+
+
+def _prefix_tsquery(term: str) -> Optional[ColumnElement]:
+    tokens = _TOKEN_RE.findall(term.lower())
+    if not tokens:
+        return None
+    return func.to_tsquery("simple", " & ".join(f"{token}:*" for token in tokens))
+
+
+def _exact_clause(term: str) -> ColumnElement:
+    return or_(InventoryItem.upc == term, InventoryItem.sku == term)
+
+
+def _fuzzy_clause(term: str, postgres: bool) -> ColumnElement:
+    clauses = [
+        name_matches(term),
+        InventoryItem.sku.icontains(term, autoescape=True),
+        InventoryItem.upc.icontains(term, autoescape=True),
+    ]
+    tsquery = _prefix_tsquery(term) if postgres else None
+    if tsquery is not None:
+        clauses.append(SEARCH_VECTOR.op("@@")(tsquery))
+    return or_(*clauses)
+
+
+def search_filter(query: Query, q: Optional[str]) -> Query:
+    """Restrict an InventoryItem query to rows matching the search box text."""
+    term = normalize_term(q)
+    if not term:
+        return query
+
+    exact = _exact_clause(term)
+    exact_hit = query.filter(exact).order_by(None).with_entities(InventoryItem.id).first()
+    if exact_hit is not None:
+        return query.filter(exact)
+    return query.filter(_fuzzy_clause(term, _is_postgres(query)))
+
+
+def relevance_order(query: Query, q: Optional[str]) -> Query:
+    """Order search results best-first; newest first among equal ranks."""
+    term = normalize_term(q)
+    if not term:
+        return query.order_by(InventoryItem.created_at.desc(), InventoryItem.id.desc())
+
+    exact_first = case((_exact_clause(term), 1), else_=0)
+    if _is_postgres(query):
+        tsquery = _prefix_tsquery(term)
+        rank = func.similarity(InventoryItem.name, term)
+        if tsquery is not None:
+            rank = rank + func.ts_rank(SEARCH_VECTOR, tsquery)
+    else:
+        lowered = term.lower()
+        rank = case(
+            (func.lower(InventoryItem.name) == lowered, 3),
+            (func.lower(InventoryItem.name).startswith(lowered, autoescape=True), 2),
+            else_=1,
+        )
+    return query.order_by(
+        exact_first.desc(),
+        rank.desc(),
+        InventoryItem.created_at.desc(),
+        InventoryItem.id.desc(),
+    )
@@ -6,7 +6,6 @@ profile picture (or initials circle) in the top-left corner.
 
 Requires: fpdf2
 """
-import base64
 import os
 import tempfile
 from datetime import datetime
@@ -16,6 +15,7 @@ from fpdf import FPDF
 
 from app.models.invoice import Invoice, InvoiceItem
 from app.models.user import User
+from app.services.photo_store import load_photo_bytes
 
 # ─── Colour palette ──────────────────────────────────────────────────────────
 BLUE       = (59, 123, 219)       # table header / initials circle
@@ -42,14 +42,13 @@ def _hex_to_rgb(value: Optional[str]) -> Optional[tuple]:
         return None
 
 def _load_profile_tmp(user: User) -> Optional[str]:
-    """Decode base64 profile_picture to a temp .jpg file. Returns path or None."""
+    """Write the profile picture (stored photo or data URL) to a temp .jpg file. Returns path or None."""
     if not getattr(user, "profile_picture", None):
         return None
     try:
-        data: str = user.profile_picture
-        if "," in data:
-            data = data.split(",", 1)[1]
-        img_bytes = base64.b64decode(data)
+        img_bytes = load_photo_bytes(user.profile_picture)
+        if img_bytes is None:
+            return None
         tmp = tempfile.NamedTemporaryFile(suffix=".jpg", delete=False)
         tmp.write(img_bytes)
         tmp.close()
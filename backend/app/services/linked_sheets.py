@@ -0,0 +1,209 @@
+"""Linked spreadsheets — /inventory/linked-sheets and the sync scheduler.
+
+A seller who keeps a master inventory in a Google Sheet links it once; the
+sheet is re-fetched every sync_interval_minutes and only what changed is
+applied:
+
+1. The export URL that worked last time is fetched conditionally
+   (If-None-Match / If-Modified-Since); a 304 ends the sync.
+2. A body whose SHA-256 matches the last applied download ends it too.
+3. Otherwise the sheet is parsed and each row fingerprinted — a hash of its
+   mapped payload, keyed by the row's external_id. Rows whose fingerprint
+   matches the last applied version are skipped; new and changed rows go
+   through the normal import (match by UPC / SKU / row id, tier limits,
+   batched writes).
+
+Rows removed from the sheet leave their items alone, and a row that was
+not applied (over the tier limit) is retried on the next sync. A sync is
+claimed by moving next_sync_at forward with a conditional UPDATE, so two
+workers never run the same sheet at once; a failed sync waits for the next
+interval.
+"""
+import hashlib
+import json
+import logging
+from datetime import timedelta
+from typing import Awaitable, Callable, Iterable, Iterator, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.base import as_utc
+from app.models.inventory import InventoryLinkedSheet
+from app.models.user import User
+from app.schemas.inventory import InventoryImportResult
+from app.services import background_jobs
+from app.services.inventory_import import import_parsed_rows
+from app.services.spreadsheet_import import ParsedImportRow, detect_format, parsed_spreadsheet
+
+logger = logging.getLogger(__name__)
+
+SYNCED = "synced"
+NOT_MODIFIED = "not_modified"
+UNCHANGED = "unchanged"
+FAILED = "failed"
+
+SheetSyncer = Callable[[InventoryLinkedSheet, Session], Awaitable[None]]
+
+def row_fingerprint(row: ParsedImportRow) -> str:
+    """Hash of a row's mapped payload; changes whenever any imported cell does."""
+    encoded = json.dumps(row.payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+def keyed_rows(parsed_rows: Iterable[ParsedImportRow]) -> Iterator[tuple[Optional[str], ParsedImportRow]]:
+    """(row key, row) pairs: the external_id, suffixed for repeats of it.
+
+    Rows without a payload (skipped by the import) have no key.
+    """
+    seen: dict[str, int] = {}
+    for row in parsed_rows:
+        if not row.payload:
+            yield None, row
+            continue
+        occurrence = seen.get(row.external_id, 0)
+        seen[row.external_id] = occurrence + 1
+        yield (row.external_id if occurrence == 0 else f"{row.external_id}:{occurrence}"), row
+
+
+def conditional_headers(sheet: InventoryLinkedSheet) -> dict[str, str]:
+    headers = {}
+    if sheet.etag:
+        headers["If-None-Match"] = sheet.etag
+    if sheet.last_modified:
+        headers["If-Modified-Since"] = sheet.last_modified
+    return headers
+
+
+def mark_checked(db: Session, sheet: InventoryLinkedSheet, status: str, **values) -> None:
+    """Record the outcome of a sync attempt on the sheet and commit."""
+    sheet.last_status = status
+    sheet.last_error = None
+    sheet.last_checked_at = background_jobs.now()
+    for name, value in values.items():
+        setattr(sheet, name, value)
+    db.commit()
+
+
+def apply_sheet_content(
+    *,
+    sheet: InventoryLinkedSheet,
+    export_url: str,
+    filename: str,
+    content_type: Optional[str],
+    content: bytes,
+    etag: Optional[str],
+    last_modified: Optional[str],
+    db: Session,
+    current_user: User,
+) -> Optional[InventoryImportResult]:
+    """Apply the rows of a fresh download that changed since the last sync.
+
+    Returns None when the download is byte-identical to the last applied
+    one. Blocks on the process pool while parsing, so async callers run it
+    via worker_pool.run_in_worker.
+    """
+    validators = {"export_url": export_url, "etag": etag, "last_modified": last_modified}
+    content_hash = hashlib.sha256(content).hexdigest()
+    if content_hash == sheet.content_hash:
+        mark_checked(db, sheet, UNCHANGED, **validators)
+        return None
+
+    previous = sheet.row_fingerprints or {}
+    fingerprints: dict[str, str] = {}
+    changed_keys: dict[int, str] = {}  # row number → key, for rows handed to the import
+    unchanged = 0
+
+    def changed_rows(parsed_rows: Iterable[ParsedImportRow]) -> Iterator[ParsedImportRow]:
+        nonlocal unchanged
+        for key, row in keyed_rows(parsed_rows):
+            if key is not None:
+                fingerprints[key] = row_fingerprint(row)
+                if previous.get(key) == fingerprints[key]:
+                    unchanged += 1
+                    continue
+                changed_keys[row.row_number] = key
+            yield row
+
+    file_format = detect_format(filename, content_type, content)
+    with parsed_spreadsheet(content, file_format, content_type) as parsed_rows:
+        result = import_parsed_rows(
+            changed_rows(parsed_rows), len(parsed_rows), dry_run=False, db=db, current_user=current_user,
+        )
+
+    # A row the import turned down is not applied: forget it so the next sync retries it.
+    for issue in result.errors:
+        fingerprints.pop(changed_keys.get(issue.row), None)
+    result.unchanged = unchanged
+    mark_checked(
+        db, sheet, SYNCED,
+        # Only a fully applied download may short-circuit the next sync.
+        content_hash=None if result.errors else content_hash,
+        row_fingerprints=fingerprints,
+        last_synced_at=background_jobs.now(),
+        last_result=result.model_dump(mode="json"),
+        **validators,
+    )
+    return result
+
+
+def claim_sheet(db: Session, sheet_id, force: bool = False) -> Optional[InventoryLinkedSheet]:
+    """Move a due sheet's next_sync_at one interval ahead; None if not due or taken.
+
+    *force* claims a sheet that is not due yet (a manual "sync now").
+    """
+    sheet = db.get(InventoryLinkedSheet, sheet_id)
+    if sheet is None:
+        return None
+    now = background_jobs.now()
+    scheduled = sheet.next_sync_at
+    if not force and as_utc(scheduled) > now:
+        return None
+    claimed = db.execute(
+        update(InventoryLinkedSheet)
+        .where(InventoryLinkedSheet.id == sheet_id, InventoryLinkedSheet.next_sync_at == scheduled)
+        .values(next_sync_at=now + timedelta(minutes=sheet.sync_interval_minutes))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    if not claimed:
+        return None
+    db.refresh(sheet)
+    return sheet
+
+
+async def run_sheet_sync(sheet_id, syncer: SheetSyncer, force: bool = False) -> None:
+    """Claim *sheet_id* and sync it, recording a failure on the sheet."""
+    with background_jobs.session_scope() as db:
+        sheet = claim_sheet(db, sheet_id, force=force)
+        if sheet is None:
+            return
+        try:
+            await syncer(sheet, db)
+        except Exception as exc:
+            if not isinstance(exc, HTTPException):
+                logger.exception("Linked sheet %s sync failed", sheet_id)
+            db.rollback()
+            mark_checked(db, db.get(InventoryLinkedSheet, sheet_id), FAILED, last_error=background_jobs.failure_message(exc, "Sync failed unexpectedly."))
+
+
+def due_sheet_ids(db: Session) -> list:
+    return [
+        sheet_id
+        for (sheet_id,) in db.query(InventoryLinkedSheet.id)
+        .filter(InventoryLinkedSheet.next_sync_at <= background_jobs.now())
+        .order_by(InventoryLinkedSheet.next_sync_at)
+        .all()
+    ]
+
+
+async def sweep_linked_sheets(syncer: SheetSyncer) -> None:
+    """Start a sync for every due linked sheet, forever."""
+    def sweep() -> None:
+        with background_jobs.session_scope() as db:
+            sheet_ids = due_sheet_ids(db)
+        for sheet_id in sheet_ids:
+            background_jobs.schedule(run_sheet_sync(sheet_id, syncer))
+
+    await background_jobs.sweep_forever(sweep, "Linked sheet")
@@ -0,0 +1,135 @@
+"""Parsed-sheet cache — repeat imports of the same spreadsheet skip parsing.
+
+Sellers run an import with dry_run=true and then for real, or upload the
+same file again. spreadsheet_import.parsed_spreadsheet keys every parse by
+a SHA-256 of the file bytes (with its format and content type) and keeps
+the spool of ParsedImportRows here. Embedded images went to the photo store
+during the first parse, so the cached rows already carry their thumbnail
+URLs and nothing is decoded again.
+
+Entries are files in a private temp directory. They expire after
+IMPORT_CACHE_TTL_SECONDS and are evicted least recently used first once
+their total size passes IMPORT_CACHE_MAX_MB (0 turns the cache off). The
+cache belongs to one API process: with several workers, a repeat import
+hits only when it lands on the same one.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import IO, BinaryIO, Optional, Union
+
+from app.config import settings
+
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+@dataclass
+class _Entry:
+    path: str
+    count: int
+    size: int
+    expires_at: float
+
+
+_entries: "OrderedDict[str, _Entry]" = OrderedDict()
+_size = 0
+_directory: Optional[str] = None
+_lock = threading.Lock()
+
+
+def _max_bytes() -> int:
+    return settings.IMPORT_CACHE_MAX_MB * 1024 * 1024
+
+
+def enabled() -> bool:
+    return _max_bytes() > 0 and settings.IMPORT_CACHE_TTL_SECONDS > 0
+
+
+def content_key(content: Union[bytes, BinaryIO], *parts: str) -> str:
+    """SHA-256 hex digest of *parts* and the content (a file is hashed in chunks)."""
+    digest = hashlib.sha256("\0".join(parts).encode() + b"\0")
+    if isinstance(content, (bytes, bytearray)):
+        digest.update(content)
+    else:
+        content.seek(0)
+        while chunk := content.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+        content.seek(0)
+    return digest.hexdigest()
+
+
+def _cache_directory() -> str:
+    global _directory
+    if _directory is None or not os.path.isdir(_directory):
+        _directory = tempfile.mkdtemp(prefix="vendora-parse-cache-")
+    return _directory
+
+
+def spool_file() -> IO[bytes]:
+    """A temp file for a new parse, on the cache's filesystem so it can be kept."""
+    with _lock:
+        directory = _cache_directory()
+    return tempfile.NamedTemporaryFile(prefix="vendora-rows-", dir=directory)
+
+
+def _discard(key: str) -> None:
+    global _size
+    entry = _entries.pop(key, None)
+    if entry is None:
+        return
+    _size -= entry.size
+    try:
+        os.unlink(entry.path)
+    except FileNotFoundError:
+        pass
+
+
+def _expire(now: float) -> None:
+    for key in [key for key, entry in _entries.items() if entry.expires_at <= now]:
+        _discard(key)
+
+
+def get(key: str) -> Optional[tuple[BinaryIO, int]]:
+    """(open spool file, row count) for a cached parse, or None.
+
+    The file is opened before the lock is released, so it stays readable
+    even if the entry is evicted while the caller iterates it.
+    """
+    if not enabled():
+        return None
+    with _lock:
+        _expire(time.monotonic())
+        entry = _entries.get(key)
+        if entry is None:
+            return None
+        _entries.move_to_end(key)
+        return open(entry.path, "rb"), entry.count
+
+
+def put(key: str, path: str, count: int) -> None:
+    """Keep the spool at *path* (a spool_file) as the parse of *key*."""
+    global _size
+    if not enabled():
+        return
+    size = os.path.getsize(path)
+    if size > _max_bytes():
+        return
+    with _lock:
+        _discard(key)
+        cached_path = os.path.join(_cache_directory(), f"{key}.rows")
+        os.link(path, cached_path)
+        _entries[key] = _Entry(cached_path, count, size, time.monotonic() + settings.IMPORT_CACHE_TTL_SECONDS)
+        _size += size
+        _expire(time.monotonic())
+        while _size > _max_bytes():
+            _discard(next(iter(_entries)))
+
+
+def clear() -> None:
+    with _lock:
+        for key in list(_entries):
+            _discard(key)
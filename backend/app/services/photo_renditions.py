@@ -0,0 +1,144 @@
+"""Resize ladder for stored photos.
+
+Every uploaded photo is re-encoded into a fixed ladder of renditions:
+
+  thumb  — 160 px long edge (grid badges, quick sheets)
+  list   — 480 px (inventory list / seller page rows)
+  detail — 1600 px (item detail; also the canonical stored photo)
+
+each as WebP and progressive JPEG. Renditions are ordinary content-addressed
+photos; photo_renditions maps (source hash, rendition, format) to them, so
+GET /photos/{hash}?size=list can pick the right bytes and the row keeps a
+single canonical URL. Photos stored before the ladder existed get their
+renditions built the first time a size is requested.
+"""
+import hashlib
+import io
+from dataclasses import dataclass
+from typing import Optional
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.photo import PhotoRendition
+from app.services.photo_store import get_photo_store, photo_digest_from_url
+
+RENDITION_SIZES = {"thumb": 160, "list": 480, "detail": 1600}
+RENDITION_PATTERN = f"^({'|'.join(RENDITION_SIZES)})$"
+CANONICAL_RENDITION = ("detail", "jpeg")
+MAX_PHOTO_UPLOAD_BYTES = 20 * 1024 * 1024
+MAX_PHOTO_PIXELS = 50_000_000
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+_MIME = {"webp": "image/webp", "jpeg": "image/jpeg"}
+
+
+class PhotoDecodeError(ValueError):
+    """The upload is not an image Pillow can safely decode."""
+
+
+@dataclass(frozen=True)
+class StoredRendition:
+    rendition: str
+    format: str
+    digest: str
+    width: int
+    height: int
+    byte_size: int
+
+
+def _encode(image: Image.Image, fmt: str) -> bytes:
+    out = io.BytesIO()
+    if fmt == "webp":
+        image.save(out, format="WEBP", quality=WEBP_QUALITY, method=4)
+    else:
+        image.save(out, format="JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return out.getvalue()
+
+
+def build_and_store_renditions(data: bytes) -> list[StoredRendition]:
+    """Decode *data*, encode the full ladder and write it to the photo store.
+
+    CPU-bound and DB-free, so async callers run it via worker_pool.run_in_worker.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as source:
+            if source.width * source.height > MAX_PHOTO_PIXELS:
+                raise PhotoDecodeError("Image dimensions are too large.")
+            # convert() always returns a detached copy we can resize in place.
+            image = ImageOps.exif_transpose(source).convert("RGB")
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as exc:
+        raise PhotoDecodeError("File is not a supported image.") from exc
+
+    store = get_photo_store()
+    stored = []
+    # Largest first so each smaller rung resamples an already-reduced image.
+    for rendition, edge in sorted(RENDITION_SIZES.items(), key=lambda kv: -kv[1]):
+        image.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+        for fmt, mime in _MIME.items():
+            encoded = _encode(image, fmt)
+            digest = hashlib.sha256(encoded).hexdigest()
+            store.put(digest, encoded, mime)
+            stored.append(StoredRendition(rendition, fmt, digest, image.width, image.height, len(encoded)))
+    return stored
+
+
+def canonical_digest(stored: list[StoredRendition]) -> str:
+    return next(r.digest for r in stored if (r.rendition, r.format) == CANONICAL_RENDITION)
+
+
+def index_renditions(db: Session, source_hash: str, stored: list[StoredRendition]) -> None:
+    """Record renditions for *source_hash*; concurrent duplicates are ignored."""
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    db.execute(
+        insert(PhotoRendition)
+        .values([
+            {
+                "source_hash": source_hash,
+                "rendition": r.rendition,
+                "format": r.format,
+                "rendition_hash": r.digest,
+                "width": r.width,
+                "height": r.height,
+                "byte_size": r.byte_size,
+            }
+            for r in stored
+        ])
+        .on_conflict_do_nothing()
+    )
+
+
+def resolve_rendition(db: Session, digest: str, size: str, accept_webp: bool) -> str:
+    """Digest of the *size* rendition of *digest*, building the ladder on first use.
+
+    Falls back to *digest* itself when the source cannot be decoded.
+    """
+    formats = ("webp", "jpeg") if accept_webp else ("jpeg",)
+    rows = (
+        db.query(PhotoRendition.format, PhotoRendition.rendition_hash)
+        .filter(PhotoRendition.source_hash == digest, PhotoRendition.rendition == size)
+        .all()
+    )
+    by_format = dict(rows)
+    if not by_format:
+        data = get_photo_store().read(digest)
+        if data is None:
+            return digest
+        try:
+            stored = build_and_store_renditions(data)
+        except PhotoDecodeError:
+            return digest
+        index_renditions(db, digest, stored)
+        db.commit()
+        by_format = {r.format: r.digest for r in stored if r.rendition == size}
+    return next((by_format[fmt] for fmt in formats if fmt in by_format), digest)
+
+
+def rendition_url(url: Optional[str], size: str) -> Optional[str]:
+    """Point a photo-store URL at one rendition; other URLs pass through."""
+    if not photo_digest_from_url(url):
+        return url
+    return f"{url.split('?', 1)[0]}?size={size}"
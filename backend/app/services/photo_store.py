@@ -0,0 +1,207 @@
+"""Content-addressed photo storage.
+
+Photo bytes are written once, keyed by their SHA-256 digest, and rows keep a
+short URL (`{PUBLIC_API_BASE_URL}/photos/<sha256>`) instead of a base64 data
+URL. Identical uploads de-duplicate for free and the bytes never change for a
+given URL, so GET /photos/{hash} can be cached forever.
+
+Backends (PHOTO_STORAGE_BACKEND):
+  local — files under PHOTO_STORAGE_DIR, fanned out as ab/cd/<sha256>
+  s3    — any S3-compatible object store (AWS, R2, MinIO) via boto3, which is
+          an optional dependency only needed when this backend is selected
+"""
+import base64
+import binascii
+import hashlib
+import os
+import re
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from app.config import settings
+
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+_PHOTO_URL_RE = re.compile(r"/photos/([0-9a-f]{64})(?:[/?#]|$)")
+
+# Magic-byte sniffing keeps the content type out of the database entirely.
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+def is_photo_digest(value: str) -> bool:
+    return bool(_DIGEST_RE.match(value or ""))
+
+
+def sniff_content_type(head: bytes) -> str:
+    for signature, mime in _SIGNATURES:
+        if head.startswith(signature):
+            return mime
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return "application/octet-stream"
+
+
+class LocalPhotoStore:
+    """Stores photos on the local filesystem."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    def put(self, digest: str, data: bytes, content_type: str) -> None:
+        path = self._path(digest)
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so a concurrent reader never sees a partial file.
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+    def size(self, digest: str) -> Optional[int]:
+        try:
+            return self._path(digest).stat().st_size
+        except FileNotFoundError:
+            return None
+
+    def read(self, digest: str, start: int = 0, end: Optional[int] = None) -> Optional[bytes]:
+        """Return bytes [start, end] inclusive (whole object when end is None)."""
+        try:
+            with open(self._path(digest), "rb") as fh:
+                fh.seek(start)
+                return fh.read() if end is None else fh.read(end - start + 1)
+        except FileNotFoundError:
+            return None
+
+
+class S3PhotoStore:
+    """Stores photos in an S3-compatible bucket."""
+
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: str = "", region: str = ""):
+        try:
+            import boto3
+        except ImportError as exc:
+            raise RuntimeError("PHOTO_STORAGE_BACKEND=s3 requires boto3 to be installed.") from exc
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            region_name=region or None,
+        )
+
+    def _key(self, digest: str) -> str:
+        return f"{self.prefix}/{digest}" if self.prefix else digest
+
+    def _missing(self, exc: Exception) -> bool:
+        code = getattr(exc, "response", {}).get("Error", {}).get("Code")
+        return code in ("404", "NoSuchKey", "NotFound")
+
+    def put(self, digest: str, data: bytes, content_type: str) -> None:
+        if self.size(digest) is not None:
+            return
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self._key(digest),
+            Body=data,
+            ContentType=content_type,
+            CacheControl="public, max-age=31536000, immutable",
+        )
+
+    def size(self, digest: str) -> Optional[int]:
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=self._key(digest))
+        except Exception as exc:
+            if self._missing(exc):
+                return None
+            raise
+        return int(head["ContentLength"])
+
+    def read(self, digest: str, start: int = 0, end: Optional[int] = None) -> Optional[bytes]:
+        kwargs = {"Bucket": self.bucket, "Key": self._key(digest)}
+        if start or end is not None:
+            kwargs["Range"] = f"bytes={start}-{'' if end is None else end}"
+        try:
+            return self.client.get_object(**kwargs)["Body"].read()
+        except Exception as exc:
+            if self._missing(exc):
+                return None
+            raise
+
+
+@lru_cache
+def get_photo_store():
+    if settings.PHOTO_STORAGE_BACKEND == "s3":
+        return S3PhotoStore(
+            bucket=settings.PHOTO_S3_BUCKET,
+            prefix=settings.PHOTO_S3_PREFIX,
+            endpoint_url=settings.PHOTO_S3_ENDPOINT_URL,
+            region=settings.PHOTO_S3_REGION,
+        )
+    return LocalPhotoStore(settings.PHOTO_STORAGE_DIR)
+
+
+def photo_url(digest: str) -> str:
+    return f"{settings.PUBLIC_API_BASE_URL.rstrip('/')}/photos/{digest}"
+
+
+def photo_digest_from_url(value: Optional[str]) -> Optional[str]:
+    """Return the digest for a URL produced by photo_url (any host), else None."""
+    if not value or value.startswith("data:"):
+        return None
+    match = _PHOTO_URL_RE.search(value)
+    return match.group(1) if match else None
+
+
+def store_photo_bytes(data: bytes, content_type: Optional[str] = None) -> str:
+    """Store *data* (idempotently) and return its public photo URL."""
+    digest = hashlib.sha256(data).hexdigest()
+    get_photo_store().put(digest, data, content_type or sniff_content_type(data[:16]))
+    return photo_url(digest)
+
+
+def decode_data_url(value: str) -> Optional[tuple[bytes, str]]:
+    """Split `data:<mime>;base64,<payload>` into (bytes, mime); None if malformed."""
+    if not value or not value.startswith("data:"):
+        return None
+    header, sep, encoded = value.partition(",")
+    if not sep or ";base64" not in header:
+        return None
+    try:
+        data = base64.b64decode(encoded, validate=False)
+    except (binascii.Error, ValueError):
+        return None
+    mime = header[len("data:"):].split(";", 1)[0] or sniff_content_type(data[:16])
+    return data, mime
+
+
+def externalize_photo(value: Optional[str]) -> Optional[str]:
+    """Move an inline data URL into the store; other values pass through."""
+    decoded = decode_data_url(value) if value else None
+    if decoded is None:
+        return value
+    data, mime = decoded
+    return store_photo_bytes(data, mime)
+
+
+def load_photo_bytes(value: Optional[str]) -> Optional[bytes]:
+    """Bytes for a stored photo URL or a legacy data URL; None for anything else."""
+    digest = photo_digest_from_url(value)
+    if digest:
+        return get_photo_store().read(digest)
+    decoded = decode_data_url(value) if value else None
+    return decoded[0] if decoded else None
@@ -2,31 +2,53 @@
 
 Accepts messy reseller spreadsheets and maps common column names into the
 Vendora inventory model. The router owns authentication and persistence.
+
+Large sheets are read as a stream: rows come off csv.reader / openpyxl's
+read-only iterator one at a time, the header is found in the first
+HEADER_PROBE_ROWS rows, and every later row is mapped and validated as it
+arrives (iter_spreadsheet_rows → iter_parsed_rows). parsed_spreadsheet runs
+that pipeline in the process pool and spools the parsed rows to a temp file
+the caller iterates, so peak memory stays flat whatever the sheet size.
+Hand-built size layouts (horizontal size tables, size/qty matrices) look
+around each block, so a sheet recognised as one in the probe is read whole;
+they are small by nature.
 """
 from __future__ import annotations
 
 import csv
-import base64
 import hashlib
 import io
-from itertools import takewhile
+from contextlib import contextmanager
+from functools import partial
+from itertools import chain, islice, takewhile
+import os
+import pickle
 import posixpath
 import re
+import shutil
+import tempfile
 import zipfile
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal, InvalidOperation
-from typing import Any
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, Union
 from xml.etree import ElementTree
 from urllib.parse import parse_qs, urlencode, urlparse
 
 from fastapi import HTTPException, status
 
+from app.services import parse_cache
+from app.services.photo_store import store_photo_bytes
+from app.services.worker_pool import WorkerLimitExceeded, process_map, run_in_process
 
 MAX_CSV_IMPORT_BYTES = 8 * 1024 * 1024
 MAX_XLSX_IMPORT_BYTES = 50 * 1024 * 1024
 MAX_EMBEDDED_IMAGE_BYTES = 12 * 1024 * 1024
 MAX_EMBEDDED_IMAGE_DIMENSION = 640
 JPEG_THUMBNAIL_QUALITY = 76
+HEADER_PROBE_ROWS = 25
+
+# Raw file bytes, or a seekable binary file holding them (e.g. a spooled upload).
+SpreadsheetSource = Union[bytes, BinaryIO]
 
 FIELD_ALIASES: dict[str, set[str]] = {
     "name": {"name", "item", "itemname", "title", "product", "productname", "description"},
@@ -152,13 +174,22 @@ class ParsedImportRow:
     external_id: str
     raw: dict[str, Any]
     warnings: list[str]
+    # Fields the seller should review ({"missing_price": True, ...}); kept
+    # as item provenance, not on the item.
+    review: dict[str, bool] = field(default_factory=dict)
+
+    def source_cells(self) -> dict[str, Any]:
+        """The row's non-empty cells by header, as stored in item provenance."""
+        return {
+            str(k): v for k, v in self.raw.items() if not str(k).startswith("__") and v not in (None, "")
+        }
 
 
 @dataclass(frozen=True)
 class EmbeddedImage:
     row: int
     col: int
-    data_url: str
+    url: str  # photo store URL
 
 
 def normalize_header(value: Any) -> str:
@@ -167,9 +198,9 @@ def normalize_header(value: Any) -> str:
 
 def resolve_field(header: str) -> str | None:
     normalized = normalize_header(header)
-    for field, aliases in FIELD_ALIASES.items():
+    for name, aliases in FIELD_ALIASES.items():
         if normalized in {normalize_header(alias) for alias in aliases}:
-            return field
+            return name
     return None
 
 
@@ -298,17 +329,41 @@ def google_sheet_candidate_csv_urls(url: str, html: str, limit: int = 80) -> lis
     ]
 
 
-def detect_format(filename: str | None, content_type: str | None, content: bytes) -> str:
+def _peek(content: SpreadsheetSource, size: int) -> bytes:
+    if isinstance(content, (bytes, bytearray)):
+        return bytes(content[:size])
+    content.seek(0)
+    head = content.read(size)
+    content.seek(0)
+    return head
+
+
+def _source_size(content: SpreadsheetSource) -> int:
+    if isinstance(content, (bytes, bytearray)):
+        return len(content)
+    size = content.seek(0, os.SEEK_END)
+    content.seek(0)
+    return size
+
+
+def _binary_source(content: SpreadsheetSource) -> BinaryIO:
+    if isinstance(content, (bytes, bytearray)):
+        return io.BytesIO(content)
+    content.seek(0)
+    return content
+
+
+def detect_format(filename: str | None, content_type: str | None, content: SpreadsheetSource) -> str:
     name = (filename or "").lower()
     ctype = (content_type or "").lower()
-    if name.endswith(".xlsx") or "spreadsheetml" in ctype or content.startswith(b"PK"):
+    if name.endswith(".xlsx") or "spreadsheetml" in ctype or _peek(content, 2) == b"PK":
         return "xlsx"
     return "csv"
 
 
-def _reject_html_download(content: bytes, content_type: str | None = None) -> None:
+def _reject_html_download(content: SpreadsheetSource, content_type: str | None = None) -> None:
     ctype = (content_type or "").lower()
-    prefix = content[:512].lstrip().lower()
+    prefix = _peek(content, 512).lstrip().lower()
     if "text/html" in ctype or prefix.startswith(b"<!doctype html") or prefix.startswith(b"<html"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -623,7 +678,11 @@ def _warehouse_matrix_rows_to_dicts(
     return rows
 
 
-def _image_data_url(image_bytes: bytes, path: str) -> str | None:
+def _embedded_thumbnail(image_bytes: bytes, path: str) -> tuple[bytes, str] | None:
+    """Shrink an embedded sheet image to a JPEG thumbnail; returns (bytes, mime).
+
+    Pure CPU work with no I/O, so it can run in the process pool.
+    """
     if len(image_bytes) > MAX_EMBEDDED_IMAGE_BYTES:
         return None
 
@@ -643,8 +702,7 @@ def _image_data_url(image_bytes: bytes, path: str) -> str | None:
                     image = image.convert("RGB")
                 output = io.BytesIO()
                 image.save(output, format="JPEG", quality=JPEG_THUMBNAIL_QUALITY)
-                encoded = base64.b64encode(output.getvalue()).decode("ascii")
-                return f"data:image/jpeg;base64,{encoded}"
+                return output.getvalue(), "image/jpeg"
         except Exception:
             pass
 
@@ -657,8 +715,13 @@ def _image_data_url(image_bytes: bytes, path: str) -> str | None:
     }.get(extension)
     if not mime:
         return None
-    encoded = base64.b64encode(image_bytes).decode("ascii")
-    return f"data:{mime};base64,{encoded}"
+    return image_bytes, mime
+
+
+def _store_embedded_image(image_bytes: bytes, path: str) -> str | None:
+    """Shrink an embedded sheet image and put it in the photo store; returns its URL."""
+    thumbnail = _embedded_thumbnail(image_bytes, path)
+    return store_photo_bytes(*thumbnail) if thumbnail else None
 
 
 def _resolve_xlsx_relationship_path(base_path: str, target: str) -> str:
@@ -667,85 +730,144 @@ def _resolve_xlsx_relationship_path(base_path: str, target: str) -> str:
     return posixpath.normpath(posixpath.join(posixpath.dirname(base_path), target))
 
 
-def _xlsx_first_sheet_images(content: bytes) -> list[EmbeddedImage]:
-    namespaces = {
-        "main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
-        "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
-        "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
-        "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
-        "xdr": "http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing",
-    }
+_XLSX_NAMESPACES = {
+    "main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "xdr": "http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing",
+}
 
-    try:
-        archive = zipfile.ZipFile(io.BytesIO(content))
-    except zipfile.BadZipFile:
-        return []
+# (row, col, media path in the archive) of one image anchored on a sheet.
+ImageAnchor = tuple[int, int, str]
 
-    try:
-        sheet_xml = archive.read("xl/worksheets/sheet1.xml")
-        sheet_rels_xml = archive.read("xl/worksheets/_rels/sheet1.xml.rels")
-    except KeyError:
-        return []
 
-    sheet_root = ElementTree.fromstring(sheet_xml)
-    drawing = sheet_root.find("main:drawing", namespaces)
-    if drawing is None:
-        return []
-    drawing_rel_id = drawing.attrib.get(f"{{{namespaces['r']}}}id")
-    if not drawing_rel_id:
-        return []
+class XlsxPackage:
+    """An XLSX file's zip archive, opened once.
 
-    sheet_rels = ElementTree.fromstring(sheet_rels_xml)
-    drawing_target = None
-    for relationship in sheet_rels.findall("rel:Relationship", namespaces):
-        if relationship.attrib.get("Id") == drawing_rel_id:
-            drawing_target = relationship.attrib.get("Target")
-            break
-    if not drawing_target:
-        return []
+    The first sheet's drawing relationships are parsed on first use of
+    first_sheet_anchors and kept; media files are read only when images are
+    actually thumbnailed.
+    """
 
-    drawing_path = _resolve_xlsx_relationship_path("xl/worksheets/sheet1.xml", drawing_target)
-    drawing_rels_path = posixpath.join(
-        posixpath.dirname(drawing_path),
-        "_rels",
-        f"{posixpath.basename(drawing_path)}.rels",
-    )
+    def __init__(self, content: SpreadsheetSource | str):
+        # Raises zipfile.BadZipFile for anything that is not a zip archive.
+        self.archive = zipfile.ZipFile(content if isinstance(content, str) else _binary_source(content))
+        self._anchors: list[ImageAnchor] | None = None
 
-    try:
-        drawing_root = ElementTree.fromstring(archive.read(drawing_path))
-        drawing_rels = ElementTree.fromstring(archive.read(drawing_rels_path))
-    except KeyError:
-        return []
+    def close(self) -> None:
+        self.archive.close()
 
-    media_targets = {
-        relationship.attrib.get("Id"): relationship.attrib.get("Target")
-        for relationship in drawing_rels.findall("rel:Relationship", namespaces)
-    }
+    def __enter__(self) -> "XlsxPackage":
+        return self
 
-    images: list[EmbeddedImage] = []
-    for anchor_name in ("oneCellAnchor", "twoCellAnchor"):
-        for anchor in drawing_root.findall(f"xdr:{anchor_name}", namespaces):
-            marker = anchor.find("xdr:from", namespaces)
-            blip = anchor.find(".//a:blip", namespaces)
-            if marker is None or blip is None:
-                continue
-            embed_id = blip.attrib.get(f"{{{namespaces['r']}}}embed")
-            media_target = media_targets.get(embed_id)
-            if not media_target:
-                continue
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
-            media_path = _resolve_xlsx_relationship_path(drawing_path, media_target)
-            try:
-                data_url = _image_data_url(archive.read(media_path), media_path)
-            except KeyError:
-                data_url = None
-            if not data_url:
-                continue
+    @property
+    def first_sheet_anchors(self) -> list[ImageAnchor]:
+        if self._anchors is None:
+            self._anchors = self._read_first_sheet_anchors()
+        return self._anchors
+
+    def _read_first_sheet_anchors(self) -> list[ImageAnchor]:
+        namespaces = _XLSX_NAMESPACES
+        archive = self.archive
+        try:
+            sheet_xml = archive.read("xl/worksheets/sheet1.xml")
+            sheet_rels_xml = archive.read("xl/worksheets/_rels/sheet1.xml.rels")
+        except KeyError:
+            return []
+
+        sheet_root = ElementTree.fromstring(sheet_xml)
+        drawing = sheet_root.find("main:drawing", namespaces)
+        if drawing is None:
+            return []
+        drawing_rel_id = drawing.attrib.get(f"{{{namespaces['r']}}}id")
+        if not drawing_rel_id:
+            return []
+
+        sheet_rels = ElementTree.fromstring(sheet_rels_xml)
+        drawing_target = None
+        for relationship in sheet_rels.findall("rel:Relationship", namespaces):
+            if relationship.attrib.get("Id") == drawing_rel_id:
+                drawing_target = relationship.attrib.get("Target")
+                break
+        if not drawing_target:
+            return []
+
+        drawing_path = _resolve_xlsx_relationship_path("xl/worksheets/sheet1.xml", drawing_target)
+        drawing_rels_path = posixpath.join(
+            posixpath.dirname(drawing_path),
+            "_rels",
+            f"{posixpath.basename(drawing_path)}.rels",
+        )
+
+        try:
+            drawing_root = ElementTree.fromstring(archive.read(drawing_path))
+            drawing_rels = ElementTree.fromstring(archive.read(drawing_rels_path))
+        except KeyError:
+            return []
+
+        media_targets = {
+            relationship.attrib.get("Id"): relationship.attrib.get("Target")
+            for relationship in drawing_rels.findall("rel:Relationship", namespaces)
+        }
+        members = set(archive.namelist())
+
+        anchors: list[ImageAnchor] = []
+        for anchor_name in ("oneCellAnchor", "twoCellAnchor"):
+            for anchor in drawing_root.findall(f"xdr:{anchor_name}", namespaces):
+                marker = anchor.find("xdr:from", namespaces)
+                blip = anchor.find(".//a:blip", namespaces)
+                if marker is None or blip is None:
+                    continue
+                embed_id = blip.attrib.get(f"{{{namespaces['r']}}}embed")
+                media_target = media_targets.get(embed_id)
+                if not media_target:
+                    continue
+
+                media_path = _resolve_xlsx_relationship_path(drawing_path, media_target)
+                if media_path not in members:
+                    continue
 
-            row = int(marker.findtext("xdr:row", default="0", namespaces=namespaces)) + 1
-            col = int(marker.findtext("xdr:col", default="0", namespaces=namespaces)) + 1
-            images.append(EmbeddedImage(row=row, col=col, data_url=data_url))
-    return images
+                row = int(marker.findtext("xdr:row", default="0", namespaces=namespaces)) + 1
+                col = int(marker.findtext("xdr:col", default="0", namespaces=namespaces)) + 1
+                anchors.append((row, col, media_path))
+        return anchors
+
+    def first_sheet_images(
+        self,
+        map_images=map,
+        anchors: list[ImageAnchor] | None = None,
+    ) -> list[EmbeddedImage]:
+        """Images anchored on the first sheet, thumbnailed and stored.
+
+        Thumbnails are made with map_images(_embedded_thumbnail, blobs, paths);
+        pass worker_pool.process_map to decode them in parallel across cores.
+        Each media file is thumbnailed once however many anchors use it.
+        *anchors* defaults to first_sheet_anchors.
+        """
+        if anchors is None:
+            anchors = self.first_sheet_anchors
+        paths = list(dict.fromkeys(path for _, _, path in anchors))
+        thumbnails = map_images(_embedded_thumbnail, [self.archive.read(path) for path in paths], paths)
+        urls = {
+            path: store_photo_bytes(*thumbnail)
+            for path, thumbnail in zip(paths, thumbnails)
+            if thumbnail
+        }
+        return [EmbeddedImage(row=row, col=col, url=urls[path]) for row, col, path in anchors if path in urls]
+
+
+def _xlsx_first_sheet_images(content: SpreadsheetSource | str, map_images=map) -> list[EmbeddedImage]:
+    """XlsxPackage.first_sheet_images for raw content; [] when it is not a zip."""
+    try:
+        package = XlsxPackage(content)
+    except zipfile.BadZipFile:
+        return []
+    with package:
+        return package.first_sheet_images(map_images)
 
 
 def _closest_matrix_image(
@@ -767,28 +889,18 @@ def _closest_matrix_image(
         candidates.append((score, image))
     if not candidates:
         return None
-    return min(candidates, key=lambda item: item[0])[1].data_url
+    return min(candidates, key=lambda item: item[0])[1].url
 
 
-def _table_rows_to_dicts(
-    table_rows: list[list[Any]],
-    embedded_images: list[EmbeddedImage] | None = None,
-) -> list[dict[str, Any]]:
-    horizontal_rows = _horizontal_size_table_rows_to_dicts(table_rows)
-    if horizontal_rows:
-        return horizontal_rows
-
-    matrix_rows = _warehouse_matrix_rows_to_dicts(table_rows, embedded_images or [])
-    if matrix_rows:
-        return matrix_rows
-
+def _detect_header(table_rows: list[list[Any]]) -> tuple[int, list[str]] | None:
+    """(index, headers) of the best header among the first HEADER_PROBE_ROWS rows."""
     candidates = [
         (idx, _header_score(row))
-        for idx, row in enumerate(table_rows[:25])
+        for idx, row in enumerate(table_rows[:HEADER_PROBE_ROWS])
         if any(str(value or "").strip() for value in row)
     ]
     if not candidates:
-        return []
+        return None
 
     header_idx, score = max(candidates, key=lambda item: item[1])
     if score < 3:
@@ -799,24 +911,157 @@ def _table_rows_to_dicts(
                 "Brand, Cost, List Price, Qty, or Image URL."
             ),
         )
+    return header_idx, _unique_headers(table_rows[header_idx])
 
-    headers = _unique_headers(table_rows[header_idx])
-    rows: list[dict[str, Any]] = []
-    for row in table_rows[header_idx + 1:]:
+
+def _dict_rows(headers: list[str], table_rows: Iterable[list[Any]]) -> Iterator[dict[str, Any]]:
+    for row in table_rows:
         if not any(value not in (None, "") for value in row):
             continue
-        rows.append({
+        yield {
             headers[idx]: value
             for idx, value in enumerate(row)
             if idx < len(headers) and value not in (None, "")
-        })
-    return rows
+        }
+
+
+def _table_rows_to_dicts(
+    table_rows: list[list[Any]],
+    embedded_images: list[EmbeddedImage] | None = None,
+) -> list[dict[str, Any]]:
+    horizontal_rows = _horizontal_size_table_rows_to_dicts(table_rows)
+    if horizontal_rows:
+        return horizontal_rows
+
+    matrix_rows = _warehouse_matrix_rows_to_dicts(table_rows, embedded_images or [])
+    if matrix_rows:
+        return matrix_rows
+
+    header = _detect_header(table_rows)
+    if header is None:
+        return []
+    header_idx, headers = header
+    return list(_dict_rows(headers, table_rows[header_idx + 1:]))
+
+
+TABLE_LAYOUT = "table"
+SIZE_TABLE_LAYOUT = "horizontal_size_table"
+MATRIX_LAYOUT = "size_quantity_matrix"
+
+# The first sheet's embedded images, or a callable that produces them when
+# (and only when) the chosen sheet turns out to need them.
+EmbeddedImages = Union[list[EmbeddedImage], Callable[[], list[EmbeddedImage]], None]
+
+
+@dataclass
+class SheetProbe:
+    """The head of one sheet, scored; *rest* continues the sheet's row stream."""
+    layout: str
+    head: list[list[Any]]
+    rest: Iterator[Any]
+    header: tuple[int, list[str]] | None = None
+
+
+def probe_sheet(table_rows: Iterable[Any]) -> SheetProbe:
+    """Read HEADER_PROBE_ROWS rows of a sheet and decide its layout.
+
+    Raises the missing-header HTTPException for a plain table without one,
+    so callers can move on to the next sheet having read only its head.
+    """
+    rows = iter(table_rows)
+    head = [list(row) for row in islice(rows, HEADER_PROBE_ROWS)]
+    if _horizontal_size_table_rows_to_dicts(head):
+        return SheetProbe(SIZE_TABLE_LAYOUT, head, rows)
+    if _warehouse_matrix_rows_to_dicts(head, []):
+        return SheetProbe(MATRIX_LAYOUT, head, rows)
+    return SheetProbe(TABLE_LAYOUT, head, rows, header=_detect_header(head))
+
+
+def _probed_rows(probe: SheetProbe, embedded_images: EmbeddedImages = None) -> Iterator[dict[str, Any]]:
+    if probe.layout == TABLE_LAYOUT:
+        if probe.header is None:
+            return iter(())
+        header_idx, headers = probe.header
+        return _dict_rows(headers, chain(probe.head[header_idx + 1:], probe.rest))
+
+    # Size layouts look around each block, so they are read whole; they are
+    # hand-built sheets, small by nature. Only matrices place images.
+    table_rows = probe.head + [list(row) for row in probe.rest]
+    images: list[EmbeddedImage] = []
+    if probe.layout == MATRIX_LAYOUT:
+        images = (embedded_images() if callable(embedded_images) else embedded_images) or []
+    return iter(_table_rows_to_dicts(table_rows, images))
+
+
+def has_inventory_layout(filename: str | None, content_type: str | None, content: bytes) -> bool:
+    """Whether a download's first rows hold a sheet the import can read.
+
+    Reads only HEADER_PROBE_ROWS rows of a CSV; workbooks are left to the
+    import itself (it probes each of their sheets).
+    """
+    if detect_format(filename, content_type, content) == "xlsx":
+        return True
+    try:
+        _reject_html_download(content, content_type)
+        probe = probe_sheet(_csv_table_rows(io.BytesIO(content)))
+    except HTTPException:
+        return False
+    return probe.layout != TABLE_LAYOUT or probe.header is not None
+
 
+def _stream_table_rows(
+    table_rows: Iterable[Any],
+    embedded_images: EmbeddedImages = None,
+) -> Iterator[dict[str, Any]]:
+    """_table_rows_to_dicts over a row stream, holding only the probe rows.
 
-def rows_from_bytes(content: bytes, file_format: str, content_type: str | None = None) -> list[dict[str, Any]]:
+    Layout and header are decided from the first HEADER_PROBE_ROWS rows, so
+    header errors raise here, before any row is consumed by the caller.
+    """
+    return _probed_rows(probe_sheet(table_rows), embedded_images)
+
+
+def _closing_workbook(workbook, rows: Iterator[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    try:
+        yield from rows
+    finally:
+        workbook.close()
+
+
+def _csv_table_rows(source: BinaryIO) -> Iterator[list[str]]:
+    text = io.TextIOWrapper(source, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        sample = text.read(2048)
+        text.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample) if sample.strip() else csv.excel
+        except csv.Error:
+            dialect = csv.excel
+        if getattr(dialect, "delimiter", ",") in {"\r", "\n"}:
+            dialect = csv.excel
+        yield from csv.reader(text, dialect=dialect)
+    finally:
+        text.detach()  # leave the caller's file open
+
+
+def iter_spreadsheet_rows(
+    content: SpreadsheetSource,
+    file_format: str,
+    content_type: str | None = None,
+    embedded_images: EmbeddedImages = None,
+) -> Iterator[dict[str, Any]]:
+    """Header-detected rows of a CSV or XLSX file, one at a time.
+
+    Size, HTML and header problems raise on the call, not mid-iteration.
+    Workbook sheets are probed in order by their first HEADER_PROBE_ROWS
+    rows; only the first one with a usable layout is read in full.
+    *embedded_images* are the first sheet's images (or a callable returning
+    them) when the caller supplies them; otherwise they are read from the
+    file, and only if that sheet is a size/qty matrix.
+    """
     max_bytes = MAX_XLSX_IMPORT_BYTES if file_format == "xlsx" else MAX_CSV_IMPORT_BYTES
     max_mb = max_bytes // (1024 * 1024)
-    if len(content) > max_bytes:
+    if _source_size(content) > max_bytes:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail=f"Spreadsheet is too large. Import files must be {max_mb} MB or less.",
@@ -832,37 +1077,178 @@ def rows_from_bytes(content: bytes, file_format: str, content_type: str | None =
                 detail="XLSX import support is not installed on the server.",
             ) from exc
 
-        workbook = load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+        workbook = load_workbook(_binary_source(content), read_only=True, data_only=True)
         last_error: HTTPException | None = None
         try:
             for sheet_idx, sheet in enumerate(workbook.worksheets):
-                table_rows = [list(row) for row in sheet.iter_rows(values_only=True)]
                 try:
-                    embedded_images = _xlsx_first_sheet_images(content) if sheet_idx == 0 else []
-                    return _table_rows_to_dicts(table_rows, embedded_images=embedded_images)
+                    probe = probe_sheet(sheet.iter_rows(values_only=True))
                 except HTTPException as exc:
                     last_error = exc
                     continue
-        finally:
+                if sheet_idx > 0:
+                    sheet_images: EmbeddedImages = []
+                elif embedded_images is not None:
+                    sheet_images = embedded_images
+                else:
+                    sheet_images = partial(_xlsx_first_sheet_images, content)
+                return _closing_workbook(workbook, _probed_rows(probe, sheet_images))
+        except BaseException:
             workbook.close()
+            raise
+        workbook.close()
         if last_error:
             raise last_error
+        return iter(())
+
+    return _stream_table_rows(_csv_table_rows(_binary_source(content)))
+
+
+def rows_from_bytes(
+    content: SpreadsheetSource,
+    file_format: str,
+    content_type: str | None = None,
+    embedded_images: EmbeddedImages = None,
+) -> list[dict[str, Any]]:
+    """All rows of iter_spreadsheet_rows as a list (small sheets, tests)."""
+    return list(iter_spreadsheet_rows(content, file_format, content_type, embedded_images))
+
+
+class ParsedRowSpool:
+    """ParsedImportRows spooled to a file by spool_parsed_rows, read back lazily.
+
+    *handle* is the open spool file; the owner closes it.
+    """
+
+    def __init__(self, handle: BinaryIO, count: int):
+        self.handle = handle
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[ParsedImportRow]:
+        self.handle.seek(0)
+        for _ in range(self.count):
+            yield pickle.load(self.handle)
+
+
+@dataclass(frozen=True)
+class SheetImagesNeeded:
+    """spool_parsed_rows result: the sheet places images; thumbnail these first."""
+    anchors: list[ImageAnchor]
+
+
+class _ImagesNeeded(Exception):
+    def __init__(self, anchors: list[ImageAnchor]):
+        super().__init__(anchors)
+        self.anchors = anchors
+
+
+def spool_parsed_rows(
+    path: str,
+    file_format: str,
+    content_type: str | None,
+    embedded_images: list[EmbeddedImage] | None,
+    out_path: str,
+) -> int | SheetImagesNeeded:
+    """Stream *path* through parsing and write each ParsedImportRow to *out_path*.
+
+    Runs in the process pool; returns the number of rows written. Image
+    thumbnails belong on the whole pool, not in this one process, so when
+    embedded_images is None and the chosen sheet is a matrix with anchored
+    images, nothing is written and SheetImagesNeeded comes back instead;
+    call again with the thumbnailed images.
+    """
+    def images_from_caller() -> list[EmbeddedImage]:
+        with XlsxPackage(path) as package:
+            anchors = package.first_sheet_anchors
+        if anchors:
+            raise _ImagesNeeded(anchors)
         return []
 
-    text = content.decode("utf-8-sig", errors="replace")
-    sample = text[:2048]
-    try:
-        dialect = csv.Sniffer().sniff(sample) if sample.strip() else csv.excel
-    except csv.Error:
-        dialect = csv.excel
-    if getattr(dialect, "delimiter", ",") in {"\r", "\n"}:
-        dialect = csv.excel
-    return _table_rows_to_dicts([list(row) for row in csv.reader(io.StringIO(text), dialect=dialect)])
+    count = 0
+    with open(path, "rb") as source, open(out_path, "wb") as out:
+        try:
+            rows = iter_spreadsheet_rows(
+                source, file_format, content_type,
+                images_from_caller if embedded_images is None else embedded_images,
+            )
+        except _ImagesNeeded as needed:
+            return SheetImagesNeeded(needed.anchors)
+        for parsed_row in iter_parsed_rows(rows):
+            pickle.dump(parsed_row, out, protocol=pickle.HIGHEST_PROTOCOL)
+            count += 1
+    return count
+
+
+@contextmanager
+def _source_path(content: SpreadsheetSource) -> Iterator[str]:
+    """A filesystem path holding *content* (spooled uploads are used in place)."""
+    name = getattr(content, "name", None)
+    if isinstance(name, str) and os.path.isfile(name):
+        content.flush()
+        yield name
+        return
+    with tempfile.NamedTemporaryFile(prefix="vendora-import-") as spool:
+        if isinstance(content, (bytes, bytearray)):
+            spool.write(content)
+        else:
+            content.seek(0)
+            shutil.copyfileobj(content, spool)
+        spool.flush()
+        yield spool.name
+
+
+@contextmanager
+def parsed_spreadsheet(
+    content: SpreadsheetSource,
+    file_format: str,
+    content_type: str | None = None,
+) -> Iterator[ParsedRowSpool]:
+    """Parse a sheet on the process pool (blocks the caller); yields its rows.
+
+    The sheet is streamed through parsing in one pool process, under the
+    per-call CPU and memory limits, into a temp file that is removed when
+    the block exits. Embedded images are only touched when the chosen sheet
+    is a size/qty matrix: the pool process reports their anchors, they are
+    thumbnailed in parallel across the pool and stored from this process,
+    and the (small) sheet is parsed again with them.
+
+    Parses are kept in services.parse_cache, keyed by a hash of the file:
+    importing the same sheet again (a commit after a dry run, a re-upload)
+    reads the cached rows and skips parsing.
+    """
+    key = parse_cache.content_key(content, file_format, (content_type or "").lower())
+    cached = parse_cache.get(key)
+    if cached is not None:
+        handle, count = cached
+        with handle:
+            yield ParsedRowSpool(handle, count)
+        return
+
+    with _source_path(content) as path, parse_cache.spool_file() as out:
+        try:
+            count = run_in_process(spool_parsed_rows, path, file_format, content_type, None, out.name)
+            if isinstance(count, SheetImagesNeeded):
+                with XlsxPackage(path) as package:
+                    embedded_images = package.first_sheet_images(process_map, anchors=count.anchors)
+                count = run_in_process(spool_parsed_rows, path, file_format, content_type, embedded_images, out.name)
+        except (WorkerLimitExceeded, MemoryError) as exc:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Spreadsheet is too large or complex to import. Split it into smaller files.",
+            ) from exc
+        parse_cache.put(key, out.name, count)
+        yield ParsedRowSpool(out, count)
+
 
+def parse_inventory_rows(rows: Iterable[dict[str, Any]]) -> list[ParsedImportRow]:
+    return list(iter_parsed_rows(rows))
 
-def parse_inventory_rows(rows: list[dict[str, Any]]) -> list[ParsedImportRow]:
-    parsed_rows: list[ParsedImportRow] = []
 
+def iter_parsed_rows(rows: Iterable[dict[str, Any]]) -> Iterator[ParsedImportRow]:
+    """Map and validate spreadsheet rows into import payloads, one at a time."""
     for idx, raw in enumerate(rows, start=2):
         row_number = idx
         raw_row_number = raw.get("__row_number")
@@ -899,7 +1285,7 @@ def parse_inventory_rows(rows: list[dict[str, Any]]) -> list[ParsedImportRow]:
 
         if not mapped.get("name"):
             warnings.append("Skipped row without item name or usable identifier.")
-            parsed_rows.append(ParsedImportRow(row_number, {}, "", raw, warnings))
+            yield ParsedImportRow(row_number, {}, "", raw, warnings)
             continue
 
         payload: dict[str, Any] = {
@@ -932,19 +1318,16 @@ def parse_inventory_rows(rows: list[dict[str, Any]]) -> list[ParsedImportRow]:
         if photo_back_url:
             payload["photo_back_url"] = photo_back_url
 
-        custom_attributes["import_raw"] = {
-            str(k): v for k, v in raw.items() if not str(k).startswith("__") and v not in (None, "")
-        }
-
+        review: dict[str, bool] = {}
         if not payload.get("buy_price") and not payload.get("expected_sell_price") and not payload.get("actual_sell_price"):
             warnings.append("Price missing. Ask the user to add cost or list price before selling this item.")
-            custom_attributes.setdefault("import_review", {})["missing_price"] = True
+            review["missing_price"] = True
         if not payload.get("size") and not custom_attributes.get("variants"):
             warnings.append("Size missing. Ask the user to confirm the size or mark it one-size.")
-            custom_attributes.setdefault("import_review", {})["missing_size"] = True
+            review["missing_size"] = True
         if not payload.get("photo_front_url"):
             warnings.append("Photo missing. Ask the user if they want to add a product photo.")
-            custom_attributes.setdefault("import_review", {})["missing_photo"] = True
+            review["missing_photo"] = True
 
         payload["custom_attributes"] = custom_attributes
         payload = {k: v for k, v in payload.items() if v not in (None, "")}
@@ -953,6 +1336,4 @@ def parse_inventory_rows(rows: list[dict[str, Any]]) -> list[ParsedImportRow]:
             str(payload.get(field, "")) for field in ("sku", "upc", "name", "size", "color")
         )
         external_id = hashlib.sha256(fingerprint_base.encode("utf-8")).hexdigest()[:32]
-        parsed_rows.append(ParsedImportRow(row_number, payload, external_id, raw, warnings))
-
-    return parsed_rows
+        yield ParsedImportRow(row_number, payload, external_id, raw, warnings, review)
@@ -0,0 +1,209 @@
+"""Shared worker pools for CPU-heavy work requested from async endpoints.
+
+Image decoding/resizing (Pillow releases the GIL while it works) must not
+run on the event loop, or one large upload stalls every other request on
+the worker. `run_in_worker` hands a callable to a small, bounded thread
+pool sized by WORKER_POOL_SIZE and awaits the result.
+
+Pure-Python CPU work (openpyxl workbook parsing, spreadsheet image
+thumbnails) holds the GIL, so a thread alone would still starve the
+process; it goes to a bounded process pool instead. `run_in_process` runs
+one call there and `process_map` fans a function out across the pool's
+cores. Both block the calling thread, so call them from worker threads,
+never from the event loop. Each pool process is capped at
+PROCESS_WORKER_MEMORY_MB of address space and each call at
+PROCESS_TASK_CPU_SECONDS of CPU time; a call that runs out raises
+WorkerLimitExceeded (or MemoryError). In the testing environment, or with
+PROCESS_POOL_SIZE = -1, both run inline in the calling thread.
+
+A pool process that dies anyway (a crash in native code, the OOM killer)
+breaks the whole pool: every call in flight on it fails, other requests'
+included. The first caller to notice replaces the pool, and every affected
+call is retried once on the new one; only a call that breaks the new pool
+as well is reported as WorkerLimitExceeded.
+"""
+import asyncio
+import functools
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterable, Optional, TypeVar
+
+from fastapi import HTTPException
+
+from app.config import settings
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_process_executor: Optional[ProcessPoolExecutor] = None
+# Guards swapping _process_executor against submits to the pool being swapped out.
+_process_lock = threading.RLock()
+
+# How often a call whose pool broke under it is retried on a fresh pool.
+BROKEN_POOL_RETRIES = 1
+
+
+class WorkerLimitExceeded(RuntimeError):
+    """A pool process was killed for exceeding its CPU (or memory) limit."""
+
+
+def _pool_size() -> int:
+    return settings.WORKER_POOL_SIZE or min(4, os.cpu_count() or 1)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=_pool_size(), thread_name_prefix="vendora-worker")
+    return _executor
+
+
+async def run_in_worker(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run fn(*args, **kwargs) on the worker pool without blocking the loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(fn, *args, **kwargs))
+
+
+# ─── Process pool ─────────────────────────────────────────────────────────────
+
+def _runs_inline() -> bool:
+    return settings.ENVIRONMENT == "testing" or settings.PROCESS_POOL_SIZE < 0
+
+
+def _limit_process_memory(memory_mb: int) -> None:
+    """Pool process initializer: cap the address space of the process."""
+    if resource is not None and memory_mb > 0:
+        limit = memory_mb * 1024 * 1024
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+class _RaisedHTTPException:
+    """Carries an HTTPException back from a pool process (it does not pickle)."""
+
+    def __init__(self, exc: HTTPException):
+        self.status_code = exc.status_code
+        self.detail = exc.detail
+        self.headers = exc.headers
+
+
+def _cpu_budget_exhausted(signum, frame):
+    raise WorkerLimitExceeded("Worker call exceeded its CPU time limit.")
+
+
+def _call_with_cpu_limit(cpu_seconds: int, fn: Callable[..., T], args: tuple, kwargs: dict):
+    """Runs in a pool process: fn(*args, **kwargs) with a fresh CPU budget.
+
+    RLIMIT_CPU counts the whole life of the process, so the soft limit is
+    moved to "used so far + cpu_seconds" for this call and lifted after it.
+    When the budget runs out the kernel sends SIGXCPU, whose handler raises
+    WorkerLimitExceeded in the call: the call fails, the process (and the
+    other calls on the pool) carry on.
+    """
+    limited = resource is not None and cpu_seconds > 0
+    if limited:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        soft = int(usage.ru_utime + usage.ru_stime) + cpu_seconds
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        previous_handler = signal.signal(signal.SIGXCPU, _cpu_budget_exhausted)
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    try:
+        return fn(*args, **kwargs)
+    except HTTPException as exc:
+        return _RaisedHTTPException(exc)
+    finally:
+        if limited:
+            # The kernel repeats SIGXCPU every second past the limit; ignore it until the limit is lifted.
+            signal.signal(signal.SIGXCPU, signal.SIG_IGN)
+            resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+            signal.signal(signal.SIGXCPU, previous_handler)
+
+
+def get_process_executor() -> ProcessPoolExecutor:
+    global _process_executor
+    with _process_lock:
+        if _process_executor is None:
+            _process_executor = ProcessPoolExecutor(
+                max_workers=settings.PROCESS_POOL_SIZE or min(4, os.cpu_count() or 1),
+                # spawn: never fork a process that already runs threads and an event loop.
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_limit_process_memory,
+                initargs=(settings.PROCESS_WORKER_MEMORY_MB,),
+            )
+        return _process_executor
+
+
+def _discard_broken_process_pool(executor: ProcessPoolExecutor) -> None:
+    """Shut *executor* down, unless another caller has already replaced it."""
+    global _process_executor
+    with _process_lock:
+        if _process_executor is not executor:
+            return
+        _process_executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _unwrap(result):
+    if isinstance(result, _RaisedHTTPException):
+        raise HTTPException(status_code=result.status_code, detail=result.detail, headers=result.headers)
+    return result
+
+
+def _run_on_pool(calls: list[tuple[Callable[..., Any], tuple, dict]]) -> list:
+    """Run each (fn, args, kwargs) in the process pool; results in order."""
+    for _ in range(BROKEN_POOL_RETRIES + 1):
+        try:
+            # Looked up and submitted to under the lock, so never a pool that is being shut down.
+            with _process_lock:
+                executor = get_process_executor()
+                futures = [
+                    executor.submit(_call_with_cpu_limit, settings.PROCESS_TASK_CPU_SECONDS, fn, args, kwargs)
+                    for fn, args, kwargs in calls
+                ]
+            return [_unwrap(future.result()) for future in futures]
+        except (BrokenProcessPool, CancelledError) as exc:
+            # CancelledError: another caller found the pool broken and shut it down.
+            _discard_broken_process_pool(executor)
+            error = exc
+    raise WorkerLimitExceeded("Worker process exceeded its resource limits.") from error
+
+
+def run_in_process(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run fn(*args, **kwargs) in the process pool and wait for the result.
+
+    fn, its arguments and its result must pickle.
+    """
+    if _runs_inline():
+        return fn(*args, **kwargs)
+    (result,) = _run_on_pool([(fn, args, kwargs)])
+    return result
+
+
+def process_map(fn: Callable[..., T], *iterables: Iterable[Any]) -> list[T]:
+    """list(map(fn, *iterables)) spread across the process pool, in order."""
+    if _runs_inline():
+        return list(map(fn, *iterables))
+    return _run_on_pool([(fn, args, {}) for args in zip(*iterables)])
+
+
+def shutdown_worker_pool() -> None:
+    global _executor, _process_executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+    if _process_executor is not None:
+        _process_executor.shutdown(wait=True, cancel_futures=True)
+        _process_executor = None
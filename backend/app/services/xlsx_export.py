@@ -2,22 +2,43 @@
 
 Photos are stored as base64 data URLs, which `=IMAGE()` in Sheets/Excel cannot
 render (it only accepts public http(s) URLs) — so the CSV export just showed a
-giant base64 string. This export decodes each photo and embeds the real image
-into the cell, producing a clean, image-rich spreadsheet that works everywhere.
+giant base64 string. This export loads each photo (from the photo store, or a
+legacy data URL) and embeds the real image into the cell, producing a clean,
+image-rich spreadsheet that works everywhere.
+
+The workbook is written in openpyxl's write-only mode into a temp file.
+Items are read as column tuples through a server-side cursor and written
+EXPORT_BATCH_ROWS at a time. Each photo becomes a PNG thumbnail file in a
+cache keyed by the photo's SHA-256 (EXPORT_THUMBNAIL_CACHE_DIR); the
+workbook only references those files and reads them back while it is
+saved, so neither rows nor images pile up in memory. Thumbnails missing
+from the cache are made for a whole batch at once across the process pool
+(worker_pool.process_map), and a repeat export finds them all cached. A
+batch whose thumbnailing runs past the worker limits leaves out the
+thumbnails it did not get to, instead of failing the export.
+*progress*, when given, is called with the number of items written after
+each batch (export jobs report it).
 """
 from __future__ import annotations
 
-import base64
+import hashlib
 import io
+import os
+import tempfile
+from typing import IO, Callable, Optional
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.drawing.image import Image as XLImage
 from openpyxl.styles import Alignment, Font, PatternFill
 from openpyxl.utils import get_column_letter
 from PIL import Image as PILImage
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.models.inventory import InventoryItem
+from app.services.photo_store import decode_data_url, load_photo_bytes, photo_digest_from_url
+from app.services.worker_pool import WorkerLimitExceeded, process_map
 
 # Text columns (the base64 URL + formula columns are intentionally dropped —
 # replaced by two columns of real embedded thumbnails).
@@ -28,6 +49,13 @@ _TEXT_COLUMNS = [
     "created_at", "updated_at",
 ]
 _PHOTO_COLUMNS = ["Front Photo", "Back Photo"]
+_PHOTO_KEYS = ("photo_front", "photo_back")
+_ITEM_COLUMNS = tuple(
+    getattr(InventoryItem, name)
+    for name in _TEXT_COLUMNS + ["photo_front_url", "photo_back_url", "custom_attributes"]
+)
+
+EXPORT_BATCH_ROWS = 500
 
 _THUMB_PX = 96
 _HEADER_FILL = PatternFill("solid", fgColor="F26722")
@@ -35,12 +63,13 @@ _HEADER_FONT = Font(color="FFFFFF", bold=True)
 
 
 def _decode_image(url: str | None) -> bytes | None:
-    """Return PNG bytes for a base64 data URL (or None). Resized to a thumbnail."""
-    if not url or not isinstance(url, str) or not url.startswith("data:"):
+    """Return PNG thumbnail bytes for a stored photo or data URL (or None)."""
+    if not url or not isinstance(url, str):
         return None
     try:
-        _, b64 = url.split(",", 1)
-        raw = base64.b64decode(b64)
+        raw = load_photo_bytes(url)
+        if raw is None:
+            return None
         im = PILImage.open(io.BytesIO(raw))
         im.thumbnail((_THUMB_PX, _THUMB_PX))
         if im.mode not in ("RGB", "RGBA"):
@@ -53,7 +82,46 @@ def _decode_image(url: str | None) -> bytes | None:
         return None
 
 
-def _resolved_photo(item: InventoryItem, key: str) -> str:
+def _thumbnail_key(url: str) -> Optional[str]:
+    """SHA-256 of the photo's bytes — taken from a photo store URL, computed for a data URL."""
+    digest = photo_digest_from_url(url)
+    if digest:
+        return digest
+    decoded = decode_data_url(url)
+    return hashlib.sha256(decoded[0]).hexdigest() if decoded else None
+
+
+def _write_thumbnail(url: str, path: str) -> bool:
+    """Runs in a pool process: write *url*'s thumbnail to *path*; False if it has none."""
+    png = _decode_image(url)
+    if png is None:
+        return False
+    fd, partial = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".partial")
+    with os.fdopen(fd, "wb") as out:
+        out.write(png)
+    os.replace(partial, path)  # readers never see a half-written thumbnail
+    return True
+
+
+def _thumbnail_paths(urls: list[str]) -> dict[str, str]:
+    """Cached thumbnail file of each photo in *urls* that has one, making missing ones."""
+    cache_dir = settings.EXPORT_THUMBNAIL_CACHE_DIR
+    os.makedirs(cache_dir, exist_ok=True)
+    wanted: dict[str, str] = {}
+    for url in dict.fromkeys(urls):
+        key = _thumbnail_key(url)
+        if key:
+            wanted[url] = os.path.join(cache_dir, f"{key}-{_THUMB_PX}.png")
+    missing = {path: url for url, path in wanted.items() if not os.path.exists(path)}
+    try:
+        made = process_map(_write_thumbnail, list(missing.values()), list(missing))
+    except (WorkerLimitExceeded, MemoryError):
+        made = [os.path.exists(path) for path in missing]
+    failed = {path for path, ok in zip(missing, made) if not ok}
+    return {url: path for url, path in wanted.items() if path not in failed}
+
+
+def _resolved_photo(item, key: str) -> str:
     direct = getattr(item, f"{key}_url", None)
     if direct:
         return direct
@@ -61,59 +129,88 @@ def _resolved_photo(item: InventoryItem, key: str) -> str:
     return attrs.get(key) or ""
 
 
-def export_inventory_xlsx(db: Session, user_id) -> bytes:
-    items = (
-        db.query(InventoryItem)
-        .filter(InventoryItem.user_id == user_id, InventoryItem.deleted_at.is_(None))
-        .order_by(InventoryItem.created_at.desc())
-        .all()
-    )
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Inventory"
-
-    headers = _TEXT_COLUMNS + _PHOTO_COLUMNS
-    ws.append(headers)
-    for col_idx in range(1, len(headers) + 1):
-        c = ws.cell(row=1, column=col_idx)
-        c.fill = _HEADER_FILL
-        c.font = _HEADER_FONT
-        c.alignment = Alignment(vertical="center")
-
-    # widen photo columns so thumbnails fit
-    front_col = len(_TEXT_COLUMNS) + 1
-    back_col = len(_TEXT_COLUMNS) + 2
-    for col in (front_col, back_col):
-        ws.column_dimensions[get_column_letter(col)].width = _THUMB_PX / 7.0
-
-    for r, item in enumerate(items, start=2):
-        values = [
-            str(item.id), item.name, item.category or "", item.sku or "", item.upc or "",
-            item.size or "", item.color or "", item.condition or "", item.quantity,
-            str(item.buy_price) if item.buy_price is not None else "",
-            str(item.expected_sell_price) if item.expected_sell_price is not None else "",
-            str(item.actual_sell_price) if item.actual_sell_price is not None else "",
-            item.status, item.platform or "", item.vendor_name or "", item.notes or "",
-            item.source or "", item.external_id or "",
-            item.created_at.isoformat() if item.created_at else "",
-            item.updated_at.isoformat() if item.updated_at else "",
-        ]
-        for col_idx, val in enumerate(values, start=1):
-            ws.cell(row=r, column=col_idx, value=val)
-
+def _item_values(item) -> list:
+    return [
+        str(item.id), item.name, item.category or "", item.sku or "", item.upc or "",
+        item.size or "", item.color or "", item.condition or "", item.quantity,
+        str(item.buy_price) if item.buy_price is not None else "",
+        str(item.expected_sell_price) if item.expected_sell_price is not None else "",
+        str(item.actual_sell_price) if item.actual_sell_price is not None else "",
+        item.status, item.platform or "", item.vendor_name or "", item.notes or "",
+        item.source or "", item.external_id or "",
+        item.created_at.isoformat() if item.created_at else "",
+        item.updated_at.isoformat() if item.updated_at else "",
+    ]
+
+
+def _append_batch(ws, batch: list, first_row: int) -> None:
+    """Write *batch* from row *first_row*, embedding each item's cached thumbnails."""
+    thumbnails = _thumbnail_paths([
+        url for item in batch for key in _PHOTO_KEYS if (url := _resolved_photo(item, key))
+    ])
+    for r, item in enumerate(batch, start=first_row):
         has_image = False
-        for key, col in (("photo_front", front_col), ("photo_back", back_col)):
-            png = _decode_image(_resolved_photo(item, key))
-            if png:
-                xlimg = XLImage(io.BytesIO(png))
+        for offset, key in enumerate(_PHOTO_KEYS):
+            path = thumbnails.get(_resolved_photo(item, key))
+            if path:
+                # A file reference: the image is read from disk when the workbook is saved.
+                xlimg = XLImage(path)
                 xlimg.width, xlimg.height = _THUMB_PX, _THUMB_PX
-                ws.add_image(xlimg, f"{get_column_letter(col)}{r}")
+                ws.add_image(xlimg, f"{get_column_letter(len(_TEXT_COLUMNS) + 1 + offset)}{r}")
                 has_image = True
         if has_image:
             ws.row_dimensions[r].height = _THUMB_PX * 0.75  # px → points
+        ws.append(_item_values(item))
+
+
+def export_inventory_xlsx(
+    db: Session,
+    user_id,
+    output: Optional[IO[bytes]] = None,
+    progress: Optional[Callable[[int], None]] = None,
+) -> IO[bytes]:
+    """Write the inventory workbook to *output* (default: a new temp file).
+
+    Returns the file rewound; the caller closes it.
+    """
+    items = (
+        db.query(*_ITEM_COLUMNS)
+        .filter(InventoryItem.user_id == user_id, InventoryItem.deleted_at.is_(None))
+        .order_by(InventoryItem.created_at.desc())
+        .yield_per(EXPORT_BATCH_ROWS)
+    )
 
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Inventory")
+    # Write-only sheets take layout before the first row is written.
     ws.freeze_panes = "A2"
-    buf = io.BytesIO()
-    wb.save(buf)
-    return buf.getvalue()
+    for col in range(len(_TEXT_COLUMNS) + 1, len(_TEXT_COLUMNS) + len(_PHOTO_COLUMNS) + 1):
+        ws.column_dimensions[get_column_letter(col)].width = _THUMB_PX / 7.0
+
+    header = []
+    for title in _TEXT_COLUMNS + _PHOTO_COLUMNS:
+        cell = WriteOnlyCell(ws, value=title)
+        cell.fill = _HEADER_FILL
+        cell.font = _HEADER_FONT
+        cell.alignment = Alignment(vertical="center")
+        header.append(cell)
+    ws.append(header)
+
+    next_row = 2
+    batch: list = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == EXPORT_BATCH_ROWS:
+            _append_batch(ws, batch, next_row)
+            next_row += len(batch)
+            batch = []
+            if progress:
+                progress(next_row - 2)
+    if batch:
+        _append_batch(ws, batch, next_row)
+
+    if output is None:
+        output = tempfile.TemporaryFile()
+    wb.save(output)
+    output.seek(0)
+    return output
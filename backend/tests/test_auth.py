@@ -331,7 +331,7 @@ class TestProfileValidation:
             headers=auth_headers,
         )
         assert response.status_code == 200
-        assert response.json()["profile_picture"].startswith("data:image/png;base64,")
+        assert "/photos/" in response.json()["profile_picture"]
 
     @pytest.mark.parametrize(
         "picture",
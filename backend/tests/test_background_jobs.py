@@ -0,0 +1,125 @@
+"""Shared background job plumbing tests (services/background_jobs.py).
+
+Coverage: exclusive claims with a fresh claim token each time; which jobs
+are claimable / resumable; progress and finish writes fenced by the claim
+token; the heartbeat; failure messages and session_scope. Behaviour of one
+kind of job (import uploads, export artifacts) is covered in its own file.
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.inventory import InventoryImportJob
+from app.services import background_jobs
+
+
+def _job(db, user, status="queued", **fields):
+    job = InventoryImportJob(user_id=user.id, status=status, **fields)
+    db.add(job)
+    db.commit()
+    return job
+
+
+def _stale() -> datetime:
+    return datetime.now(timezone.utc) - timedelta(seconds=background_jobs.STALE_AFTER_SECONDS + 1)
+
+
+class TestClaims:
+    def test_claim_is_exclusive(self, job_db, test_user):
+        job = _job(job_db, test_user, rows_processed=7)
+        claimed = background_jobs.claim_job(job_db, InventoryImportJob, job.id, rows_processed=0)
+        assert claimed.status == "running"
+        assert claimed.attempts == 1 and claimed.rows_processed == 0
+        assert claimed.claim_token is not None and claimed.started_at is not None
+        assert background_jobs.claim_job(job_db, InventoryImportJob, job.id) is None
+
+    def test_every_claim_gets_a_new_token(self, job_db, test_user):
+        job = background_jobs.claim_job(job_db, InventoryImportJob, _job(job_db, test_user).id)
+        first = job.claim_token
+        job.updated_at = _stale()
+        job_db.commit()
+        again = background_jobs.claim_job(job_db, InventoryImportJob, job.id)
+        assert again.claim_token != first and again.attempts == 2
+
+    def test_queued_and_stale_running_jobs_are_resumable(self, job_db, test_user):
+        queued = _job(job_db, test_user)
+        stale = _job(job_db, test_user, status="running", updated_at=_stale())
+        fresh = _job(job_db, test_user, status="running")
+        done = _job(job_db, test_user, status="completed", updated_at=_stale())
+
+        resumable = background_jobs.resumable_job_ids(job_db, InventoryImportJob)
+        assert [job_id for job_id in resumable if job_id in {queued.id, stale.id}] == [queued.id, stale.id]
+        assert fresh.id not in resumable and done.id not in resumable
+        claimable = job_db.query(InventoryImportJob.id).filter(
+            background_jobs.claimable(InventoryImportJob, background_jobs.now())
+        )
+        assert {job_id for (job_id,) in claimable} >= {queued.id, stale.id}
+
+
+class TestClaimTokens:
+    def test_superseded_run_can_neither_touch_nor_finish(self, job_db, test_user):
+        job = _job(job_db, test_user, status="running", claim_token=uuid.uuid4())
+        old_token = uuid.uuid4()
+
+        with pytest.raises(background_jobs.ClaimLost):
+            background_jobs.touch_job(InventoryImportJob, job.id, old_token, rows_processed=5)
+        assert not background_jobs.finish_job(job_db, InventoryImportJob, job.id, old_token, status="completed")
+        job_db.refresh(job)
+        assert job.status == "running" and job.rows_processed == 0 and job.finished_at is None
+
+    def test_owner_writes_and_finishes(self, job_db, test_user):
+        token = uuid.uuid4()
+        job = _job(job_db, test_user, status="running", claim_token=token, updated_at=_stale())
+
+        background_jobs.touch_job(InventoryImportJob, job.id, token, rows_processed=5)
+        job_db.refresh(job)
+        assert job.rows_processed == 5
+        assert job.id not in background_jobs.resumable_job_ids(job_db, InventoryImportJob)  # fresh heartbeat
+        assert background_jobs.finish_job(job_db, InventoryImportJob, job.id, token, status="completed")
+        job_db.refresh(job)
+        assert job.status == "completed" and job.finished_at is not None
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_keeps_the_job_fresh_until_the_claim_is_lost(self, job_db, test_user, monkeypatch):
+        job = background_jobs.claim_job(job_db, InventoryImportJob, _job(job_db, test_user).id)
+        job.updated_at = _stale()
+        job_db.commit()
+        beats = []
+
+        async def beat(seconds):
+            beats.append(seconds)
+            if len(beats) == 2:
+                job.claim_token = uuid.uuid4()  # claimed by another run
+                job_db.commit()
+
+        monkeypatch.setattr(background_jobs.asyncio, "sleep", beat)
+        await background_jobs.heartbeat(InventoryImportJob, job.id, job.claim_token)
+        assert beats == [background_jobs.HEARTBEAT_SECONDS] * 2
+        job_db.refresh(job)
+        assert job.id not in background_jobs.resumable_job_ids(job_db, InventoryImportJob)
+
+
+def test_failure_message_uses_http_detail():
+    unexpected = "Import failed unexpectedly."
+    assert background_jobs.failure_message(HTTPException(400, detail="Bad sheet."), unexpected) == "Bad sheet."
+    assert background_jobs.failure_message(
+        HTTPException(403, detail={"error": "tier_limit", "message": "Upgrade."}), unexpected
+    ) == "Upgrade."
+    assert background_jobs.failure_message(HTTPException(403, detail={"error": "tier_limit"}), unexpected) == "tier_limit"
+    assert background_jobs.failure_message(RuntimeError("secret"), unexpected) == unexpected
+
+
+def test_session_scope_closes_its_session(monkeypatch):
+    class FakeSession:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    session = FakeSession()
+    monkeypatch.setattr(background_jobs, "SessionLocal", lambda: session)
+    with background_jobs.session_scope() as db:
+        assert db is session
+    assert session.closed
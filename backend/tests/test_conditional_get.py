@@ -0,0 +1,151 @@
+"""Conditional GET tests — ETag / If-None-Match / Last-Modified.
+
+Coverage: 304 on GET /inventory, /inventory/{id}, /dashboard, /invoices and
+/sellers/{user_id}; validators change when the underlying rows change;
+If-None-Match precedence over If-Modified-Since.
+"""
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from app.services import conditional
+
+
+def _revalidate(client, path, etag, headers=None):
+    return client.get(path, headers={**(headers or {}), "If-None-Match": etag})
+
+
+class TestInventoryConditional:
+    def test_list_answers_304_until_items_change(self, client, auth_headers):
+        client.post("/api/v1/inventory", json={"name": "First"}, headers=auth_headers)
+        first = client.get("/api/v1/inventory", headers=auth_headers)
+        etag = first.headers["etag"]
+        assert etag.startswith('W/"')
+        assert first.headers["cache-control"] == "private, no-cache"
+
+        not_modified = _revalidate(client, "/api/v1/inventory", etag, auth_headers)
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["etag"] == etag
+
+        other_page = client.get("/api/v1/inventory?view=summary", headers=auth_headers)
+        assert other_page.headers["etag"] != etag
+
+        client.post("/api/v1/inventory", json={"name": "Second"}, headers=auth_headers)
+        changed = _revalidate(client, "/api/v1/inventory", etag, auth_headers)
+        assert changed.status_code == 200
+        assert changed.json()["total"] == 2
+
+    def test_bulk_writes_change_the_list_etag(self, client, auth_headers):
+        etag = client.get("/api/v1/inventory", headers=auth_headers).headers["etag"]
+        created = client.post(
+            "/api/v1/inventory/bulk", json={"items": [{"name": "A"}, {"name": "B"}]}, headers=auth_headers,
+        ).json()
+        after_create = _revalidate(client, "/api/v1/inventory", etag, auth_headers)
+        assert after_create.status_code == 200
+
+        client.post("/api/v1/inventory/bulk-delete", json={"item_ids": created["ids"]}, headers=auth_headers)
+        after_delete = _revalidate(client, "/api/v1/inventory", after_create.headers["etag"], auth_headers)
+        assert after_delete.status_code == 200
+        assert after_delete.json()["total"] == 0
+
+    def test_list_etag_is_per_user(self, client, auth_headers, second_auth_headers):
+        etag = client.get("/api/v1/inventory", headers=auth_headers).headers["etag"]
+        assert _revalidate(client, "/api/v1/inventory", etag, second_auth_headers).status_code == 200
+
+    def test_item_uses_updated_at(self, client, auth_headers):
+        item = client.post("/api/v1/inventory", json={"name": "Single"}, headers=auth_headers).json()
+        path = f"/api/v1/inventory/{item['id']}"
+        resp = client.get(path, headers=auth_headers)
+        assert resp.status_code == 200
+        last_modified = resp.headers["last-modified"]
+
+        assert _revalidate(client, path, resp.headers["etag"], auth_headers).status_code == 304
+        since = client.get(path, headers={**auth_headers, "If-Modified-Since": last_modified})
+        assert since.status_code == 304
+
+        # If-None-Match wins over If-Modified-Since when both are sent.
+        both = client.get(
+            path,
+            headers={**auth_headers, "If-None-Match": 'W/"stale"', "If-Modified-Since": last_modified},
+        )
+        assert both.status_code == 200
+        garbled = client.get(path, headers={**auth_headers, "If-Modified-Since": "not a date"})
+        assert garbled.status_code == 200
+
+    def test_missing_item_is_still_404(self, client, auth_headers):
+        resp = client.get(
+            "/api/v1/inventory/00000000-0000-0000-0000-000000000000",
+            headers={**auth_headers, "If-None-Match": "*"},
+        )
+        assert resp.status_code == 404
+
+
+class TestDashboardAndInvoicesConditional:
+    def test_dashboard_304_until_inventory_changes(self, client, auth_headers):
+        etag = client.get("/api/v1/dashboard", headers=auth_headers).headers["etag"]
+        assert _revalidate(client, "/api/v1/dashboard", etag, auth_headers).status_code == 304
+
+        client.post("/api/v1/inventory", json={"name": "Stock"}, headers=auth_headers)
+        changed = _revalidate(client, "/api/v1/dashboard", etag, auth_headers)
+        assert changed.status_code == 200
+        assert changed.json()["total_items"] == 1
+
+    def test_invoices_304_until_invoice_added(self, client, auth_headers):
+        etag = client.get("/api/v1/invoices", headers=auth_headers).headers["etag"]
+        assert _revalidate(client, "/api/v1/invoices", etag, auth_headers).status_code == 304
+
+        client.post("/api/v1/invoices", json={
+            "customer_name": "Jane",
+            "items": [{"description": "Tee", "quantity": 1, "unit_price": "20.00"}],
+        }, headers=auth_headers)
+        changed = _revalidate(client, "/api/v1/invoices", etag, auth_headers)
+        assert changed.status_code == 200
+        assert changed.json()["total"] == 1
+
+
+class TestChangeVersions:
+    def test_every_write_transaction_counts(self, db, test_user):
+        from app.models.inventory import InventoryItem
+        from app.services import change_versions
+
+        assert change_versions.current(db, test_user.id, "inventory", "invoices") == (0, 0)
+        item = InventoryItem(user_id=test_user.id, name="Counted")
+        db.add(item)
+        db.commit()
+        item.name = "Renamed"
+        db.commit()
+        db.refresh(item)  # a flush with nothing modified is not a write
+        db.commit()
+        change_versions.bump(db, test_user.id, "inventory", "invoices")
+        assert change_versions.current(db, test_user.id, "inventory", "invoices") == (3, 1)
+
+
+class TestSellerConditional:
+    def test_public_page_revalidates(self, client, db, test_user):
+        test_user.is_partner = True
+        db.add(test_user)
+        db.commit()
+        path = f"/api/v1/sellers/{test_user.id}"
+
+        resp = client.get(path)
+        assert resp.headers["cache-control"] == "public, no-cache"
+        assert _revalidate(client, path, resp.headers["etag"]).status_code == 304
+
+
+class TestValidatorHelpers:
+    def test_etag_matching_is_weak(self):
+        assert conditional.etag_matches('"abc"', 'W/"abc"')
+        assert conditional.etag_matches('W/"x", W/"abc"', '"abc"')
+        assert conditional.etag_matches("*", 'W/"abc"')
+        assert not conditional.etag_matches('"abd"', 'W/"abc"')
+        assert not conditional.etag_matches(None, '"abc"')
+
+    def test_if_modified_since_compares_at_second_resolution(self):
+        modified = datetime(2026, 3, 1, 12, 0, 0, 500000)
+        header = format_datetime(modified.replace(tzinfo=timezone.utc), usegmt=True)
+        assert conditional._not_modified_since(header, modified)
+        earlier = format_datetime(datetime(2026, 3, 1, 11, 0, tzinfo=timezone.utc), usegmt=True)
+        assert not conditional._not_modified_since(earlier, modified)
+        assert not conditional._not_modified_since(header, None)
+        aware = modified.replace(tzinfo=timezone(timedelta(hours=2)))
+        assert conditional._not_modified_since(header, aware)
@@ -6,13 +6,17 @@ import pytest
 import csv
 import io
 from app.models.inventory import InventoryItem
+from app.services import csv_export
 from app.services.csv_export import (
     _image_formula,
     _resolved_photo,
     _size_breakdown,
     _variant_rows,
+    export_inventory_csv,
     export_inventory_warehouse_csv,
+    export_transactions_csv,
 )
+from app.models.transaction import Transaction
 
 
 class TestCSVHelperEdges:
@@ -44,7 +48,7 @@ class TestCSVHelperEdges:
         assert _variant_rows(item) == [("OS", 0)]
 
     def test_empty_and_uneven_warehouse_exports(self, db, test_user):
-        empty = list(csv.reader(io.StringIO(export_inventory_warehouse_csv(db, test_user.id))))
+        empty = list(csv.reader(io.StringIO("".join(export_inventory_warehouse_csv(db, test_user.id)))))
         assert empty[0][0] == "Product Name"
         first = InventoryItem(
             user_id=test_user.id, name="One", status="in_stock", quantity=3,
@@ -53,11 +57,55 @@ class TestCSVHelperEdges:
         second = InventoryItem(user_id=test_user.id, name="Two", status="in_stock", quantity=1)
         db.add_all([first, second])
         db.commit()
-        rows = list(csv.reader(io.StringIO(export_inventory_warehouse_csv(db, test_user.id))))
+        rows = list(csv.reader(io.StringIO("".join(export_inventory_warehouse_csv(db, test_user.id)))))
         assert any("One" in row for row in rows)
         assert not any(row and "Image URL" in row for row in rows)
 
 
+class TestCSVExportStreaming:
+    def test_exports_are_yielded_in_chunks(self, db, test_user, monkeypatch):
+        monkeypatch.setattr(csv_export, "EXPORT_CHUNK_BYTES", 1)
+        db.add_all([
+            InventoryItem(user_id=test_user.id, name=f"Chunk {idx}", status="in_stock", quantity=1)
+            for idx in range(5)
+        ])
+        db.add_all([
+            Transaction(user_id=test_user.id, method="cash", status="completed", gross_amount=10,
+                        fee_amount=0, net_amount=10, quantity=1, is_refund=False)
+            for _ in range(2)
+        ])
+        db.commit()
+
+        chunks = list(export_inventory_csv(db, test_user.id))
+        assert len(chunks) == 6  # header with the first row, one per row after, then the empty tail
+        rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+        assert sorted(row["name"] for row in rows) == [f"Chunk {idx}" for idx in range(5)]
+
+        warehouse = list(export_inventory_warehouse_csv(db, test_user.id))
+        assert len(warehouse) == 3  # two full pairs, then the odd item
+        titles = [row[0] for row in csv.reader(io.StringIO("".join(warehouse))) if row and row[0].startswith("Chunk")]
+        assert len(titles) == 3
+
+        transactions = list(export_transactions_csv(db, test_user.id))
+        assert len(list(csv.reader(io.StringIO("".join(transactions))))) == 3
+
+    def test_items_are_read_as_columns_through_a_cursor(self, db, test_user, monkeypatch):
+        streamed = []
+        real_streamed = csv_export._streamed
+
+        def spy(query):
+            streamed.append(real_streamed(query))
+            return streamed[-1]
+
+        monkeypatch.setattr(csv_export, "_streamed", spy)
+        db.add(InventoryItem(user_id=test_user.id, name="Column", status="in_stock", quantity=1))
+        db.commit()
+        "".join(export_inventory_csv(db, test_user.id))
+        (query,) = streamed
+        assert query.load_options._yield_per == csv_export.EXPORT_FETCH_ROWS
+        assert all(not isinstance(row, InventoryItem) for row in query)
+
+
 class TestCSVExportGating:
     def test_free_user_blocked(self, client, auth_headers):
         """Free users cannot export CSV."""
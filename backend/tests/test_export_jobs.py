@@ -0,0 +1,301 @@
+"""Asynchronous export job tests.
+
+Coverage: 202 + job id from POST /export/jobs; polling and downloading the
+finished file (whole and by Range); reuse of a job while the data is
+unchanged; expiry by the sweeper; Pro gate, validation and privacy; the
+attempt limit, superseded runs and per-attempt artifacts. The shared claim /
+resume plumbing is covered in test_background_jobs.py.
+"""
+import asyncio
+import csv
+import io
+import os
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from openpyxl import load_workbook
+from sqlalchemy import update
+
+from app.models.export import ExportJob
+from app.services import background_jobs, export_jobs
+
+
+def _add_items(client, headers, *names):
+    for name in names:
+        resp = client.post("/api/v1/inventory", json={"name": name, "buy_price": "10.00"}, headers=headers)
+        assert resp.status_code == 201
+
+
+def _queue(client, headers, **options):
+    return client.post("/api/v1/export/jobs", json=options, headers=headers)
+
+
+class TestExportJobs:
+    def test_csv_job_completes_and_downloads(self, client, pro_headers, job_db):
+        _add_items(client, pro_headers, "Jordan 4 Military Blue", "Vintage Denim Jacket")
+
+        resp = _queue(client, pro_headers)
+        assert resp.status_code == 202
+        job = resp.json()
+        assert job["status"] == "queued"
+        assert job["filename"] == "vendora_inventory.csv"
+        assert resp.headers["location"] == f"/api/v1/export/jobs/{job['id']}"
+
+        polled = client.get(f"/api/v1/export/jobs/{job['id']}", headers=pro_headers).json()
+        assert polled["status"] == "completed"
+        assert polled["progress"] == 1.0
+        assert polled["rows_processed"] == polled["total_rows"] == 2
+        assert polled["download_url"] == f"/api/v1/export/jobs/{job['id']}/download"
+        assert polled["expires_at"] is not None
+
+        download = client.get(polled["download_url"], headers=pro_headers)
+        assert download.status_code == 200
+        assert download.headers["content-type"].startswith("text/csv")
+        assert "vendora_inventory.csv" in download.headers["content-disposition"]
+        assert download.headers["accept-ranges"] == "bytes"
+        assert int(download.headers["content-length"]) == polled["artifact_size"]
+        names = {row["name"] for row in csv.DictReader(io.StringIO(download.text))}
+        assert names == {"Jordan 4 Military Blue", "Vintage Denim Jacket"}
+
+    def test_download_resumes_with_range(self, client, pro_headers, job_db):
+        _add_items(client, pro_headers, "Jordan 4 Military Blue")
+        job = _queue(client, pro_headers).json()
+        whole = client.get(f"/api/v1/export/jobs/{job['id']}/download", headers=pro_headers).content
+
+        part = client.get(
+            f"/api/v1/export/jobs/{job['id']}/download",
+            headers={**pro_headers, "Range": "bytes=10-"},
+        )
+        assert part.status_code == 206
+        assert part.headers["content-range"] == f"bytes 10-{len(whole) - 1}/{len(whole)}"
+        assert part.content == whole[10:]
+
+    def test_unchanged_data_reuses_the_job(self, client, pro_headers, job_db, test_user):
+        _add_items(client, pro_headers, "Jordan 4 Military Blue")
+        first = _queue(client, pro_headers).json()
+
+        again = _queue(client, pro_headers)
+        assert again.status_code == 200
+        assert again.json()["id"] == first["id"]
+        assert again.json()["status"] == "completed"
+        assert job_db.query(ExportJob).filter(ExportJob.user_id == test_user.id).count() == 1
+
+        other_format = _queue(client, pro_headers, format="xlsx")
+        assert other_format.status_code == 202
+        assert other_format.json()["id"] != first["id"]
+
+    def test_changed_data_builds_a_new_file(self, client, pro_headers, job_db):
+        _add_items(client, pro_headers, "Jordan 4 Military Blue")
+        first = _queue(client, pro_headers).json()
+
+        _add_items(client, pro_headers, "Vintage Denim Jacket")
+        second = _queue(client, pro_headers)
+        assert second.status_code == 202
+        assert second.json()["id"] != first["id"]
+        polled = client.get(f"/api/v1/export/jobs/{second.json()['id']}", headers=pro_headers).json()
+        assert polled["total_rows"] == 2
+
+    def test_missing_file_is_not_reused(self, client, pro_headers, job_db):
+        first = _queue(client, pro_headers).json()
+        os.unlink(job_db.get(ExportJob, uuid.UUID(first["id"])).artifact_path)
+
+        resp = client.get(f"/api/v1/export/jobs/{first['id']}/download", headers=pro_headers)
+        assert resp.status_code == 410
+        again = _queue(client, pro_headers)
+        assert again.status_code == 202
+        assert again.json()["id"] != first["id"]
+
+    def test_expired_file_is_swept_and_gone(self, client, pro_headers, job_db):
+        job = _queue(client, pro_headers).json()
+        row = job_db.get(ExportJob, uuid.UUID(job["id"]))
+        path = row.artifact_path
+        row.expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+        job_db.commit()
+
+        assert export_jobs.expire_artifacts(job_db) == 1
+        assert not os.path.exists(path)
+        polled = client.get(f"/api/v1/export/jobs/{job['id']}", headers=pro_headers).json()
+        assert polled["status"] == "expired"
+        assert polled["download_url"] is None
+        resp = client.get(f"/api/v1/export/jobs/{job['id']}/download", headers=pro_headers)
+        assert resp.status_code == 410
+
+    def test_unfinished_job_cannot_be_downloaded(self, client, pro_headers, test_user, job_db):
+        job = ExportJob(
+            user_id=test_user.id, dataset="inventory", source_version="v1", status="running",
+            filename="vendora_inventory.csv",
+        )
+        job_db.add(job)
+        job_db.commit()
+        resp = client.get(f"/api/v1/export/jobs/{job.id}/download", headers=pro_headers)
+        assert resp.status_code == 409
+
+    def test_xlsx_job(self, client, pro_headers, job_db):
+        _add_items(client, pro_headers, "Jordan 4 Military Blue")
+        job = _queue(client, pro_headers, format="xlsx").json()
+        assert job["filename"] == "vendora_inventory.xlsx"
+
+        download = client.get(f"/api/v1/export/jobs/{job['id']}/download", headers=pro_headers)
+        assert download.headers["content-type"] == export_jobs.MEDIA_TYPES["xlsx"]
+        rows = list(load_workbook(io.BytesIO(download.content)).active.values)
+        assert rows[1][rows[0].index("name")] == "Jordan 4 Military Blue"
+
+    def test_warehouse_and_transactions_jobs(self, client, pro_headers, job_db):
+        warehouse = _queue(client, pro_headers, template="warehouse").json()
+        transactions = _queue(client, pro_headers, dataset="transactions").json()
+        assert warehouse["filename"] == "vendora_inventory_warehouse.csv"
+        assert transactions["filename"] == "vendora_transactions.csv"
+        for job in (warehouse, transactions):
+            polled = client.get(f"/api/v1/export/jobs/{job['id']}", headers=pro_headers).json()
+            assert polled["status"] == "completed"
+
+    @pytest.mark.parametrize("options", [
+        {"dataset": "transactions", "format": "xlsx"},
+        {"template": "warehouse", "format": "xlsx"},
+        {"format": "pdf"},
+    ])
+    def test_invalid_options_rejected(self, client, pro_headers, options):
+        assert _queue(client, pro_headers, **options).status_code == 422
+
+    def test_free_tier_gets_403(self, client, auth_headers):
+        resp = _queue(client, auth_headers)
+        assert resp.status_code == 403
+        assert resp.json()["detail"]["error"] == "pro_required"
+
+    def test_other_sellers_job_is_not_found(self, client, pro_headers, second_user, second_auth_headers, db, job_db):
+        job = _queue(client, pro_headers).json()
+        second_user.subscription_tier = "pro"
+        db.commit()
+        for path in (f"/api/v1/export/jobs/{job['id']}", f"/api/v1/export/jobs/{job['id']}/download"):
+            resp = client.get(path, headers=second_auth_headers)
+            assert resp.status_code == 404
+            assert resp.json()["detail"] == "Export job not found."
+
+    def test_failed_build_is_recorded(self, client, pro_headers, job_db, monkeypatch):
+        def broken(*args, **kwargs):
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr(export_jobs, "build_artifact", broken)
+        job = _queue(client, pro_headers).json()
+        polled = client.get(f"/api/v1/export/jobs/{job['id']}", headers=pro_headers).json()
+        assert polled["status"] == "failed"
+        assert polled["error_message"] == "Export failed unexpectedly."
+        download = client.get(f"/api/v1/export/jobs/{job['id']}/download", headers=pro_headers)
+        assert download.status_code == 410
+        assert download.json()["detail"].startswith("This export failed")
+        assert _queue(client, pro_headers).status_code == 202  # a failed job is not reused
+
+
+class TestExportJobPlumbing:
+    def _job(self, db, user, **fields):
+        job = ExportJob(
+            user_id=user.id, dataset="inventory", source_version="v1", filename="vendora_inventory.csv", **fields,
+        )
+        db.add(job)
+        db.commit()
+        return job
+
+    @pytest.mark.asyncio
+    async def test_repeatedly_interrupted_job_fails(self, job_db, test_user):
+        job = self._job(job_db, test_user, attempts=export_jobs.MAX_ATTEMPTS)
+        await export_jobs.run_export_job(job.id)
+        job_db.refresh(job)
+        assert job.status == "failed"
+        assert "repeated interruptions" in job.error_message
+
+    @pytest.mark.asyncio
+    async def test_claimed_job_is_not_run_twice(self, job_db, test_user):
+        job = self._job(job_db, test_user, status="completed")
+        await export_jobs.run_export_job(job.id)
+        job_db.refresh(job)
+        assert job.status == "completed" and job.attempts == 0
+
+    @pytest.mark.asyncio
+    async def test_superseded_run_leaves_the_job_alone(self, job_db, test_user, monkeypatch):
+        job = self._job(job_db, test_user)
+
+        def taken_over(db, job, progress):
+            job_db.execute(
+                update(ExportJob).where(ExportJob.id == job.id).values(claim_token=uuid.uuid4())
+            )
+            job_db.commit()
+            progress(1)
+            raise AssertionError("progress should have stopped the run")  # pragma: no cover
+
+        monkeypatch.setattr(export_jobs, "build_artifact", taken_over)
+        await export_jobs.run_export_job(job.id)
+        job_db.refresh(job)
+        assert job.status == "running" and job.finished_at is None
+
+    def test_each_attempt_writes_a_file_of_its_own(self, job_db, test_user, tmp_path, monkeypatch):
+        monkeypatch.setattr(export_jobs.settings, "EXPORT_ARTIFACT_DIR", str(tmp_path))
+        job = self._job(job_db, test_user)
+        first, _ = export_jobs.build_artifact(job_db, job, lambda rows: None)
+        second, _ = export_jobs.build_artifact(job_db, job, lambda rows: None)
+        assert first != second
+        assert os.path.exists(first) and os.path.exists(second)
+
+    def test_failed_build_removes_its_file(self, job_db, test_user, tmp_path, monkeypatch):
+        monkeypatch.setattr(export_jobs.settings, "EXPORT_ARTIFACT_DIR", str(tmp_path))
+
+        def half_written(db, user_id, progress):
+            yield "id,name\r\n"
+            raise RuntimeError("connection lost")
+
+        monkeypatch.setattr(export_jobs, "export_inventory_csv", half_written)
+        with pytest.raises(RuntimeError):
+            export_jobs.build_artifact(job_db, self._job(job_db, test_user), lambda rows: None)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_progress_is_recorded(self, job_db, test_user):
+        token = uuid.uuid4()
+        job = self._job(job_db, test_user, status="running", total_rows=4, claim_token=token)
+        export_jobs.ExportProgress(job.id, token)(2)
+        job_db.refresh(job)
+        assert job.rows_processed == 2
+        assert export_jobs.describe_job(job).progress == 0.5
+
+    @pytest.mark.asyncio
+    async def test_sweep_expires_and_resumes(self, job_db, test_user, monkeypatch):
+        queued = self._job(job_db, test_user)
+        gone = self._job(
+            job_db, test_user, status="completed", artifact_path="/nonexistent/export.csv",
+            expires_at=datetime.now(timezone.utc) - timedelta(minutes=1),
+        )
+        scheduled = []
+
+        async def stop(seconds):
+            raise asyncio.CancelledError
+
+        monkeypatch.setattr(export_jobs, "schedule_export_job", scheduled.append)
+        monkeypatch.setattr(background_jobs.asyncio, "sleep", stop)
+        with pytest.raises(asyncio.CancelledError):
+            await export_jobs.sweep_export_jobs()
+        assert queued.id in scheduled
+        job_db.refresh(gone)
+        assert gone.status == "expired" and gone.artifact_path is None
+
+    @pytest.mark.asyncio
+    async def test_sweep_survives_errors(self, monkeypatch):
+        @contextmanager
+        def unavailable():
+            raise RuntimeError("database down")
+            yield
+
+        async def stop(seconds):
+            raise asyncio.CancelledError
+
+        monkeypatch.setattr(background_jobs, "session_scope", unavailable)
+        monkeypatch.setattr(background_jobs.asyncio, "sleep", stop)
+        with pytest.raises(asyncio.CancelledError):
+            await export_jobs.sweep_export_jobs()
+
+    @pytest.mark.asyncio
+    async def test_schedule_runs_the_job(self, job_db, test_user):
+        job = self._job(job_db, test_user)
+        export_jobs.schedule_export_job(job.id)
+        await asyncio.gather(*background_jobs._tasks)
+        job_db.refresh(job)
+        assert job.status == "completed"
@@ -0,0 +1,309 @@
+"""Background spreadsheet import job tests.
+
+Coverage: 202 + job id for background=true on /import/file and /import;
+polling GET /imports/{job_id} and the SSE stream; failures recorded on the
+job; the stored upload deleted by the run that finishes the job; the
+attempt limit and superseded runs; the ETA estimate. The shared claim /
+resume plumbing is covered in test_background_jobs.py.
+"""
+import asyncio
+import io
+import json
+import os
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.inventory import InventoryImportJob, InventoryItem, InventoryItemProvenance
+from app.services import background_jobs, import_jobs
+
+CSV_CONTENT = """Product Name,SKU,Qty
+Jordan 4 Military Blue,J4-MB-10,2
+Vintage Denim Jacket,LV-JKT-M,1
+"""
+
+
+def _upload(client, auth_headers, content=CSV_CONTENT, **params):
+    return client.post(
+        "/api/v1/inventory/import/file",
+        params={"background": "true", **params},
+        files={"file": ("inventory.csv", content, "text/csv")},
+        headers=auth_headers,
+    )
+
+
+class TestBackgroundImport:
+    def test_file_import_returns_202_and_completes(self, client, auth_headers, job_db, tmp_path, monkeypatch):
+        monkeypatch.setattr(import_jobs.settings, "IMPORT_UPLOAD_DIR", str(tmp_path))
+        resp = _upload(client, auth_headers)
+        assert resp.status_code == 202
+        job = resp.json()
+        assert job["status"] == "queued"
+        assert resp.headers["location"] == f"/api/v1/inventory/imports/{job['id']}"
+
+        polled = client.get(f"/api/v1/inventory/imports/{job['id']}", headers=auth_headers).json()
+        assert polled["status"] == "completed"
+        assert polled["progress"] == 1.0
+        assert polled["rows_processed"] == polled["total_rows"] == 2
+        assert polled["rows_created"] == 2
+        assert polled["result"]["created"] == 2
+        assert polled["finished_at"] is not None
+        assert job_db.get(InventoryImportJob, job["id"]).upload_path is None
+        assert list(tmp_path.iterdir()) == []  # the stored upload is gone with the job
+        assert job_db.query(InventoryItem).filter(InventoryItem.sku == "J4-MB-10").count() == 1
+        provenance = job_db.query(InventoryItemProvenance).filter_by(import_job_id=uuid.UUID(job["id"])).all()
+        assert sorted(entry.row_number for entry in provenance) == [2, 3]
+
+    def test_dry_run_job_writes_nothing(self, client, auth_headers, job_db, test_user):
+        job = _upload(client, auth_headers, dry_run="true").json()
+        polled = client.get(f"/api/v1/inventory/imports/{job['id']}", headers=auth_headers).json()
+        assert polled["status"] == "completed" and polled["dry_run"] is True
+        assert polled["result"]["created"] == 2
+        assert job_db.query(InventoryItem).filter(InventoryItem.user_id == test_user.id).count() == 0
+
+    def test_unparseable_upload_fails_the_job(self, client, auth_headers, job_db):
+        job = _upload(client, auth_headers, content="<!doctype html><html><body>Sign in</body></html>").json()
+        polled = client.get(f"/api/v1/inventory/imports/{job['id']}", headers=auth_headers).json()
+        assert polled["status"] == "failed"
+        assert polled["error_message"]
+        assert polled["result"] is None
+
+    @pytest.mark.asyncio
+    async def test_missing_upload_fails_the_job(self, job_db, test_user):
+        from app.routers.inventory import run_background_import
+
+        path = import_jobs.store_upload(io.BytesIO(CSV_CONTENT.encode()))
+        os.unlink(path)
+        job = InventoryImportJob(user_id=test_user.id, status="queued", filename="inventory.csv", upload_path=path)
+        job_db.add(job)
+        job_db.commit()
+
+        await import_jobs.run_import_job(job.id, run_background_import)
+        job_db.refresh(job)
+        assert job.status == "failed"
+        assert job.error_message == "The uploaded file is no longer available. Upload it again."
+
+    def test_link_import_runs_in_background(self, client, auth_headers, job_db, monkeypatch):
+        from app.routers import inventory as inventory_router
+
+        async def public_dns(url):
+            return None
+
+        class FakeResponse:
+            headers = {"content-type": "text/csv"}
+            content = CSV_CONTENT.encode()
+
+            def raise_for_status(self):
+                return None
+
+        class FakeAsyncClient:
+            def __init__(self, *args, **kwargs):
+                pass
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, exc_type, exc, tb):
+                return False
+
+            async def get(self, url):
+                return FakeResponse()
+
+        monkeypatch.setattr(inventory_router, "_assert_public_dns", public_dns)
+        monkeypatch.setattr(inventory_router.httpx, "AsyncClient", FakeAsyncClient)
+
+        resp = client.post(
+            "/api/v1/inventory/import",
+            json={"url": "https://example.com/inventory.csv", "background": True},
+            headers=auth_headers,
+        )
+        assert resp.status_code == 202
+        polled = client.get(f"/api/v1/inventory/imports/{resp.json()['id']}", headers=auth_headers).json()
+        assert polled["status"] == "completed"
+        assert polled["rows_created"] == 2
+
+    def test_link_is_validated_before_queueing(self, client, auth_headers, job_db, test_user):
+        resp = client.post(
+            "/api/v1/inventory/import",
+            json={"url": "http://localhost/inventory.csv", "background": True},
+            headers=auth_headers,
+        )
+        assert resp.status_code == 400
+        assert job_db.query(InventoryImportJob).filter(InventoryImportJob.user_id == test_user.id).count() == 0
+
+    def test_event_stream_ends_with_finished_job(self, client, auth_headers, job_db):
+        job = _upload(client, auth_headers).json()
+        resp = client.get(f"/api/v1/inventory/imports/{job['id']}/events", headers=auth_headers)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        events = [block for block in resp.text.split("\n\n") if block]
+        assert events[-1].startswith("event: progress\ndata: ")
+        assert json.loads(events[-1].split("data: ", 1)[1])["status"] == "completed"
+
+    def test_jobs_are_private(self, client, auth_headers, second_auth_headers, job_db):
+        job = _upload(client, auth_headers).json()
+        assert client.get(f"/api/v1/inventory/imports/{job['id']}", headers=second_auth_headers).status_code == 404
+        events = client.get(f"/api/v1/inventory/imports/{job['id']}/events", headers=second_auth_headers)
+        assert events.status_code == 404
+
+
+class TestInterruptedJobs:
+    def _job(self, db, user, **fields):
+        path = import_jobs.store_upload(io.BytesIO(CSV_CONTENT.encode()))
+        job = InventoryImportJob(user_id=user.id, status="queued", upload_path=path, **fields)
+        db.add(job)
+        db.commit()
+        return job
+
+    @pytest.mark.asyncio
+    async def test_repeatedly_interrupted_job_fails(self, job_db, test_user):
+        job = self._job(job_db, test_user, attempts=import_jobs.MAX_ATTEMPTS)
+        upload_path = job.upload_path
+
+        async def never_called(*args):
+            raise AssertionError("importer should not run")
+
+        await import_jobs.run_import_job(job.id, never_called)
+        job_db.refresh(job)
+        assert job.status == "failed"
+        assert job.upload_path is None
+        assert not os.path.exists(upload_path)
+
+
+def test_eta_is_linear_in_rows_processed(test_user):
+    now = datetime(2026, 3, 1, 12, 0, 30, tzinfo=timezone.utc)
+    job = InventoryImportJob(
+        id=uuid.uuid4(), user_id=test_user.id, status="running", dry_run=False,
+        total_rows=400, rows_processed=100, rows_created=0, rows_updated=0, rows_skipped=0, rows_errored=0,
+        started_at=now - timedelta(seconds=30), created_at=now, updated_at=now,
+    )
+    described = import_jobs.describe_job(job, now=now)
+    assert described.progress == 0.25
+    assert described.eta_seconds == 90
+
+
+class TestRunnerPlumbing:
+    @pytest.mark.asyncio
+    async def test_unexpected_error_fails_job_with_generic_message(self, job_db, test_user):
+        job = InventoryImportJob(user_id=test_user.id, status="queued")
+        job_db.add(job)
+        job_db.commit()
+
+        async def broken(job, db, progress):
+            progress(1, 10)
+            raise RuntimeError("boom")
+
+        await import_jobs.run_import_job(job.id, broken)
+        job_db.refresh(job)
+        assert job.status == "failed"
+        assert job.error_message == "Import failed unexpectedly."
+
+    @pytest.mark.asyncio
+    async def test_sweep_schedules_resumable_jobs(self, job_db, test_user, monkeypatch):
+        job = InventoryImportJob(user_id=test_user.id, status="queued")
+        job_db.add(job)
+        job_db.commit()
+        ran = []
+
+        async def importer(job, db, progress):
+            ran.append(job.id)
+            raise RuntimeError("stop")
+
+        earlier = set(background_jobs._tasks)  # left behind by other tests' event loops
+
+        async def stop_after_one_pass(seconds):
+            await asyncio.gather(*(background_jobs._tasks - earlier))
+            raise asyncio.CancelledError
+
+        monkeypatch.setattr(background_jobs.asyncio, "sleep", stop_after_one_pass)
+        with pytest.raises(asyncio.CancelledError):
+            await import_jobs.sweep_import_jobs(importer)
+        assert job.id in ran
+
+    @pytest.mark.asyncio
+    async def test_sweep_survives_database_errors(self, monkeypatch):
+        @contextmanager
+        def unavailable():
+            raise RuntimeError("database down")
+            yield  # pragma: no cover
+
+        async def stop(seconds):
+            raise asyncio.CancelledError
+
+        monkeypatch.setattr(background_jobs, "session_scope", unavailable)
+        monkeypatch.setattr(background_jobs.asyncio, "sleep", stop)
+        with pytest.raises(asyncio.CancelledError):
+            await import_jobs.sweep_import_jobs(None)
+
+    @pytest.mark.asyncio
+    async def test_event_stream_for_missing_job_is_empty(self, job_db):
+        events = [event async for event in import_jobs.job_event_stream(uuid.uuid4())]
+        assert events == []
+
+    @pytest.mark.asyncio
+    async def test_event_stream_polls_until_job_finishes(self, job_db, test_user, monkeypatch):
+        job = InventoryImportJob(user_id=test_user.id, status="running", total_rows=4, rows_processed=1)
+        job_db.add(job)
+        job_db.commit()
+
+        async def advance(seconds):
+            job.rows_processed = 4
+            job.status = "completed"
+            job_db.commit()
+
+        monkeypatch.setattr(background_jobs.asyncio, "sleep", advance)
+        events = [event async for event in import_jobs.job_event_stream(job.id)]
+        statuses = [json.loads(event.split("data: ", 1)[1])["status"] for event in events]
+        assert statuses == ["running", "completed"]
+
+    def test_progress_is_written_on_its_own_session(self, job_db, test_user):
+        token = uuid.uuid4()
+        job = InventoryImportJob(user_id=test_user.id, status="running", claim_token=token)
+        job_db.add(job)
+        job_db.commit()
+
+        import_jobs.JobProgress(job.id, token)(3, 10)
+        job_db.refresh(job)
+        assert (job.rows_processed, job.total_rows) == (3, 10)
+
+
+class TestClaimTokens:
+    def _claimed(self, db, user):
+        db.add(job := InventoryImportJob(user_id=user.id, status="queued"))
+        db.commit()
+        return import_jobs.claim_job(db, job.id)
+
+    def _reclaim(self, db, job):
+        job.updated_at = datetime.now(timezone.utc) - timedelta(seconds=background_jobs.STALE_AFTER_SECONDS + 1)
+        db.commit()
+        return import_jobs.claim_job(db, job.id)
+
+    def test_superseded_run_can_neither_report_nor_finish(self, job_db, test_user):
+        job = self._claimed(job_db, test_user)
+        old_token = job.claim_token
+        self._reclaim(job_db, job)
+
+        with pytest.raises(background_jobs.ClaimLost):
+            import_jobs.JobProgress(job.id, old_token)(5, 10)
+        upload_path = import_jobs.store_upload(io.BytesIO(CSV_CONTENT.encode()))
+        assert not import_jobs._finish(job_db, job.id, old_token, upload_path, status="completed")
+        job_db.refresh(job)
+        assert job.status == "running" and job.rows_processed == 0
+        assert os.path.exists(upload_path)  # the run that took over still reads it
+
+    @pytest.mark.asyncio
+    async def test_superseded_run_stops_without_finishing(self, job_db, test_user):
+        job = InventoryImportJob(user_id=test_user.id, status="queued")
+        job_db.add(job)
+        job_db.commit()
+
+        async def taken_over(job, db, progress):
+            self._reclaim(db, job)
+            progress(1, 2)
+            raise AssertionError("progress should have stopped the run")  # pragma: no cover
+
+        await import_jobs.run_import_job(job.id, taken_over)
+        job_db.refresh(job)
+        assert job.status == "running" and job.finished_at is None and job.attempts == 2
@@ -1,4 +1,6 @@
 """Infrastructure, startup, database lifecycle, and transactional email tests."""
+import asyncio
+
 import httpx
 import pytest
 
@@ -119,8 +121,26 @@ async def test_lifespan_runs_code_relative_migrations(monkeypatch):
     from app import main
 
     called = {}
+
+    async def sweep(importer):
+        called["sweeper"] = importer
+
+    async def sweep_sheets(syncer):
+        called["sheet_sweeper"] = syncer
+
+    async def sweep_exports():
+        called["export_sweeper"] = True
+
     monkeypatch.setattr(main.settings, "ENVIRONMENT", "development")
     monkeypatch.setattr(main.alembic_command, "upgrade", lambda cfg, rev: called.update(revision=rev))
+    monkeypatch.setattr(main, "sweep_import_jobs", sweep)
+    monkeypatch.setattr(main, "sweep_linked_sheets", sweep_sheets)
+    monkeypatch.setattr(main, "sweep_export_jobs", sweep_exports)
     async with main.lifespan(main.app):
-        pass
-    assert called == {"revision": "head"}
+        await asyncio.sleep(0)
+    assert called == {
+        "revision": "head",
+        "sweeper": main.inventory.run_background_import,
+        "sheet_sweeper": main.inventory.sync_linked_sheet,
+        "export_sweeper": True,
+    }
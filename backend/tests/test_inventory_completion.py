@@ -1,4 +1,5 @@
 """Completion coverage for inventory pricing, photo, and URL safety paths."""
+import asyncio
 from decimal import Decimal
 import socket
 
@@ -6,6 +7,7 @@ import httpx
 import pytest
 from fastapi import HTTPException
 
+from app.dependencies.tier_limiter import TIER_LIMITS
 from app.models.inventory import InventoryItem
 from app.routers import inventory as inventory_router
 
@@ -237,7 +239,7 @@ class TestMarketAndPricing:
             headers=auth_headers,
         )
         assert response.status_code == 200
-        assert response.json()["photo_front_url"].startswith("data:image/jpeg")
+        assert "/photos/" in response.json()["photo_front_url"]
         assert response.json()["photo_back_url"] == "https://example.com/back.jpg"
         front_only = client.patch(
             f"/api/v1/inventory/{created['id']}/photos",
@@ -417,6 +419,80 @@ class TestImportNetworkSafetyCompletion:
         with pytest.raises(HTTPException, match="too many times"):
             await inventory_router._download_public_content(Client(), "https://example.com/items.csv")
 
+    @pytest.mark.asyncio
+    async def test_host_checks_resolve_each_host_once(self, monkeypatch):
+        lookups = []
+
+        async def check_dns(url):
+            lookups.append(url)
+            await asyncio.sleep(0)
+            if "private" in url:
+                raise HTTPException(status_code=400, detail="Import link must resolve only to public addresses.")
+
+        monkeypatch.setattr(inventory_router, "_assert_public_dns", check_dns)
+        hosts = inventory_router._PublicHostChecks()
+        await asyncio.gather(*(
+            hosts.check(f"https://docs.google.com/spreadsheets/d/S/export?gid={gid}") for gid in range(5)
+        ))
+        await hosts.check("https://DOCS.google.com./other")
+        await hosts.check("http://docs.google.com/insecure")
+        assert len(lookups) == 2
+
+        for _ in range(2):
+            with pytest.raises(HTTPException, match="public addresses"):
+                await hosts.check("https://private.example.com/items.csv")
+        assert len(lookups) == 3
+
+    @pytest.mark.asyncio
+    async def test_candidate_race_takes_first_readable_sheet_and_cancels_the_rest(self, monkeypatch):
+        in_flight = peak = 0
+        cancelled = []
+        readable = "https://example.com/tab-3"
+
+        async def download(_client, url, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            try:
+                if url == readable:
+                    return b"Product Name,SKU,Qty\nHat,H-1,1\n", "text/csv", url
+                if url.endswith("tab-1"):
+                    raise httpx.ConnectError("offline")
+                if url.endswith("tab-2"):
+                    return b"notes,,\nnothing here,,\n", "text/csv", url
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.append(url)
+                raise
+            finally:
+                in_flight -= 1
+
+        monkeypatch.setattr(inventory_router, "_download_public_content", download)
+        monkeypatch.setattr(inventory_router, "CANDIDATE_FETCH_CONCURRENCY", 4)
+        urls = [f"https://example.com/tab-{idx}" for idx in range(1, 20)]
+        winner = await inventory_router._first_readable_candidate(None, urls, inventory_router._PublicHostChecks())
+        assert winner[2] == readable
+        assert peak <= 4
+        assert cancelled and readable not in cancelled
+
+        async def unreadable(_client, url, **kwargs):
+            return b"<html>sign in</html>", "text/html", url
+
+        monkeypatch.setattr(inventory_router, "_download_public_content", unreadable)
+        assert await inventory_router._first_readable_candidate(None, urls[:3], inventory_router._PublicHostChecks()) is None
+
+    @pytest.mark.asyncio
+    async def test_earlier_readable_candidate_wins_even_when_slower(self, monkeypatch):
+        async def download(_client, url, **kwargs):
+            if url.endswith("tab-1"):
+                await asyncio.sleep(0.05)
+            return b"Product Name,SKU,Qty\nHat,H-1,1\n", "text/csv", url
+
+        monkeypatch.setattr(inventory_router, "_download_public_content", download)
+        urls = [f"https://example.com/tab-{idx}" for idx in range(1, 4)]
+        winner = await inventory_router._first_readable_candidate(None, urls, inventory_router._PublicHostChecks())
+        assert winner[2] == urls[0]
+
 
 class TestInventoryImportRouteEdges:
     class DummyClient:
@@ -510,7 +586,7 @@ class TestInventoryImportRouteEdges:
         assert response.json()["detail"] == "unsupported sheet"
 
     def test_dry_run_reports_tier_limit_and_csv_validation(self, client, auth_headers, monkeypatch):
-        monkeypatch.setitem(inventory_router.TIER_LIMITS, "free", 0)
+        monkeypatch.setitem(TIER_LIMITS, "free", 0)
         response = client.post(
             "/api/v1/inventory/import/file?dry_run=true",
             files={"file": ("items.csv", b"Product Name,SKU\nLimited,L-1\n", "text/csv")},
@@ -609,6 +685,29 @@ class TestInventoryImportRouteEdges:
         assert response.status_code == 400
         assert "Could not find an inventory header row" in response.json()["detail"]
 
+    def test_header_error_stands_when_no_discovered_sheet_is_readable(self, client, auth_headers, monkeypatch):
+        monkeypatch.setattr(inventory_router.httpx, "AsyncClient", self.DummyClient)
+        downloads = []
+
+        async def download(_client, url, **kwargs):
+            downloads.append(url)
+            return b"foo,bar\nx,y\n", "text/csv", url
+
+        monkeypatch.setattr(inventory_router, "_download_public_content", download)
+        monkeypatch.setattr(
+            inventory_router,
+            "google_sheet_candidate_csv_urls",
+            lambda url, html: [f"https://example.com/tab-{idx}.csv" for idx in range(3)],
+        )
+        response = client.post(
+            "/api/v1/inventory/import",
+            json={"url": "https://example.com/items.csv", "dry_run": True},
+            headers=auth_headers,
+        )
+        assert response.status_code == 400
+        assert "Could not find an inventory header row" in response.json()["detail"]
+        assert len(downloads) == 5
+
     def test_link_import_handles_empty_candidate_list(self, client, auth_headers, monkeypatch):
         monkeypatch.setattr(inventory_router.httpx, "AsyncClient", self.DummyClient)
         monkeypatch.setattr(inventory_router, "_validate_import_host", lambda url: [])
@@ -165,3 +165,450 @@ class TestOwnershipEnforcement:
         assert resp_a.json()["items"][0]["name"] == "User A Item"
         assert resp_b.json()["total"] == 1
         assert resp_b.json()["items"][0]["name"] == "User B Item"
+
+
+class TestCursorPagination:
+    def _seed(self, client, auth_headers, count=5):
+        ids = []
+        for i in range(count):
+            resp = client.post(
+                "/api/v1/inventory",
+                json={"name": f"Item {i}", "expected_sell_price": f"{10 + i}.00"},
+                headers=auth_headers,
+            )
+            ids.append(resp.json()["id"])
+        return ids
+
+    def _walk(self, client, auth_headers, query):
+        seen, cursor = [], None
+        for _ in range(10):
+            url = f"/api/v1/inventory?per_page=2&{query}"
+            if cursor:
+                url += f"&cursor={cursor}"
+            data = client.get(url, headers=auth_headers).json()
+            seen.extend(item["name"] for item in data["items"])
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        return seen
+
+    def test_cursor_walks_every_item_once(self, client, auth_headers):
+        self._seed(client, auth_headers)
+        first = client.get("/api/v1/inventory?per_page=2", headers=auth_headers).json()
+        assert first["page"] == 1
+        assert first["next_cursor"]
+
+        second = client.get(
+            f"/api/v1/inventory?per_page=2&cursor={first['next_cursor']}",
+            headers=auth_headers,
+        ).json()
+        assert second["page"] is None
+        assert {i["id"] for i in first["items"]}.isdisjoint({i["id"] for i in second["items"]})
+
+        names = self._walk(client, auth_headers, "sort=created_at")
+        assert sorted(names) == [f"Item {i}" for i in range(5)]
+
+    def test_sort_by_name_and_price(self, client, auth_headers, db, test_user):
+        from app.models.inventory import InventoryItem as _Item
+        self._seed(client, auth_headers)
+        db.add(_Item(user_id=test_user.id, name="Unpriced", status="in_stock"))
+        db.flush()
+
+        assert self._walk(client, auth_headers, "sort=name") == sorted(
+            [f"Item {i}" for i in range(5)] + ["Unpriced"]
+        )
+        # NULL prices sort as the highest value in both directions.
+        assert self._walk(client, auth_headers, "sort=price&order=desc") == [
+            "Unpriced", "Item 4", "Item 3", "Item 2", "Item 1", "Item 0",
+        ]
+        assert self._walk(client, auth_headers, "sort=price&order=asc") == [
+            "Item 0", "Item 1", "Item 2", "Item 3", "Item 4", "Unpriced",
+        ]
+
+    def test_cursor_is_a_row_value_comparison(self, db):
+        import uuid as _uuid
+        from datetime import datetime as _dt, timezone as _tz
+        from sqlalchemy.dialects import postgresql
+        from app.models.inventory import InventoryItem as _Item
+        from app.services.inventory_listing import apply_cursor
+
+        query = apply_cursor(db.query(_Item.id), "created_at", "desc", _dt.now(_tz.utc), _uuid.uuid4())
+        sql = str(query.statement.compile(dialect=postgresql.dialect()))
+        assert "(inventory_items.created_at, inventory_items.id) < (" in sql
+        assert " OR " not in sql
+
+    def test_count_modes(self, client, auth_headers):
+        self._seed(client, auth_headers, count=3)
+        none = client.get("/api/v1/inventory?count=none", headers=auth_headers).json()
+        assert none["total"] is None and none["pages"] is None
+        assert len(none["items"]) == 3
+
+        estimate = client.get("/api/v1/inventory?count=estimate", headers=auth_headers).json()
+        assert estimate["total"] >= 0
+
+    def test_rejects_bad_or_mismatched_cursor(self, client, auth_headers):
+        self._seed(client, auth_headers, count=3)
+        resp = client.get("/api/v1/inventory?cursor=not-a-cursor", headers=auth_headers)
+        assert resp.status_code == 400
+        assert resp.json()["detail"]["error"] == "invalid_cursor"
+
+        token = client.get("/api/v1/inventory?per_page=1", headers=auth_headers).json()["next_cursor"]
+        resp = client.get(f"/api/v1/inventory?sort=name&cursor={token}", headers=auth_headers)
+        assert resp.status_code == 400
+
+
+class TestSearch:
+    def _add(self, client, auth_headers, name, **extra):
+        resp = client.post("/api/v1/inventory", json={"name": name, **extra}, headers=auth_headers)
+        assert resp.status_code == 201
+        return resp.json()
+
+    def test_exact_upc_or_sku_suppresses_fuzzy_matches(self, client, auth_headers):
+        target = self._add(client, auth_headers, "Dunk Low Panda", sku="DD1391", upc="195866000001")
+        self._add(client, auth_headers, "Dunk Low Grey", sku="DD1391-001")
+        self._add(client, auth_headers, "Code 195866000001 box", sku="OTHER")
+
+        for term in ("DD1391", "195866000001"):
+            data = client.get(f"/api/v1/inventory?q={term}", headers=auth_headers).json()
+            assert [item["id"] for item in data["items"]] == [target["id"]]
+            assert data["total"] == 1
+
+    def test_relevance_ranks_exact_then_prefix_then_substring(self, client, auth_headers):
+        self._add(client, auth_headers, "Air Jordan 1")
+        self._add(client, auth_headers, "Jordan")
+        self._add(client, auth_headers, "Jordan 4 Retro")
+
+        data = client.get("/api/v1/inventory?q=jordan", headers=auth_headers).json()
+        assert [item["name"] for item in data["items"]] == ["Jordan", "Jordan 4 Retro", "Air Jordan 1"]
+
+        by_date = client.get("/api/v1/inventory?q=jordan&sort=created_at", headers=auth_headers).json()
+        assert sorted(item["name"] for item in by_date["items"]) == ["Air Jordan 1", "Jordan", "Jordan 4 Retro"]
+
+    def test_relevance_cursor_pages_through_results(self, client, auth_headers):
+        for i in range(5):
+            self._add(client, auth_headers, f"Yeezy {i}")
+        self._add(client, auth_headers, "Unrelated")
+
+        seen, cursor = [], None
+        for _ in range(5):
+            url = "/api/v1/inventory?q=yeezy&per_page=2" + (f"&cursor={cursor}" if cursor else "")
+            data = client.get(url, headers=auth_headers).json()
+            seen.extend(item["name"] for item in data["items"])
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        assert sorted(seen) == [f"Yeezy {i}" for i in range(5)]
+
+        resp = client.get(f"/api/v1/inventory?q=yeezy&sort=name&cursor={cursor or 'x'}", headers=auth_headers)
+        assert resp.status_code == 400
+
+    def test_like_wildcards_are_literal(self, client, auth_headers):
+        self._add(client, auth_headers, "100% Cotton Tee")
+        self._add(client, auth_headers, "1000 Piece Puzzle")
+
+        data = client.get("/api/v1/inventory?q=100%25", headers=auth_headers).json()
+        assert [item["name"] for item in data["items"]] == ["100% Cotton Tee"]
+
+    def test_market_price_uses_internal_history(self, client, auth_headers, db, test_user):
+        from app.models.inventory import InventoryItem as _Item
+        for price in ("100.00", "200.00"):
+            db.add(_Item(user_id=test_user.id, name="Travis Scott Jordan 1", actual_sell_price=price, status="sold"))
+        db.add(_Item(user_id=test_user.id, name="Travis Scott Jordan 1", status="in_stock"))
+        db.flush()
+
+        data = client.get("/api/v1/inventory/market-price?query=travis scott", headers=auth_headers).json()
+        assert data["internal_history"] == {"avg_sold_price": 150.0, "sample_count": 2}
+
+
+class TestSparseFields:
+    PHOTO = "data:image/png;base64,iVBORw0KGgo="
+
+    def _add_with_photos(self, db, test_user):
+        # Written directly: legacy rows still hold inline data URLs.
+        from app.models.inventory import InventoryItem as _Item
+        item = _Item(
+            user_id=test_user.id,
+            name=SAMPLE_ITEM["name"],
+            status="in_stock",
+            photo_front_url=self.PHOTO,
+            photo_back_url="https://cdn.example.com/back.jpg",
+            custom_attributes={"notes": "x" * 500},
+        )
+        db.add(item)
+        db.flush()
+        return {"id": str(item.id)}
+
+    def test_summary_view_replaces_blobs_with_photo_urls(self, client, auth_headers, db, test_user):
+        item = self._add_with_photos(db, test_user)
+        data = client.get("/api/v1/inventory?view=summary", headers=auth_headers).json()
+        row = data["items"][0]
+        assert row["id"] == item["id"]
+        assert row["name"] == SAMPLE_ITEM["name"]
+        assert "custom_attributes" not in row and "user_id" not in row
+        assert row["photo_front_url"].endswith(f"/api/v1/inventory/{item['id']}/photos/front?size=list")
+        assert row["photo_back_url"] == "https://cdn.example.com/back.jpg"
+
+        full = client.get("/api/v1/inventory", headers=auth_headers).json()
+        assert full["items"][0]["photo_front_url"] == self.PHOTO
+
+    def test_fields_subset_and_cursor(self, client, auth_headers, db, test_user):
+        for _ in range(3):
+            self._add_with_photos(db, test_user)
+        data = client.get(
+            "/api/v1/inventory?fields=name,quantity&per_page=2&sort=name", headers=auth_headers
+        ).json()
+        assert [set(row) for row in data["items"]] == [{"id", "name", "quantity"}] * 2
+        assert data["next_cursor"]
+
+        resp = client.get("/api/v1/inventory?fields=name,password", headers=auth_headers)
+        assert resp.status_code == 400
+        assert resp.json()["detail"]["error"] == "invalid_fields"
+
+    def test_photo_endpoint_serves_binary_or_redirects(self, client, auth_headers, db, test_user):
+        item = self._add_with_photos(db, test_user)
+        front = client.get(f"/api/v1/inventory/{item['id']}/photos/front", headers=auth_headers)
+        assert front.status_code == 200
+        assert front.headers["content-type"] == "image/png"
+        assert front.content.startswith(b"\x89PNG")
+
+        back = client.get(
+            f"/api/v1/inventory/{item['id']}/photos/back", headers=auth_headers, follow_redirects=False
+        )
+        assert back.status_code == 307
+        assert back.headers["location"] == "https://cdn.example.com/back.jpg"
+
+        assert client.get(f"/api/v1/inventory/{item['id']}/photos/side", headers=auth_headers).status_code == 404
+
+    def test_photo_endpoint_is_owner_only(self, client, second_auth_headers, db, test_user):
+        item = self._add_with_photos(db, test_user)
+        resp = client.get(f"/api/v1/inventory/{item['id']}/photos/front", headers=second_auth_headers)
+        assert resp.status_code == 404
+
+
+class TestChangesFeed:
+    URL = "/api/v1/inventory/changes"
+
+    def _create(self, client, auth_headers, name):
+        return client.post("/api/v1/inventory", json={**SAMPLE_ITEM, "name": name}, headers=auth_headers).json()
+
+    def test_full_sync_pages_by_token(self, client, auth_headers, second_auth_headers):
+        names = {self._create(client, auth_headers, f"Item {i}")["name"] for i in range(3)}
+        self._create(client, second_auth_headers, "Not mine")
+
+        first = client.get(f"{self.URL}?limit=2", headers=auth_headers).json()
+        assert len(first["items"]) == 2 and first["has_more"] is True
+        rest = client.get(f"{self.URL}?limit=2&since={first['next_token']}", headers=auth_headers).json()
+        assert rest["has_more"] is False
+        assert {i["name"] for i in first["items"] + rest["items"]} == names
+        assert first["deleted"] == [] and rest["deleted"] == []
+
+    def test_deletes_come_back_as_tombstones(self, client, auth_headers):
+        item = self._create(client, auth_headers, "Going away")
+        token = client.get(self.URL, headers=auth_headers).json()["next_token"]
+        client.delete(f"/api/v1/inventory/{item['id']}", headers=auth_headers)
+
+        resp = client.get(f"{self.URL}?since={token}", headers=auth_headers).json()
+        assert resp["items"] == []
+        assert [t["id"] for t in resp["deleted"]] == [item["id"]]
+        assert resp["deleted"][0]["deleted_at"]
+
+    def test_ledger_quantity_changes_surface(self, client, auth_headers, db, test_user):
+        from app.models.inventory import InventoryItem as _Item
+        from app.services.inventory import deduct_stock
+
+        item = self._create(client, auth_headers, "Stocked")
+        token = client.get(self.URL, headers=auth_headers).json()["next_token"]
+        row = db.query(_Item).filter(_Item.id == item["id"]).one()
+        deduct_stock(db, row, quantity=1, event_type="sale", source_type="test", source_id="s1")
+        db.commit()
+
+        resp = client.get(f"{self.URL}?since={token}", headers=auth_headers).json()
+        changed = {i["id"]: i for i in resp["items"]}
+        assert changed[item["id"]]["quantity"] == 0
+        assert changed[item["id"]]["status"] == "sold"
+
+    def test_caught_up_token_returns_nothing(self, client, auth_headers):
+        self._create(client, auth_headers, "Settled")
+        token = client.get(self.URL, headers=auth_headers).json()["next_token"]
+        resp = client.get(f"{self.URL}?since={token}", headers=auth_headers).json()
+        assert resp["items"] == [] and resp["has_more"] is False
+        assert resp["next_token"] == token
+
+    def test_rows_of_long_transactions_are_not_skipped(self, client, auth_headers, db, test_user):
+        from datetime import datetime, timedelta, timezone
+        from app.models.inventory import InventoryItem as _Item
+
+        self._create(client, auth_headers, "Before")
+        token = client.get(self.URL, headers=auth_headers).json()["next_token"]
+        # Committed now, but stamped as if its transaction had started an hour ago
+        late = _Item(user_id=test_user.id, name="Late", updated_at=datetime.now(timezone.utc) - timedelta(hours=1))
+        db.add(late)
+        db.commit()
+
+        resp = client.get(f"{self.URL}?since={token}", headers=auth_headers).json()
+        assert [i["id"] for i in resp["items"]] == [str(late.id)]
+
+    def test_bulk_writes_surface(self, client, auth_headers):
+        item = self._create(client, auth_headers, "Bulk listed")
+        token = client.get(self.URL, headers=auth_headers).json()["next_token"]
+        client.post(
+            "/api/v1/inventory/bulk-status", json={"item_ids": [item["id"]], "status": "listed"}, headers=auth_headers
+        )
+
+        resp = client.get(f"{self.URL}?since={token}", headers=auth_headers).json()
+        assert [(i["id"], i["status"]) for i in resp["items"]] == [(item["id"], "listed")]
+
+    def test_invalid_token_is_400(self, client, auth_headers):
+        resp = client.get(f"{self.URL}?since=not-a-token", headers=auth_headers)
+        assert resp.status_code == 400
+        assert resp.json()["detail"]["error"] == "invalid_change_token"
+
+
+class TestBulkMutations:
+    def _create(self, client, auth_headers, n, **extra):
+        return [
+            client.post("/api/v1/inventory", json={**SAMPLE_ITEM, "name": f"Bulk {i}", **extra}, headers=auth_headers).json()["id"]
+            for i in range(n)
+        ]
+
+    def test_bulk_status_reports_per_id_outcomes(self, client, auth_headers, second_auth_headers):
+        ids = self._create(client, auth_headers, 3)
+        client.patch(f"/api/v1/inventory/{ids[2]}/status", json={"status": "sold"}, headers=auth_headers)
+        foreign = self._create(client, second_auth_headers, 1)[0]
+
+        resp = client.post(
+            "/api/v1/inventory/bulk-status",
+            json={"item_ids": [ids[0], ids[1].upper(), ids[0], ids[2], foreign, "nope"], "status": "listed"},
+            headers=auth_headers,
+        )
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["updated"] == 2 and data["failed"] == 3
+        outcomes = {r["id"]: r for r in data["results"]}
+        assert [r["id"] for r in data["results"]] == [ids[0], ids[1], ids[2], foreign, "nope"]
+        assert outcomes[ids[0]]["outcome"] == "updated"
+        assert outcomes[ids[2]]["outcome"] == "invalid_transition"
+        assert outcomes[ids[2]]["status"] == "sold"
+        assert outcomes[ids[2]]["allowed_transitions"] == ["shipped", "paid"]
+        assert outcomes[foreign]["outcome"] == "not_found"
+        assert outcomes["nope"]["outcome"] == "not_found"
+
+        listed = client.get("/api/v1/inventory?status=listed", headers=auth_headers).json()
+        assert {i["id"] for i in listed["items"]} == {ids[0], ids[1]}
+
+    def test_bulk_status_validation(self, client, auth_headers, monkeypatch):
+        bad_status = client.post(
+            "/api/v1/inventory/bulk-status", json={"item_ids": ["x"], "status": "gone"}, headers=auth_headers
+        )
+        assert bad_status.status_code == 400
+        assert bad_status.json()["detail"]["error"] == "invalid_status"
+
+        empty = client.post("/api/v1/inventory/bulk-status", json={"item_ids": [], "status": "listed"}, headers=auth_headers)
+        assert empty.status_code == 400
+
+        from app.services import inventory_bulk
+        monkeypatch.setattr(inventory_bulk, "BULK_MAX_ITEMS", 2)
+        too_many = client.post(
+            "/api/v1/inventory/bulk-status", json={"item_ids": ["a", "b", "c"], "status": "listed"}, headers=auth_headers
+        )
+        assert too_many.status_code == 400
+        assert too_many.json()["detail"]["error"] == "too_many_items"
+
+        only_invalid = client.post(
+            "/api/v1/inventory/bulk-status", json={"item_ids": ["a"], "status": "listed"}, headers=auth_headers
+        ).json()
+        assert only_invalid["updated"] == 0 and only_invalid["results"][0]["outcome"] == "not_found"
+
+    def test_bulk_delete_is_set_based(self, client, auth_headers, db, test_user):
+        from app.models.inventory import InventoryItem as _Item
+        ids = self._create(client, auth_headers, 2)
+        sheet = _Item(user_id=test_user.id, name="From sheet", status="in_stock", source="spreadsheet")
+        db.add(sheet)
+        db.flush()
+        ids.append(str(sheet.id))
+
+        resp = client.post(
+            "/api/v1/inventory/bulk-delete",
+            json={"item_ids": [*ids, "missing"], "delete_from_source": True},
+            headers=auth_headers,
+        )
+        data = resp.json()
+        assert data["deleted"] == 3
+        assert data["source_unsupported"] == 1 and data["source_note"]
+        assert [r["outcome"] for r in data["results"]] == ["deleted"] * 3 + ["not_found"]
+        assert client.get(f"/api/v1/inventory/{ids[0]}", headers=auth_headers).status_code == 404
+
+        again = client.post("/api/v1/inventory/bulk-delete", json={"item_ids": ["missing"]}, headers=auth_headers)
+        assert again.json()["deleted"] == 0
+        assert client.post("/api/v1/inventory/bulk-delete", json={"item_ids": []}, headers=auth_headers).status_code == 400
+
+    def test_bulk_create_inserts_in_request_order(self, client, auth_headers):
+        items = [{**SAMPLE_ITEM, "name": f"Haul {i}", "quantity": i + 1} for i in range(5)]
+        items[0]["photo_front_url"] = "data:image/png;base64,iVBORw0KGgo="
+        resp = client.post("/api/v1/inventory/bulk", json={"items": items}, headers=auth_headers)
+        assert resp.status_code == 201
+        data = resp.json()
+        assert data["created"] == 5 and len(data["ids"]) == 5
+
+        first = client.get(f"/api/v1/inventory/{data['ids'][0]}", headers=auth_headers).json()
+        assert first["name"] == "Haul 0" and first["status"] == "in_stock"
+        assert first["custom_attributes"] == {}
+        assert "/api/v1/photos/" in first["photo_front_url"]
+        last = client.get(f"/api/v1/inventory/{data['ids'][4]}", headers=auth_headers).json()
+        assert last["quantity"] == 5 and last["buy_price"] == "120.00"
+
+    def test_bulk_create_validation(self, client, auth_headers):
+        assert client.post("/api/v1/inventory/bulk", json={"items": []}, headers=auth_headers).status_code == 400
+        invalid = client.post("/api/v1/inventory/bulk", json={"items": [{"name": "ok"}, {"quantity": 2}]}, headers=auth_headers)
+        assert invalid.status_code == 422
+        oversized = client.post("/api/v1/inventory/bulk", json={"items": [{"name": "x"}] * 1001}, headers=auth_headers)
+        assert oversized.status_code == 422
+        assert client.get("/api/v1/inventory", headers=auth_headers).json()["total"] == 0
+
+
+class TestFacets:
+    def _seed(self, client, auth_headers):
+        rows = [
+            {"name": "Dunk Low", "category": "sneakers", "platform": "ebay", "condition": "new"},
+            {"name": "Dunk High", "category": "sneakers", "platform": "ebay"},
+            {"name": "Box Logo Tee", "category": "apparel", "condition": "used"},
+        ]
+        ids = [client.post("/api/v1/inventory", json=row, headers=auth_headers).json()["id"] for row in rows]
+        client.patch(f"/api/v1/inventory/{ids[2]}/status", json={"status": "listed"}, headers=auth_headers)
+
+    def test_counts_every_facet_in_one_response(self, client, auth_headers, second_auth_headers):
+        self._seed(client, auth_headers)
+        client.post("/api/v1/inventory", json={"name": "Other seller", "category": "sneakers"}, headers=second_auth_headers)
+
+        data = client.get("/api/v1/inventory/facets", headers=auth_headers).json()
+        assert data["total"] == 3
+        assert data["facets"]["category"] == [{"value": "sneakers", "count": 2}, {"value": "apparel", "count": 1}]
+        assert data["facets"]["status"] == [{"value": "in_stock", "count": 2}, {"value": "listed", "count": 1}]
+        assert data["facets"]["platform"] == [{"value": "ebay", "count": 2}, {"value": None, "count": 1}]
+        assert {b["value"] for b in data["facets"]["condition"]} == {"new", "used", None}
+        assert data["facets"]["source"] == [{"value": None, "count": 3}]
+
+    def test_facets_respect_filters(self, client, auth_headers):
+        self._seed(client, auth_headers)
+        data = client.get("/api/v1/inventory/facets?q=dunk&status=in_stock", headers=auth_headers).json()
+        assert data["total"] == 2
+        assert data["facets"]["category"] == [{"value": "sneakers", "count": 2}]
+
+    def test_first_list_page_can_include_facets(self, client, auth_headers):
+        self._seed(client, auth_headers)
+        first = client.get("/api/v1/inventory?per_page=1&include_facets=true", headers=auth_headers).json()
+        assert first["facets"]["category"][0] == {"value": "sneakers", "count": 2}
+        later = client.get(
+            f"/api/v1/inventory?per_page=1&include_facets=true&cursor={first['next_cursor']}", headers=auth_headers
+        ).json()
+        assert later["facets"] is None
+        assert client.get("/api/v1/inventory", headers=auth_headers).json()["facets"] is None
+
+    def test_union_fallback_matches(self, client, auth_headers, db, test_user):
+        from app.models.inventory import InventoryItem as _Item
+        from app.services import inventory_facets
+        self._seed(client, auth_headers)
+        query = db.query(_Item).filter(_Item.user_id == test_user.id, _Item.deleted_at.is_(None))
+        rows = inventory_facets._union_rows(query)
+        assert ("category", "sneakers", 2) in rows
+        assert ("_total", None, 3) in rows
@@ -1,6 +1,7 @@
 """Inventory spreadsheet import tests."""
 import io
 import socket
+from urllib.parse import urlparse
 
 import httpx
 import pytest
@@ -183,7 +184,7 @@ def test_import_inventory_horizontal_size_table_warns_for_missing_price(client,
         {"size": "XL", "quantity": 1},
         {"size": "2XL", "quantity": 0},
     ]
-    assert data["sample_items"][0]["custom_attributes"]["import_review"]["missing_price"] is True
+    assert "import_review" not in data["sample_items"][0]["custom_attributes"]
     assert any("Price missing" in issue["message"] for issue in data["warnings"])
 
 
@@ -208,7 +209,10 @@ def test_import_inventory_warehouse_xlsx_embedded_image(client, auth_headers):
     item = items_resp.json()["items"][0]
     assert item["name"] == "The Cotton Wreath Hoodie Black"
     assert item["quantity"] == 3
-    assert item["photo_front_url"].startswith("data:image/jpeg;base64,")
+    assert "/photos/" in item["photo_front_url"]
+    photo = client.get(urlparse(item["photo_front_url"]).path)
+    assert photo.status_code == 200
+    assert photo.headers["content-type"] == "image/jpeg"
 
 
 def test_import_inventory_extracts_photo_url_from_image_formula(client, auth_headers):
@@ -270,6 +274,111 @@ def test_import_inventory_csv_file_updates_existing_sku(client, auth_headers):
     assert jordan["quantity"] == 2
 
 
+def test_import_records_provenance_outside_the_item(client, auth_headers, second_auth_headers):
+    for _ in range(2):
+        resp = client.post(
+            "/api/v1/inventory/import/file",
+            files={"file": ("inventory.csv", CSV_CONTENT, "text/csv")},
+            headers=auth_headers,
+        )
+        assert resp.status_code == 200
+
+    items = client.get("/api/v1/inventory?per_page=10", headers=auth_headers).json()["items"]
+    jordan = next(item for item in items if item["sku"] == "J4-MB-10")
+    assert jordan["custom_attributes"] == {"brand": "Nike"}
+
+    resp = client.get(f"/api/v1/inventory/{jordan['id']}/provenance", headers=auth_headers)
+    assert resp.status_code == 200
+    entries = resp.json()
+    assert len(entries) == 2  # one per import, appended
+    assert entries[0]["source"] == "spreadsheet" and entries[0]["import_job_id"] is None
+    assert entries[0]["row_number"] == 2
+    assert entries[0]["source_cells"]["SKU"] == "J4-MB-10"
+    assert entries[0]["source_cells"]["Cost"] == "$120.00"
+    assert entries[0]["review"] == {"missing_size": True}
+    assert "Image URL" not in next(
+        entry for entry in client.get(
+            f"/api/v1/inventory/{next(item['id'] for item in items if item['sku'] == 'LV-JKT-M')}/provenance",
+            headers=auth_headers,
+        ).json()
+    )["source_cells"]
+
+    assert client.get(f"/api/v1/inventory/{jordan['id']}/provenance?limit=1", headers=auth_headers).json() == entries[:1]
+    assert client.get(f"/api/v1/inventory/{jordan['id']}/provenance", headers=second_auth_headers).status_code == 404
+
+
+def test_item_deleted_during_import_gets_no_provenance(db, test_user, monkeypatch):
+    from app.models.inventory import InventoryItem, InventoryItemProvenance
+    from app.services import inventory_import
+    from app.services.spreadsheet_import import ParsedImportRow
+
+    item = InventoryItem(user_id=test_user.id, name="Gone", sku="GONE-1", status="in_stock")
+    db.add(item)
+    db.flush()
+    monkeypatch.setattr(inventory_import, "PROGRESS_EVERY_ROWS", 1)
+    reported = []
+
+    def rows():
+        db.delete(item)  # after the match index is built
+        db.flush()
+        yield ParsedImportRow(2, {"name": "Gone", "sku": "GONE-1"}, "gone", {"SKU": "GONE-1"}, [])
+
+    result = inventory_import.import_parsed_rows(
+        rows(), 1, dry_run=False, db=db, current_user=test_user, progress=lambda *args: reported.append(args),
+    )
+    assert result.updated == 1
+    assert reported == [(0, 1), (1, 1), (1, 1)]  # the last one just before the commit
+    assert db.query(InventoryItemProvenance).filter_by(inventory_item_id=item.id).count() == 0
+
+
+def test_import_matches_with_one_prefetch_query(client, auth_headers, db, test_user):
+    from sqlalchemy import event
+    from app.models.inventory import InventoryItem
+
+    test_user.subscription_tier = "pro"
+    for i in range(0, 40, 2):
+        db.add(InventoryItem(user_id=test_user.id, name=f"Old {i}", sku=f"SKU-{i}", status="in_stock"))
+    db.flush()
+    rows = "\n".join(f"Item {i},SKU-{i},{i + 1}" for i in range(40))
+    csv_content = f"Product Name,SKU,Qty\n{rows}\n"
+
+    statements = []
+    engine = db.get_bind().engine
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        resp = client.post(
+            "/api/v1/inventory/import/file",
+            files={"file": ("inventory.csv", csv_content, "text/csv")},
+            headers=auth_headers,
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert resp.status_code == 200
+    assert resp.json()["created"] == 20 and resp.json()["updated"] == 20
+    item_selects = [s for s in statements if s.lstrip().upper().startswith("SELECT") and "inventory_items" in s]
+    assert len(item_selects) <= 4  # tier count + match index + matched-item load, never per row
+    items = client.get("/api/v1/inventory?per_page=100&sort=name&order=asc", headers=auth_headers).json()["items"]
+    assert {item["name"] for item in items} == {f"Item {i}" for i in range(40)}
+    assert next(item for item in items if item["sku"] == "SKU-2")["quantity"] == 3
+
+
+def test_import_match_index_prefers_upc_then_sku_then_external_id():
+    from uuid import uuid4
+    from app.services.inventory_import import ImportMatchIndex
+
+    by_upc, by_sku, by_ext = uuid4(), uuid4(), uuid4()
+    index = ImportMatchIndex(by_upc={"0001": by_upc}, by_sku={"A": by_sku}, by_external_id={"row-1": by_ext})
+    assert index.match({"upc": "0001", "sku": "A"}, "row-1") == by_upc
+    assert index.match({"upc": "9999", "sku": "A"}, "row-1") == by_sku
+    assert index.match({"sku": "B"}, "row-1") == by_ext
+    assert index.match({}, "row-2") is None
+
+
 def test_import_inventory_from_read_only_link(client, auth_headers, monkeypatch):
     from app.routers import inventory as inventory_router
 
@@ -567,3 +676,33 @@ def test_import_upload_rejects_file_above_csv_limit(client, auth_headers):
 
     assert response.status_code == 413
     assert response.json()["detail"] == "Spreadsheet upload is too large."
+
+
+def test_import_writes_in_batches_within_one_transaction(client, auth_headers, db, test_user, monkeypatch):
+    from app.models.inventory import InventoryItem
+    from app.services import inventory_import
+
+    test_user.subscription_tier = "pro"
+    db.add(InventoryItem(user_id=test_user.id, name="Old", sku="B-3", status="in_stock"))
+    db.flush()
+    monkeypatch.setattr(inventory_import, "WRITE_BATCH_SIZE", 2)
+    batches = []
+    real_write = inventory_import._write_batch
+
+    def write_batch(db, creates, updates, provenance):
+        batches.append(len(creates) + len(updates))
+        real_write(db, creates, updates, provenance)
+
+    monkeypatch.setattr(inventory_import, "_write_batch", write_batch)
+    rows = "\n".join(f"Batch {i},B-{i},{i}" for i in range(7))
+    resp = client.post(
+        "/api/v1/inventory/import/file",
+        files={"file": ("inventory.csv", f"Product Name,SKU,Qty\n{rows}\n", "text/csv")},
+        headers=auth_headers,
+    )
+
+    assert resp.status_code == 200
+    assert resp.json()["created"] == 6 and resp.json()["updated"] == 1
+    assert batches == [2, 2, 2, 1]
+    items = db.query(InventoryItem).filter(InventoryItem.user_id == test_user.id).all()
+    assert sorted(item.name for item in items) == [f"Batch {i}" for i in range(7)]
@@ -0,0 +1,299 @@
+"""Linked spreadsheet sync tests.
+
+Coverage: linking a sheet runs a first sync; conditional re-fetches (304),
+byte-identical downloads and per-row fingerprints keep repeat syncs from
+re-applying unchanged rows; failures, claims and the sweeper.
+"""
+import asyncio
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+
+from app.models.inventory import InventoryItem, InventoryLinkedSheet
+from app.routers import inventory as inventory_router
+from app.services import background_jobs, inventory_import, linked_sheets
+from app.services.spreadsheet_import import ParsedImportRow
+
+SHEET_URL = "https://example.com/master.csv"
+CSV_CONTENT = """Product Name,SKU,Qty,List Price
+Jordan 4 Military Blue,J4-MB-10,2,260
+Vintage Denim Jacket,LV-JKT-M,1,80
+,,3,
+"""
+
+
+class SheetServer:
+    """Serves one CSV with an ETag and answers If-None-Match with 304."""
+
+    def __init__(self, body=CSV_CONTENT, etag='"v1"'):
+        self.body = body
+        self.etag = etag
+        self.requests = []
+
+    def respond(self, url, headers):
+        self.requests.append((url, dict(headers or {})))
+        if self.etag and (headers or {}).get("If-None-Match") == self.etag:
+            return FakeResponse(304, b"", {"etag": self.etag})
+        return FakeResponse(200, self.body.encode(), {"content-type": "text/csv", "etag": self.etag or ""})
+
+
+class FakeResponse:
+    is_redirect = False
+
+    def __init__(self, status_code, content, headers):
+        self.status_code = status_code
+        self.content = content
+        self.headers = httpx.Headers(headers)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            request = httpx.Request("GET", SHEET_URL)
+            raise httpx.HTTPStatusError("error", request=request, response=httpx.Response(self.status_code))
+
+
+@pytest.fixture()
+def server(monkeypatch):
+    server = SheetServer()
+
+    class FakeAsyncClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        async def get(self, url, headers=None):
+            return server.respond(url, headers)
+
+    async def public_dns(url):
+        return None
+
+    monkeypatch.setattr(inventory_router, "_assert_public_dns", public_dns)
+    monkeypatch.setattr(inventory_router.httpx, "AsyncClient", FakeAsyncClient)
+    return server
+
+
+def _link(client, auth_headers, url=SHEET_URL):
+    return client.post("/api/v1/inventory/linked-sheets", json={"url": url}, headers=auth_headers)
+
+
+def _sync(client, auth_headers, sheet_id):
+    resp = client.post(f"/api/v1/inventory/linked-sheets/{sheet_id}/sync", headers=auth_headers)
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def _items(db, user):
+    return {item.sku: item for item in db.query(InventoryItem).filter(InventoryItem.user_id == user.id)}
+
+
+class TestLinkedSheetSync:
+    def test_linking_runs_the_first_sync(self, client, auth_headers, server, job_db, test_user):
+        resp = _link(client, auth_headers)
+        assert resp.status_code == 201
+        sheet = client.get(f"/api/v1/inventory/linked-sheets/{resp.json()['id']}", headers=auth_headers).json()
+        assert sheet["last_status"] == "synced"
+        assert sheet["last_result"]["created"] == 2
+        assert set(_items(job_db, test_user)) == {"J4-MB-10", "LV-JKT-M"}
+        listed = client.get("/api/v1/inventory/linked-sheets", headers=auth_headers).json()
+        assert [entry["id"] for entry in listed] == [sheet["id"]]
+
+    def test_unchanged_sheet_answers_304(self, client, auth_headers, server, job_db):
+        sheet_id = _link(client, auth_headers).json()["id"]
+        assert _sync(client, auth_headers, sheet_id)["last_status"] == "not_modified"
+        assert server.requests[-1][1]["If-None-Match"] == '"v1"'
+
+    def test_identical_download_is_not_reparsed(self, client, auth_headers, server, job_db, monkeypatch):
+        sheet_id = _link(client, auth_headers).json()["id"]
+        server.etag = None
+
+        def unexpected(*args, **kwargs):
+            raise AssertionError("sheet should not be parsed")
+
+        monkeypatch.setattr(linked_sheets, "parsed_spreadsheet", unexpected)
+        assert _sync(client, auth_headers, sheet_id)["last_status"] == "unchanged"
+
+    def test_only_changed_rows_are_applied(self, client, auth_headers, server, job_db, test_user):
+        sheet_id = _link(client, auth_headers).json()["id"]
+        items = _items(job_db, test_user)
+        items["LV-JKT-M"].notes = "edited in Vendora"
+        job_db.commit()
+
+        server.body = CSV_CONTENT.replace("Jordan 4 Military Blue,J4-MB-10,2,260", "Jordan 4 Military Blue,J4-MB-10,5,275")
+        server.body += "Yeezy Slide Onyx,YZ-SL-9,1,90\n"
+        server.etag = '"v2"'
+        result = _sync(client, auth_headers, sheet_id)["last_result"]
+        assert (result["created"], result["updated"], result["unchanged"]) == (1, 1, 1)
+
+        job_db.expire_all()
+        items = _items(job_db, test_user)
+        assert items["J4-MB-10"].quantity == 5
+        assert items["LV-JKT-M"].notes == "edited in Vendora"
+        assert "YZ-SL-9" in items
+
+    def test_rows_over_the_tier_limit_are_retried(self, client, auth_headers, server, job_db, test_user, monkeypatch):
+        monkeypatch.setitem(inventory_import.TIER_LIMITS, test_user.subscription_tier, 1)
+        sheet_id = _link(client, auth_headers).json()["id"]
+        sheet = job_db.get(InventoryLinkedSheet, uuid.UUID(sheet_id))
+        assert len(sheet.last_result["errors"]) == 1
+        assert len(sheet.row_fingerprints) == 1
+
+        monkeypatch.setitem(inventory_import.TIER_LIMITS, test_user.subscription_tier, None)
+        server.etag = None
+        result = _sync(client, auth_headers, sheet_id)["last_result"]
+        assert (result["created"], result["unchanged"]) == (1, 1)
+
+    def test_failed_sync_is_recorded(self, client, auth_headers, server, job_db):
+        server.body = "<!doctype html><html><body>Sign in</body></html>"
+        sheet = client.get(
+            f"/api/v1/inventory/linked-sheets/{_link(client, auth_headers).json()['id']}", headers=auth_headers,
+        ).json()
+        assert sheet["last_status"] == "failed"
+        assert "web page" in sheet["last_error"]
+
+    def test_http_errors_fail_the_sync(self, client, auth_headers, server, job_db, monkeypatch):
+        sheet_id = _link(client, auth_headers).json()["id"]
+        monkeypatch.setattr(server, "respond", lambda url, headers: FakeResponse(404, b"", {}))
+        sheet = _sync(client, auth_headers, sheet_id)
+        assert sheet["last_status"] == "failed"
+        assert sheet["last_error"] == "Spreadsheet link returned HTTP 404."
+
+        def unreachable(url, headers):
+            raise httpx.ConnectError("down")
+
+        monkeypatch.setattr(server, "respond", unreachable)
+        assert _sync(client, auth_headers, sheet_id)["last_error"] == "Could not download the spreadsheet link."
+
+    def test_import_errors_are_not_retried_on_other_candidates(self, client, auth_headers, server, job_db, monkeypatch):
+        sheet_id = _link(client, auth_headers).json()["id"]
+        server.etag = None
+
+        def too_large(**kwargs):
+            raise HTTPException(status_code=413, detail="Spreadsheet is too large to import.")
+
+        monkeypatch.setattr(inventory_router, "apply_sheet_content", too_large)
+        assert _sync(client, auth_headers, sheet_id)["last_error"] == "Spreadsheet is too large to import."
+
+    def test_links_are_unique_and_private(self, client, auth_headers, second_auth_headers, server, job_db):
+        sheet_id = _link(client, auth_headers).json()["id"]
+        assert _link(client, auth_headers).status_code == 409
+        assert _link(client, auth_headers, url="http://localhost/sheet.csv").status_code == 400
+        path = f"/api/v1/inventory/linked-sheets/{sheet_id}"
+        assert client.get(path, headers=second_auth_headers).status_code == 404
+        assert client.delete(path, headers=second_auth_headers).status_code == 404
+        assert client.delete(path, headers=auth_headers).status_code == 204
+        assert client.get(path, headers=auth_headers).status_code == 404
+
+
+class TestScheduling:
+    def _sheet(self, db, user, **fields):
+        sheet = InventoryLinkedSheet(
+            user_id=user.id, url=f"https://example.com/{uuid.uuid4()}.csv",
+            **{"next_sync_at": datetime.now(timezone.utc) - timedelta(minutes=1), **fields},
+        )
+        db.add(sheet)
+        db.commit()
+        return sheet
+
+    def test_due_sheet_is_claimed_once(self, db, test_user):
+        sheet = self._sheet(db, test_user)
+        assert sheet.id in linked_sheets.due_sheet_ids(db)
+        assert linked_sheets.claim_sheet(db, sheet.id) is sheet
+        assert linked_sheets.claim_sheet(db, sheet.id) is None
+        assert linked_sheets.claim_sheet(db, sheet.id, force=True) is sheet
+        assert linked_sheets.claim_sheet(db, uuid.uuid4()) is None
+
+    def test_sheet_claimed_elsewhere_is_not_claimed_again(self, db, test_user):
+        sheet = self._sheet(db, test_user)
+        db.execute(
+            update(InventoryLinkedSheet)
+            .where(InventoryLinkedSheet.id == sheet.id)
+            .values(next_sync_at=sheet.next_sync_at - timedelta(seconds=1))
+            .execution_options(synchronize_session=False)
+        )
+        assert linked_sheets.claim_sheet(db, sheet.id) is None
+
+    @pytest.mark.asyncio
+    async def test_sheet_that_is_not_due_is_left_alone(self, job_db, test_user):
+        sheet = self._sheet(job_db, test_user, next_sync_at=datetime.now(timezone.utc) + timedelta(hours=1))
+
+        async def never_called(sheet, db):
+            raise AssertionError("syncer should not run")
+
+        await linked_sheets.run_sheet_sync(sheet.id, never_called)
+
+    @pytest.mark.asyncio
+    async def test_unexpected_error_fails_sync_with_generic_message(self, job_db, test_user):
+        sheet = self._sheet(job_db, test_user)
+
+        async def broken(sheet, db):
+            raise RuntimeError("boom")
+
+        await linked_sheets.run_sheet_sync(sheet.id, broken)
+        job_db.refresh(sheet)
+        assert (sheet.last_status, sheet.last_error) == ("failed", "Sync failed unexpectedly.")
+
+    @pytest.mark.asyncio
+    async def test_sweep_syncs_due_sheets(self, job_db, test_user, monkeypatch):
+        sheet = self._sheet(job_db, test_user)
+        synced = []
+
+        async def syncer(sheet, db):
+            synced.append(sheet.id)
+
+        earlier = set(background_jobs._tasks)  # left behind by other tests' event loops
+
+        async def stop_after_one_pass(seconds):
+            await asyncio.gather(*(background_jobs._tasks - earlier))
+            raise asyncio.CancelledError
+
+        monkeypatch.setattr(background_jobs.asyncio, "sleep", stop_after_one_pass)
+        with pytest.raises(asyncio.CancelledError):
+            await linked_sheets.sweep_linked_sheets(syncer)
+        assert sheet.id in synced
+
+    @pytest.mark.asyncio
+    async def test_sweep_survives_database_errors(self, monkeypatch):
+        @contextmanager
+        def unavailable():
+            raise RuntimeError("database down")
+            yield  # pragma: no cover
+
+        async def stop(seconds):
+            raise asyncio.CancelledError
+
+        monkeypatch.setattr(background_jobs, "session_scope", unavailable)
+        monkeypatch.setattr(background_jobs.asyncio, "sleep", stop)
+        with pytest.raises(asyncio.CancelledError):
+            await linked_sheets.sweep_linked_sheets(None)
+
+
+def test_repeated_rows_get_distinct_keys():
+    row = ParsedImportRow(2, {"name": "Hat"}, "abc", {}, [])
+    skipped = ParsedImportRow(3, {}, "", {}, [])
+    keys = [key for key, _ in linked_sheets.keyed_rows([row, skipped, row, row])]
+    assert keys == ["abc", None, "abc:1", "abc:2"]
+
+
+def test_failure_message_uses_http_detail():
+    assert background_jobs.failure_message(
+        HTTPException(403, detail={"error": "tier_limit", "message": "Upgrade."}), "Sync failed unexpectedly."
+    ) == "Upgrade."
+    assert background_jobs.failure_message(HTTPException(403, detail={"error": "tier_limit"}), "") == "tier_limit"
+
+
+def test_conditional_headers_send_the_stored_validators():
+    sheet = InventoryLinkedSheet(etag='"v1"', last_modified="Tue, 01 Sep 2026 10:00:00 GMT")
+    assert linked_sheets.conditional_headers(sheet) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Tue, 01 Sep 2026 10:00:00 GMT",
+    }
+    assert linked_sheets.conditional_headers(InventoryLinkedSheet(last_modified="Tue")) == {"If-Modified-Since": "Tue"}
@@ -0,0 +1,120 @@
+"""Parquet export tests.
+
+Coverage: typed columns (decimal money, UTC timestamps, dictionary-encoded
+text) for inventory, the stock ledger and transactions; one row group per
+batch streamed as it is written; ownership; Pro gate; the missing-pyarrow
+error.
+"""
+import builtins
+import io
+import uuid
+from decimal import Decimal
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fastapi import HTTPException
+
+from app.models.inventory import InventoryItem, InventoryStockLedger
+from app.services import parquet_export
+
+
+def _table(resp) -> pa.Table:
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == parquet_export.PARQUET_MEDIA_TYPE
+    return pq.read_table(io.BytesIO(resp.content))
+
+
+class TestParquetExport:
+    def test_inventory_columns_are_typed(self, client, pro_headers):
+        client.post("/api/v1/inventory", json={
+            "name": "Jordan 1 Chicago", "category": "sneakers", "buy_price": "170.00", "quantity": 2,
+        }, headers=pro_headers)
+        client.post("/api/v1/inventory", json={
+            "name": "Yeezy 350", "category": "sneakers", "buy_price": "220.50",
+        }, headers=pro_headers)
+
+        resp = client.get("/api/v1/export/inventory.parquet", headers=pro_headers)
+        assert "vendora_inventory.parquet" in resp.headers["content-disposition"]
+        table = _table(resp)
+        assert table.schema.field("buy_price").type == pa.decimal128(10, 2)
+        assert table.schema.field("created_at").type == pa.timestamp("us", tz="UTC")
+        assert pa.types.is_dictionary(table.schema.field("category").type)
+        assert table.column("name").to_pylist() == ["Jordan 1 Chicago", "Yeezy 350"]
+        assert table.column("buy_price").to_pylist() == [Decimal("170.00"), Decimal("220.50")]
+        assert table.column("quantity").to_pylist() == [2, 1]
+        assert table.column("category").chunk(0).dictionary.to_pylist() == ["sneakers"]
+
+    def test_ledger_export(self, client, pro_headers, db, test_user):
+        item = InventoryItem(user_id=test_user.id, name="Jordan 4", quantity=3)
+        db.add(item)
+        db.flush()
+        db.add(InventoryStockLedger(
+            inventory_item_id=item.id, user_id=test_user.id,
+            delta_quantity=-1, quantity_after=2, event_type="sale",
+        ))
+        db.commit()
+
+        table = _table(client.get("/api/v1/export/ledger.parquet", headers=pro_headers))
+        assert table.to_pylist()[0] | {"created_at": None, "id": None} == {
+            "id": None,
+            "inventory_item_id": str(item.id),
+            "delta_quantity": -1,
+            "quantity_after": 2,
+            "event_type": "sale",
+            "source_type": None,
+            "source_id": None,
+            "created_at": None,
+        }
+
+    def test_transactions_export(self, client, pro_headers):
+        client.post("/api/v1/transactions", json={"method": "cash", "gross_amount": "100.00"}, headers=pro_headers)
+
+        table = _table(client.get("/api/v1/export/transactions.parquet", headers=pro_headers))
+        row = table.to_pylist()[0]
+        assert row["gross_amount"] == Decimal("100.00")
+        assert row["method"] == "cash"
+        assert row["is_refund"] is False
+        assert table.schema.field("net_amount").type == pa.decimal128(10, 2)
+
+    def test_empty_export_keeps_the_schema(self, client, pro_headers):
+        table = _table(client.get("/api/v1/export/transactions.parquet", headers=pro_headers))
+        assert table.num_rows == 0
+        assert "gross_amount" in table.schema.names
+
+    def test_other_sellers_rows_are_left_out(self, client, pro_headers, db, second_user):
+        db.add(InventoryItem(user_id=second_user.id, name="Not mine"))
+        db.commit()
+        table = _table(client.get("/api/v1/export/inventory.parquet", headers=pro_headers))
+        assert table.num_rows == 0
+
+    @pytest.mark.parametrize("path", ["inventory.parquet", "ledger.parquet", "transactions.parquet"])
+    def test_free_user_blocked(self, client, auth_headers, path):
+        resp = client.get(f"/api/v1/export/{path}", headers=auth_headers)
+        assert resp.status_code == 403
+
+
+class TestParquetStreaming:
+    def test_each_batch_is_a_row_group_handed_out_as_written(self, db, test_user, monkeypatch):
+        monkeypatch.setattr(parquet_export, "PARQUET_BATCH_ROWS", 2)
+        db.add_all(InventoryItem(user_id=test_user.id, name=f"Item {n}") for n in range(5))
+        db.flush()
+
+        chunks = list(parquet_export.export_inventory_parquet(db, test_user.id))
+        assert len(chunks) == 4  # three row groups, then the footer
+        parquet = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+        assert parquet.metadata.num_row_groups == 3
+        assert parquet.metadata.num_rows == 5
+
+    def test_missing_pyarrow_fails_before_streaming(self, db, monkeypatch):
+        real_import = builtins.__import__
+
+        def no_pyarrow(name, *args, **kwargs):
+            if name.startswith("pyarrow"):
+                raise ImportError(name)
+            return real_import(name, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "__import__", no_pyarrow)
+        with pytest.raises(HTTPException) as exc:
+            parquet_export.export_transactions_parquet(db, uuid.uuid4())
+        assert exc.value.status_code == 500
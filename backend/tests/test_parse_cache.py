@@ -0,0 +1,133 @@
+"""Parsed-sheet cache tests — hits skip parsing, TTL and size eviction.
+
+The suite runs with the cache off (IMPORT_CACHE_MAX_MB=0); these tests turn
+it on and empty it afterwards.
+"""
+import io
+import os
+
+import pytest
+
+from app.services import parse_cache, spreadsheet_import
+
+CSV_CONTENT = b"Product Name,SKU,Qty\nJordan 4 Military Blue,J4-MB-10,2\nVintage Denim Jacket,LV-JKT-M,1\n"
+
+
+@pytest.fixture()
+def cache(monkeypatch):
+    monkeypatch.setattr(parse_cache.settings, "IMPORT_CACHE_MAX_MB", 1)
+    monkeypatch.setattr(parse_cache.settings, "IMPORT_CACHE_TTL_SECONDS", 60)
+    yield parse_cache
+    parse_cache.clear()
+
+
+@pytest.fixture()
+def parses(monkeypatch):
+    calls = []
+    real_run = spreadsheet_import.run_in_process
+
+    def counting_run(fn, *args, **kwargs):
+        calls.append(fn)
+        return real_run(fn, *args, **kwargs)
+
+    monkeypatch.setattr(spreadsheet_import, "run_in_process", counting_run)
+    return calls
+
+
+def _skus(content, file_format="csv", content_type=None):
+    with spreadsheet_import.parsed_spreadsheet(content, file_format, content_type) as rows:
+        return [row.payload["sku"] for row in rows]
+
+
+def _spool(cache, data: bytes):
+    spool = cache.spool_file()
+    spool.write(data)
+    spool.flush()
+    return spool
+
+
+class TestParsedSpreadsheetCache:
+    def test_repeat_parse_is_served_from_the_cache(self, cache, parses):
+        assert _skus(CSV_CONTENT) == ["J4-MB-10", "LV-JKT-M"]
+        assert _skus(io.BytesIO(CSV_CONTENT)) == ["J4-MB-10", "LV-JKT-M"]
+        assert len(parses) == 1
+
+    def test_key_covers_format_and_content_type(self, cache, parses):
+        _skus(CSV_CONTENT)
+        with pytest.raises(Exception, match="web page"):
+            _skus(CSV_CONTENT, content_type="text/html")
+        _skus(CSV_CONTENT.replace(b"J4-MB-10", b"J4-MB-11"))
+        assert len(parses) == 3
+
+    def test_disabled_cache_always_parses(self, parses):
+        _skus(CSV_CONTENT)
+        _skus(CSV_CONTENT)
+        assert len(parses) == 2
+
+    def test_dry_run_then_commit_parses_once(self, client, auth_headers, cache, parses):
+        for dry_run in ("true", "false"):
+            resp = client.post(
+                "/api/v1/inventory/import/file",
+                params={"dry_run": dry_run},
+                files={"file": ("inventory.csv", CSV_CONTENT, "text/csv")},
+                headers=auth_headers,
+            )
+            assert resp.status_code == 200
+            assert resp.json()["created"] == 2
+        assert len(parses) == 1
+
+
+class TestEviction:
+    def test_entries_expire_after_the_ttl(self, cache, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(parse_cache.time, "monotonic", lambda: now[0])
+        with _spool(cache, b"rows") as spool:
+            cache.put("a", spool.name, 1)
+        handle, count = cache.get("a")
+        handle.close()
+        assert count == 1
+        now[0] += 61
+        assert cache.get("a") is None
+
+    def test_least_recently_used_entries_go_first(self, cache, monkeypatch):
+        monkeypatch.setattr(parse_cache.settings, "IMPORT_CACHE_MAX_MB", 1)
+        half = b"x" * (512 * 1024)
+        for key in ("a", "b"):
+            with _spool(cache, half) as spool:
+                cache.put(key, spool.name, 1)
+        cache.get("a")[0].close()
+        with _spool(cache, b"y") as spool:
+            cache.put("c", spool.name, 1)
+        assert cache.get("b") is None
+        for key in ("a", "c"):
+            cache.get(key)[0].close()
+
+    def test_oversized_parse_is_not_kept(self, cache):
+        with _spool(cache, b"x" * (1024 * 1024 + 1)) as spool:
+            cache.put("big", spool.name, 1)
+        assert cache.get("big") is None
+
+    def test_open_entry_survives_eviction(self, cache):
+        with _spool(cache, b"rows") as spool:
+            cache.put("a", spool.name, 1)
+            cache.put("a", spool.name, 2)
+        handle, count = cache.get("a")
+        cache.clear()
+        with handle:
+            assert (handle.read(), count) == (b"rows", 2)
+
+    def test_missing_entry_file_is_tolerated(self, cache):
+        with _spool(cache, b"rows") as spool:
+            cache.put("a", spool.name, 1)
+        os.unlink(parse_cache._entries["a"].path)
+        cache.clear()
+        assert cache.get("a") is None
+
+    def test_cache_directory_is_recreated(self, cache, monkeypatch):
+        monkeypatch.setattr(parse_cache, "_directory", "/nonexistent/vendora-cache")
+        with cache.spool_file() as spool:
+            assert not spool.name.startswith("/nonexistent/")
+
+    def test_files_and_bytes_hash_alike(self):
+        assert parse_cache.content_key(io.BytesIO(b"abc"), "csv") == parse_cache.content_key(b"abc", "csv")
+        assert parse_cache.content_key(b"abc", "csv") != parse_cache.content_key(b"abc", "xlsx")
@@ -0,0 +1,192 @@
+"""Photo store tests — /api/v1/photos/{hash} and services/photo_store.py.
+
+Coverage: data URLs externalized on write, de-duplication by content hash,
+strong ETag / 304, immutable caching, single byte ranges (206/416).
+"""
+import base64
+import hashlib
+import io
+from urllib.parse import urlparse
+
+import pytest
+from PIL import Image
+
+from app.services import photo_store
+
+
+def _jpeg_bytes(color=(10, 120, 200)) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (32, 32), color).save(out, format="JPEG")
+    return out.getvalue()
+
+
+def _data_url(data: bytes, mime: str = "image/jpeg") -> str:
+    return f"data:{mime};base64,{base64.b64encode(data).decode()}"
+
+
+@pytest.fixture()
+def stored(client, auth_headers):
+    data = _jpeg_bytes()
+    item = client.post("/api/v1/inventory", json={"name": "Photo item"}, headers=auth_headers).json()
+    resp = client.patch(
+        f"/api/v1/inventory/{item['id']}/photos",
+        json={"photo_front": _data_url(data)},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 200
+    return data, urlparse(resp.json()["photo_front_url"]).path
+
+
+class TestPhotoStore:
+    def test_patch_externalizes_data_url_by_content_hash(self, stored):
+        data, path = stored
+        assert path == f"/api/v1/photos/{hashlib.sha256(data).hexdigest()}"
+
+    def test_identical_bytes_share_one_url(self, client, auth_headers, stored):
+        data, path = stored
+        created = client.post(
+            "/api/v1/inventory",
+            json={"name": "Same photo", "photo_back_url": _data_url(data)},
+            headers=auth_headers,
+        ).json()
+        assert urlparse(created["photo_back_url"]).path == path
+
+    def test_remote_urls_pass_through(self):
+        assert photo_store.externalize_photo("https://cdn.example.com/a.jpg") == "https://cdn.example.com/a.jpg"
+        assert photo_store.externalize_photo(None) is None
+        assert photo_store.load_photo_bytes("https://cdn.example.com/a.jpg") is None
+
+    def test_digest_parsing_and_sniffing(self):
+        digest = "a" * 64
+        assert photo_store.photo_digest_from_url(f"https://old-host/api/v1/photos/{digest}") == digest
+        assert photo_store.photo_digest_from_url("https://x/photos/abc") is None
+        assert photo_store.decode_data_url("data:image/png,not-base64") is None
+        assert photo_store.sniff_content_type(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "image/webp"
+        assert photo_store.sniff_content_type(b"\x89PNG\r\n\x1a\n") == "image/png"
+        assert photo_store.sniff_content_type(b"????") == "application/octet-stream"
+
+
+class TestPhotoServing:
+    def test_serves_bytes_with_immutable_caching(self, client, stored):
+        data, path = stored
+        resp = client.get(path)
+        assert resp.status_code == 200
+        assert resp.content == data
+        assert resp.headers["content-type"] == "image/jpeg"
+        assert resp.headers["etag"] == f'"{path.rsplit("/", 1)[1]}"'
+        assert "immutable" in resp.headers["cache-control"]
+        assert resp.headers["accept-ranges"] == "bytes"
+
+    def test_if_none_match_returns_304(self, client, stored):
+        _, path = stored
+        etag = client.get(path).headers["etag"]
+        resp = client.get(path, headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+
+    def test_byte_ranges(self, client, stored):
+        data, path = stored
+        resp = client.get(path, headers={"Range": "bytes=0-9"})
+        assert resp.status_code == 206
+        assert resp.content == data[:10]
+        assert resp.headers["content-range"] == f"bytes 0-9/{len(data)}"
+
+        tail = client.get(path, headers={"Range": "bytes=-5"})
+        assert tail.status_code == 206 and tail.content == data[-5:]
+        assert tail.headers["content-type"] == "image/jpeg"
+
+        stale = client.get(path, headers={"Range": "bytes=0-9", "If-Range": '"other"'})
+        assert stale.status_code == 200 and stale.content == data
+
+        unsatisfiable = client.get(path, headers={"Range": f"bytes={len(data)}-"})
+        assert unsatisfiable.status_code == 416
+        assert unsatisfiable.headers["content-range"] == f"bytes */{len(data)}"
+
+    def test_unknown_or_malformed_hash_is_404(self, client):
+        assert client.get(f"/api/v1/photos/{'0' * 64}").status_code == 404
+        assert client.get("/api/v1/photos/not-a-hash").status_code == 404
+
+    def test_item_photo_endpoint_redirects_to_store(self, client, auth_headers):
+        item = client.post(
+            "/api/v1/inventory",
+            json={"name": "Redirect", "photo_front_url": _data_url(_jpeg_bytes((1, 2, 3)))},
+            headers=auth_headers,
+        ).json()
+        resp = client.get(
+            f"/api/v1/inventory/{item['id']}/photos/front", headers=auth_headers, follow_redirects=False
+        )
+        assert resp.status_code == 307
+        assert resp.headers["location"] == item["photo_front_url"]
+
+
+def _upload(client, auth_headers, item_id, data, side="front", filename="photo.jpg"):
+    return client.post(
+        f"/api/v1/inventory/{item_id}/photos/{side}",
+        files={"file": (filename, data, "application/octet-stream")},
+        headers=auth_headers,
+    )
+
+
+class TestPhotoUpload:
+    @pytest.fixture()
+    def item(self, client, auth_headers):
+        return client.post("/api/v1/inventory", json={"name": "Upload item"}, headers=auth_headers).json()
+
+    def _big_png(self) -> bytes:
+        out = io.BytesIO()
+        Image.new("RGBA", (2400, 1200), (200, 30, 30, 255)).save(out, format="PNG")
+        return out.getvalue()
+
+    def test_multipart_upload_builds_rendition_ladder(self, client, auth_headers, item):
+        resp = _upload(client, auth_headers, item["id"], self._big_png(), side="back")
+        assert resp.status_code == 200
+        path = urlparse(resp.json()["photo_back_url"]).path
+
+        detail = client.get(path)
+        assert detail.headers["content-type"] == "image/jpeg"
+        with Image.open(io.BytesIO(detail.content)) as image:
+            assert image.size == (1600, 800)
+            assert image.info.get("progressive") or image.info.get("progression")
+
+        thumb = client.get(f"{path}?size=thumb", headers={"Accept": "image/webp,image/*"})
+        assert thumb.headers["content-type"] == "image/webp"
+        assert "Accept" in thumb.headers["vary"]
+        with Image.open(io.BytesIO(thumb.content)) as image:
+            assert image.size == (160, 80)
+
+        listed = client.get(f"{path}?size=list", headers={"Accept": "image/jpeg"})
+        assert listed.headers["content-type"] == "image/jpeg"
+        with Image.open(io.BytesIO(listed.content)) as image:
+            assert image.size == (480, 240)
+        assert listed.headers["etag"] != detail.headers["etag"]
+
+    def test_summary_view_references_list_rendition(self, client, auth_headers, item):
+        _upload(client, auth_headers, item["id"], _jpeg_bytes())
+        row = client.get("/api/v1/inventory?view=summary", headers=auth_headers).json()["items"][0]
+        assert row["photo_front_url"].endswith("?size=list")
+
+        redirect = client.get(
+            f"/api/v1/inventory/{item['id']}/photos/front?size=thumb",
+            headers=auth_headers,
+            follow_redirects=False,
+        )
+        assert redirect.status_code == 307
+        assert redirect.headers["location"].endswith("?size=thumb")
+
+    def test_legacy_photo_gets_renditions_on_first_request(self, client, stored):
+        _, path = stored
+        resp = client.get(f"{path}?size=thumb")
+        assert resp.status_code == 200
+        with Image.open(io.BytesIO(resp.content)) as image:
+            assert image.size == (32, 32)  # never upscaled
+        assert resp.headers["etag"] != client.get(path).headers["etag"]
+
+    def test_rejects_non_images_and_oversized_uploads(self, client, auth_headers, item, monkeypatch):
+        resp = _upload(client, auth_headers, item["id"], b"not an image")
+        assert resp.status_code == 400
+        assert resp.json()["detail"]["error"] == "invalid_image"
+
+        from app.routers import inventory as inventory_router
+        monkeypatch.setattr(inventory_router, "MAX_PHOTO_UPLOAD_BYTES", 10)
+        assert _upload(client, auth_headers, item["id"], _jpeg_bytes()).status_code == 413
+        assert _upload(client, auth_headers, item["id"], _jpeg_bytes(), side="top").status_code == 404
@@ -11,8 +11,10 @@ from fastapi import HTTPException
 from PIL import Image
 from openpyxl import Workbook
 import openpyxl
+import openpyxl.drawing.image
 
 from app.services import spreadsheet_import as subject
+from app.services.photo_store import load_photo_bytes
 
 
 @pytest.mark.parametrize(
@@ -89,6 +91,15 @@ def test_google_sheet_candidate_urls_deduplicate_and_limit():
     assert subject.google_sheet_candidate_csv_urls(url, "no sheet ids here") == []
 
 
+def test_inventory_layout_probe_reads_only_the_head():
+    table = b"Product Name,SKU,Qty\nHat,H-1,1\n"
+    assert subject.has_inventory_layout("tab.csv", "text/csv", table)
+    assert subject.has_inventory_layout("book.xlsx", None, b"PK")
+    assert not subject.has_inventory_layout("tab.csv", "text/csv", b"foo,bar\nx,y\n")
+    assert not subject.has_inventory_layout("tab.csv", "text/html", table)
+    assert not subject.has_inventory_layout("tab.csv", "text/csv", b"")
+
+
 def test_format_detection_and_html_rejection():
     assert subject.detect_format("items.xlsx", None, b"data") == "xlsx"
     assert subject.detect_format(None, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", b"data") == "xlsx"
@@ -153,12 +164,13 @@ def test_color_and_size_inference_edges():
 
 
 def test_image_encoding_fallbacks_and_size_limit(monkeypatch):
-    assert subject._image_data_url(b"x" * (subject.MAX_EMBEDDED_IMAGE_BYTES + 1), "a.png") is None
-    assert subject._image_data_url(b"not-an-image", "a.unknown") is None
-    assert subject._image_data_url(b"not-an-image", "a.png").startswith("data:image/png;base64,")
+    assert subject._store_embedded_image(b"x" * (subject.MAX_EMBEDDED_IMAGE_BYTES + 1), "a.png") is None
+    assert subject._store_embedded_image(b"not-an-image", "a.unknown") is None
+    raw_url = subject._store_embedded_image(b"not-an-image", "a.png")
+    assert load_photo_bytes(raw_url) == b"not-an-image"
     png = io.BytesIO()
     Image.new("RGBA", (2, 2), (255, 0, 0, 128)).save(png, format="PNG")
-    assert subject._image_data_url(png.getvalue(), "a.png").startswith("data:image/jpeg;base64,")
+    assert load_photo_bytes(subject._store_embedded_image(png.getvalue(), "a.png")).startswith(b"\xff\xd8")
 
     real_import = builtins.__import__
 
@@ -168,7 +180,7 @@ def test_image_encoding_fallbacks_and_size_limit(monkeypatch):
         return real_import(name, *args, **kwargs)
 
     monkeypatch.setattr(builtins, "__import__", without_pillow)
-    assert subject._image_data_url(b"raw", "a.png").startswith("data:image/png;base64,")
+    assert load_photo_bytes(subject._store_embedded_image(b"raw", "a.png")) == b"raw"
 
 
 def test_relationship_and_closest_image_helpers():
@@ -359,12 +371,165 @@ def test_parse_inventory_rows_handles_skips_synthesis_and_review_flags():
     assert parsed[1].payload["name"] == "Acme Hat A-1"
     assert parsed[1].payload["status"] == "listed"
     assert parsed[1].payload["custom_attributes"]["oddfield"] == "kept"
-    assert parsed[1].payload["custom_attributes"]["import_review"] == {
+    assert parsed[1].review == {
         "missing_price": True,
         "missing_size": True,
         "missing_photo": True,
     }
+    assert set(parsed[1].payload["custom_attributes"]) == {"brand", "oddfield"}
+    assert parsed[0].source_cells() == {}
+    assert parsed[1].source_cells()["Odd Field"] == "kept"
     assert any("Ignored photo" in warning for warning in parsed[1].warnings)
     assert parsed[2].payload["photo_front_url"].startswith("https://")
     assert parsed[2].payload["photo_back_url"].startswith("https://")
     assert len(parsed[2].external_id) == 32
+
+
+def test_header_is_only_searched_in_the_probe_rows():
+    notes = [[f"note{idx}", ""] for idx in range(subject.HEADER_PROBE_ROWS - 1)]
+    rows = subject.rows_from_bytes(_csv(notes + [["Product Name", "SKU"], ["Hat", "A"]]), "csv")
+    assert rows == [{"Product Name": "Hat", "SKU": "A"}]
+    with pytest.raises(HTTPException, match="Could not find"):
+        subject.rows_from_bytes(_csv(notes + [["note", ""], ["Product Name", "SKU"], ["Hat", "A"]]), "csv")
+
+
+def _csv(rows):
+    return "\n".join(",".join(row) for row in rows).encode() + b"\n"
+
+
+def test_spreadsheet_rows_stream_from_a_file(tmp_path):
+    path = tmp_path / "items.csv"
+    path.write_bytes(_csv([["Product Name", "SKU"]] + [[f"Item {idx}", f"S-{idx}"] for idx in range(100)]))
+    with open(path, "rb") as source:
+        assert subject.detect_format("items", None, source) == "csv"
+        rows = subject.iter_spreadsheet_rows(source, "csv")
+        assert next(rows) == {"Product Name": "Item 0", "SKU": "S-0"}
+        parsed = subject.iter_parsed_rows(rows)
+        assert next(parsed).payload["sku"] == "S-1"
+        assert sum(1 for _ in parsed) == 98
+        assert not source.closed
+
+    with open(path, "rb") as source:
+        with pytest.raises(HTTPException, match="web page"):
+            subject.iter_spreadsheet_rows(source, "csv", "text/html")
+
+
+def test_empty_sheet_streams_no_rows():
+    assert list(subject._stream_table_rows(iter([["", None]]))) == []
+
+
+def test_parsed_rows_spool_through_a_temp_file(tmp_path):
+    source = tmp_path / "items.csv"
+    source.write_bytes(b"Product Name,SKU\nHat,A\n,\nScarf,B\n")
+    spool = tmp_path / "rows.pickle"
+    assert subject.spool_parsed_rows(str(source), "csv", None, None, str(spool)) == 2
+    with open(spool, "rb") as handle:
+        rows = subject.ParsedRowSpool(handle, 2)
+        assert len(rows) == 2
+        assert [row.payload["sku"] for row in rows] == ["A", "B"]
+
+    with open(source, "rb") as upload, subject.parsed_spreadsheet(upload, "csv") as parsed:
+        assert [row.payload["name"] for row in parsed] == ["Hat", "Scarf"]
+    with subject.parsed_spreadsheet(io.BytesIO(source.read_bytes()), "csv") as parsed:
+        assert len(parsed) == 2
+
+
+def test_xlsx_workbook_is_closed_when_sheet_setup_fails(monkeypatch):
+    workbook = Workbook()
+    workbook.active.append(["Product Name", "SKU"])
+    output = io.BytesIO()
+    workbook.save(output)
+    closed = []
+    real_load = openpyxl.load_workbook
+
+    def load(*args, **kwargs):
+        loaded = real_load(*args, **kwargs)
+        monkeypatch.setattr(loaded, "close", lambda: closed.append(True))
+        return loaded
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(openpyxl, "load_workbook", load)
+    monkeypatch.setattr(subject, "_probed_rows", broken)
+    with pytest.raises(RuntimeError):
+        subject.iter_spreadsheet_rows(output.getvalue(), "xlsx", embedded_images=[])
+    assert closed == [True]
+
+
+def _matrix_workbook(with_image=True):
+    workbook = Workbook()
+    sheet = workbook.active
+    for row in ([None, None, None], ["Wreath Hoodie\nBlack", None, None], [None, None, None], [None, "Size", "QTY"], [None, "S", 1]):
+        sheet.append(row)
+    if with_image:
+        png = io.BytesIO()
+        Image.new("RGB", (8, 8), color=(16, 80, 160)).save(png, format="PNG")
+        sheet.add_image(openpyxl.drawing.image.Image(io.BytesIO(png.getvalue())), "A3")
+    return workbook
+
+
+def _xlsx(workbook):
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+
+def test_workbook_probe_reads_only_the_head_of_rejected_sheets(monkeypatch):
+    workbook = Workbook()
+    for idx in range(200):
+        workbook.active.append([f"note {idx}", "x"])
+    second = workbook.create_sheet("Items")
+    second.append(["Product Name", "SKU"])
+    second.append(["Hat", "A"])
+    consumed = []
+    real_probe = subject.probe_sheet
+
+    def counting_probe(table_rows):
+        consumed.append(0)
+
+        def counted():
+            for row in table_rows:
+                consumed[-1] += 1
+                yield row
+
+        return real_probe(counted())
+
+    monkeypatch.setattr(subject, "probe_sheet", counting_probe)
+    assert subject.rows_from_bytes(_xlsx(workbook), "xlsx") == [{"Product Name": "Hat", "SKU": "A"}]
+    assert consumed[0] == subject.HEADER_PROBE_ROWS
+
+
+def test_matrix_sheet_images_are_read_only_when_needed(monkeypatch):
+    rows = subject.rows_from_bytes(_xlsx(_matrix_workbook()), "xlsx")
+    assert load_photo_bytes(rows[0]["Image URL"])
+
+    def unexpected(*args, **kwargs):
+        raise AssertionError("images should not be read")
+
+    monkeypatch.setattr(subject.XlsxPackage, "first_sheet_images", unexpected)
+    table = Workbook()
+    table.active.append(["Product Name", "SKU"])
+    table.active.append(["Hat", "A"])
+    png = io.BytesIO()
+    Image.new("RGB", (8, 8)).save(png, format="PNG")
+    table.active.add_image(openpyxl.drawing.image.Image(io.BytesIO(png.getvalue())), "C2")
+    with subject.parsed_spreadsheet(_xlsx(table), "xlsx") as parsed:
+        assert [row.payload["sku"] for row in parsed] == ["A"]
+    with subject.parsed_spreadsheet(_xlsx(_matrix_workbook(with_image=False)), "xlsx") as parsed:
+        assert [row.payload["quantity"] for row in parsed] == [1]
+
+
+def test_matrix_sheet_images_are_requested_from_the_caller(tmp_path):
+    path = tmp_path / "matrix.xlsx"
+    path.write_bytes(_xlsx(_matrix_workbook()))
+    out = tmp_path / "rows.pickle"
+    needed = subject.spool_parsed_rows(str(path), "xlsx", None, None, str(out))
+    assert needed == subject.SheetImagesNeeded([(3, 1, "xl/media/image1.png")])
+    with subject.XlsxPackage(str(path)) as package:
+        assert package.first_sheet_anchors is package.first_sheet_anchors
+        images = package.first_sheet_images(anchors=needed.anchors)
+    assert subject.spool_parsed_rows(str(path), "xlsx", None, images, str(out)) == 1
+    with open(out, "rb") as handle:
+        (row,) = subject.ParsedRowSpool(handle, 1)
+    assert row.payload["photo_front_url"] == images[0].url
@@ -7,14 +7,24 @@ Coverage:
   - CSV import: preview endpoint parses file and returns preview rows
   - CSV import: commit endpoint applies creates/updates
   - CSV import: duplicate commit rejected (job not in 'previewed' state)
+  - CSV import: preview returns the first page; GET /imports/{id}/rows pages the rest
+  - CSV import: commit runs in checkpointed chunks and resumes after a crash
+  - CSV import: committed rows keep their CSV cells as item provenance
   - Inventory list: search, status filter, source filter, available_only filter
 """
 import io
 import csv
+import uuid
 import pytest
 from datetime import datetime, timezone
 
-from app.models.inventory import InventoryItem, InventoryStockLedger, InventoryImportJob, InventoryImportRow
+from app.models.inventory import (
+    InventoryItem,
+    InventoryItemProvenance,
+    InventoryStockLedger,
+    InventoryImportJob,
+    InventoryImportRow,
+)
 from app.services.inventory import deduct_stock, restore_stock
 
 
@@ -389,6 +399,172 @@ class TestImportCommitEdgeCases:
         assert ledger.delta_quantity == 3 and ledger.quantity_after == 5
 
 
+class TestChunkedCommit:
+    def _preview(self, client, auth_headers, body):
+        resp = client.post(
+            "/api/v1/inventory/imports/preview",
+            files={"file": ("chunked.csv", body.encode(), "text/csv")},
+            headers=auth_headers,
+        )
+        assert resp.status_code == 201
+        return resp.json()["job_id"]
+
+    def test_interrupted_commit_resumes_after_its_checkpoint(self, client, auth_headers, db, test_user, monkeypatch):
+        from app.services import import_commit
+
+        body = "name,sku,quantity\n" + "".join(f"Chunk {idx},CH-{idx},1\n" for idx in range(1, 6))
+        job_id = self._preview(client, auth_headers, body)
+        monkeypatch.setattr(import_commit, "COMMIT_CHUNK_ROWS", 2)
+        real_quantities = import_commit._active_quantities
+        calls = 0
+
+        def crash_on_second_chunk(*args):
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                raise RuntimeError("worker died")
+            return real_quantities(*args)
+
+        monkeypatch.setattr(import_commit, "_active_quantities", crash_on_second_chunk)
+        with pytest.raises(RuntimeError):
+            client.post(f"/api/v1/inventory/imports/{job_id}/commit", headers=auth_headers)
+        job = db.get(InventoryImportJob, uuid.UUID(job_id))
+        db.refresh(job)
+        assert (job.status, job.rows_processed, job.rows_created) == ("previewed", 2, 2)
+
+        resp = client.post(f"/api/v1/inventory/imports/{job_id}/commit", headers=auth_headers)
+        assert resp.status_code == 200
+        assert resp.json()["rows_created"] == 5
+        skus = [
+            sku for (sku,) in db.query(InventoryItem.sku)
+            .filter(InventoryItem.user_id == test_user.id, InventoryItem.sku.like("CH-%"))
+        ]
+        assert sorted(skus) == [f"CH-{idx}" for idx in range(1, 6)]
+
+    def test_repeated_updates_of_one_item_apply_in_row_order(self, client, auth_headers, db, test_user):
+        item = InventoryItem(user_id=test_user.id, name="Repeat", sku="RP-1", quantity=2, status="in_stock")
+        db.add(item)
+        db.commit()
+        job_id = self._preview(client, auth_headers, "name,sku,quantity\nRepeat A,RP-1,3\nRepeat B,RP-1,7\n")
+
+        resp = client.post(f"/api/v1/inventory/imports/{job_id}/commit", headers=auth_headers)
+        assert resp.json()["rows_updated"] == 2
+        db.refresh(item)
+        assert (item.name, item.quantity) == ("Repeat B", 7)
+        ledger = (
+            db.query(InventoryStockLedger)
+            .filter_by(inventory_item_id=item.id)
+            .order_by(InventoryStockLedger.quantity_after)
+            .all()
+        )
+        assert [(entry.delta_quantity, entry.quantity_after) for entry in ledger] == [(1, 3), (4, 7)]
+
+    def test_chunk_of_invalid_rows_is_skipped(self, client, auth_headers):
+        job_id = self._preview(client, auth_headers, "name,sku,quantity\nBad A,BD-1,many\nBad B,BD-2,lots\n")
+        resp = client.post(f"/api/v1/inventory/imports/{job_id}/commit", headers=auth_headers)
+        assert (resp.json()["rows_created"], resp.json()["rows_skipped"]) == (0, 2)
+
+    def test_concurrent_commit_of_the_same_job_is_refused(self, client, auth_headers, db):
+        from fastapi import HTTPException
+        from sqlalchemy import update
+
+        from app.services.import_commit import commit_preview_job
+
+        job_id = self._preview(client, auth_headers, "name,sku\nRace,RC-1\n")
+        job = db.get(InventoryImportJob, uuid.UUID(job_id))
+        db.execute(
+            update(InventoryImportJob).where(InventoryImportJob.id == job.id).values(rows_processed=1)
+            .execution_options(synchronize_session=False)
+        )
+        with pytest.raises(HTTPException) as exc:
+            commit_preview_job(db, job, job.user_id)
+        assert exc.value.status_code == 409
+
+
+class TestImportRowPaging:
+    def _preview(self, client, auth_headers, count):
+        rows = "name,sku,quantity\n" + "".join(
+            f"Item {idx},PG-{idx},{'many' if idx % 10 == 0 else 1}\n" for idx in range(1, count + 1)
+        )
+        resp = client.post(
+            "/api/v1/inventory/imports/preview",
+            files={"file": ("paged.csv", rows.encode(), "text/csv")},
+            headers=auth_headers,
+        )
+        assert resp.status_code == 201
+        return resp.json()
+
+    def test_preview_returns_first_page_and_rows_endpoint_pages_the_rest(self, client, auth_headers, monkeypatch):
+        from app.routers import inventory as inventory_router
+
+        monkeypatch.setattr(inventory_router, "PREVIEW_INSERT_BATCH_SIZE", 50)
+        data = self._preview(client, auth_headers, 120)
+        assert data["total_rows"] == 120
+        assert (data["rows_to_create"], data["rows_errored"]) == (108, 12)
+        assert len(data["rows"]) == 50 and data["has_more_rows"] is True
+
+        resp = client.get(
+            f"/api/v1/inventory/imports/{data['job_id']}/rows",
+            params={"page": 3, "per_page": 50},
+            headers=auth_headers,
+        )
+        assert resp.status_code == 200
+        page = resp.json()
+        assert (page["total"], page["pages"]) == (120, 3)
+        assert [row["row_number"] for row in page["items"]] == list(range(101, 121))
+
+        errors = client.get(
+            f"/api/v1/inventory/imports/{data['job_id']}/rows",
+            params={"action": "error"},
+            headers=auth_headers,
+        ).json()
+        assert errors["total"] == 12
+        assert all(row["action"] == "error" and row["error_message"] for row in errors["items"])
+
+    def test_small_preview_has_no_more_rows(self, client, auth_headers):
+        data = self._preview(client, auth_headers, 3)
+        assert len(data["rows"]) == 3 and data["has_more_rows"] is False
+
+    def test_rows_are_private(self, client, auth_headers, second_auth_headers):
+        data = self._preview(client, auth_headers, 3)
+        path = f"/api/v1/inventory/imports/{data['job_id']}/rows"
+        assert client.get(path, headers=second_auth_headers).status_code == 404
+
+    def test_commit_drops_raw_rows(self, client, auth_headers, db):
+        data = self._preview(client, auth_headers, 3)
+        assert client.post(f"/api/v1/inventory/imports/{data['job_id']}/commit", headers=auth_headers).status_code == 200
+        rows = db.query(InventoryImportRow).filter(InventoryImportRow.job_id == data["job_id"]).all()
+        assert len(rows) == 3
+        assert all(row.raw_data == {} for row in rows)
+        assert rows[0].mapped_data is not None
+
+    def test_committed_rows_keep_their_cells_as_provenance(self, client, auth_headers, db, test_user):
+        item = InventoryItem(user_id=test_user.id, name="Before", sku="PV-1", quantity=1, status="in_stock")
+        db.add(item)
+        db.commit()
+        resp = client.post(
+            "/api/v1/inventory/imports/preview",
+            files={"file": ("prov.csv", b"name,sku,quantity,notes\nAfter,PV-1,2,\nFresh,PV-2,1,new\n", "text/csv")},
+            headers=auth_headers,
+        )
+        job_id = resp.json()["job_id"]
+        assert client.post(f"/api/v1/inventory/imports/{job_id}/commit", headers=auth_headers).status_code == 200
+
+        entries = (
+            db.query(InventoryItemProvenance)
+            .filter(InventoryItemProvenance.import_job_id == uuid.UUID(job_id))
+            .order_by(InventoryItemProvenance.row_number)
+            .all()
+        )
+        assert [(entry.row_number, entry.source_cells) for entry in entries] == [
+            (1, {"name": "After", "sku": "PV-1", "quantity": "2"}),
+            (2, {"name": "Fresh", "sku": "PV-2", "quantity": "1", "notes": "new"}),
+        ]
+        assert entries[0].inventory_item_id == item.id
+        created = db.query(InventoryItem).filter_by(user_id=test_user.id, sku="PV-2").one()
+        assert entries[1].inventory_item_id == created.id
+
+
 class TestCSVRoundTrip:
     """Regression tests for export → re-import column alignment.
 
@@ -48,6 +48,20 @@ class TestFreeTierLimit:
         resp = client.post("/api/v1/inventory", json={"name": "Replacement"}, headers=auth_headers)
         assert resp.status_code == 201
 
+    def test_bulk_create_checks_whole_batch(self, client, auth_headers):
+        """A batch that would cross the limit is rejected as a whole."""
+        client.post("/api/v1/inventory", json={"name": "Existing"}, headers=auth_headers)
+        batch = {"items": [{"name": f"Haul {i}"} for i in range(25)]}
+        resp = client.post("/api/v1/inventory/bulk", json=batch, headers=auth_headers)
+        assert resp.status_code == 403
+        data = resp.json()["detail"]
+        assert data["error"] == "tier_limit_reached"
+        assert data["current_count"] == 1 and data["requested"] == 25
+
+        batch["items"].pop()
+        assert client.post("/api/v1/inventory/bulk", json=batch, headers=auth_headers).status_code == 201
+        assert client.get("/api/v1/inventory", headers=auth_headers).json()["total"] == 25
+
 
 class TestProTierUnlimited:
     def test_pro_user_no_limit(self, client, db, second_user, second_auth_headers):
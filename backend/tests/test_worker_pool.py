@@ -0,0 +1,176 @@
+"""Worker pool tests — process pool path, resource limits and inline mode.
+
+The suite runs with ENVIRONMENT=testing, where the process pool runs calls
+inline; tests that need real pool processes switch that off and shut the
+pool down afterwards.
+"""
+import base64
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+from openpyxl import Workbook
+from openpyxl.drawing.image import Image as WorkbookImage
+from PIL import Image
+
+from app.services import spreadsheet_import, worker_pool, xlsx_export
+from app.services.photo_store import load_photo_bytes
+
+
+def _spin(*args):
+    while True:
+        pass
+
+
+def _die_once(marker):
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return "survived"
+
+
+def _sleep_then(value):
+    time.sleep(3)
+    return value
+
+
+def _address_space_limit():
+    import resource
+
+    return resource.getrlimit(resource.RLIMIT_AS)[0]
+
+
+@pytest.fixture()
+def process_pool(monkeypatch):
+    monkeypatch.setattr(worker_pool.settings, "ENVIRONMENT", "development")
+    monkeypatch.setattr(worker_pool.settings, "PROCESS_POOL_SIZE", 2)
+    monkeypatch.setattr(worker_pool.settings, "PROCESS_WORKER_MEMORY_MB", 2048)
+    monkeypatch.setattr(worker_pool.settings, "PROCESS_TASK_CPU_SECONDS", 1)
+    yield
+    worker_pool.shutdown_worker_pool()
+
+
+class TestProcessPool:
+    def test_runs_calls_and_maps_in_order(self, process_pool):
+        assert worker_pool.run_in_process(pow, 2, 10) == 1024
+        assert worker_pool.process_map(pow, [2, 3, 4], [2, 2, 2]) == [4, 9, 16]
+        assert worker_pool.run_in_process(_address_space_limit) == 2048 * 1024 * 1024
+
+    def test_http_errors_cross_the_process_boundary(self, process_pool):
+        with pytest.raises(HTTPException, match="web page") as exc:
+            worker_pool.run_in_process(spreadsheet_import.rows_from_bytes, b"<html>oops", "csv")
+        assert exc.value.status_code == 400
+        with pytest.raises(HTTPException, match="web page"):
+            worker_pool.process_map(spreadsheet_import.rows_from_bytes, [b"<html>oops"], ["csv"])
+
+    def test_cpu_budget_stops_runaway_call_and_keeps_the_pool(self, process_pool):
+        with pytest.raises(worker_pool.WorkerLimitExceeded):
+            worker_pool.run_in_process(_spin)
+        pool = worker_pool._process_executor
+        assert worker_pool.run_in_process(pow, 3, 2) == 9
+        with pytest.raises(worker_pool.WorkerLimitExceeded):
+            worker_pool.process_map(_spin, [1, 2])
+        assert worker_pool._process_executor is pool
+
+    def test_runaway_call_does_not_fail_other_callers(self, process_pool):
+        with ThreadPoolExecutor(max_workers=2) as callers:
+            innocent = callers.submit(worker_pool.run_in_process, _sleep_then, "done")
+            runaway = callers.submit(worker_pool.run_in_process, _spin)
+            with pytest.raises(worker_pool.WorkerLimitExceeded):
+                runaway.result()
+            assert innocent.result() == "done"
+
+    def test_callers_on_a_broken_pool_are_retried(self, process_pool, tmp_path):
+        with ThreadPoolExecutor(max_workers=2) as callers:
+            innocent = callers.submit(worker_pool.run_in_process, _sleep_then, "done")
+            crashing = callers.submit(worker_pool.run_in_process, _die_once, str(tmp_path / "died"))
+            assert crashing.result() == "survived"
+            assert innocent.result() == "done"
+
+    def test_a_call_that_breaks_every_pool_is_over_its_limits(self, process_pool, monkeypatch):
+        monkeypatch.setattr(worker_pool, "BROKEN_POOL_RETRIES", 0)
+        with pytest.raises(worker_pool.WorkerLimitExceeded):
+            worker_pool.run_in_process(os._exit, 1)
+
+    def test_only_the_pool_that_broke_is_discarded(self, process_pool):
+        broken = worker_pool.get_process_executor()
+        worker_pool._discard_broken_process_pool(broken)
+        current = worker_pool.get_process_executor()
+        assert current is not broken
+        worker_pool._discard_broken_process_pool(broken)  # a late caller of the old pool
+        assert worker_pool._process_executor is current
+        assert worker_pool.run_in_process(pow, 2, 2) == 4
+
+    def test_parses_spreadsheet_in_the_pool(self, process_pool):
+        with spreadsheet_import.parsed_spreadsheet(b"Product Name,SKU\nHat,A\n", "csv") as rows:
+            assert len(rows) == 1
+            assert [row.payload["sku"] for row in rows] == ["A"]
+
+    def test_sheet_images_are_thumbnailed_in_the_pool(self, process_pool):
+        workbook = Workbook()
+        sheet = workbook.active
+        for row in (
+            [None, None, None],
+            ["The Cotton Wreath Hoodie\nBlack", None, None],
+            [None, None, None],
+            [None, "Size", "QTY"],
+            [None, "S", 1],
+        ):
+            sheet.append(row)
+        png = io.BytesIO()
+        Image.new("RGB", (900, 300), color=(16, 80, 160)).save(png, format="PNG")
+        sheet.add_image(WorkbookImage(io.BytesIO(png.getvalue())), "A3")
+        output = io.BytesIO()
+        workbook.save(output)
+
+        with spreadsheet_import.parsed_spreadsheet(output.getvalue(), "xlsx") as rows:
+            (row,) = list(rows)
+        photo = load_photo_bytes(row.payload["photo_front_url"])
+        with Image.open(io.BytesIO(photo)) as thumbnail:
+            assert thumbnail.format == "JPEG"
+            assert max(thumbnail.size) == spreadsheet_import.MAX_EMBEDDED_IMAGE_DIMENSION
+
+    def test_export_thumbnails_are_made_in_the_pool(self, process_pool, tmp_path):
+        png = io.BytesIO()
+        Image.new("RGB", (300, 200), color=(200, 30, 30)).save(png, format="PNG")
+        data_url = "data:image/png;base64," + base64.b64encode(png.getvalue()).decode()
+        paths = [str(tmp_path / "good.png"), str(tmp_path / "bad.png")]
+
+        made = worker_pool.process_map(xlsx_export._write_thumbnail, [data_url, "data:image/png;base64,AAAA"], paths)
+        assert made == [True, False]
+        with Image.open(paths[0]) as thumbnail:
+            assert max(thumbnail.size) == 96
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["good.png"]
+
+
+class TestInlineMode:
+    def test_testing_environment_runs_inline(self):
+        assert worker_pool.run_in_process(pow, 2, 3) == 8
+        assert worker_pool.process_map(abs, [-1, -2]) == [1, 2]
+        assert worker_pool._process_executor is None
+
+    def test_cpu_limit_wrapper_restores_the_limit(self):
+        import resource
+
+        before = resource.getrlimit(resource.RLIMIT_CPU)
+        assert worker_pool._call_with_cpu_limit(5, pow, (2, 2), {}) == 4
+        assert resource.getrlimit(resource.RLIMIT_CPU)[1] == before[1]
+        raised = worker_pool._call_with_cpu_limit(0, spreadsheet_import.rows_from_bytes, (b"<html>", "csv"), {})
+        with pytest.raises(HTTPException):
+            worker_pool._unwrap(raised)
+
+    def test_memory_initializer_skips_when_unlimited(self):
+        worker_pool._limit_process_memory(0)
+
+    def test_exhausted_worker_becomes_413(self, monkeypatch):
+        def exhausted(*args, **kwargs):
+            raise worker_pool.WorkerLimitExceeded("cpu")
+
+        monkeypatch.setattr(spreadsheet_import, "run_in_process", exhausted)
+        with pytest.raises(HTTPException) as exc:
+            with spreadsheet_import.parsed_spreadsheet(b"Product Name,SKU\nHat,A\n", "csv"):
+                pass  # pragma: no cover
+        assert exc.value.status_code == 413
@@ -6,6 +6,9 @@ from openpyxl import load_workbook
 from PIL import Image as PILImage
 
 from app.models.inventory import InventoryItem
+from app.services import xlsx_export
+from app.services.photo_store import externalize_photo, photo_url
+from app.services.worker_pool import WorkerLimitExceeded
 from app.services.xlsx_export import _decode_image, export_inventory_xlsx
 
 
@@ -21,6 +24,7 @@ def test_decode_image_handles_data_url_and_junk():
     assert _decode_image("") is None
     assert _decode_image("https://x/y.jpg") is None     # not a data URL -> skipped
     assert _decode_image("data:image/jpeg;base64,not-base64!!") is None  # bad payload -> None (no crash)
+    assert _decode_image(externalize_photo(_data_url())) is not None  # photo store URL -> PNG bytes
 
 
 def test_xlsx_embeds_real_image_not_base64_text(db, test_user):
@@ -31,7 +35,7 @@ def test_xlsx_embeds_real_image_not_base64_text(db, test_user):
     db.commit()
 
     xlsx = export_inventory_xlsx(db, test_user.id)
-    wb = load_workbook(io.BytesIO(xlsx))
+    wb = load_workbook(xlsx)
     ws = wb.active
 
     # a real image is embedded (the whole point)
@@ -47,6 +51,106 @@ def test_xlsx_ok_when_no_photo(db, test_user):
     db.add(InventoryItem(user_id=test_user.id, name="No Photo", status="in_stock", quantity=1))
     db.commit()
     xlsx = export_inventory_xlsx(db, test_user.id)
-    ws = load_workbook(io.BytesIO(xlsx)).active
+    ws = load_workbook(xlsx).active
     assert len(ws._images) == 0            # nothing embedded, no crash
     assert any(c.value == "No Photo" for row in ws.iter_rows() for c in row)
+
+
+def _image_rows(ws) -> list[int]:
+    return sorted(image.anchor._from.row + 1 for image in ws._images)
+
+
+def test_thumbnails_are_cached_by_photo_hash(db, test_user, monkeypatch):
+    made = []
+    real_write = xlsx_export._write_thumbnail
+
+    def counting_write(url, path):
+        made.append(path)
+        return real_write(url, path)
+
+    monkeypatch.setattr(xlsx_export, "_write_thumbnail", counting_write)
+    shared = _data_url((10, 20, 30))
+    db.add_all([
+        InventoryItem(user_id=test_user.id, name="Same A", status="in_stock", quantity=1, photo_front_url=shared),
+        InventoryItem(user_id=test_user.id, name="Same B", status="in_stock", quantity=1,
+                      photo_front_url=externalize_photo(shared), photo_back_url=_data_url((40, 50, 60))),
+    ])
+    db.commit()
+
+    with export_inventory_xlsx(db, test_user.id) as xlsx:
+        assert len(load_workbook(xlsx).active._images) == 3
+    assert len(made) == 2  # the data URL and its stored copy share one thumbnail
+
+    with export_inventory_xlsx(db, test_user.id) as xlsx:
+        assert len(load_workbook(xlsx).active._images) == 3
+    assert len(made) == 2  # a repeat export does no image work
+
+
+def test_rows_are_written_in_batches(db, test_user, monkeypatch):
+    monkeypatch.setattr(xlsx_export, "EXPORT_BATCH_ROWS", 2)
+    for idx in range(5):
+        db.add(InventoryItem(
+            user_id=test_user.id, name=f"Batch {idx}", status="in_stock", quantity=1,
+            photo_front_url=_data_url((idx, 0, 0)) if idx % 2 == 0 else None,
+        ))
+        db.commit()
+
+    with export_inventory_xlsx(db, test_user.id) as xlsx:
+        ws = load_workbook(xlsx).active
+        names = [ws.cell(row=r, column=2).value for r in range(2, 7)]
+        assert names == [f"Batch {idx}" for idx in (4, 3, 2, 1, 0)]
+        assert _image_rows(ws) == [2, 4, 6]  # each photo stays on its item's row
+        assert ws.freeze_panes == "A2"
+
+
+def test_only_decodable_photos_are_embedded(db, test_user, monkeypatch):
+    monkeypatch.setattr(xlsx_export, "EXPORT_BATCH_ROWS", 3)
+    gray = io.BytesIO()
+    PILImage.new("L", (120, 40), 128).save(gray, "PNG")
+    db.add_all([
+        InventoryItem(user_id=test_user.id, name="Lost", status="in_stock", quantity=1,
+                      photo_front_url=photo_url("0" * 64), photo_back_url="https://x/y.jpg"),
+        InventoryItem(user_id=test_user.id, name="Junk", status="in_stock", quantity=1,
+                      photo_front_url="data:image/png;base64," + base64.b64encode(b"not an image").decode()),
+        InventoryItem(user_id=test_user.id, name="Gray", status="in_stock", quantity=1,
+                      photo_front_url="data:image/png;base64," + base64.b64encode(gray.getvalue()).decode()),
+    ])
+    db.commit()
+    with export_inventory_xlsx(db, test_user.id) as xlsx:
+        assert len(load_workbook(xlsx).active._images) == 1
+
+
+def test_batch_over_the_worker_limits_is_left_without_photos(db, test_user, monkeypatch):
+    monkeypatch.setattr(xlsx_export, "EXPORT_BATCH_ROWS", 1)
+    real_map = xlsx_export.process_map
+
+    def exhausted_once(fn, urls, paths):
+        if len(exhausted_once.calls) == 0:
+            exhausted_once.calls.append(urls)
+            raise WorkerLimitExceeded("cpu")
+        return real_map(fn, urls, paths)
+
+    exhausted_once.calls = []
+    monkeypatch.setattr(xlsx_export, "process_map", exhausted_once)
+    for name, color in (("Fine", (1, 2, 3)), ("Huge", (4, 5, 6))):
+        db.add(InventoryItem(user_id=test_user.id, name=name, status="in_stock", quantity=1,
+                             photo_front_url=_data_url(color)))
+        db.commit()
+
+    with export_inventory_xlsx(db, test_user.id) as xlsx:
+        ws = load_workbook(xlsx).active
+        assert [ws.cell(row=r, column=2).value for r in (2, 3)] == ["Huge", "Fine"]
+        assert _image_rows(ws) == [3]  # only the batch that ran out lost its photo
+
+
+def test_xlsx_endpoint_streams_the_workbook(client, auth_headers, db, test_user):
+    test_user.subscription_tier = "pro"
+    db.add(InventoryItem(user_id=test_user.id, name="Streamed", status="in_stock", quantity=1,
+                         photo_front_url=_data_url()))
+    db.commit()
+    resp = client.get("/api/v1/export/inventory?format=xlsx", headers=auth_headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    ws = load_workbook(io.BytesIO(resp.content)).active
+    assert ws.cell(row=2, column=2).value == "Streamed"
+    assert len(ws._images) == 1